@@ -0,0 +1,205 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from ifaceparser import *
+from ifaceobjcgen import *
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+benchIntegralTypes = [ "int32", "int64", "double", "string", "bool" ]
+
+def nestedDictIDL( depth ):
+	typedef = OrderedDict()
+	typedef['value'] = 'string'
+	if depth > 1:
+		typedef['nested'] = nestedDictIDL( depth - 1 )
+	return typedef
+
+def nestedListIDL( depth, itemType ):
+	if depth == 0:
+		return itemType
+	return [ nestedListIDL( depth - 1, itemType ) ]
+
+def structsIDL( namePrefix, params, referableTypes ):
+	structs = []
+	for structIndex in range( params.structs ):
+		structName = '%s%d' % ( namePrefix, structIndex )
+		typedef = OrderedDict()
+		for fieldIndex in range( params.fields ):
+			fieldName = 's%d_field_%d' % ( structIndex, fieldIndex )
+			if fieldIndex % 5 == 4 and len( referableTypes ) > 0:
+				typedef[fieldName] = referableTypes[ ( structIndex + fieldIndex ) % len( referableTypes ) ]
+			else:
+				typedef[fieldName] = benchIntegralTypes[ fieldIndex % len( benchIntegralTypes ) ]
+		if params.nesting > 0:
+			typedef['s%d_nested' % structIndex] = nestedDictIDL( params.nesting )
+		if params.list_nesting > 0:
+			itemType = referableTypes[ structIndex % len( referableTypes ) ] if len( referableTypes ) > 0 else 'string'
+			typedef['s%d_items' % structIndex] = nestedListIDL( params.list_nesting, itemType )
+
+		struct = OrderedDict()
+		struct['struct'] = structName
+		if params.extends > 1 and structIndex % params.extends != 0:
+			struct['extends'] = '%s%d' % ( namePrefix, structIndex - 1 )
+		struct['typedef'] = typedef
+		structs.append( struct )
+		referableTypes.append( structName )
+	return structs
+
+def methodsIDL( params, referableTypes ):
+	methods = []
+	for methodIndex in range( params.methods ):
+		structName = referableTypes[ methodIndex % len( referableTypes ) ] if len( referableTypes ) > 0 else 'string'
+		method = OrderedDict()
+		if methodIndex % 2 == 0:
+			method['get'] = 'method%d' % methodIndex
+		else:
+			method['post'] = 'method%d' % methodIndex
+			method['request'] = { 'item': structName }
+		method['endpoint'] = 'items/${item_id}/method%d' % methodIndex
+		method['url_params'] = { 'token': 'string' }
+		method['response'] = { 'result': [ structName ] }
+		methods.append( method )
+	return methods
+
+def synthesizeCorpus( corpusDir, params ):
+	#one shared types module imported by "fanout" service modules
+	corpus = OrderedDict()
+	commonTypes = []
+	commonIface = structsIDL( 'Common', params, commonTypes )
+	if params.fanout == 0:
+		commonIface.extend( methodsIDL( params, commonTypes ) )
+	corpus['commontypes.json'] = { 'iface': commonIface }
+
+	for serviceIndex in range( params.fanout ):
+		serviceTypes = list( commonTypes )
+		serviceIface = [ { 'import': 'commontypes.json' } ]
+		serviceIface.extend( structsIDL( 'Service%dType' % serviceIndex, params, serviceTypes ) )
+		serviceIface.extend( methodsIDL( params, serviceTypes ) )
+		corpus['service%d.json' % serviceIndex] = { 'iface': serviceIface }
+
+	jsonFiles = []
+	for fileName in corpus.keys():
+		jsonFile = os.path.join( corpusDir, fileName )
+		with open( jsonFile, 'wt' ) as jFile:
+			json.dump( corpus[fileName], jFile, indent=1 )
+		jsonFiles.append( jsonFile )
+	return jsonFiles
+
+def timed( phaseTimes, phase, action ):
+	startTime = time.time()
+	result = action()
+	phaseTimes[phase] = phaseTimes.get( phase, 0.0 ) + time.time() - startTime
+	return result
+
+def benchmarkCorpus( jsonFiles, genDir, context=None, options=OBJCDefaultOptions ):
+	phaseTimes = OrderedDict()
+
+	for jsonFile in jsonFiles:
+		with open( jsonFile, 'rt' ) as jFile:
+			timed( phaseTimes, 'jsonLoad', lambda: json.load( jFile, object_pairs_hook=OrderedDict ) )
+
+	#parseModule loads JSON itself, so this phase includes "jsonLoad" time
+	#every run renders the corpus from scratch
+	OBJCFragments.clear()
+	moduleCache = GenModuleCache()
+	modules = []
+	for jsonFile in jsonFiles:
+		modules.append( timed( phaseTimes, 'parseModule', lambda: parseModule( jsonFile, context, moduleCache ) ) )
+
+	rendered = []
+	for module in modules:
+		header = timed( phaseTimes, 'OBJCHeader', lambda: OBJCHeader( module, options ) )
+		implementation = timed( phaseTimes, 'OBJCModule', lambda: OBJCModule( module, options ) )
+		rendered.append( ( module, header, implementation ) )
+
+	if not os.path.exists( genDir ):
+		os.makedirs( genDir )
+	for module, header, implementation in rendered:
+		timed( phaseTimes, 'write', lambda: writeFileIfChanged( os.path.join( genDir, module.name + '.h' ), header ) )
+		timed( phaseTimes, 'write', lambda: writeFileIfChanged( os.path.join( genDir, module.name + '.m' ), implementation ) )
+
+	#size of the generated code, to compare generator versions by
+	outputSizes = OrderedDict( [ ( extension, OrderedDict( [ ( 'bytes', 0 ), ( 'lines', 0 ) ] ) ) for extension in ( '.h', '.m' ) ] )
+	for module, header, implementation in rendered:
+		for extension, text in ( ( '.h', header ), ( '.m', implementation ) ):
+			outputSizes[extension]['bytes'] += len( text )
+			outputSizes[extension]['lines'] += text.count( '\n' )
+	return phaseTimes, outputSizes
+
+def main():
+	parser = argparse.ArgumentParser(description='ifacegen generator benchmark on a synthetic IDL corpus')
+	parser.add_argument('--structs', type=int, action='store', default=50, required=False, help='Number of structs per module')
+	parser.add_argument('--fields', type=int, action='store', default=20, required=False, help='Number of fields per struct')
+	parser.add_argument('--nesting', type=int, action='store', default=2, required=False, help='Depth of nested struct declared in every struct')
+	parser.add_argument('--list-nesting', type=int, action='store', default=2, required=False, help='Depth of nested list declared in every struct')
+	parser.add_argument('--extends', type=int, action='store', default=3, required=False, help='Length of "extends" chains structs are grouped in')
+	parser.add_argument('--fanout', type=int, action='store', default=4, required=False, help='Number of modules importing the shared types module')
+	parser.add_argument('--methods', type=int, action='store', default=20, required=False, help='Number of methods per module')
+	parser.add_argument('--idl', action='store', nargs='+', required=False, help='IDL files to benchmark instead of a synthetic corpus, e.g. to measure generated code size of real modules')
+	parser.add_argument('--prefix', type=unicode, action='store', required=False, help='Class and methods prefix of the IDL files')
+	parser.add_argument('--json-writer', action='store_true', required=False, help='Generate with --json-writer')
+	parser.add_argument('--json-reader', action='store_true', required=False, help='Generate with --json-reader')
+	parser.add_argument('--codec', action='store', choices=['msgpack'], required=False, help='Generate with --codec')
+	parser.add_argument('--repeat', type=int, action='store', default=5, required=False, help='Number of runs, the best time of each phase is reported')
+	parser.add_argument('-o', '--output', action='store', required=False, help='File to write JSON results to instead of stdout')
+
+	parsedArgs = parser.parse_args()
+
+	options = OBJCOptions( jsonWriter=parsedArgs.json_writer, jsonReader=parsedArgs.json_reader, lazy=False, codec=parsedArgs.codec )
+	workDir = tempfile.mkdtemp( prefix='ifacebench' )
+	try:
+		jsonFiles = parsedArgs.idl if parsedArgs.idl is not None else synthesizeCorpus( workDir, parsedArgs )
+		bestTimes = OrderedDict()
+		for runIndex in range( parsedArgs.repeat ):
+			phaseTimes, outputSizes = benchmarkCorpus( jsonFiles, os.path.join( workDir, 'gen-objc-%d' % runIndex ), GenContext( parsedArgs.prefix ), options )
+			for phase in phaseTimes.keys():
+				bestTimes[phase] = min( bestTimes.get( phase, phaseTimes[phase] ), phaseTimes[phase] )
+
+		results = OrderedDict()
+		results['params'] = OrderedDict( sorted( vars( parsedArgs ).items() ) )
+		del results['params']['output']
+		results['python'] = sys.version.split()[0]
+		results['corpus'] = OrderedDict( [ ( 'files', len( jsonFiles ) ), ( 'inputBytes', sum( [ os.path.getsize( jsonFile ) for jsonFile in jsonFiles ] ) ), ( 'outputBytes', sum( [ size['bytes'] for size in outputSizes.values() ] ) ) ] )
+		results['output'] = outputSizes
+		results['phases'] = OrderedDict( [ ( phase, round( bestTimes[phase] * 1000, 3 ) ) for phase in bestTimes.keys() ] )
+		results['units'] = 'ms'
+	finally:
+		shutil.rmtree( workDir )
+
+	resultsJSON = json.dumps( results, indent=1, separators=(',', ': ') )
+	if parsedArgs.output is not None:
+		with open( parsedArgs.output, 'wt' ) as outFile:
+			outFile.write( resultsJSON + '\n' )
+	else:
+		print( resultsJSON )
+
+	return 0
+
+#########
+
+if __name__ == "__main__":
+	main()
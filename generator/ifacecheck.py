@@ -0,0 +1,333 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from ifaceparser import *
+from ifacepygen import *
+from ifacejsonreader import *
+from collections import OrderedDict
+import argparse
+import json
+import re
+import sys
+import time
+
+#decodes JSON fixtures with the Python counterparts of the generated initWithJSONReader: and readDictionary:withError:
+#and checks that the streaming reader gets the same objects the NSDictionary-based decoding does;
+#with --codec the decoded objects are also written in the binary codec and read back
+
+def loadDecoders( modules, codec=None ):
+	namespace = {}
+	exec compile( PYModule( modules, codec ), '<decoders>', 'exec' ) in namespace
+	return namespace
+
+def decodeFixture( decoders, genType, data ):
+	namespace = dict( decoders )
+	namespace['reader'] = JSONReader( data )
+	fromReader = eval( PYJSONReaderValue( genType, 'reader' ), namespace )
+	if not namespace['reader'].finish():
+		return ( None, None, namespace['reader'].error() )
+	namespace['value'] = parseJSONData( data )
+	fromDictionary = eval( PYDictionaryValue( genType, 'value' ), namespace )
+	jsonObject = decoders['jsonObject']
+	return ( jsonObject( fromReader ), jsonObject( fromDictionary ), None )
+
+def checkFixtures( modules, fixtures ):
+	decoders = loadDecoders( modules )
+	failures = 0
+	for fixture in fixtures:
+		fixtureFile, typeName = fixture.rsplit( ':', 1 )
+		genType = PYDecodedType( typeName, modules )
+		if genType is None:
+			print 'FAIL %s: unknown type %s' % ( fixtureFile, typeName )
+			failures += 1
+			continue
+		with open( fixtureFile, 'rb' ) as inFile:
+			data = inFile.read()
+		fromReader, fromDictionary, error = decodeFixture( decoders, genType, data )
+		if error is not None:
+			print 'FAIL %s as %s: %s' % ( fixtureFile, typeName, error )
+			failures += 1
+		elif fromReader != fromDictionary:
+			print 'FAIL %s as %s:\n  reader:     %s\n  dictionary: %s' % ( fixtureFile, typeName, json.dumps( fromReader ), json.dumps( fromDictionary ) )
+			failures += 1
+		else:
+			print 'OK %s as %s' % ( fixtureFile, typeName )
+	return failures
+
+codecTimingRounds = 100
+
+def timed( action ):
+	#average time of a call in microseconds
+	start = time.time()
+	for i in range( codecTimingRounds ):
+		action()
+	return ( time.time() - start ) * 1e6 / codecTimingRounds
+
+def checkCodecFixture( decoders, genType, data ):
+	#( jsonObject of the JSON decoding, jsonObject of the codec round trip, sizes and times, error )
+	namespace = dict( decoders )
+	namespace['JSONReader'] = JSONReader
+	namespace['data'] = data
+	decodeJSON = eval( 'lambda: ( lambda reader: ( %s, reader ) )( JSONReader( data ) )' % PYJSONReaderValue( genType, 'reader' ), namespace )
+	value, reader = decodeJSON()
+	if not reader.finish():
+		return ( None, None, None, reader.error() )
+	namespace['value'] = value
+	encode = eval( 'lambda: ( lambda data: ( %s, data )[1] )( bytearray() )' % PYMessagePackWriterValue( genType, 'value' ), namespace )
+	try:
+		codecData = encode()
+	except MessagePackError as error:
+		return ( None, None, None, error )
+	namespace['codecData'] = codecData
+	decodeCodec = eval( 'lambda: ( lambda reader: ( %s, reader ) )( MessagePackReader( codecData ) )' % PYMessagePackReaderValue( genType, 'reader' ), namespace )
+	codecValue, reader = decodeCodec()
+	if not reader.finish():
+		return ( None, None, None, reader.error() )
+	jsonObject = decoders['jsonObject']
+	stats = 'JSON %d bytes, decode %.1fus; msgpack %d bytes, encode %.1fus, decode %.1fus' % ( len( data ), timed( decodeJSON ), len( codecData ), timed( encode ), timed( decodeCodec ) )
+	return ( jsonObject( value ), jsonObject( codecValue ), stats, None )
+
+def checkCodec( modules, fixtures, calls, codec ):
+	#every fixture, and every response of a call, goes JSON -> object -> codec -> object
+	#and has to come back as the same object; sizes and times are printed to compare the formats
+	if codec is None:
+		return 0
+	decoders = loadDecoders( modules, codec )
+	checked = [ tuple( fixture.rsplit( ':', 1 ) ) + ( PYDecodedType( fixture.rsplit( ':', 1 )[1], modules ), ) for fixture in fixtures ]
+	for call in calls:
+		methodName, fixtureFile = ( call.split( ':', 1 ) + [ None ] )[:2]
+		module, method = findMethod( modules, methodName )
+		if fixtureFile and method is not None and method.responseType is not None:
+			checked.append( ( fixtureFile, methodName, method.responseType ) )
+	failures = 0
+	for fixtureFile, typeName, genType in checked:
+		if genType is None:
+			continue
+		with open( fixtureFile, 'rb' ) as inFile:
+			data = inFile.read()
+		fromJSON, fromCodec, stats, error = checkCodecFixture( decoders, genType, data )
+		if error is not None:
+			print 'FAIL %s %s as %s: %s' % ( codec, fixtureFile, typeName, error )
+			failures += 1
+		elif fromJSON != fromCodec:
+			print 'FAIL %s %s as %s:\n  JSON:  %s\n  %s: %s' % ( codec, fixtureFile, typeName, json.dumps( fromJSON ), codec, json.dumps( fromCodec ) )
+			failures += 1
+		else:
+			print 'OK %s %s as %s: %s' % ( codec, fixtureFile, typeName, stats )
+	return failures
+
+class MockTransport( object ):
+	#keeps every request in flight until completeAll, then answers them in reverse order,
+	#as a transport running many requests over one client may do
+	def __init__( self ):
+		self.calls = []
+
+	def sendRequest( self, request, completion ):
+		self.calls.append( ( request, completion ) )
+
+	def completeAll( self, respond ):
+		calls = self.calls
+		self.calls = []
+		for request, completion in reversed( calls ):
+			completion( respond( request ), None )
+
+sampleIntegralValues = { "bool": lambda index: index % 2 == 1, "int32": lambda index: index, "int64": lambda index: index + 2**40, "double": lambda index: index + 0.5, "string": lambda index: u'call%d' % index, "raw": lambda index: { u'call': index }, "rawstr": lambda index: u'{"call":%d}' % index }
+
+def sampleValue( decoders, genType, index ):
+	#arguments of a call differ from those of the other calls, so a request mixed up with another one is caught
+	if isinstance( genType, GenIntegralType ):
+		return sampleIntegralValues[genType.sType]( index )
+	if isinstance( genType, GenComplexType ):
+		value = decoders[genType.name]()
+		for field in genType.allFields():
+			setattr( value, field.alias, sampleValue( decoders, field.type, index ) )
+		return value
+	if isinstance( genType.itemType, GenComplexType ) and genType.itemType.name in decoders:
+		return [ sampleValue( decoders, genType.itemType, index ) ]
+	return []
+
+def expectedRequest( decoders, method, args ):
+	jsonObject = decoders['jsonObject']
+	endpoint = args.get( 'endpoint', method.endpoint )
+	if method.restfulParamsType is not None:
+		endpoint = re.sub( r'\$\{(\w+)\}', lambda match: unicode( args[match.group( 1 )] ), method.endpoint )
+	params = OrderedDict( ( section, OrderedDict( ( field.name, jsonObject( args[field.alias] ) ) for field in customRequestType.allFields() ) ) for section, customRequestType in method.customRequestTypes.items() )
+	body = None
+	if method.requestJsonType is not None:
+		body = OrderedDict( ( field.name, jsonObject( args[field.alias] ) ) for field in method.requestJsonType.allFields() )
+	return ( endpoint, params, body, method.retryPolicy, method.cachePolicy, method.bodyEncoding )
+
+def findMethod( modules, methodName ):
+	for module in modules:
+		for method in module.methods:
+			if method.name == methodName:
+				return ( module, method )
+	return ( None, None )
+
+def findBatch( modules, batchName ):
+	for module in modules:
+		for batch in module.batches:
+			if batch.name == batchName:
+				return ( module, batch )
+	return ( None, None )
+
+def resultRecorder( results, index ):
+	return lambda *result: results.setdefault( index, [] ).append( result )
+
+def batchResponse( pending ):
+	#results come in reverse order, each call has to find its own one by id
+	results = []
+	for callId, ( index, call, method, data, expected, request ) in reversed( list( enumerate( pending ) ) ):
+		result = OrderedDict( [ ( 'id', callId ), ( 'status', 200 ) ] )
+		if data is not None:
+			result['body'] = json.loads( data, object_pairs_hook=OrderedDict )
+		results.append( result )
+	return json.dumps( OrderedDict( [ ( 'results', results ) ] ) )
+
+def checkBatchRequest( batch, request, pending ):
+	#the calls of the envelope are what the calls alone would send
+	envelope = json.loads( request.body, object_pairs_hook=OrderedDict )
+	if request.endpoint != batch.endpoint or request.method != 'POST' or len( envelope['calls'] ) != len( pending ):
+		print 'FAIL batch %s: request %s %s with %d calls, expected POST %s with %d calls' % ( batch.name, request.method, request.endpoint, len( envelope['calls'] ), batch.endpoint, len( pending ) )
+		return None
+	requests = []
+	for callId, envelopeCall in enumerate( envelope['calls'] ):
+		callRequest = pending[callId][5]
+		method = callRequest.method
+		if method == 'AUTO':
+			method = 'GET' if callRequest.body is None else 'POST'
+		if envelopeCall['id'] != callId or envelopeCall['method'] != method:
+			print 'FAIL batch %s: call %s' % ( batch.name, json.dumps( envelopeCall ) )
+			return None
+		requests.append( ( envelopeCall['endpoint'], envelopeCall.get( 'params', OrderedDict() ), envelopeCall.get( 'body' ), callRequest.retryPolicy, callRequest.cachePolicy, callRequest.bodyEncoding ) )
+	return requests
+
+def checkCalls( modules, calls, batchName=None ):
+	#runs all the calls at once over one client and one transport, each completion has to get
+	#the response to its own request whatever order the transport answers them in;
+	#with a batch all of them go in its envelope request
+	decoders = loadDecoders( modules )
+	transport = MockTransport()
+	pending = []
+	results = {}
+	failures = [ 0 ]
+
+	def makeCalls( clientForModule ):
+		for index, call in enumerate( calls ):
+			methodName, fixtureFile = ( call.split( ':', 1 ) + [ None ] )[:2]
+			module, method = findMethod( modules, methodName )
+			client = clientForModule( module ) if method is not None else None
+			if client is None:
+				print 'FAIL call %s: unknown method' % call if method is None else 'FAIL call %s: method is not of module %s' % ( call, batchModule.name )
+				failures[0] += 1
+				continue
+			data = None
+			if fixtureFile:
+				with open( fixtureFile, 'rb' ) as inFile:
+					data = inFile.read()
+			args = OrderedDict()
+			if method.endpoint is None:
+				args['endpoint'] = u'endpoint%d' % index
+			for field in PYMethodArgs( method ):
+				args[field.alias] = sampleValue( decoders, field.type, index )
+			getattr( client, method.name )( *args.values(), completion=resultRecorder( results, index ) )
+			request = client.transport.calls[-1][0]
+			request.fixture = data
+			pending.append( ( index, call, method, data, expectedRequest( decoders, method, args ), request ) )
+
+	batchModule = None
+	if batchName is None:
+		clients = {}
+		makeCalls( lambda module: clients.setdefault( module.name, decoders[module.name]( transport ) ) )
+		transport.completeAll( lambda request: request.fixture )
+		requests = [ ( request.endpoint, request.params, None if request.body is None else json.loads( request.body, object_pairs_hook=OrderedDict ), request.retryPolicy, request.cachePolicy, request.bodyEncoding ) for index, call, method, data, expected, request in pending ]
+	else:
+		batchModule, batch = findBatch( modules, batchName )
+		if batch is None:
+			print 'FAIL batch %s: unknown batch' % batchName
+			return 1
+		batchResults = []
+		getattr( decoders[batchModule.name]( transport ), batch.name )( lambda client: makeCalls( lambda module: client if module is batchModule else None ), batchResults.append )
+		if len( pending ) == 0:
+			return failures[0]
+		requests = checkBatchRequest( batch, transport.calls[0][0], pending )
+		if requests is None:
+			return failures[0] + 1
+		transport.completeAll( lambda request: batchResponse( pending ) )
+		if batchResults != [ None ]:
+			print 'FAIL batch %s: completion got %s' % ( batchName, batchResults )
+			return failures[0] + 1
+
+	for ( index, call, method, data, expected, request ), actual in zip( pending, requests ):
+		if actual != expected:
+			print 'FAIL call %s: request %s, expected %s' % ( call, json.dumps( actual ), json.dumps( expected ) )
+			failures[0] += 1
+			continue
+		if len( results.get( index, [] ) ) != 1:
+			print 'FAIL call %s: completion called %d times' % ( call, len( results.get( index, [] ) ) )
+			failures[0] += 1
+			continue
+		result = results[index][0]
+		if method.responseType is None:
+			if result[0] is not None:
+				print 'FAIL call %s: %s' % ( call, result[0] )
+				failures[0] += 1
+				continue
+		elif data is not None:
+			namespace = dict( decoders )
+			namespace['value'] = parseJSONData( data )
+			try:
+				fromDictionary = decoders['jsonObject']( eval( PYDictionaryValue( method.responseType, 'value' ), namespace ) )
+			except JSONReaderError as error:
+				print 'FAIL call %s: %s' % ( call, error )
+				failures[0] += 1
+				continue
+			if result[1] is not None or decoders['jsonObject']( result[0] ) != fromDictionary:
+				print 'FAIL call %s:\n  completion: %s, %s\n  expected:   %s' % ( call, json.dumps( decoders['jsonObject']( result[0] ) ), result[1], json.dumps( fromDictionary ) )
+				failures[0] += 1
+				continue
+		print 'OK call %s' % call
+	return failures[0]
+
+def main():
+	parser = argparse.ArgumentParser(description='Checks the JSON reader decoding of fixtures against the NSDictionary-based one')
+	parser.add_argument('rpcInput', metavar='I', type=unicode, nargs = '+', help = 'Input JSON RPC files')
+	parser.add_argument('--prefix', type=unicode, action='store', required=False, help='Class and methods prefix')
+	parser.add_argument('--fixture', action='append', default=[], required=False, help='FILE:TYPE to decode, TYPE is a type name, [TYPE] for a list of it, or a method name for its response')
+	parser.add_argument('--call', action='append', default=[], required=False, help='METHOD[:FILE] to call through a mock transport with FILE as the response, all the calls are in flight at once')
+	parser.add_argument('--batch', action='store', required=False, help='BATCH to queue all the calls in, they are sent in its envelope request')
+	parser.add_argument('--codec', action='store', choices=['msgpack'], required=False, help='Binary codec to round trip the fixtures and the call responses through, with sizes and times compared to JSON')
+	parser.add_argument('-o', '--output', action='store', required=False, help='File to write the generated Python decoders to')
+	parsedArgs = parser.parse_args()
+
+	context = GenContext( parsedArgs.prefix )
+	moduleCache = GenModuleCache()
+	modules = [ parseModule( rpcInput, context, moduleCache ) for rpcInput in parsedArgs.rpcInput ]
+
+	if parsedArgs.output is not None:
+		with open( parsedArgs.output, 'wt' ) as outFile:
+			outFile.write( PYModule( modules, parsedArgs.codec ) )
+
+	failures = checkFixtures( modules, parsedArgs.fixture ) + checkCalls( modules, parsedArgs.call, parsedArgs.batch ) + checkCodec( modules, parsedArgs.fixture, parsedArgs.call, parsedArgs.codec )
+	if failures > 0:
+		sys.exit( 1 )
+
+if __name__ == "__main__":
+	main()
@@ -23,36 +23,138 @@
 
 from ifaceparser import *
 from ifaceobjcgen import *
+from ifacemanifest import *
 import argparse
 import sys
 import types
 import os
+import multiprocessing
+import time
+import cProfile
 from collections import OrderedDict
 from string import Template
 
-def processIface( jsonFile, verbose, typeNamePrefix, outDir, category ):
+def parseIface( jsonFile, verbose, options, context=None, moduleCache=None, manifest=None, keepResident=False ):
 
-	if outDir is not None:
-		genDir = os.path.abspath( outDir )
+	if manifest is not None and manifest.isUpToDate( jsonFile, options ):
+		if verbose:
+			print( "Module " + jsonFile + " is up to date" )
+		if keepResident:
+			parseModule( jsonFile, context, moduleCache )
+		return None
 
-	if typeNamePrefix is not None:
-		GenModule.namePrefix = typeNamePrefix
-		GenType.namePrefix = typeNamePrefix
-
-	module = parseModule( jsonFile )
+	module = parseModule( jsonFile, context, moduleCache )
 	if module is None:
 		print("Can't load module " + jsonFile)
-		return
+		return None
 
 	if verbose:
 		for genTypeKey in module.typeList.keys():
 			print( str( module.typeList[genTypeKey] ) + '\n' )
 		for method in module.methods:
 			print( str( method ) + '\n' )
+		for batch in module.batches:
+			print( str( batch ) + '\n' )
+
+	return module
 
-	if genDir is None:
-		genDir = 'gen-objc'
-	writeObjCImplementation( genDir, category, module )
+def generateIface( job ):
+	genDir, category, module, profiling, objcOptions = job
+	profile = GenProfile() if profiling else None
+	try:
+		return ( writeObjCImplementation( genDir, category, module, profile, objcOptions ), None, profile )
+	except Exception as ex:
+		return ( None, str(ex), profile )
+
+def processIfaces( rpcInputs, verbose, typeNamePrefix, outDir, category, jobs=1, force=False, moduleCache=None, profiling=False, objcOptions=OBJCDefaultOptions ):
+
+	genDir = os.path.abspath( outDir if outDir is not None else 'gen-objc' )
+
+	options = { "prefix": typeNamePrefix, "category": category, "objc": objcOptions._asdict(), "generator": generatorHash() }
+	profile = GenProfile() if profiling else None
+	context = GenContext( typeNamePrefix, profile )
+	#a cache passed in by the caller outlives this call, so every module is kept parsed in it
+	keepResident = moduleCache is not None
+	if moduleCache is None:
+		moduleCache = GenModuleCache()
+	manifest = GenManifest( genDir )
+	if force:
+		manifest.modules.clear()
+
+	errors = OrderedDict()
+	modules = OrderedDict()
+	for rpcInput in rpcInputs:
+		try:
+			module = parseIface( rpcInput, verbose, options, context, moduleCache, manifest, keepResident )
+		except Exception as ex:
+			errors[rpcInput] = str(ex)
+			continue
+		if module is not None:
+			modules[rpcInput] = module
+
+	genJobs = [ ( genDir, category, modules[rpcInput], profiling, objcOptions ) for rpcInput in modules.keys() ]
+	if jobs > 1 and len( genJobs ) > 1:
+		pool = multiprocessing.Pool( min( jobs, len( genJobs ) ) )
+		try:
+			results = pool.map( generateIface, genJobs )
+		finally:
+			pool.close()
+			pool.join()
+	else:
+		results = [ generateIface( genJob ) for genJob in genJobs ]
+
+	for rpcInput, result in zip( modules.keys(), results ):
+		outputHashes, error, moduleProfile = result
+		if moduleProfile is not None:
+			profile.merge( moduleProfile )
+		if error is not None:
+			errors[rpcInput] = error
+		else:
+			manifest.update( rpcInput, moduleSourceFiles( modules[rpcInput] ), options, outputHashes )
+
+	manifest.save()
+
+	for rpcInput in rpcInputs:
+		if rpcInput in errors:
+			print( rpcInput + ": " + errors[rpcInput] )
+	if profile is not None:
+		print( profile.report() )
+	return len( errors ) == 0
+
+def watchedFileTimes( rpcInputs, moduleCache ):
+	fileTimes = {}
+	for watchedFile in [ os.path.abspath( rpcInput ) for rpcInput in rpcInputs ] + moduleCache.sourceFiles():
+		try:
+			fileTimes[watchedFile] = os.stat( watchedFile ).st_mtime
+		except OSError:
+			fileTimes[watchedFile] = None
+	return fileTimes
+
+def watchIfaces( rpcInputs, verbose, typeNamePrefix, outDir, category, jobs=1, force=False, profiling=False, objcOptions=OBJCDefaultOptions, interval=0.3 ):
+
+	moduleCache = GenModuleCache()
+	processIfaces( rpcInputs, verbose, typeNamePrefix, outDir, category, jobs, force, moduleCache, profiling, objcOptions )
+	fileTimes = watchedFileTimes( rpcInputs, moduleCache )
+	print( "Watching %d files for changes, press Ctrl+C to stop" % len( fileTimes ) )
+
+	try:
+		while True:
+			time.sleep( interval )
+			currentFileTimes = watchedFileTimes( rpcInputs, moduleCache )
+			changedFiles = [ watchedFile for watchedFile in currentFileTimes.keys() if fileTimes.get( watchedFile ) != currentFileTimes[watchedFile] ]
+			if len( changedFiles ) == 0:
+				continue
+
+			startTime = time.time()
+			invalidatedFiles = moduleCache.invalidate( changedFiles )
+			#inputs failed last time are not in the cache and are retried as well
+			affectedInputs = [ rpcInput for rpcInput in rpcInputs if moduleCache.keyForFile( rpcInput ) in invalidatedFiles or not moduleCache.contains( rpcInput, typeNamePrefix ) ]
+			processIfaces( affectedInputs, verbose, typeNamePrefix, outDir, category, jobs, False, moduleCache, profiling, objcOptions )
+			print( "Regenerated %d modules in %d ms" % ( len( affectedInputs ), int( ( time.time() - startTime ) * 1000 ) ) )
+
+			fileTimes = watchedFileTimes( rpcInputs, moduleCache )
+	except KeyboardInterrupt:
+		pass
 
 def main():
 	parser = argparse.ArgumentParser(description='JSON-ObjC interface generator')
@@ -62,26 +164,57 @@ def main():
 	parser.add_argument('--verbose', action='store_true', required=False, help='Verbose mode')
 	parser.add_argument('-o', '--outdir', action='store', required=False, help="Output directory name")
 	parser.add_argument('--category', type=unicode, action='store', required=False, help='Generate a separate category files for de-/serialization methods')
+	parser.add_argument('--json-writer', action='store_true', required=False, help='Generate appendJSONToData:error: writing JSON bytes directly into NSMutableData, used by dumpWithError: and RPC requests')
+	parser.add_argument('--json-reader', action='store_true', required=False, help='Generate initWithJSONReader: reading objects right from JSON bytes, used by initWithJSONData:error: and RPC responses')
+	parser.add_argument('--lazy', action='store_true', required=False, help='Decode nested objects and lists of objects of all structs on first access, as the "lazy" struct flag does')
+	parser.add_argument('--codec', action='store', choices=['msgpack'], required=False, help='Generate a binary codec along with JSON: appendMessagePackToData:error: and initWithMessagePackReader:, RPC responses of MessagePack content type are decoded with it')
+	parser.add_argument('--force', action='store_true', required=False, help='Regenerate all modules ignoring the manifest in the output directory')
+	parser.add_argument('--watch', action='store_true', required=False, help='Keep running and regenerate modules when their IDL files or imports change')
+	parser.add_argument('--profile', action='store_true', required=False, help='Print time of every generation phase and growth of the process peak memory per module')
+	parser.add_argument('--profile-dump', action='store', required=False, help='Write cProfile statistics of the run into the file given')
+	parser.add_argument('-j', '--jobs', type=int, action='store', default=1, required=False, help='Number of processes to generate modules in, 0 for the number of CPU cores')
 
 	parsedArgs = parser.parse_args()
 	if len(sys.argv) == 1:
 	    parser.print_help()
 	    return 0
+	if parsedArgs.lazy and parsedArgs.category is not None:
+		parser.error('--lazy is not supported with --category')
+
+	objcOptions = OBJCOptions( jsonWriter=parsedArgs.json_writer, jsonReader=parsedArgs.json_reader, lazy=parsedArgs.lazy, codec=parsedArgs.codec )
+
+	jobs = parsedArgs.jobs
+	if jobs <= 0:
+		jobs = multiprocessing.cpu_count()
+
+	if parsedArgs.watch:
+		watchIfaces( parsedArgs.rpcInput, parsedArgs.verbose, parsedArgs.prefix, parsedArgs.outdir, parsedArgs.category, jobs, parsedArgs.force, parsedArgs.profile, objcOptions )
+		return 0
+
+	profiler = None
+	if parsedArgs.profile_dump is not None:
+		profiler = cProfile.Profile()
+		profiler.enable()
 
 	try:
-		for rpcInput in parsedArgs.rpcInput:
-			processIface( rpcInput, parsedArgs.verbose, parsedArgs.prefix, parsedArgs.outdir, parsedArgs.category )
+		succeeded = processIfaces( parsedArgs.rpcInput, parsedArgs.verbose, parsedArgs.prefix, parsedArgs.outdir, parsedArgs.category, jobs, parsedArgs.force, None, parsedArgs.profile, objcOptions )
 	except Exception as ex:
 		print( str(ex) )
 		sys.exit(1)
 	except:
-		print( "Unexpected error:" + sys.exc_info()[0] )
+		print( "Unexpected error:" + str( sys.exc_info()[0] ) )
 		sys.exit(1)		
 
+	if profiler is not None:
+		profiler.disable()
+		profiler.dump_stats( parsedArgs.profile_dump )
+
+	if not succeeded:
+		sys.exit(1)
+
 	return 0
 
 #########
 
 if __name__ == "__main__":
 	main()
-	
\ No newline at end of file
@@ -0,0 +1,449 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import re
+import struct
+from collections import OrderedDict
+
+#Python counterpart of transport/IFJSONReader.m, the generated Python decoders read JSON bytes with it
+#the same way the Objective-C ones do, so the decoding can be checked on any platform
+
+jsonReaderMaxDepth = 512
+jsonReaderNumberBufferLength = 63
+
+jsonWhitespace = bytearray( b' \t\n\r' )
+jsonNumberBytes = bytearray( b'0123456789-+.eE' )
+jsonEscapes = { ord('"'): u'"', ord('\\'): u'\\', ord('/'): u'/', ord('b'): u'\b', ord('f'): u'\f', ord('n'): u'\n', ord('r'): u'\r', ord('t'): u'\t' }
+
+integerPrefix = re.compile( br'^[ \t\n\r]*([+-]?[0-9]+)' )
+realPrefix = re.compile( br'^[ \t\n\r]*([+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?)' )
+
+int64Min = -( 1 << 63 )
+int64Max = ( 1 << 63 ) - 1
+
+class JSONReaderError( Exception ):
+	pass
+
+def clampInt64( value ):
+	return max( int64Min, min( int64Max, value ) )
+
+def wrapInt32( value ):
+	return struct.unpack( '<i', struct.pack( '<q', value )[:4] )[0]
+
+def strtoll( buf ):
+	match = integerPrefix.match( buf )
+	if match is None:
+		return 0
+	return clampInt64( int( match.group( 1 ) ) )
+
+def strtod( buf ):
+	match = realPrefix.match( buf )
+	if match is None:
+		return 0.0
+	return float( match.group( 1 ) )
+
+def realToInt64( value ):
+	if value != value:
+		return 0
+	if value in ( float( 'inf' ), float( '-inf' ) ):
+		return int64Min
+	return clampInt64( int( value ) )
+
+def boolFromString( buf ):
+	#the way NSString boolValue works: Y, y, T, t or a non-zero digit after whitespace, sign and zeros
+	rest = bytes( buf ).lstrip( b' \t\n\r+-0' )
+	return len( rest ) > 0 and rest[:1] in b'YyTt123456789'
+
+def unescape( data, start, end ):
+	chars = []
+	position = start
+	while position < end:
+		c = data[position]
+		position += 1
+		if c != ord('\\'):
+			literalEnd = data.find( b'\\', position, end )
+			if literalEnd < 0:
+				literalEnd = end
+			chars.append( bytes( data[position-1:literalEnd] ).decode( 'utf-8' ) )
+			position = literalEnd
+			continue
+		if position >= end:
+			raise JSONReaderError( "Invalid escape sequence" )
+		c = data[position]
+		position += 1
+		if c in jsonEscapes:
+			chars.append( jsonEscapes[c] )
+			continue
+		if c != ord('u'):
+			raise JSONReaderError( "Invalid escape sequence" )
+		codePoint = hex4( data, position, end )
+		position += 4
+		if 0xD800 <= codePoint <= 0xDBFF:
+			if end - position < 6 or data[position] != ord('\\') or data[position+1] != ord('u'):
+				raise JSONReaderError( "Invalid escape sequence" )
+			lowSurrogate = hex4( data, position + 2, end )
+			if not 0xDC00 <= lowSurrogate <= 0xDFFF:
+				raise JSONReaderError( "Invalid escape sequence" )
+			position += 6
+			codePoint = 0x10000 + ( ( codePoint - 0xD800 ) << 10 ) + ( lowSurrogate - 0xDC00 )
+		elif 0xDC00 <= codePoint <= 0xDFFF:
+			#a lone low surrogate makes invalid UTF-8 the Objective-C reader can't make a string of
+			raise JSONReaderError( "Invalid escape sequence" )
+		chars.append( struct.pack( '<I', codePoint ).decode( 'utf-32-le' ) )
+	return u''.join( chars )
+
+def hex4( data, position, end ):
+	if end - position < 4:
+		raise JSONReaderError( "Invalid escape sequence" )
+	try:
+		return int( bytes( data[position:position+4] ).decode( 'ascii' ), 16 )
+	except ValueError:
+		raise JSONReaderError( "Invalid escape sequence" )
+
+class JSONReader:
+	def __init__( self, data ):
+		self.data = bytearray( data )
+		self.length = len( self.data )
+		self.position = 0
+		self.firstMember = False
+		self.errorMessage = None
+		self.errorPosition = 0
+
+	def fail( self, message ):
+		if self.errorMessage is None:
+			self.errorMessage = message
+			self.errorPosition = self.position
+
+	def failed( self ):
+		return self.errorMessage is not None
+
+	def error( self ):
+		if self.errorMessage is None:
+			return None
+		return '%s at offset %d' % ( self.errorMessage, self.errorPosition )
+
+	def skipWhitespace( self ):
+		while self.position < self.length and self.data[self.position] in jsonWhitespace:
+			self.position += 1
+
+	def peek( self ):
+		#skips whitespace and returns the next byte without consuming it, 0 at the end of data or after an error
+		if self.errorMessage is not None:
+			return 0
+		self.skipWhitespace()
+		if self.position >= self.length:
+			self.fail( "Unexpected end of JSON data" )
+			return 0
+		return self.data[self.position]
+
+	def consumeLiteral( self, literal ):
+		if self.data[self.position:self.position+len( literal )] != literal:
+			self.fail( "Invalid literal" )
+			return False
+		self.position += len( literal )
+		return True
+
+	def skipNull( self ):
+		if self.peek() != ord('n'):
+			return False
+		self.consumeLiteral( b'null' )
+		return True
+
+	def scanString( self ):
+		#returns ( start, end, escaped ) of the string starting at the opening quote, or None
+		position = self.position + 1
+		escaped = False
+		while position < self.length:
+			c = self.data[position]
+			if c == ord('"'):
+				start = self.position + 1
+				self.position = position + 1
+				return ( start, position, escaped )
+			if c == ord('\\'):
+				escaped = True
+				position += 1
+			elif c < 0x20:
+				self.position = position
+				self.fail( "Control character in string" )
+				return None
+			position += 1
+		self.position = self.length
+		self.fail( "Unterminated string" )
+		return None
+
+	def skipNumber( self ):
+		start = self.position
+		while self.position < self.length and self.data[self.position] in jsonNumberBytes:
+			self.position += 1
+		if self.position == start:
+			self.fail( "Unexpected character" )
+
+	def skipValue( self ):
+		depth = 0
+		while True:
+			c = self.peek()
+			if c == 0:
+				return
+			if c in ( ord('{'), ord('[') ):
+				depth += 1
+				if depth > jsonReaderMaxDepth:
+					self.fail( "JSON is nested too deep" )
+					return
+				self.position += 1
+				#empty containers are closed right away
+				c = self.peek()
+				if c in ( ord('}'), ord(']') ):
+					self.position += 1
+					depth -= 1
+			elif c in ( ord('}'), ord(']'), ord(','), ord(':') ):
+				if depth == 0:
+					self.fail( "Unexpected character" )
+					return
+				self.position += 1
+				if c in ( ord('}'), ord(']') ):
+					depth -= 1
+			elif c == ord('"'):
+				self.scanString()
+			elif c == ord('t'):
+				self.consumeLiteral( b'true' )
+			elif c == ord('f'):
+				self.consumeLiteral( b'false' )
+			elif c == ord('n'):
+				self.consumeLiteral( b'null' )
+			else:
+				self.skipNumber()
+			if depth == 0 or self.errorMessage is not None:
+				return
+
+	def finish( self ):
+		#fails if an error occured or there is anything but whitespace after the value read
+		if self.errorMessage is None:
+			self.skipWhitespace()
+			if self.position < self.length:
+				self.fail( "Garbage at the end of JSON data" )
+		return self.errorMessage is None
+
+	def beginContainer( self, opening, message ):
+		c = self.peek()
+		if c == ord('n'):
+			self.consumeLiteral( b'null' )
+			return False
+		if c != ord( opening ):
+			if c != 0:
+				self.fail( message )
+			return False
+		self.position += 1
+		self.firstMember = True
+		return True
+
+	def nextMember( self, closing ):
+		c = self.peek()
+		first = self.firstMember
+		self.firstMember = False
+		if c == ord( closing ):
+			self.position += 1
+			return False
+		if not first:
+			if c != ord(','):
+				if c != 0:
+					self.fail( "Comma expected" )
+				return False
+			self.position += 1
+		return self.errorMessage is None
+
+	def beginObject( self ):
+		return self.beginContainer( '{', "Object expected" )
+
+	def nextKey( self ):
+		#UTF-8 bytes of the next member name, None after the last member
+		if not self.nextMember( '}' ):
+			return None
+		if self.peek() != ord('"'):
+			self.fail( "Member name expected" )
+			return None
+		scanned = self.scanString()
+		if scanned is None:
+			return None
+		start, end, escaped = scanned
+		key = bytes( self.data[start:end] )
+		#long escaped names can't match any field and are left as is, like the Objective-C reader does
+		if escaped and end - start <= 256:
+			try:
+				key = unescape( self.data, start, end ).encode( 'utf-8' )
+			except JSONReaderError as e:
+				self.fail( str( e ) )
+				return None
+		if self.peek() != ord(':'):
+			self.fail( "Colon expected" )
+			return None
+		self.position += 1
+		return key
+
+	def beginArray( self ):
+		return self.beginContainer( '[', "Array expected" )
+
+	def nextItem( self ):
+		return self.nextMember( ']' )
+
+	def readNumber( self ):
+		#returns ( kind, buffer ) for a number, true/false or the bytes of a string; kind is None for null
+		c = self.peek()
+		if c == 0:
+			return ( None, None )
+		if c == ord('n'):
+			self.consumeLiteral( b'null' )
+			return ( None, None )
+		if c == ord('t'):
+			self.consumeLiteral( b'true' )
+			return ( 'integer', b'1' )
+		if c == ord('f'):
+			self.consumeLiteral( b'false' )
+			return ( None, None )
+		if c in ( ord('{'), ord('[') ):
+			self.fail( "Number expected" )
+			return ( None, None )
+		if c == ord('"'):
+			scanned = self.scanString()
+			if scanned is None:
+				return ( None, None )
+			start, end = scanned[:2]
+		else:
+			start = self.position
+			self.skipNumber()
+			end = self.position
+		buf = bytes( self.data[start:min( end, start + jsonReaderNumberBufferLength )] )
+		if c == ord('"'):
+			return ( 'string', buf )
+		if any( c in buf for c in ( b'.', b'e', b'E' ) ):
+			return ( 'real', buf )
+		return ( 'integer', buf )
+
+	def readBool( self ):
+		kind, buf = self.readNumber()
+		if kind in ( 'integer', 'string' ):
+			return boolFromString( buf )
+		if kind == 'real':
+			return strtod( buf ) != 0.0
+		return False
+
+	def readInt64( self ):
+		kind, buf = self.readNumber()
+		#NSString longLongValue stops at a decimal point or an exponent, as strtoll does
+		if kind in ( 'integer', 'string' ):
+			return strtoll( buf )
+		if kind == 'real':
+			return realToInt64( strtod( buf ) )
+		return 0
+
+	def readInt32( self ):
+		return wrapInt32( self.readInt64() )
+
+	def readDouble( self ):
+		kind, buf = self.readNumber()
+		if kind is None:
+			return 0.0
+		return strtod( buf )
+
+	def readString( self ):
+		c = self.peek()
+		if c == ord('n'):
+			self.consumeLiteral( b'null' )
+			return None
+		if c != ord('"'):
+			if c != 0:
+				self.fail( "String expected" )
+			return None
+		scanned = self.scanString()
+		if scanned is None:
+			return None
+		start, end = scanned[:2]
+		try:
+			return unescape( self.data, start, end )
+		except ( JSONReaderError, UnicodeDecodeError ):
+			self.fail( "Invalid string" )
+			return None
+
+	def objectFromData( self, data ):
+		try:
+			return json.loads( data.decode( 'utf-8' ), object_pairs_hook=OrderedDict )
+		except ( ValueError, UnicodeDecodeError ):
+			self.fail( "Invalid JSON value" )
+			return None
+
+	def readObject( self ):
+		if self.skipNull() or self.errorMessage is not None:
+			return None
+		start = self.position
+		self.skipValue()
+		if self.errorMessage is not None:
+			return None
+		return self.objectFromData( bytes( self.data[start:self.position] ) )
+
+	def readObjectString( self ):
+		string = self.readString()
+		if string is None:
+			return None
+		return self.objectFromData( string.encode( 'utf-8' ) )
+
+############################
+# NSDictionary reading
+############################
+
+#the values the readDictionary:withError: methods get from NSJSONSerialization and NSNumber/NSString accessors,
+#decoders read them to check the JSON reader against
+
+def foundationInt64Value( value ):
+	if value is None or value is False:
+		return 0
+	if value is True:
+		return 1
+	if isinstance( value, float ):
+		return realToInt64( value )
+	if isinstance( value, ( int, long ) ):
+		return clampInt64( value )
+	if isinstance( value, basestring ):
+		return strtoll( value.encode( 'utf-8' ) )
+	raise JSONReaderError( "Number expected" )
+
+def foundationInt32Value( value ):
+	return wrapInt32( foundationInt64Value( value ) )
+
+def foundationDoubleValue( value ):
+	if value is None:
+		return 0.0
+	if isinstance( value, basestring ):
+		return strtod( value.encode( 'utf-8' ) )
+	if isinstance( value, ( bool, int, long, float ) ):
+		return float( value )
+	raise JSONReaderError( "Number expected" )
+
+def foundationBoolValue( value ):
+	if isinstance( value, basestring ):
+		return boolFromString( value.encode( 'utf-8' ) )
+	return foundationDoubleValue( value ) != 0.0
+
+def foundationObjectFromString( value ):
+	if value is None:
+		return None
+	return json.loads( value, object_pairs_hook=OrderedDict )
+
+def parseJSONData( data ):
+	return json.loads( bytes( data ).decode( 'utf-8' ), object_pairs_hook=OrderedDict )
@@ -0,0 +1,104 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+manifestFileName = '.ifacegen-manifest.json'
+manifestVersion = 1
+
+def hashOfData( data ):
+	return hashlib.sha1( data ).hexdigest()
+
+def hashOfFile( filePath ):
+	if not os.path.isfile( filePath ):
+		return None
+	with open( filePath, "rb" ) as inFile:
+		return hashOfData( inFile.read() )
+
+def generatorHash():
+	#any change of the generator itself invalidates all the modules generated before
+	generatorDir = os.path.dirname( os.path.abspath( __file__ ) )
+	sha = hashlib.sha1()
+	for fileName in sorted( os.listdir( generatorDir ) ):
+		if fileName.endswith( '.py' ):
+			with open( os.path.join( generatorDir, fileName ), "rb" ) as inFile:
+				sha.update( inFile.read() )
+	return sha.hexdigest()
+
+class GenManifest:
+	def __init__( self, genDir ):
+		self.genDir = genDir
+		self.filePath = os.path.join( genDir, manifestFileName )
+		self.modules = OrderedDict()
+		self.load()
+
+	def load( self ):
+		if not os.path.isfile( self.filePath ):
+			return
+		try:
+			with open( self.filePath, "rt" ) as jFile:
+				jsonObj = json.load( jFile, object_pairs_hook=OrderedDict )
+		except ValueError:
+			#broken manifest just means everything is regenerated
+			return
+		if jsonObj.get( "version" ) != manifestVersion or not "modules" in jsonObj:
+			return
+		self.modules = jsonObj["modules"]
+
+	def relativePath( self, filePath ):
+		return os.path.relpath( os.path.abspath( filePath ), self.genDir )
+
+	def absolutePath( self, relativePath ):
+		return os.path.normpath( os.path.join( self.genDir, relativePath ) )
+
+	def isUpToDate( self, jsonFile, options ):
+		record = self.modules.get( self.relativePath( jsonFile ) )
+		if record is None or record["options"] != options:
+			return False
+		for sourceFile in record["sources"].keys():
+			if hashOfFile( self.absolutePath( sourceFile ) ) != record["sources"][sourceFile]:
+				return False
+		for outputFile in record["outputs"].keys():
+			if hashOfFile( os.path.join( self.genDir, outputFile ) ) != record["outputs"][outputFile]:
+				return False
+		return True
+
+	def update( self, jsonFile, sourceFiles, options, outputHashes ):
+		record = OrderedDict()
+		record["options"] = options
+		record["sources"] = OrderedDict()
+		for sourceFile in sourceFiles:
+			record["sources"][self.relativePath( sourceFile )] = hashOfFile( sourceFile )
+		record["outputs"] = OrderedDict()
+		for outputFile in outputHashes.keys():
+			record["outputs"][outputFile] = outputHashes[outputFile]
+		self.modules[self.relativePath( jsonFile )] = record
+
+	def save( self ):
+		if not os.path.exists( self.genDir ):
+			os.makedirs( self.genDir )
+		jsonObj = OrderedDict()
+		jsonObj["version"] = manifestVersion
+		jsonObj["modules"] = self.modules
+		with open( self.filePath, "wt" ) as jFile:
+			json.dump( jsonObj, jFile, indent=1, separators=(',', ': ') )
@@ -0,0 +1,479 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from ifacejsonreader import JSONReaderError, clampInt64, wrapInt32, strtoll, strtod, realToInt64, boolFromString
+from collections import OrderedDict
+import json
+import struct
+
+#Python counterpart of transport/IFMessagePack.m, the generated Python codecs write and read MessagePack
+#with it the same way the Objective-C ones do, so the binary codec can be checked on any platform
+
+messagePackReaderMaxDepth = 512
+messagePackNumberBufferLength = 63
+
+uint64Max = ( 1 << 64 ) - 1
+
+class MessagePackError( Exception ):
+	pass
+
+############################
+# Writer
+############################
+
+def appendHeader( data, type, value, size ):
+	data.append( type )
+	for i in reversed( range( size ) ):
+		data.append( ( value >> ( 8 * i ) ) & 0xFF )
+
+def appendLengthHeader( data, fixType, fixLimit, type8, type16, type32, length ):
+	if fixType != 0 and length < fixLimit:
+		appendHeader( data, fixType | length, 0, 0 )
+	elif type8 != 0 and length <= 0xFF:
+		appendHeader( data, type8, length, 1 )
+	elif length <= 0xFFFF:
+		appendHeader( data, type16, length, 2 )
+	else:
+		appendHeader( data, type32, length, 4 )
+
+def messagePackAppendNil( data ):
+	data.append( 0xC0 )
+
+def messagePackAppendBool( data, value ):
+	data.append( 0xC3 if value else 0xC2 )
+
+def appendUInt64( data, value ):
+	if value <= 0x7F:
+		appendHeader( data, value, 0, 0 )
+	elif value <= 0xFF:
+		appendHeader( data, 0xCC, value, 1 )
+	elif value <= 0xFFFF:
+		appendHeader( data, 0xCD, value, 2 )
+	elif value <= 0xFFFFFFFF:
+		appendHeader( data, 0xCE, value, 4 )
+	else:
+		appendHeader( data, 0xCF, value, 8 )
+
+def messagePackAppendInt64( data, value ):
+	value = clampInt64( value )
+	if value >= 0:
+		appendUInt64( data, value )
+	elif value >= -32:
+		appendHeader( data, value & 0xFF, 0, 0 )
+	elif value >= -0x80:
+		appendHeader( data, 0xD0, value, 1 )
+	elif value >= -0x8000:
+		appendHeader( data, 0xD1, value, 2 )
+	elif value >= -0x80000000:
+		appendHeader( data, 0xD2, value, 4 )
+	else:
+		appendHeader( data, 0xD3, value, 8 )
+
+def messagePackAppendInt32( data, value ):
+	messagePackAppendInt64( data, wrapInt32( value ) )
+
+def messagePackAppendDouble( data, value ):
+	data.append( 0xCB )
+	data += struct.pack( '>d', value )
+
+def messagePackAppendMapHeader( data, count ):
+	appendLengthHeader( data, 0x80, 16, 0, 0xDE, 0xDF, count )
+
+def messagePackAppendArrayHeader( data, count ):
+	appendLengthHeader( data, 0x90, 16, 0, 0xDC, 0xDD, count )
+
+def messagePackAppendString( data, string ):
+	if string is None:
+		messagePackAppendNil( data )
+		return
+	if isinstance( string, unicode ):
+		string = string.encode( 'utf-8' )
+	appendLengthHeader( data, 0xA0, 32, 0xD9, 0xDA, 0xDB, len( string ) )
+	data += string
+
+def messagePackAppendObject( data, value ):
+	if value is None:
+		messagePackAppendNil( data )
+	elif isinstance( value, basestring ):
+		messagePackAppendString( data, value )
+	elif isinstance( value, bool ):
+		messagePackAppendBool( data, value )
+	elif isinstance( value, float ):
+		messagePackAppendDouble( data, value )
+	elif isinstance( value, ( int, long ) ):
+		if value > uint64Max or value < -( 1 << 63 ):
+			raise MessagePackError( "Integer out of range in MessagePack write" )
+		if value > ( 1 << 63 ) - 1:
+			appendUInt64( data, value )
+		else:
+			messagePackAppendInt64( data, value )
+	elif isinstance( value, dict ):
+		messagePackAppendMapHeader( data, len( value ) )
+		for key, item in value.items():
+			if not isinstance( key, basestring ):
+				raise MessagePackError( "Map key is not a string in MessagePack write" )
+			messagePackAppendString( data, key )
+			messagePackAppendObject( data, item )
+	elif isinstance( value, ( list, tuple ) ):
+		messagePackAppendArrayHeader( data, len( value ) )
+		for item in value:
+			messagePackAppendObject( data, item )
+	elif isinstance( value, bytearray ):
+		appendLengthHeader( data, 0, 0, 0xC4, 0xC5, 0xC6, len( value ) )
+		data += value
+	else:
+		raise MessagePackError( "Invalid type in MessagePack write" )
+
+def messagePackAppendObjectString( data, value ):
+	if value is None:
+		messagePackAppendNil( data )
+		return
+	messagePackAppendString( data, json.dumps( value, separators=( ',', ':' ) ) )
+
+############################
+# Reader
+############################
+
+class MessagePackValue:
+	#a value header; bytes of a string, binary or extension are at [start, start + length), containers hold length entries
+	def __init__( self ):
+		self.type = None
+		self.integer = 0
+		self.unsignedInteger = 0
+		self.real = 0.0
+		self.start = 0
+		self.length = 0
+
+class MessagePackReader:
+	def __init__( self, data ):
+		self.data = bytearray( data )
+		self.length = len( self.data )
+		self.position = 0
+		self.errorMessage = None
+		self.errorPosition = 0
+
+	def fail( self, message ):
+		if self.errorMessage is None:
+			self.errorMessage = message
+			self.errorPosition = self.position
+
+	def failed( self ):
+		return self.errorMessage is not None
+
+	def error( self ):
+		if self.errorMessage is None:
+			return None
+		return '%s at offset %d' % ( self.errorMessage, self.errorPosition )
+
+	def readUInt( self, size ):
+		if self.length - self.position < size:
+			self.fail( "Unexpected end of data" )
+			return None
+		value = 0
+		for i in range( size ):
+			value = ( value << 8 ) | self.data[self.position]
+			self.position += 1
+		return value
+
+	def takeBytes( self, value, typeSize, length ):
+		if length is None:
+			return False
+		if self.length - self.position < typeSize or self.length - self.position - typeSize < length:
+			self.fail( "Unexpected end of data" )
+			return False
+		value.start = self.position + typeSize
+		value.length = length
+		self.position = value.start + value.length
+		return True
+
+	def checkCount( self, value, count ):
+		#every entry takes a byte at least, so counts over the data left can't be right
+		if count is None:
+			return False
+		if ( count * 2 if value.type == 'map' else count ) > self.length - self.position:
+			self.fail( "Unexpected end of data" )
+			return False
+		value.length = count
+		return True
+
+	def readHeader( self ):
+		#the header of the next value, the bytes of strings, binaries and extensions are consumed as well; None on error
+		if self.errorMessage is not None:
+			return None
+		if self.position >= self.length:
+			self.fail( "Unexpected end of data" )
+			return None
+		c = self.data[self.position]
+		self.position += 1
+		value = MessagePackValue()
+		ok = True
+		if c <= 0x7F or c >= 0xE0:
+			value.type = 'integer'
+			value.integer = c if c <= 0x7F else c - 0x100
+		elif c <= 0x8F:
+			value.type = 'map'
+			ok = self.checkCount( value, c & 0x0F )
+		elif c <= 0x9F:
+			value.type = 'array'
+			ok = self.checkCount( value, c & 0x0F )
+		elif c <= 0xBF:
+			value.type = 'string'
+			ok = self.takeBytes( value, 0, c & 0x1F )
+		elif c == 0xC0:
+			value.type = 'nil'
+		elif c in ( 0xC2, 0xC3 ):
+			value.type = 'bool'
+			value.integer = 1 if c == 0xC3 else 0
+		elif 0xC4 <= c <= 0xC6:
+			value.type = 'binary'
+			ok = self.takeBytes( value, 0, self.readUInt( 1 << ( c - 0xC4 ) ) )
+		elif 0xC7 <= c <= 0xC9:
+			value.type = 'extension'
+			ok = self.takeBytes( value, 1, self.readUInt( 1 << ( c - 0xC7 ) ) )
+		elif c in ( 0xCA, 0xCB ):
+			value.type = 'real'
+			size = 4 if c == 0xCA else 8
+			bits = self.readUInt( size )
+			ok = bits is not None
+			if ok:
+				value.real = struct.unpack( '>f' if size == 4 else '>d', struct.pack( '>I' if size == 4 else '>Q', bits ) )[0]
+		elif 0xCC <= c <= 0xCF:
+			u = self.readUInt( 1 << ( c - 0xCC ) )
+			ok = u is not None
+			if ok:
+				value.type = 'unsigned' if u > ( 1 << 63 ) - 1 else 'integer'
+				value.integer = clampInt64( u )
+				value.unsignedInteger = u
+		elif 0xD0 <= c <= 0xD3:
+			size = 1 << ( c - 0xD0 )
+			u = self.readUInt( size )
+			ok = u is not None
+			if ok:
+				#sign extension of the size bytes read
+				value.type = 'integer'
+				value.integer = u - ( 1 << ( 8 * size ) ) if u >> ( 8 * size - 1 ) else u
+		elif 0xD4 <= c <= 0xD8:
+			value.type = 'extension'
+			ok = self.takeBytes( value, 1, 1 << ( c - 0xD4 ) )
+		elif 0xD9 <= c <= 0xDB:
+			value.type = 'string'
+			ok = self.takeBytes( value, 0, self.readUInt( 1 << ( c - 0xD9 ) ) )
+		elif c in ( 0xDC, 0xDD ):
+			value.type = 'array'
+			ok = self.checkCount( value, self.readUInt( 2 << ( c - 0xDC ) ) )
+		elif c in ( 0xDE, 0xDF ):
+			value.type = 'map'
+			ok = self.checkCount( value, self.readUInt( 2 << ( c - 0xDE ) ) )
+		else:
+			self.position -= 1
+			self.fail( "Invalid type" )
+			ok = False
+		return value if ok else None
+
+	def skipValue( self ):
+		#values to skip are counted, so nesting takes no stack
+		remaining = 1
+		while remaining > 0:
+			value = self.readHeader()
+			if value is None:
+				return
+			remaining -= 1
+			if value.type == 'array':
+				remaining += value.length
+			elif value.type == 'map':
+				remaining += value.length * 2
+
+	def finish( self ):
+		#fails if an error occured or there is anything after the value read
+		if self.errorMessage is None and self.position < self.length:
+			self.fail( "Garbage at the end of data" )
+		return self.errorMessage is None
+
+	def beginContainer( self, type, message ):
+		start = self.position
+		value = self.readHeader()
+		if value is None or value.type == 'nil':
+			return None
+		if value.type != type:
+			self.position = start
+			self.fail( message )
+			return None
+		return value.length
+
+	def beginMap( self ):
+		#None for nil, otherwise the number of entries, each one is a key and a value to read or skip
+		return self.beginContainer( 'map', "Map expected" )
+
+	def nextKey( self ):
+		#UTF-8 bytes of the key, which has to be a string
+		start = self.position
+		value = self.readHeader()
+		if value is None:
+			return None
+		if value.type != 'string':
+			self.position = start
+			self.fail( "Map key is not a string" )
+			return None
+		return bytes( self.data[value.start:value.start+value.length] )
+
+	def beginArray( self ):
+		#None for nil, otherwise the number of items to read or skip
+		return self.beginContainer( 'array', "Array expected" )
+
+	def readNumber( self ):
+		#a scalar with the bytes of a string in value.buffer; containers, binaries and extensions fail
+		start = self.position
+		value = self.readHeader()
+		if value is None:
+			return None
+		if value.type == 'string':
+			#NSString answers intValue, doubleValue etc. as well, numbers in strings are read the same way
+			value.buffer = bytes( self.data[value.start:value.start+min( value.length, messagePackNumberBufferLength )] )
+		elif value.type in ( 'binary', 'extension', 'array', 'map' ):
+			self.position = start
+			self.fail( "Number expected" )
+			return None
+		return value
+
+	def readBool( self ):
+		value = self.readNumber()
+		if value is None:
+			return False
+		if value.type in ( 'bool', 'integer', 'unsigned' ):
+			return value.integer != 0
+		if value.type == 'real':
+			return value.real != 0.0
+		if value.type == 'string':
+			return boolFromString( value.buffer.split( b'\0' )[0] )
+		return False
+
+	def readInt64( self ):
+		value = self.readNumber()
+		if value is None:
+			return 0
+		if value.type in ( 'bool', 'integer', 'unsigned' ):
+			return value.integer
+		if value.type == 'real':
+			return realToInt64( value.real )
+		if value.type == 'string':
+			return strtoll( value.buffer.split( b'\0' )[0] )
+		return 0
+
+	def readInt32( self ):
+		return wrapInt32( self.readInt64() )
+
+	def readDouble( self ):
+		value = self.readNumber()
+		if value is None:
+			return 0.0
+		if value.type in ( 'bool', 'integer' ):
+			return float( value.integer )
+		if value.type == 'unsigned':
+			return float( value.unsignedInteger )
+		if value.type == 'real':
+			return value.real
+		if value.type == 'string':
+			return strtod( value.buffer.split( b'\0' )[0] )
+		return 0.0
+
+	def stringValue( self, value ):
+		try:
+			return bytes( self.data[value.start:value.start+value.length] ).decode( 'utf-8' )
+		except UnicodeDecodeError:
+			self.position = value.start
+			self.fail( "Invalid string" )
+			return None
+
+	def readString( self ):
+		start = self.position
+		value = self.readHeader()
+		if value is None or value.type == 'nil':
+			return None
+		if value.type != 'string':
+			self.position = start
+			self.fail( "String expected" )
+			return None
+		return self.stringValue( value )
+
+	def readValue( self, depth ):
+		#( True, object ) with None for nil, ( False, None ) once an error occurs
+		start = self.position
+		value = self.readHeader()
+		if value is None:
+			return ( False, None )
+		if value.type == 'nil':
+			return ( True, None )
+		if value.type == 'bool':
+			return ( True, value.integer != 0 )
+		if value.type == 'integer':
+			return ( True, value.integer )
+		if value.type == 'unsigned':
+			return ( True, value.unsignedInteger )
+		if value.type == 'real':
+			return ( True, value.real )
+		if value.type == 'string':
+			string = self.stringValue( value )
+			return ( string is not None, string )
+		if value.type == 'binary':
+			return ( True, bytearray( self.data[value.start:value.start+value.length] ) )
+		if value.type == 'extension':
+			self.position = start
+			self.fail( "Unsupported type" )
+			return ( False, None )
+		if depth >= messagePackReaderMaxDepth:
+			self.position = start
+			self.fail( "MessagePack is nested too deep" )
+			return ( False, None )
+		if value.type == 'array':
+			items = []
+			for i in range( value.length ):
+				ok, item = self.readValue( depth + 1 )
+				if not ok:
+					return ( False, None )
+				items.append( item )
+			return ( True, items )
+		members = OrderedDict()
+		for i in range( value.length ):
+			key = self.nextKey()
+			if key is None:
+				return ( False, None )
+			try:
+				name = key.decode( 'utf-8' )
+			except UnicodeDecodeError:
+				self.fail( "Invalid string" )
+				return ( False, None )
+			ok, item = self.readValue( depth + 1 )
+			if not ok:
+				return ( False, None )
+			members[name] = item
+		return ( True, members )
+
+	def readObject( self ):
+		return self.readValue( 0 )[1]
+
+	def readObjectString( self ):
+		string = self.readString()
+		if string is None:
+			return None
+		try:
+			return json.loads( string, object_pairs_hook=OrderedDict )
+		except ValueError:
+			self.fail( "Invalid JSON value" )
+			return None
@@ -23,7 +23,7 @@
 
 import types
 import os
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
 tabooedNames = [ "void", "id", "description" ]
 tabooedStarts = [ "new", "alloc", "copy", "mutableCopy" ]
@@ -91,17 +91,31 @@ def traverseComplexType( tType, typeNameSet, callback ):
 
 ##############
 
+GenField = namedtuple( 'GenField', [ 'name', 'alias', 'type', 'owner' ] )
+
 genIntegralTypeList = [ "int32", "int64", "double", "string", "bool", "raw", "rawstr" ]
 
+class GenContext:
+	def __init__( self, namePrefix=None, profile=None ):
+		self.namePrefix = namePrefix if namePrefix is not None else ""
+		self.profile = profile
+
+	def decorateName( self, name ):
+		if len( self.namePrefix ) and not name.startswith( self.namePrefix ):
+			return self.namePrefix + capitalizeFirstLetter( name )
+		return name
+
+defaultGenContext = GenContext()
+
 class GenType:
-	namePrefix = ""
-	def __init__( self, name ):
-		if len( GenType.namePrefix ) and not name.startswith( GenType.namePrefix ):
-			self.name = GenType.namePrefix + capitalizeFirstLetter( name )
-		else:
-			self.name = name
+	def __init__( self, name, context=None ):
+		if context is None:
+			context = defaultGenContext
+		self.name = context.decorateName( name )
 		self.nullable = False
 		self.ptr = "*"
+		#resolved type identity the emitters memoize generated fragments by
+		self.fragmentKey_ = None
 
 class GenIntegralType( GenType ):
 	def __init__( self, sType ):
@@ -120,15 +134,26 @@ class GenIntegralType( GenType ):
 			return False
 		return self.sType == other.sType
 
+#integral types are immutable, so one instance per IDL type name is shared by all the fields
+genIntegralTypes = dict( [ ( sType, GenIntegralType( sType ) ) for sType in genIntegralTypeList ] )
+
+def integralTypeFromName( sType ):
+	return genIntegralTypes.get( sType )
+
 class GenComplexType( GenType ):
-	def __init__( self, decoration, name ):
+	def __init__( self, decoration, name, context=None ):
 		if decoration is None or len( decoration ) == 0:
-			GenType.__init__( self, makeAlias( name ) )
+			GenType.__init__( self, makeAlias( name ), context )
 		else:
-			GenType.__init__( self, decoration + capitalizeFirstLetter( makeAlias( name ) ) )
+			GenType.__init__( self, decoration + capitalizeFirstLetter( makeAlias( name ) ), context )
 		self.fields_ = OrderedDict()
 		self.fieldAliases_ = {}
 		self.baseType = None
+		#nested objects and lists of a lazy type are decoded on first access
+		self.lazy = False
+		self.fieldTable_ = None
+		self.ownFieldTable_ = None
+		self.fieldIndex_ = None
 
 	def __eq__( self, other ):
 		if other is None or not isinstance( other, GenComplexType ):
@@ -145,34 +170,56 @@ class GenComplexType( GenType ):
 	def addFieldType( self, fieldName, fieldType ):
 		self.fields_[fieldName] = fieldType
 		self.fieldAliases_[fieldName] = makeAlias( fieldName )
+		self.fieldTable_ = None
+		self.fragmentKey_ = None
+
+	def resolveFields( self ):
+		fieldTable = []
+		if self.baseType is not None:
+			fieldTable.extend( self.baseType.allFields() )
+		#ancestor's declaration of a field wins over the redeclared one
+		fieldIndex = {}
+		for field in fieldTable:
+			fieldIndex.setdefault( field.name, field )
+		ownFieldTable = []
+		for fieldName in self.fields_.keys():
+			if not fieldName in fieldIndex:
+				fieldIndex[fieldName] = GenField( fieldName, self.fieldAliases_[fieldName], self.fields_[fieldName], self )
+			ownFieldTable.append( fieldIndex[fieldName] )
+		fieldTable.extend( ownFieldTable )
+		self.fieldTable_ = tuple( fieldTable )
+		self.ownFieldTable_ = tuple( ownFieldTable )
+		self.fieldIndex_ = fieldIndex
+
+	def allFields( self ):
+		if self.fieldTable_ is None:
+			self.resolveFields()
+		return self.fieldTable_
+
+	def fields( self ):
+		if self.fieldTable_ is None:
+			self.resolveFields()
+		return self.ownFieldTable_
 
 	def fieldNames( self ):
 		return self.fields_.keys()
 
 	def allFieldNames( self ):
-		fieldsList = []
-		if self.baseType is not None:
-			fieldsList.extend( self.baseType.allFieldNames() )
-		fieldsList.extend( self.fieldNames() )
-		return fieldsList		
+		return [ field.name for field in self.allFields() ]
 
 	def fieldType( self, fieldName ):
-		if self.baseType is not None:		
-			ft = self.baseType.fieldType( fieldName )
-			if ft is not None:
-				return ft
-		if not fieldName in self.fields_:
+		if self.fieldTable_ is None:
+			self.resolveFields()
+		if not fieldName in self.fieldIndex_:
 			return None
-		return self.fields_[fieldName]
+		return self.fieldIndex_[fieldName].type
 
 	def fieldAlias( self, fieldName ):
-		if self.baseType is not None:		
-			fa = self.baseType.fieldAlias( fieldName )
-			if fa is not None:
-				return fa
-		if not fieldName in self.fields_:
-			return None				
-		return self.fieldAliases_[fieldName]
+		if self.fieldTable_ is None:
+			self.resolveFields()
+		if not fieldName in self.fieldIndex_:
+			return None
+		return self.fieldIndex_[fieldName].alias
 
 	def traverseComplexTypes( self, callback ):
 		typeNameSet = set([self.name])
@@ -180,17 +227,15 @@ class GenComplexType( GenType ):
 
 	def __str__( self ):
 		fields = []
-		for name in self.allFieldNames():
-			fieldType = self.fieldType(name)
-			fieldAlias = self.fieldAlias(name)
-			fields.append('%s(%s):%s' % (fieldAlias, name, str(fieldType) if isinstance(fieldType, GenIntegralType) else fieldType.name))
+		for field in self.allFields():
+			fields.append('%s(%s):%s' % (field.alias, field.name, str(field.type) if isinstance(field.type, GenIntegralType) else field.type.name))
 		if self.baseType is not None:
 			return 'GenComplexType %s, extends %s: [%s]' % (self.name, self.baseType.name, ", ".join(fields))
 		return 'GenComplexType %s: [%s]' % (self.name, ", ".join(fields))
 
 class GenListType( GenType ):
-	def __init__( self, decoration, name ):
-		GenType.__init__( self, decoration + capitalizeFirstLetter( makeAlias( name ) ) )
+	def __init__( self, decoration, name, context=None ):
+		GenType.__init__( self, decoration + capitalizeFirstLetter( makeAlias( name ) ), context )
 		self.itemType = None
 
 	def traverseComplexTypes( self, callback ):
@@ -210,20 +255,32 @@ class GenMethod:
 		self.customRequestTypes = OrderedDict()
 		self.responseType = None
 		self.responseArgName = None
+		self.retryPolicy = None
+		self.cachePolicy = None
+		self.bodyEncoding = None
 
 	def __str__(self):
 		return "GenMethod " + self.name + ": JSON params: " + str( self.requestJsonType ) + ", Custom params: " + strFromDictionary(self.customRequestTypes) + ", Response type: " + str( self.responseType )
 
+class GenBatch:
+	def __init__( self, name, endpoint ):
+		self.name = name
+		self.endpoint = endpoint
+
+	def __str__(self):
+		return "GenBatch " + self.name + ": endpoint: " + self.endpoint
+
 class GenModule:
-	namePrefix = ""
-	def __init__( self, name ):
+	def __init__( self, name, context=None ):
+		if context is None:
+			context = defaultGenContext
 		self.typeList = OrderedDict()
 		self.methods = []
-		if len(GenModule.namePrefix) and not name.startswith( GenModule.namePrefix ):
-			self.name = GenModule.namePrefix + capitalizeFirstLetter(name)
-		else:
-			self.name = name
+		self.batches = []
+		self.name = context.decorateName( name )
 		self.importedModuleNames = []
 		self.importedTypeList = OrderedDict()
+		self.sourceFile = None
+		self.importedModules = []
 
 		
\ No newline at end of file
@@ -20,19 +20,120 @@
 # THE SOFTWARE.
 
 from ifaceparser import *
+from ifacemsgpack import messagePackAppendMapHeader, messagePackAppendString
 import argparse
 import sys
 import types
 import os
-from collections import OrderedDict
+import hashlib
+import itertools
+import json
+import uuid
+from collections import OrderedDict, namedtuple
 from string import Template
 
+class OBJCTemplate(Template):
+	#string.Template compiled once at import: the text is split into (literal, placeholder) parts,
+	#so substitute() is a plain join instead of a regex scan on every call
+	def __init__( self, template ):
+		super( OBJCTemplate, self ).__init__( template )
+		self.parts = []
+		self.tail = ''
+		literal = ''
+		position = 0
+		for match in self.pattern.finditer( template ):
+			literal += template[position:match.start()]
+			position = match.end()
+			if match.group( 'escaped' ) is not None:
+				literal += self.delimiter
+				continue
+			placeholder = match.group( 'named' ) or match.group( 'braced' )
+			if placeholder is None:
+				raise ValueError( 'Invalid placeholder in template: ' + match.group() )
+			self.parts.append( ( literal, placeholder ) )
+			literal = ''
+		self.tail = literal + template[position:]
+
+	def substitute( self, **mapping ):
+		pieces = []
+		for literal, placeholder in self.parts:
+			pieces.append( literal )
+			pieces.append( '%s' % ( mapping[placeholder], ) )
+		pieces.append( self.tail )
+		return ''.join( pieces )
+
+def OBJCTypeReference( genType ):
+	#what a fragment of another type depends on when it refers to this one
+	if isinstance( genType, GenIntegralType ):
+		return genType.sType
+	if isinstance( genType, GenListType ):
+		return ( 'list', OBJCTypeReference( genType.itemType ) )
+	return genType.name
+
+def OBJCTypeKey( genType ):
+	#fully resolved identity of a type: everything its fragments are rendered from, names include the prefix already
+	if genType.fragmentKey_ is None:
+		if isinstance( genType, GenComplexType ):
+			baseKey = OBJCTypeKey( genType.baseType ) if genType.baseType is not None else None
+			fields = tuple( ( field.name, field.alias, OBJCTypeReference( field.type ) ) for field in genType.fields() )
+			genType.fragmentKey_ = ( genType.name, baseKey, fields, genType.lazy )
+		else:
+			genType.fragmentKey_ = OBJCTypeReference( genType )
+	return genType.fragmentKey_
+
+class OBJCFragmentCache:
+	def __init__( self, capacity=4096 ):
+		self.capacity = capacity
+		self.fragments = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def fragment( self, key, fragmentGenerator, *args ):
+		if key in self.fragments:
+			self.hits += 1
+			#most recently used fragments are kept at the end
+			fragment = self.fragments.pop( key )
+			self.fragments[key] = fragment
+			return fragment
+		self.misses += 1
+		fragment = fragmentGenerator( *args )
+		self.fragments[key] = fragment
+		if len( self.fragments ) > self.capacity:
+			self.fragments.popitem( last=False )
+			self.evictions += 1
+		return fragment
+
+	def clear( self ):
+		self.fragments.clear()
+
+	def counters( self ):
+		return OrderedDict( [ ( "fragment cache hits", self.hits ), ( "fragment cache misses", self.misses ), ( "fragment cache evictions", self.evictions ) ] )
+
+#shared by all the modules generated in the process, so types imported by several modules are rendered once
+OBJCFragments = OBJCFragmentCache()
+
+def OBJCFragment( fragmentGenerator ):
+	#memoizes a per-type fragment by the resolved type and the rest of the arguments (e.g. category)
+	fragmentName = fragmentGenerator.__name__
+	def cachedFragment( genType, *args ):
+		return OBJCFragments.fragment( ( fragmentName, OBJCTypeKey( genType ) ) + args, fragmentGenerator, genType, *args )
+	cachedFragment.__name__ = fragmentName
+	return cachedFragment
+
+#generation modes, hashable to be a part of fragment cache keys
+OBJCOptions = namedtuple( 'OBJCOptions', [ 'jsonWriter', 'jsonReader', 'lazy', 'codec' ] )
+OBJCDefaultOptions = OBJCOptions( jsonWriter=False, jsonReader=False, lazy=False, codec=None )
+
+OBJCIntegralTypeMap = { "string": "NSString", "bool": "BOOL", "int32": "int32_t", "int64": "int64_t", "double": "double_t", "raw": "NSDictionary", "rawstr": "NSDictionary" }
+OBJCHTTPMethodMap = { "get": "IFHTTPMETHOD_GET", "head": "IFHTTPMETHOD_HEAD", "post": "IFHTTPMETHOD_POST", "put": "IFHTTPMETHOD_PUT", "delete": "IFHTTPMETHOD_DELETE" }
+OBJCContentEncodingMap = { "gzip": "IFCONTENTENCODING_GZIP", "deflate": "IFCONTENTENCODING_DEFLATE" }
+
 def OBJCAssumeType( genType ):
 	if isinstance( genType, GenIntegralType ):
 		t = genType.sType
-		integralTypeMap = { "string": "NSString", "bool": "BOOL", "int32": "int32_t", "int64": "int64_t", "double": "double_t", "raw": "NSDictionary", "rawstr": "NSDictionary" }
-		if t in integralTypeMap:
-			return integralTypeMap[t]
+		if t in OBJCIntegralTypeMap:
+			return OBJCIntegralTypeMap[t]
 	if isinstance( genType, GenComplexType ):
 		return genType.name
 	if isinstance( genType, GenListType ):
@@ -40,43 +141,36 @@ def OBJCAssumeType( genType ):
 	return "_ERROR_"
 
 def OBJCHTTPEnumFromName( httpMethodName ):
-	httpMethodMap = { "get": "IFHTTPMETHOD_GET", "head": "IFHTTPMETHOD_HEAD", "post": "IFHTTPMETHOD_POST", "put": "IFHTTPMETHOD_PUT", "delete": "IFHTTPMETHOD_DELETE" }
-	if httpMethodName in httpMethodMap:
-		return httpMethodMap[httpMethodName]
+	if httpMethodName in OBJCHTTPMethodMap:
+		return OBJCHTTPMethodMap[httpMethodName]
 	return "_ERROR_"
 
+OBJCDecorateTypeForDictTemplate = OBJCTemplate('jsonNullable($objcTypeStr)')
+OBJCDecorateTypeForDictNumberTemplate = OBJCTemplate('@($objcTypeStr)')
+OBJCDecorateTypeForDictRawStrTemplate = OBJCTemplate('[[NSString alloc] initWithData:[NSJSONSerialization dataWithJSONObject:$objcTypeStr options:jsonFormatOption error:error] encoding:NSUTF8StringEncoding]')
+
 def OBJCDecorateTypeForDict( objcTypeStr, genType ):
-	template = Template('($objcTypeStr == nil ? [NSNull null] : $objcTypeStr)')
+	template = OBJCDecorateTypeForDictTemplate
 	if genType.sType == 'bool' or genType.sType == 'int32' or genType.sType == 'int64' or genType.sType == 'double':
-		template = Template('@($objcTypeStr)')
+		template = OBJCDecorateTypeForDictNumberTemplate
 	if genType.sType == 'rawstr':
-		template = Template('[[NSString alloc] initWithData:[NSJSONSerialization dataWithJSONObject:$objcTypeStr options:jsonFormatOption error:error] encoding:NSUTF8StringEncoding]')
+		template = OBJCDecorateTypeForDictRawStrTemplate
 	return template.substitute( objcTypeStr=objcTypeStr )
 
+#values are converted by the static helpers of OBJCImplementationPreamble, one per integral type
+OBJCDecorateTypeFromJSONHelperMap = { "bool": "jsonBool", "int32": "jsonInt32", "int64": "jsonInt64", "double": "jsonDouble", "string": "jsonString", "raw": "jsonDictionary" }
+OBJCDecorateTypeFromJSONTemplate = OBJCTemplate('$helper($varValue)')
+OBJCDecorateTypeFromJSONRawStrTemplate = OBJCTemplate('jsonObjectFromString($varValue, error)')
+
 def OBJCDecorateTypeFromJSON( genType, varValue ):
-	templateNSNumberStr = Template('( tmp = $tmpVarValue, [tmp isEqual:[NSNull null]] ? $emptyVal : ((NSNumber*)tmp).$selector )')
-	templateNSStringStr = Template('( tmp = $tmpVarValue, [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp )')
-	templateNSDictionaryStr = Template('( tmp = $tmpVarValue, [tmp isEqual:[NSNull null]] ? nil : (NSDictionary*)tmp )')
-	templateNSArrayStr = Template('( tmp = $tmpVarValue, [tmp isEqual:[NSNull null]] ? nil : (NSArray*)tmp )')
-	templateRawNSDictionaryStr = Template('( tmp = $tmpVarValue, [tmp isEqual:[NSNull null]] ? nil : [NSJSONSerialization JSONObjectWithData:[(NSString*)tmp dataUsingEncoding:NSUTF8StringEncoding] options:NSJSONReadingAllowFragments error:&error] )')
 	if isinstance( genType, GenListType ):
-		return templateNSArrayStr.substitute( tmpVarValue=varValue )
+		return OBJCDecorateTypeFromJSONTemplate.substitute( helper='jsonArray', varValue=varValue )
 	if not isinstance( genType, GenIntegralType ):
 		return "ERROR"
-	if genType.sType == "bool":
-		return templateNSNumberStr.substitute( tmpVarValue=varValue, emptyVal='NO', selector='boolValue' )
-	if genType.sType == "int32":
-		return templateNSNumberStr.substitute( tmpVarValue=varValue, emptyVal='0', selector='intValue' )
-	if genType.sType == "int64":
-		return templateNSNumberStr.substitute( tmpVarValue=varValue, emptyVal='0L', selector='longLongValue' )
-	if genType.sType == "double":
-		return templateNSNumberStr.substitute( tmpVarValue=varValue, emptyVal='0.0', selector='doubleValue' )
-	if genType.sType == "string":
-		return templateNSStringStr.substitute( tmpVarValue=varValue )
-	if genType.sType == "raw":
-		return templateNSDictionaryStr.substitute( tmpVarValue=varValue )
+	if genType.sType in OBJCDecorateTypeFromJSONHelperMap:
+		return OBJCDecorateTypeFromJSONTemplate.substitute( helper=OBJCDecorateTypeFromJSONHelperMap[genType.sType], varValue=varValue )
 	if genType.sType == "rawstr":
-		return templateRawNSDictionaryStr.substitute( tmpVarValue=varValue )
+		return OBJCDecorateTypeFromJSONRawStrTemplate.substitute( varValue=varValue )
 	return "ERROR";
 
 def OBJCEmptyValForType( genType ):
@@ -90,47 +184,107 @@ def OBJCAppendIfNotEmpty( list, strItem ):
 	if strItem is not None and len(strItem) > 0:
 		list.append( strItem )
 
+def OBJCJoinChunks( separator, chunks ):
+	first = True
+	for chunk in chunks:
+		if chunk is None or len(chunk) == 0:
+			continue
+		if not first:
+			yield separator
+		first = False
+		yield chunk
+
+def OBJCTemplateChunks( template, **parts ):
+	#same as template.substitute(), but yields text piece by piece, parts can be strings or chunk iterables
+	for literal, placeholder in template.parts:
+		yield literal
+		part = parts[placeholder]
+		if isinstance( part, basestring ):
+			yield part
+		else:
+			for chunk in part:
+				yield chunk
+	yield template.tail
+
 def isModuleDependsOnHTTPTransport( module ):
 	for method in module.methods:
-		if method.httpMethod is not None:
+		if method.httpMethod is not None or OBJCRPCMethodUsesHTTPTransportOptions( method ):
 			return True
 	return False
 
+def OBJCRPCMethodUsesHTTPTransportOptions( method ):
+	#such methods call the IFHTTPTransport writeAll: taking them
+	return method.retryPolicy is not None or method.cachePolicy is not None or method.bodyEncoding is not None
+
 ############################
 # Header declaration
 ############################
 
+OBJCArgListTemplate = OBJCTemplate('$arg:($argType$argTypePtr)$argAlias')
+
+@OBJCFragment
 def OBJCArgList( genType ):
-	template = Template('$arg:($argType$argTypePtr)$argAlias')
 	argList = []
-	for fieldName in genType.allFieldNames():
-		fieldType = genType.fieldType(fieldName)
-		fieldAlias = genType.fieldAlias(fieldName)
-		argList.append( template.substitute( arg=capitalizeFirstLetter(fieldAlias), argType=OBJCAssumeType(fieldType), argTypePtr=fieldType.ptr, argAlias=fieldAlias ) )
+	for field in genType.allFields():
+		argList.append( OBJCArgListTemplate.substitute( arg=capitalizeFirstLetter(field.alias), argType=OBJCAssumeType(field.type), argTypePtr=field.type.ptr, argAlias=field.alias ) )
 	return '\n\tand'.join(argList)
 
+OBJCTypeInitDeclarationTemplate = OBJCTemplate('- (instancetype)initWith$argList')
+
+@OBJCFragment
 def OBJCTypeInitDeclaration( genType ):
-	return Template('- (instancetype)initWith$argList').substitute( argList=OBJCArgList( genType ) )
+	return OBJCTypeInitDeclarationTemplate.substitute( argList=OBJCArgList( genType ) )
 
-def OBJCTypeSerializersDeclarationList( genType ):
-	return """\
+OBJCTypeSerializersDeclarations = """\
 - (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
 - (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
 - (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
 - (NSData*)dumpWithError:(NSError* __autoreleasing*)error;"""
 
+OBJCTypeJSONWriterDeclaration = """
+- (BOOL)appendJSONToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error;"""
+
+OBJCTypeJSONReaderDeclaration = """
+- (instancetype)initWithJSONReader:(IFJSONReader*)reader;"""
+
+OBJCTypeMessagePackDeclaration = """
+- (instancetype)initWithMessagePackData:(NSData*)data error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithMessagePackReader:(IFMessagePackReader*)reader;
+- (BOOL)appendMessagePackToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error;
+- (NSData*)messagePackDataWithError:(NSError* __autoreleasing*)error;"""
+
+def OBJCTypeSerializersDeclarationList( genType, options=OBJCDefaultOptions ):
+	declarations = OBJCTypeSerializersDeclarations
+	if options.jsonWriter:
+		declarations += OBJCTypeJSONWriterDeclaration
+	if options.jsonReader:
+		declarations += OBJCTypeJSONReaderDeclaration
+	if options.codec == 'msgpack':
+		declarations += OBJCTypeMessagePackDeclaration
+	declarations += ''.join( OBJCLazyAccessorDeclarationTemplate.substitute( propType=OBJCAssumeType( field.type ), propTypePtr=field.type.ptr, alias=field.alias ) for field in OBJCLazyFields( genType, options ) )
+	return declarations
+
+OBJCTypePropertyListTemplate = OBJCTemplate('@property (nonatomic) $propType$propTypePtr $propAlias;')
+OBJCTypePropertyListListTemplate = OBJCTemplate('@property (nonatomic) $propType$propTypePtr/*$itemType*/ $propAlias;')
+
+@OBJCFragment
 def OBJCTypePropertyList( genType ):
-	template = Template('@property (nonatomic) $propType$propTypePtr $propAlias;')
-	listTemplate = Template('@property (nonatomic) $propType$propTypePtr/*$itemType*/ $propAlias;')
 	propList = []
-	for fieldName in genType.fieldNames():
-		fieldType = genType.fieldType(fieldName)
-		if isinstance( fieldType, GenListType ):
-			propList.append( listTemplate.substitute(propType=OBJCAssumeType( fieldType ), propTypePtr=fieldType.ptr, itemType=OBJCAssumeType( fieldType.itemType ), propAlias=genType.fieldAlias( fieldName )) )
+	for field in genType.fields():
+		if isinstance( field.type, GenListType ):
+			propList.append( OBJCTypePropertyListListTemplate.substitute(propType=OBJCAssumeType( field.type ), propTypePtr=field.type.ptr, itemType=OBJCAssumeType( field.type.itemType ), propAlias=field.alias) )
 		else:
-			propList.append( template.substitute(propType=OBJCAssumeType( fieldType ), propTypePtr=fieldType.ptr, propAlias=genType.fieldAlias( fieldName )) )
+			propList.append( OBJCTypePropertyListTemplate.substitute(propType=OBJCAssumeType( field.type ), propTypePtr=field.type.ptr, propAlias=field.alias) )
 	return '\n'.join(propList)
 
+OBJCTypeDeclarationTemplate = OBJCTemplate("""\
+@interface $typeName: $baseTypeName
+$init;
+$serializers
+$properties
+@end
+""")
+
 def OBJCTypeDeclaration( genType, serializersListGenerator ):
 	if isinstance( genType, GenIntegralType ) or isinstance( genType, GenListType ):
 		return ''
@@ -139,67 +293,66 @@ def OBJCTypeDeclaration( genType, serializersListGenerator ):
 	if genType.baseType is not None:
 		baseTypeName = genType.baseType.name
 
-	template = Template("""\
-@interface $typeName: $baseTypeName
-$init;
+	return OBJCTypeDeclarationTemplate.substitute(typeName=genType.name, baseTypeName=baseTypeName, init=OBJCTypeInitDeclaration( genType ), serializers=serializersListGenerator( genType ), properties=OBJCTypePropertyList( genType ))
+
+OBJCCategoryTypeDeclarationTemplate = OBJCTemplate("""\
+@interface $typeName($category)
 $serializers
-$properties
 @end
 """)
 
-	return template.substitute(typeName=genType.name, baseTypeName=baseTypeName, init=OBJCTypeInitDeclaration( genType ), serializers=serializersListGenerator( genType ), properties=OBJCTypePropertyList( genType ))
-
-def OBJCCategoryTypeDeclaration( genType, category ):
+@OBJCFragment
+def OBJCCategoryTypeDeclaration( genType, category, options=OBJCDefaultOptions ):
 	if isinstance( genType, GenIntegralType ) or isinstance( genType, GenListType ):
 		return ''
 
-	template = Template("""\
-@interface $typeName($category)
-$serializers
-@end
-""")
-	return template.substitute( typeName=genType.name, category=category, serializers=OBJCTypeSerializersDeclarationList( genType ) )
+	return OBJCCategoryTypeDeclarationTemplate.substitute( typeName=genType.name, category=category, serializers=OBJCTypeSerializersDeclarationList( genType, options ) )
 
 def OBJCTypeForwardingDeclaration( genType ):
 	return '@class %s;\n' % genType.name;
 
+OBJCImportListTemplate = OBJCTemplate('#import "$modImport.h"\n')
+
 def OBJCImportList( module ):
-	template = Template('#import "$modImport.h"\n')
 	importList = ''
 	for name in module.importedModuleNames:
-		importList += template.substitute(modImport=name)
+		importList += OBJCImportListTemplate.substitute(modImport=name)
 	return importList
 
 def OBJCFindDependenciesUnresolved( typeSet, typeToCheck ):
 	unresolved = []
 	if isinstance( typeToCheck, GenComplexType ):
-		for fieldName in typeToCheck.allFieldNames():
-			fieldType = typeToCheck.fieldType(fieldName)
-			if isinstance( fieldType, GenComplexType ) and ( fieldType.name not in typeSet ):
-				unresolved.append( fieldType )
+		for field in typeToCheck.allFields():
+			if isinstance( field.type, GenComplexType ) and ( field.type.name not in typeSet ):
+				unresolved.append( field.type )
 	return unresolved
 
-def OBJCTypeDeclarationList( module, serializersListGenerator ):
-	declList = []
+def OBJCTypeDeclarations( module, serializersListGenerator ):
 	alreadyDeclaredTypes = set( module.importedTypeList.keys() )
 	for genTypeName in module.typeList.keys():
 		currentType = module.typeList[genTypeName]
 		alreadyDeclaredTypes.add( genTypeName )
 		for forwardingType in OBJCFindDependenciesUnresolved( alreadyDeclaredTypes, currentType ):
-			declList.append( OBJCTypeForwardingDeclaration( forwardingType ) )
-		OBJCAppendIfNotEmpty( declList, OBJCTypeDeclaration( currentType, serializersListGenerator ) )
-	return '\n'.join( declList )
+			yield OBJCTypeForwardingDeclaration( forwardingType )
+		yield OBJCTypeDeclaration( currentType, serializersListGenerator )
 
-def OBJCCategoryTypeDeclarationList( module, category ):
-	declList = []
-	for genTypeName in module.typeList.keys():
-		currentType = module.typeList[genTypeName]
-		OBJCAppendIfNotEmpty( declList, OBJCCategoryTypeDeclaration( currentType, category ) )
-	return '\n'.join( declList )
+def OBJCTypeDeclarationChunks( module, serializersListGenerator ):
+	return OBJCJoinChunks( '\n', OBJCTypeDeclarations( module, serializersListGenerator ) )
+
+def OBJCTypeDeclarationList( module, serializersListGenerator ):
+	return ''.join( OBJCTypeDeclarationChunks( module, serializersListGenerator ) )
+
+def OBJCCategoryTypeDeclarationChunks( module, category, options=OBJCDefaultOptions ):
+	return OBJCJoinChunks( '\n', ( OBJCCategoryTypeDeclaration( module.typeList[genTypeName], category, options ) for genTypeName in module.typeList.keys() ) )
+
+def OBJCCategoryTypeDeclarationList( module, category, options=OBJCDefaultOptions ):
+	return ''.join( OBJCCategoryTypeDeclarationChunks( module, category, options ) )
 
 #TODO: make a column if there are more than 2 args in the declaration
-def OBJCRPCMethodDeclaration( method ):
-	template = Template('- ($responseType)${methodName}With$argList')
+OBJCRPCMethodDeclarationTemplate = OBJCTemplate('- ($responseType)${methodName}With$argList')
+OBJCRPCMethodCompletionArgTemplate = OBJCTemplate('Completion:(void (^)(${responseArg}NSError* error))completion')
+
+def OBJCRPCMethodArgList( method ):
 	argList = []
 
 	if method.endpoint is None:
@@ -210,33 +363,55 @@ def OBJCRPCMethodDeclaration( method ):
 		argList.append( OBJCArgList( customRequestType ) )
 	if method.requestJsonType is not None:
 		argList.append( OBJCArgList( method.requestJsonType ) )
+	return argList
 
+def OBJCRPCResponseType( method ):
+	if method.responseType is None:
+		return 'void'
+	return "%s%s" % ( OBJCAssumeType(method.responseType), method.responseType.ptr )
+
+def OBJCRPCMethodDeclaration( method ):
+	argList = OBJCRPCMethodArgList( method )
 	argList.append('Error:(NSError* __autoreleasing*)error')
 
 	argListStr = '\n\tand'.join(argList)
 
-	responseType = 'void'
+	return OBJCRPCMethodDeclarationTemplate.substitute( responseType=OBJCRPCResponseType( method ), methodName=method.name, argList=argListStr )
+
+def OBJCRPCMethodAsyncDeclaration( method ):
+	responseArg = ''
 	if method.responseType is not None:
-		responseType = "%s%s" % ( OBJCAssumeType(method.responseType), method.responseType.ptr )
+		responseArg = '%s response, ' % OBJCRPCResponseType( method )
+	argList = OBJCRPCMethodArgList( method )
+	argList.append( OBJCRPCMethodCompletionArgTemplate.substitute( responseArg=responseArg ) )
+
+	return OBJCRPCMethodDeclarationTemplate.substitute( responseType='void', methodName=method.name, argList='\n\tand'.join(argList) )
 
-	return template.substitute( responseType=responseType, methodName=method.name, argList=argListStr )
+OBJCRPCBatchDeclarationTemplate = OBJCTemplate('- (void)${batchName}WithBuilder:(void (^)($rpcClientName* batch))builder\n\tandCompletion:(void (^)(NSError* error))completion')
+
+def OBJCRPCBatchDeclaration( module, batch ):
+	return OBJCRPCBatchDeclarationTemplate.substitute( batchName=batch.name, rpcClientName=module.name )
 
 def OBJCRPCMethodList( module ):
 	methodList = []
 	for method in module.methods:
 		methodList.append( OBJCRPCMethodDeclaration( method ) )
+		methodList.append( OBJCRPCMethodAsyncDeclaration( method ) )
+	for batch in module.batches:
+		methodList.append( OBJCRPCBatchDeclaration( module, batch ) )
 	return ';\n'.join(methodList)
 
-def OBCRPCDeclaration( module ):
-	if len(module.methods) == 0:
-		return ''
-
-	template = Template("""\
+OBCRPCDeclarationTemplate = OBJCTemplate("""\
 @interface $rpcClientName: IFServiceClient
 $methods;
 @end
 """)
-	return template.substitute( rpcClientName=module.name, methods=OBJCRPCMethodList( module ) )
+
+def OBCRPCDeclaration( module ):
+	if len(module.methods) == 0:
+		return ''
+
+	return OBCRPCDeclarationTemplate.substitute( rpcClientName=module.name, methods=OBJCRPCMethodList( module ) )
 
 OBJCGeneratedWarning = """\
 /**
@@ -249,7 +424,21 @@ OBJCGeneratedWarning = """\
 OBJCHeaderIFImports = """\
 #import "IFServiceClient.h"
 """
-OBJCHeaderTemplate = Template("""\
+OBJCHeaderJSONReaderImport = """\
+#import "IFJSONReader.h"
+"""
+OBJCHeaderMessagePackImport = """\
+#import "IFMessagePack.h"
+"""
+
+def OBJCHeaderJSONReaderImports( options ):
+	imports = ''
+	if options.jsonReader:
+		imports += OBJCHeaderJSONReaderImport
+	if options.codec == 'msgpack':
+		imports += OBJCHeaderMessagePackImport
+	return imports
+OBJCHeaderTemplate = OBJCTemplate("""\
 $generatedWarning
 
 #import <Foundation/Foundation.h>
@@ -258,62 +447,77 @@ $typeDeclarationList
 $rpcDeclaration
 """)
 
-def OBJCHeader( module ):
-	return OBJCHeaderTemplate.substitute( generatedWarning=OBJCGeneratedWarning, IFImportList=OBJCHeaderIFImports, importList=OBJCImportList( module ), typeDeclarationList=OBJCTypeDeclarationList( module, OBJCTypeSerializersDeclarationList ), rpcDeclaration=OBCRPCDeclaration( module ) )
+def OBJCHeaderChunks( module, options=OBJCDefaultOptions ):
+	return OBJCTemplateChunks( OBJCHeaderTemplate, generatedWarning=OBJCGeneratedWarning, IFImportList=OBJCHeaderIFImports + OBJCHeaderJSONReaderImports( options ), importList=OBJCImportList( module ), typeDeclarationList=OBJCTypeDeclarationChunks( module, lambda genType: OBJCTypeSerializersDeclarationList( genType, options ) ), rpcDeclaration=OBCRPCDeclaration( module ) )
+
+def OBJCHeader( module, options=OBJCDefaultOptions ):
+	return ''.join( OBJCHeaderChunks( module, options ) )
+
+def OBJCHeaderForCategoryChunks( module ):
+	return OBJCTemplateChunks( OBJCHeaderTemplate, generatedWarning=OBJCGeneratedWarning, IFImportList='', importList=OBJCImportList( module ), typeDeclarationList=OBJCTypeDeclarationChunks( module, lambda genType: '' ),  rpcDeclaration='' )
 
 def OBJCHeaderForCategory( module ):
-	return OBJCHeaderTemplate.substitute( generatedWarning=OBJCGeneratedWarning, IFImportList='', importList=OBJCImportList( module ), typeDeclarationList=OBJCTypeDeclarationList( module, lambda genType: '' ),  rpcDeclaration='' )
+	return ''.join( OBJCHeaderForCategoryChunks( module ) )
 
-def OBJCCategoryHeader( module, category ):
-	template = Template("""\
+OBJCCategoryHeaderChunksTemplate = OBJCTemplate("""\
 $generatedWarning
 
 #import "$moduleName.h"
-
+$JSONReaderImport
 $typeDeclarationList
 """)
-	return template.substitute( generatedWarning=OBJCGeneratedWarning, moduleName=module.name, typeDeclarationList=OBJCCategoryTypeDeclarationList( module, category ) )
+
+def OBJCCategoryHeaderChunks( module, category, options=OBJCDefaultOptions ):
+	return OBJCTemplateChunks( OBJCCategoryHeaderChunksTemplate, generatedWarning=OBJCGeneratedWarning, moduleName=module.name, JSONReaderImport=OBJCHeaderJSONReaderImports( options ), typeDeclarationList=OBJCCategoryTypeDeclarationChunks( module, category, options ) )
+
+def OBJCCategoryHeader( module, category, options=OBJCDefaultOptions ):
+	return ''.join( OBJCCategoryHeaderChunks( module, category, options ) )
 
 ############################
 # Implementation module
 ############################
 
+OBJCTypeFieldInitListTemplate = OBJCTemplate('\t\t_$fieldAlias = $fieldAlias;')
+
+@OBJCFragment
 def OBJCTypeFieldInitList( genType ):
-	template = Template('\t\t_$fieldAlias = $fieldAlias;')
 	fieldList = []
-	for fieldName in genType.fieldNames():
-		field = genType.fieldType(fieldName)
-		fieldAlias = genType.fieldAlias(fieldName)
-		fieldList.append( template.substitute( fieldAlias=fieldAlias ) )
+	for field in genType.fields():
+		fieldList.append( OBJCTypeFieldInitListTemplate.substitute( fieldAlias=field.alias ) )
 	return '\n'.join( fieldList )
 
+@OBJCFragment
 def OBJCTypeMethodActualArgList( genType ):
 	argList = []
-	for fieldName in genType.allFieldNames():
-		fieldType = genType.fieldType( fieldName )
-		fieldAlias = genType.fieldAlias( fieldName )
-		argList.append( '%s:%s' % ( capitalizeFirstLetter( fieldAlias ), fieldAlias ) )
+	for field in genType.allFields():
+		argList.append( '%s:%s' % ( capitalizeFirstLetter( field.alias ), field.alias ) )
 	return '\n\t\t\t\t\t\tand'.join( argList )
 
-def OBJCTypeInitImplList( genType ):
-	baseTemplate = Template("""
+OBJCTypeInitImplListBaseTemplate = OBJCTemplate("""
 $declaration {
 	if (self=[super init]) {
 $fieldInitList
 	}
 	return self;
 }""")
-
-	superTemplate = Template("""
+OBJCTypeInitImplListSuperTemplate = OBJCTemplate("""
 $declaration {
 	if (self = [super initWith$actualArgList]) {
 $fieldInitList
 	}
 	return self;
 }""")
+
+@OBJCFragment
+def OBJCTypeInitImplList( genType ):
 	if genType.baseType is not None:
-		return superTemplate.substitute( declaration=OBJCTypeInitDeclaration( genType ), actualArgList=OBJCTypeMethodActualArgList( genType.baseType ), fieldInitList=OBJCTypeFieldInitList( genType ) )
-	return baseTemplate.substitute( declaration=OBJCTypeInitDeclaration( genType ), fieldInitList=OBJCTypeFieldInitList( genType ) )
+		return OBJCTypeInitImplListSuperTemplate.substitute( declaration=OBJCTypeInitDeclaration( genType ), actualArgList=OBJCTypeMethodActualArgList( genType.baseType ), fieldInitList=OBJCTypeFieldInitList( genType ) )
+	return OBJCTypeInitImplListBaseTemplate.substitute( declaration=OBJCTypeInitDeclaration( genType ), fieldInitList=OBJCTypeFieldInitList( genType ) )
+
+OBJCUnwindTypeToDictFieldTemplate = OBJCTemplate('$tabLevel@"$argName":$argValue')
+OBJCUnwindTypeToDictDictionaryTemplate = OBJCTemplate('@{\n$fieldList\n$tabLevel}')
+OBJCUnwindTypeToDictIntegralListTemplate = OBJCTemplate('jsonNullable($objcArgName)')
+OBJCUnwindTypeToDictArrayTemplate = OBJCTemplate('${listFunction}ToJSON($objcArgName, error)')
 
 def OBJCUnwindTypeToDict( genType, objcArgName, level, recursive=True ):
 	if isinstance( genType, GenIntegralType ):
@@ -323,77 +527,435 @@ def OBJCUnwindTypeToDict( genType, objcArgName, level, recursive=True ):
 		if not recursive:
 			return '[%s dictionaryWithError:error]' % objcArgName
 
-		fieldTemplate = Template('$tabLevel@"$argName":$argValue')
 		fieldList = []
 
-		for argName in genType.allFieldNames():
-			fieldType = genType.fieldType(argName)
-			objcStatement = genType.fieldAlias(argName)
+		for field in genType.allFields():
+			objcStatement = field.alias
 			if objcArgName is not None:
-				objcStatement = '%s.%s' % ( objcArgName, genType.fieldAlias(argName) )
-			fieldList.append( fieldTemplate.substitute( tabLevel='\t'*level, argName=argName, argValue=OBJCUnwindTypeToDict( fieldType, objcStatement, level+1, recursive=False ) ) )
+				objcStatement = '%s.%s' % ( objcArgName, field.alias )
+			fieldList.append( OBJCUnwindTypeToDictFieldTemplate.substitute( tabLevel='\t'*level, argName=field.name, argValue=OBJCUnwindTypeToDict( field.type, objcStatement, level+1, recursive=False ) ) )
 
-		return Template('@{\n$fieldList\n$tabLevel}').substitute( fieldList=',\n'.join(fieldList), tabLevel='\t'*(level-1) )
+		return OBJCUnwindTypeToDictDictionaryTemplate.substitute( fieldList=',\n'.join(fieldList), tabLevel='\t'*(level-1) )
 
 	elif isinstance( genType, GenListType ):
 		if isinstance( genType.itemType, GenIntegralType ):
-			return Template('($objcArgName == nil ? [NSNull null] : $objcArgName)').substitute(objcArgName=objcArgName)
+			return OBJCUnwindTypeToDictIntegralListTemplate.substitute(objcArgName=objcArgName)
 		else:
-			arrayTemplate = Template("""\
-^NSArray*(NSArray* inArr) {
-${tabLevel}NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
-${tabLevel}for($objcType$objcTypePtr inObj in inArr) { [resArr addObject:$argValue]; }
-${tabLevel}return resArr; } ($objcArgName)""")
-			return arrayTemplate.substitute( tabLevel='\t'*level, objcType=OBJCAssumeType(genType.itemType), objcTypePtr=genType.itemType.ptr, argValue=OBJCUnwindTypeToDict( genType.itemType, 'inObj', level+2, recursive=False ), objcArgName=objcArgName )
+			return OBJCUnwindTypeToDictArrayTemplate.substitute( listFunction=OBJCListFunctionName( genType ), objcArgName=objcArgName )
+
+OBJCListTypeFromDictionaryListTypeTemplate = OBJCTemplate('${listFunction}FromJSON($objcDataGetter, error)')
 
 def OBJCListTypeFromDictionary( genType, objcDataGetter, level ):
-	listTypeTemplate = Template("""\
-^NSArray*(id inObj) {
-${tabLevel}\tNSMutableArray* items;
-${tabLevel}\tif ( inObj == nil ||  [inObj isEqual:[NSNull null]] || ![inObj isKindOfClass:NSArray.class]) return nil;
-${tabLevel}\tNSArray* inArr = (NSArray*)inObj;
-${tabLevel}\titems = [NSMutableArray arrayWithCapacity:inArr.count];
-${tabLevel}\tfor ( id item in inArr ) { id tmp; [items addObject:$itemObj]; }
-${tabLevel}\treturn items;
-${tabLevel}}( $objcDataGetter )""")
-	return listTypeTemplate.substitute( tabLevel='\t'*level, itemObj=OBJCTypeFromDictionary(genType.itemType, "item", level+1 ), objcDataGetter=objcDataGetter )
+	return OBJCListTypeFromDictionaryListTypeTemplate.substitute( listFunction=OBJCListFunctionName( genType ), objcDataGetter=objcDataGetter )
+
+############################
+# List functions
+############################
+
+#lists of complex types are converted by static functions, one pair per item type in a file,
+#which nested lists and all the fields of this list type call
+def OBJCListFunctionName( genType ):
+	if isinstance( genType.itemType, GenListType ):
+		return OBJCListFunctionName( genType.itemType ) + 'List'
+	return genType.itemType.name + 'List'
+
+OBJCListToJSON = 1
+OBJCListFromJSON = 2
+
+def OBJCCollectListTypes( genType, directions, listTypes ):
+	if not isinstance( genType, GenListType ) or isinstance( genType.itemType, GenIntegralType ):
+		return
+	#nested lists go first, since the functions of the outer ones call them
+	if isinstance( genType.itemType, GenListType ):
+		OBJCCollectListTypes( genType.itemType, directions, listTypes )
+	listFunction = OBJCListFunctionName( genType )
+	listTypes[listFunction] = ( genType, listTypes.get( listFunction, ( None, 0 ) )[1] | directions )
+
+def OBJCModuleListTypes( module, withMethods=True ):
+	listTypes = OrderedDict()
+	#list types of the module are fields of its complex types or arguments of its methods
+	for genType in module.typeList.values():
+		if isinstance( genType, GenComplexType ):
+			for field in genType.allFields():
+				OBJCCollectListTypes( field.type, OBJCListToJSON | OBJCListFromJSON, listTypes )
+	if withMethods:
+		for method in module.methods:
+			for requestType in [ method.requestJsonType ] + list( method.customRequestTypes.values() ):
+				if isinstance( requestType, GenComplexType ):
+					for field in requestType.allFields():
+						OBJCCollectListTypes( field.type, OBJCListToJSON, listTypes )
+				else:
+					OBJCCollectListTypes( requestType, OBJCListToJSON, listTypes )
+			OBJCCollectListTypes( method.responseType, OBJCListFromJSON, listTypes )
+	return listTypes
+
+OBJCListToJSONFunctionTemplate = OBJCTemplate("""\
+static NSArray* ${listFunction}ToJSON(NSArray* inArr, NSError* __autoreleasing* error) {
+	NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
+	for ( $objcType$objcTypePtr inObj in inArr ) { [resArr addObject:$itemToJSON]; }
+	return resArr;
+}
+
+""")
+OBJCListFromJSONFunctionTemplate = OBJCTemplate("""\
+static NSArray* ${listFunction}FromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:$itemFromJSON]; }
+	return items;
+}
+
+""")
+
+OBJCListFromJSONReaderFunctionTemplate = OBJCTemplate("""\
+static NSArray* ${listFunction}FromJSONReader(IFJSONReader* reader) {
+	if ( !IFJSONReaderBeginArray(reader) ) return nil;
+	NSMutableArray* items = [NSMutableArray array];
+	while ( IFJSONReaderNextItem(reader) ) {
+		id item = $itemValue;
+		if ( item != nil ) [items addObject:item];
+	}
+	return items;
+}
+
+""")
+OBJCListFromMessagePackReaderFunctionTemplate = OBJCTemplate("""\
+static NSArray* ${listFunction}FromMessagePackReader(IFMessagePackReader* reader) {
+	NSUInteger count;
+	if ( !IFMessagePackReaderBeginArray(reader, &count) ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:count];
+	while ( count-- > 0 && !IFMessagePackReaderFailed(reader) ) {
+		id item = $itemValue;
+		if ( item != nil ) [items addObject:item];
+	}
+	return items;
+}
+
+""")
+
+def OBJCListFunctions( module, withMethods=True, options=OBJCDefaultOptions ):
+	listTypes = OBJCModuleListTypes( module, withMethods )
+	functions = []
+	for listFunction in listTypes.keys():
+		listType, directions = listTypes[listFunction]
+		itemType = listType.itemType
+		if directions & OBJCListToJSON:
+			functions.append( OBJCListToJSONFunctionTemplate.substitute( listFunction=listFunction, objcType=OBJCAssumeType( itemType ), objcTypePtr=itemType.ptr, itemToJSON=OBJCUnwindTypeToDict( itemType, 'inObj', 1, recursive=False ) ) )
+		if directions & OBJCListFromJSON:
+			functions.append( OBJCListFromJSONFunctionTemplate.substitute( listFunction=listFunction, itemFromJSON=OBJCTypeFromDictionary( itemType, 'item', 1 ) ) )
+			#the readers of a list type are shared the same way by fields and responses
+			if options.jsonReader:
+				functions.append( OBJCListFromJSONReaderFunctionTemplate.substitute( listFunction=listFunction, itemValue=OBJCJSONReaderValue( itemType, 'reader', 1 ) ) )
+			if options.codec == 'msgpack':
+				functions.append( OBJCListFromMessagePackReaderFunctionTemplate.substitute( listFunction=listFunction, itemValue=OBJCMessagePackReaderValue( itemType, 'reader', 1 ) ) )
+	return ''.join( functions )
+
+OBJCTypeFromDictionaryComplexTypeTemplate = OBJCTemplate('[[$typeName alloc] initWithDictionary:$objcDataGetter error:error]')
 
 def OBJCTypeFromDictionary( genType, objcDataGetter, level ):
-	complexTypeTemplate = Template('[[$typeName alloc] initWithDictionary:$objcDataGetter error:error]')
 	if isinstance( genType, GenIntegralType ):
 		return OBJCDecorateTypeFromJSON( genType, objcDataGetter )
 	if isinstance( genType, GenComplexType ):
-		return complexTypeTemplate.substitute( typeName=genType.name, objcDataGetter=objcDataGetter )
+		return OBJCTypeFromDictionaryComplexTypeTemplate.substitute( typeName=genType.name, objcDataGetter=objcDataGetter )
 	if isinstance( genType, GenListType ):
 		if isinstance(genType.itemType, GenIntegralType):
 			return OBJCDecorateTypeFromJSON( genType, objcDataGetter )
 		else:
 			return OBJCListTypeFromDictionary( genType, objcDataGetter, level+1 )
 
-def OBJCComplexTypeFieldListFromDictionary( genType, objcDictArgName ):
-	template = Template('\tself.$argName = $value')
+OBJCComplexTypeFieldListFromDictionaryTemplate = OBJCTemplate('\tself.$argName = $value')
+
+OBJCComplexTypeLazyFieldFromDictionaryTemplate = OBJCTemplate('\t_${argName}JSON = $objcDataGetter')
+
+def OBJCComplexTypeFieldListFromDictionary( genType, objcDictArgName, lazyFields=() ):
 	fieldList = []
 	#here we init all the fields available, including ancestor's ones instead of calling non-public "[super readDictionary]" method
-	for fieldName in genType.allFieldNames():
-		fieldType = genType.fieldType(fieldName)
-		objcDataGetter = '%s[@"%s"]' % ( objcDictArgName, fieldName )
-		fieldList.append( template.substitute( argName=genType.fieldAlias(fieldName), value=OBJCTypeFromDictionary( fieldType, objcDataGetter, 1 ) ) )
+	for field in genType.allFields():
+		objcDataGetter = '%s[@"%s"]' % ( objcDictArgName, field.name )
+		if field.name in lazyFields:
+			#readDictionary is called by initializers only, so the value is not materialized yet
+			fieldList.append( OBJCComplexTypeLazyFieldFromDictionaryTemplate.substitute( argName=field.alias, objcDataGetter=objcDataGetter ) )
+			continue
+		fieldList.append( OBJCComplexTypeFieldListFromDictionaryTemplate.substitute( argName=field.alias, value=OBJCTypeFromDictionary( field.type, objcDataGetter, 1 ) ) )
 	return ';\n'.join( fieldList )
 
-def OBJCTypeSerializationImplList( genType ):
-	template = Template("""
-- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
-	return $typeDictionary;
+############################
+# Direct JSON writer
+############################
+
+#fields of a complex type are written right into NSMutableData by the IFJSONWriter.h helpers
+OBJCJSONWriterIntegralMap = { "bool": "IFJSONAppendBool(data, $value);", "int32": "IFJSONAppendInt32(data, $value);", "int64": "IFJSONAppendInt64(data, $value);", "string": "IFJSONAppendString(data, $value);", "double": "if ( !IFJSONAppendDouble(data, $value, error) ) $failure;", "raw": "if ( !IFJSONAppendObject(data, $value, error) ) $failure;", "rawstr": "if ( !IFJSONAppendObjectString(data, $value, error) ) $failure;" }
+OBJCJSONWriterIntegralTemplates = dict( [ ( sType, OBJCTemplate( OBJCJSONWriterIntegralMap[sType] ) ) for sType in OBJCJSONWriterIntegralMap.keys() ] )
+OBJCJSONWriterIntegralListTemplate = OBJCTemplate( OBJCJSONWriterIntegralMap["raw"] )
+OBJCJSONWriterComplexTemplate = OBJCTemplate("""\
+${tabLevel}if ( $value == nil ) IFJSONAppendNull(data);
+${tabLevel}else if ( ![$value appendJSONToData:data error:error] ) $failure;""")
+OBJCJSONWriterListTemplate = OBJCTemplate("""\
+${tabLevel}if ( $value == nil ) IFJSONAppendNull(data);
+${tabLevel}else {
+${tabLevel}	IFJSONAppendLiteral(data, "[");
+${tabLevel}	BOOL first$level = YES;
+${tabLevel}	for ( $itemType$itemTypePtr item$level in $value ) {
+${tabLevel}		if ( !first$level ) IFJSONAppendLiteral(data, ",");
+${tabLevel}		first$level = NO;
+$itemStatements
+${tabLevel}	}
+${tabLevel}	IFJSONAppendLiteral(data, "]");
+${tabLevel}}""")
+OBJCJSONWriterLiteralTemplate = OBJCTemplate('${tabLevel}IFJSONAppendLiteral(data, $literal);')
+
+#rough size of a value in JSON, only used to pre-size the output buffer
+OBJCJSONSizeHintMap = { "bool": 5, "int32": 11, "int64": 20, "double": 24, "string": 32, "raw": 64, "rawstr": 64 }
+OBJCJSONSizeHintDefault = 64
+
+def OBJCCStringLiteral( text ):
+	return '"%s"' % text.replace( '\\', '\\\\' ).replace( '"', '\\"' )
+
+def OBJCJSONWriterValue( genType, value, level, failure ):
+	tabLevel = '\t'*level
+	if isinstance( genType, GenIntegralType ):
+		return tabLevel + OBJCJSONWriterIntegralTemplates[genType.sType].substitute( value=value, failure=failure )
+	if isinstance( genType, GenComplexType ):
+		return OBJCJSONWriterComplexTemplate.substitute( tabLevel=tabLevel, value=value, failure=failure )
+	if isinstance( genType.itemType, GenIntegralType ):
+		#lists of integral types are kept as NSArray of NSNumber/NSString, so NSJSONSerialization writes them as is
+		return tabLevel + OBJCJSONWriterIntegralListTemplate.substitute( value=value, failure=failure )
+	itemStatements = OBJCJSONWriterValue( genType.itemType, 'item%d' % level, level+2, failure )
+	return OBJCJSONWriterListTemplate.substitute( tabLevel=tabLevel, value=value, level=level, itemType=OBJCAssumeType( genType.itemType ), itemTypePtr=genType.itemType.ptr, itemStatements=itemStatements )
+
+def OBJCJSONWriterObject( genType, objcArgName, level, failure ):
+	tabLevel = '\t'*level
+	statements = []
+	separator = '{'
+	for field in genType.allFields():
+		value = field.alias
+		if objcArgName is not None:
+			value = '%s.%s' % ( objcArgName, field.alias )
+		statements.append( OBJCJSONWriterLiteralTemplate.substitute( tabLevel=tabLevel, literal=OBJCCStringLiteral( separator + json.dumps( field.name ) + ':' ) ) )
+		statements.append( OBJCJSONWriterValue( field.type, value, level, failure ) )
+		separator = ','
+	statements.append( OBJCJSONWriterLiteralTemplate.substitute( tabLevel=tabLevel, literal=OBJCCStringLiteral( '{}' if separator == '{' else '}' ) ) )
+	return '\n'.join( statements )
+
+def OBJCJSONSizeHint( genType ):
+	sizeHint = 2
+	for field in genType.allFields():
+		sizeHint += len( field.name ) + 4
+		if isinstance( field.type, GenIntegralType ):
+			sizeHint += OBJCJSONSizeHintMap[field.type.sType]
+		else:
+			sizeHint += OBJCJSONSizeHintDefault
+	return sizeHint
+
+############################
+# Direct JSON reader
+############################
+
+#fields are assigned right from the IFJSONReader.h token stream, by a switch on the member name length
+OBJCJSONReaderIntegralMap = { "bool": "IFJSONReadBool", "int32": "IFJSONReadInt32", "int64": "IFJSONReadInt64", "double": "IFJSONReadDouble", "string": "IFJSONReadString", "raw": "IFJSONReadObject", "rawstr": "IFJSONReadObjectString" }
+OBJCJSONReaderComplexTemplate = OBJCTemplate('[[$typeName alloc] initWithJSONReader:$reader]')
+OBJCJSONReaderListTemplate = OBJCTemplate('${listFunction}FromJSONReader($reader)')
+OBJCJSONReaderCaseTemplate = OBJCTemplate("""\
+			case $length:""")
+OBJCJSONReaderFieldTemplate = OBJCTemplate("""\
+				if ( IFJSONKeyEquals(key, $literal) ) {
+					self.$alias = $value;
+					continue;
+				}""")
+
+def OBJCJSONReaderValue( genType, reader, level ):
+	if isinstance( genType, GenIntegralType ):
+		return '%s(%s)' % ( OBJCJSONReaderIntegralMap[genType.sType], reader )
+	if isinstance( genType, GenComplexType ):
+		return OBJCJSONReaderComplexTemplate.substitute( typeName=genType.name, reader=reader )
+	if isinstance( genType.itemType, GenIntegralType ):
+		#lists of integral types are kept as NSArray of NSNumber/NSString, so NSJSONSerialization reads them as is
+		return 'IFJSONReadObject(%s)' % reader
+	return OBJCJSONReaderListTemplate.substitute( listFunction=OBJCListFunctionName( genType ), reader=reader )
+
+def OBJCUniqueFields( genType ):
+	#a redeclared field is read and written once, as the ancestor declares it
+	fields = OrderedDict()
+	for field in genType.allFields():
+		fields.setdefault( field.name, field )
+	return fields.values()
+
+def OBJCReaderFieldSwitch( genType, fieldTemplate, readerValue ):
+	fieldsByLength = OrderedDict()
+	for field in OBJCUniqueFields( genType ):
+		fieldsByLength.setdefault( len( field.name.encode( 'utf-8' ) ), [] ).append( field )
+	cases = []
+	for length in fieldsByLength.keys():
+		cases.append( OBJCJSONReaderCaseTemplate.substitute( length=length ) )
+		for field in fieldsByLength[length]:
+			cases.append( fieldTemplate.substitute( literal=OBJCCStringLiteral( field.name ), alias=field.alias, value=readerValue( field.type, 'reader', 5 ) ) )
+		cases.append( '\t\t\t\tbreak;' )
+	return '\n'.join( cases )
+
+def OBJCJSONReaderFieldSwitch( genType ):
+	return OBJCReaderFieldSwitch( genType, OBJCJSONReaderFieldTemplate, OBJCJSONReaderValue )
+
+OBJCTypeJSONReaderImplTemplate = OBJCTemplate("""\
+- (instancetype)initWithJSONReader:(IFJSONReader*)reader {
+	if ( !IFJSONReaderBeginObject(reader) ) return nil;
+	if (self = [super init]) {
+		[self readJSONReader:reader];
+		if ( IFJSONReaderFailed(reader) ) self = nil;
+	}
+	return self;
 }
 
-- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
-	NSDictionary* dict = [self dictionaryWithError:error];
-	if (*error) return nil;
-	else return [NSJSONSerialization dataWithJSONObject:[self dictionaryWithError:error] options:jsonFormatOption error:error];
+- (void)readJSONReader:(IFJSONReader*)reader {
+	IFJSONKey key;
+	while ( IFJSONReaderNextKey(reader, &key) ) {
+		switch ( key.length ) {
+$fieldSwitch
+		}
+		IFJSONReaderSkipValue(reader);
+	}
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	IFJSONReader reader;
+	IFJSONReaderInit(&reader, jsonData);
+	self = [self initWithJSONReader:&reader];
+	if ( !IFJSONReaderFinish(&reader, error) ) self = nil;
+	return self;
+}""")
+
+############################
+# MessagePack codec
+############################
+
+#binary counterpart of the direct JSON writer and reader on top of IFMessagePack.h, map keys are the IDL field names
+OBJCMessagePackWriterIntegralMap = { "bool": "IFMessagePackAppendBool(data, $value);", "int32": "IFMessagePackAppendInt64(data, $value);", "int64": "IFMessagePackAppendInt64(data, $value);", "string": "IFMessagePackAppendString(data, $value);", "double": "IFMessagePackAppendDouble(data, $value);", "raw": "if ( !IFMessagePackAppendObject(data, $value, error) ) $failure;", "rawstr": "if ( !IFMessagePackAppendObjectString(data, $value, error) ) $failure;" }
+OBJCMessagePackWriterIntegralTemplates = dict( [ ( sType, OBJCTemplate( OBJCMessagePackWriterIntegralMap[sType] ) ) for sType in OBJCMessagePackWriterIntegralMap.keys() ] )
+OBJCMessagePackWriterIntegralListTemplate = OBJCTemplate( OBJCMessagePackWriterIntegralMap["raw"] )
+OBJCMessagePackWriterComplexTemplate = OBJCTemplate("""\
+${tabLevel}if ( $value == nil ) IFMessagePackAppendNil(data);
+${tabLevel}else if ( ![$value appendMessagePackToData:data error:error] ) $failure;""")
+OBJCMessagePackWriterListTemplate = OBJCTemplate("""\
+${tabLevel}if ( $value == nil ) IFMessagePackAppendNil(data);
+${tabLevel}else {
+${tabLevel}	IFMessagePackAppendArrayHeader(data, $value.count);
+${tabLevel}	for ( $itemType$itemTypePtr item$level in $value ) {
+$itemStatements
+${tabLevel}	}
+${tabLevel}}""")
+OBJCMessagePackWriterLiteralTemplate = OBJCTemplate('${tabLevel}IFMessagePackAppendLiteral(data, $literal);')
+
+def OBJCBytesLiteral( data ):
+	#3-digit octal escapes can't run into the next character
+	chars = []
+	for byte in bytearray( data ):
+		if byte < 0x20 or byte >= 0x7F or chr( byte ) in '"\\?':
+			chars.append( '\\%03o' % byte )
+		else:
+			chars.append( chr( byte ) )
+	return '"%s"' % ''.join( chars )
+
+def OBJCMessagePackWriterValue( genType, value, level, failure ):
+	tabLevel = '\t'*level
+	if isinstance( genType, GenIntegralType ):
+		return tabLevel + OBJCMessagePackWriterIntegralTemplates[genType.sType].substitute( value=value, failure=failure )
+	if isinstance( genType, GenComplexType ):
+		return OBJCMessagePackWriterComplexTemplate.substitute( tabLevel=tabLevel, value=value, failure=failure )
+	if isinstance( genType.itemType, GenIntegralType ):
+		return tabLevel + OBJCMessagePackWriterIntegralListTemplate.substitute( value=value, failure=failure )
+	itemStatements = OBJCMessagePackWriterValue( genType.itemType, 'item%d' % level, level+2, failure )
+	return OBJCMessagePackWriterListTemplate.substitute( tabLevel=tabLevel, value=value, level=level, itemType=OBJCAssumeType( genType.itemType ), itemTypePtr=genType.itemType.ptr, itemStatements=itemStatements )
+
+def OBJCMessagePackWriterObject( genType, level, failure ):
+	tabLevel = '\t'*level
+	fields = OBJCUniqueFields( genType )
+	#the map header goes along with the first key, keys are written as literals
+	header = bytearray()
+	messagePackAppendMapHeader( header, len( fields ) )
+	statements = []
+	for field in fields:
+		messagePackAppendString( header, field.name )
+		statements.append( OBJCMessagePackWriterLiteralTemplate.substitute( tabLevel=tabLevel, literal=OBJCBytesLiteral( header ) ) )
+		statements.append( OBJCMessagePackWriterValue( field.type, 'self.' + field.alias, level, failure ) )
+		header = bytearray()
+	if len( fields ) == 0:
+		statements.append( OBJCMessagePackWriterLiteralTemplate.substitute( tabLevel=tabLevel, literal=OBJCBytesLiteral( header ) ) )
+	return '\n'.join( statements )
+
+OBJCMessagePackReaderIntegralMap = { "bool": "IFMessagePackReadBool", "int32": "IFMessagePackReadInt32", "int64": "IFMessagePackReadInt64", "double": "IFMessagePackReadDouble", "string": "IFMessagePackReadString", "raw": "IFMessagePackReadObject", "rawstr": "IFMessagePackReadObjectString" }
+OBJCMessagePackReaderComplexTemplate = OBJCTemplate('[[$typeName alloc] initWithMessagePackReader:$reader]')
+OBJCMessagePackReaderListTemplate = OBJCTemplate('${listFunction}FromMessagePackReader($reader)')
+OBJCMessagePackReaderFieldTemplate = OBJCTemplate("""\
+				if ( IFMessagePackKeyEquals(key, $literal) ) {
+					self.$alias = $value;
+					continue;
+				}""")
+
+def OBJCMessagePackReaderValue( genType, reader, level ):
+	if isinstance( genType, GenIntegralType ):
+		return '%s(%s)' % ( OBJCMessagePackReaderIntegralMap[genType.sType], reader )
+	if isinstance( genType, GenComplexType ):
+		return OBJCMessagePackReaderComplexTemplate.substitute( typeName=genType.name, reader=reader )
+	if isinstance( genType.itemType, GenIntegralType ):
+		return 'IFMessagePackReadObject(%s)' % reader
+	return OBJCMessagePackReaderListTemplate.substitute( listFunction=OBJCListFunctionName( genType ), reader=reader )
+
+OBJCTypeMessagePackImplTemplate = OBJCTemplate("""
+
+- (instancetype)initWithMessagePackReader:(IFMessagePackReader*)reader {
+	NSUInteger count;
+	if ( !IFMessagePackReaderBeginMap(reader, &count) ) return nil;
+	if (self = [super init]) {
+		[self readMessagePackReader:reader count:count];
+		if ( IFMessagePackReaderFailed(reader) ) self = nil;
+	}
+	return self;
+}
+
+- (void)readMessagePackReader:(IFMessagePackReader*)reader count:(NSUInteger)count {
+	IFMessagePackKey key;
+	while ( count-- > 0 && IFMessagePackReaderNextKey(reader, &key) ) {
+		switch ( key.length ) {
+$fieldSwitch
+		}
+		IFMessagePackReaderSkipValue(reader);
+	}
+}
+
+- (instancetype)initWithMessagePackData:(NSData*)data error:(NSError* __autoreleasing*)error {
+	if ( data == nil ) return nil;
+	IFMessagePackReader reader;
+	IFMessagePackReaderInit(&reader, data);
+	self = [self initWithMessagePackReader:&reader];
+	if ( !IFMessagePackReaderFinish(&reader, error) ) self = nil;
+	return self;
+}
+
+- (BOOL)appendMessagePackToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error {
+$writerStatements
+	return YES;
+}
+
+- (NSData*)messagePackDataWithError:(NSError* __autoreleasing*)error {
+	NSMutableData* data = [NSMutableData dataWithCapacity:$sizeHint];
+	if ( ![self appendMessagePackToData:data error:error] ) return nil;
+	return data;
+}""")
+
+def OBJCTypeMessagePackImpl( genType, options, lazyCheck='' ):
+	if options.codec != 'msgpack':
+		return ''
+	return OBJCTypeMessagePackImplTemplate.substitute( fieldSwitch=OBJCReaderFieldSwitch( genType, OBJCMessagePackReaderFieldTemplate, OBJCMessagePackReaderValue ), writerStatements=lazyCheck + OBJCMessagePackWriterObject( genType, 1, 'return NO' ), sizeHint=OBJCJSONSizeHint( genType ) )
+
+OBJCTypeSerializationImplListTemplate = OBJCTemplate("""
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+${lazyCheck}	return $typeDictionary;
 }
 
+$dump
+
 - (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
-	id tmp;
 $complexTypeFieldsFromDictionary;
 }
 
@@ -406,6 +968,10 @@ $complexTypeFieldsFromDictionary;
 	return self;
 }
 
+$JSONDataInit
+""")
+
+OBJCTypeJSONDataInitImpl = """\
 - (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
 	if ( jsonData == nil ) return nil;
 	if (self = [super init]) {
@@ -415,67 +981,193 @@ $complexTypeFieldsFromDictionary;
 		if ( error && *error != nil ) self = nil;
 	}
 	return self;
+}"""
+
+OBJCTypeDumpImpl = """\
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}"""
+
+OBJCTypeJSONWriterImplTemplate = OBJCTemplate("""\
+- (BOOL)appendJSONToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error {
+$writerStatements
+	return YES;
 }
-""")
-	
-	return template.substitute( typeDictionary=OBJCUnwindTypeToDict( genType, 'self', 2 ), complexTypeFieldsFromDictionary=OBJCComplexTypeFieldListFromDictionary( genType,'dict' ) )
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSMutableData* data = [NSMutableData dataWithCapacity:$sizeHint];
+	if ( ![self appendJSONToData:data error:error] ) return nil;
+	return data;
+}""")
+
+@OBJCFragment
+def OBJCTypeSerializationImplList( genType, options=OBJCDefaultOptions, lazyFields=() ):
+	dump = OBJCTypeDumpImpl
+	if options.jsonWriter:
+		dump = OBJCTypeJSONWriterImplTemplate.substitute( writerStatements=OBJCLazyCheck( genType, options, 'NO' ) + OBJCJSONWriterObject( genType, 'self', 1, 'return NO' ), sizeHint=OBJCJSONSizeHint( genType ) )
+	jsonDataInit = OBJCTypeJSONDataInitImpl
+	if options.jsonReader:
+		jsonDataInit = OBJCTypeJSONReaderImplTemplate.substitute( fieldSwitch=OBJCJSONReaderFieldSwitch( genType ) )
+	jsonDataInit += OBJCTypeMessagePackImpl( genType, options, OBJCLazyCheck( genType, options, 'NO' ) )
+	return OBJCTypeSerializationImplListTemplate.substitute( lazyCheck=OBJCLazyCheck( genType, options, 'nil' ), typeDictionary=OBJCUnwindTypeToDict( genType, 'self', 2 ), dump=dump, complexTypeFieldsFromDictionary=OBJCComplexTypeFieldListFromDictionary( genType,'dict', lazyFields ), JSONDataInit=jsonDataInit )
 	
-def OBJCTypeImplementation( genType ):
-	if isinstance( genType, GenIntegralType ) or isinstance( genType, GenListType ):
-		return ''
-	template = Template("""\
-@implementation $typeName
-$initImplList
+OBJCTypeImplementationTemplate = OBJCTemplate("""\
+@implementation $typeName$lazyIvars
+$initImplList$lazyAccessors
 $serializationImplList
 @end
 """)
-	return template.substitute( typeName=genType.name, initImplList=OBJCTypeInitImplList(genType), serializationImplList=OBJCTypeSerializationImplList(genType) )
 
-def OBJCTypeImplementationForCategory( genType ):
+############################
+# Lazy fields
+############################
+
+#nested objects and lists of objects of a lazy type keep their JSON value till the property is read first;
+#only own fields are deferred, since ivars of the ancestors are not accessible
+def OBJCLazyFields( genType, options=OBJCDefaultOptions ):
+	if not ( genType.lazy or options.lazy ):
+		return ()
+	lazyFields = []
+	for field in genType.fields():
+		if field.owner is not genType:
+			continue
+		if isinstance( field.type, GenComplexType ) or ( isinstance( field.type, GenListType ) and not isinstance( field.type.itemType, GenIntegralType ) ):
+			lazyFields.append( field )
+	return tuple( lazyFields )
+
+OBJCLazyIvarsTemplate = OBJCTemplate(""" {
+$ivarList
+}""")
+OBJCLazyIvarTemplate = OBJCTemplate('\tid _${alias}JSON;')
+OBJCLazyAccessorDeclarationTemplate = OBJCTemplate("""
+- ($propType$propTypePtr)${alias}WithError:(NSError* __autoreleasing*)error;""")
+OBJCLazyAccessorsTemplate = OBJCTemplate("""\
+@synthesize $alias = _$alias;
+
+- ($propType$propTypePtr)$alias {
+	return [self ${alias}WithError:NULL];
+}
+
+- ($propType$propTypePtr)${alias}WithError:(NSError* __autoreleasing*)outError {
+	@synchronized(self) {
+		if ( _${alias}JSON != nil ) {
+			//the JSON value is kept till it is decoded, so a malformed one is reported on every access
+			NSError* __autoreleasing decodeError = nil;
+			NSError* __autoreleasing* error = &decodeError;
+			$propType$propTypePtr value = $value;
+			if ( decodeError != nil ) {
+				if ( outError ) *outError = decodeError;
+				return nil;
+			}
+			_$alias = value;
+			_${alias}JSON = nil;
+		}
+		return _$alias;
+	}
+}
+
+- (void)set$capitalizedAlias:($propType$propTypePtr)$alias {
+	@synchronized(self) {
+		_${alias}JSON = nil;
+		_$alias = $alias;
+	}
+}""")
+
+OBJCLazyCheckTemplate = OBJCTemplate("""\
+	NSError* __autoreleasing lazyError = nil;
+$accessorCalls
+	if ( lazyError != nil ) {
+		if ( error ) *error = lazyError;
+		return $failure;
+	}
+""")
+
+def OBJCLazyCheck( genType, options, failure ):
+	#serializers decode the deferred fields, the inherited ones included, and fail with the error of a malformed one
+	lazyFields = []
+	while genType is not None:
+		lazyFields = list( OBJCLazyFields( genType, options ) ) + lazyFields
+		genType = genType.baseType
+	if len( lazyFields ) == 0:
+		return ''
+	return OBJCLazyCheckTemplate.substitute( accessorCalls='\n'.join( '\t[self %sWithError:&lazyError];' % field.alias for field in lazyFields ), failure=failure )
+
+def OBJCLazyIvars( lazyFields ):
+	if len( lazyFields ) == 0:
+		return ''
+	return OBJCLazyIvarsTemplate.substitute( ivarList='\n'.join( OBJCLazyIvarTemplate.substitute( alias=field.alias ) for field in lazyFields ) )
+
+def OBJCLazyAccessors( lazyFields ):
+	accessors = []
+	for field in lazyFields:
+		accessors.append( OBJCLazyAccessorsTemplate.substitute( alias=field.alias, capitalizedAlias=capitalizeFirstLetter( field.alias ), propType=OBJCAssumeType( field.type ), propTypePtr=field.type.ptr, value=OBJCTypeFromDictionary( field.type, '_%sJSON' % field.alias, 3 ) ) )
+	if len( accessors ) == 0:
+		return ''
+	return '\n\n' + '\n\n'.join( accessors )
+
+@OBJCFragment
+def OBJCTypeImplementation( genType, options=OBJCDefaultOptions ):
 	if isinstance( genType, GenIntegralType ) or isinstance( genType, GenListType ):
 		return ''
-	template = Template("""\
+	lazyFields = OBJCLazyFields( genType, options )
+	return OBJCTypeImplementationTemplate.substitute( typeName=genType.name, lazyIvars=OBJCLazyIvars( lazyFields ), initImplList=OBJCTypeInitImplList(genType), lazyAccessors=OBJCLazyAccessors( lazyFields ), serializationImplList=OBJCTypeSerializationImplList(genType, options, tuple( field.name for field in lazyFields )) )
+
+OBJCTypeImplementationForCategoryTemplate = OBJCTemplate("""\
 @implementation $typeName
 $initImplList
 @end
 """)
-	return template.substitute( typeName=genType.name, initImplList=OBJCTypeInitImplList(genType) )
 
-def OBJCCategoryTypeImplementation( genType, category ):
+@OBJCFragment
+def OBJCTypeImplementationForCategory( genType ):
 	if isinstance( genType, GenIntegralType ) or isinstance( genType, GenListType ):
 		return ''
-	template = Template("""\
+	return OBJCTypeImplementationForCategoryTemplate.substitute( typeName=genType.name, initImplList=OBJCTypeInitImplList(genType) )
+
+OBJCCategoryTypeImplementationTemplate = OBJCTemplate("""\
 @implementation $typeName($category)
 $serializationImplList
 @end
 """)
-	return template.substitute( typeName=genType.name, category=category, serializationImplList=OBJCTypeSerializationImplList(genType) )	
+
+@OBJCFragment
+def OBJCCategoryTypeImplementation( genType, category, options=OBJCDefaultOptions ):
+	if isinstance( genType, GenIntegralType ) or isinstance( genType, GenListType ):
+		return ''
+	return OBJCCategoryTypeImplementationTemplate.substitute( typeName=genType.name, category=category, serializationImplList=OBJCTypeSerializationImplList(genType, options) )	
+
+def OBJCTypeImplementationChunks( module, implGenerator ):
+	return OBJCJoinChunks( '\n', ( implGenerator( module.typeList[genTypeName] ) for genTypeName in module.typeList.keys() ) )
 
 def OBJCTypeImplementationList( module, implGenerator ):
-	implList = []
-	for genTypeName in module.typeList.keys():
-		currentType = module.typeList[genTypeName]
-		OBJCAppendIfNotEmpty( implList, implGenerator( currentType ) )
-	return '\n'.join( implList )
+	return ''.join( OBJCTypeImplementationChunks( module, implGenerator ) )
 
-def OBJCRPCMethodImplementation( method ):
-	jsonArgsTemplate = Template('[NSJSONSerialization dataWithJSONObject:$jsonArgDict options:jsonFormatOption error:error]')
-	customArgsTemplate = Template("""\
+OBJCRPCMethodImplementationJsonArgsTemplate = OBJCTemplate('[NSJSONSerialization dataWithJSONObject:$jsonArgDict options:jsonFormatOption error:error]')
+OBJCRPCMethodImplementationCustomArgsTemplate = OBJCTemplate("""\
 	if (![self.transport respondsToSelector:@selector($customArgSectionName:)]) {
 		assert("Transport does not respond to selector $customArgSectionName:");
 	} else {
 		[self.transport performSelector:@selector($customArgSectionName:) withObject:$customArgDict];
 	}
 """)
-	restfulParamsTemplate = Template('[NSString stringWithFormat:$endpoint, $restfulParamsArgList]')
-	returnTemplate = Template('return $response;')
-
-	transportMethodTemplate = Template('[self.transport writeAll:jsonData endpoint:$endpoint error:error]')
-	transportHTTPMethodTemplate = Template('[(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:$endpoint method:$httpMethod error:error]')
-
-	template = Template("""\
+OBJCRPCMethodImplementationRestfulParamsTemplate = OBJCTemplate('[NSString stringWithFormat:$endpoint, $restfulParamsArgList]')
+OBJCRPCMethodImplementationJSONWriterTemplate = OBJCTemplate("""\
+^NSData*() {
+		NSMutableData* data = [NSMutableData dataWithCapacity:$sizeHint];
+$writerStatements
+		return data;
+	}()""")
+OBJCRPCMethodImplementationReturnTemplate = OBJCTemplate('return $response;')
+OBJCRPCMethodImplementationTransportMethodTemplate = OBJCTemplate('[self.transport writeAll:jsonData endpoint:$endpoint error:error]')
+OBJCRPCMethodImplementationTransportHTTPMethodTemplate = OBJCTemplate('[(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:$endpoint method:$httpMethod error:error]')
+OBJCRPCMethodImplementationTransportPoliciesTemplate = OBJCTemplate('[(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:$endpoint method:$httpMethod retryPolicy:$retryPolicy cachePolicy:$cachePolicy error:error]')
+OBJCRPCMethodImplementationTransportEncodingTemplate = OBJCTemplate('[(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:$endpoint method:$httpMethod retryPolicy:$retryPolicy cachePolicy:$cachePolicy bodyEncoding:$bodyEncoding error:error]')
+OBJCRetryPolicyTemplate = OBJCTemplate('[IFRetryPolicy policyWithDictionary:@{$policyDict}]')
+OBJCCachePolicyTemplate = OBJCTemplate('[IFCachePolicy policyWithDictionary:@{$policyDict}]')
+OBJCRPCMethodImplementationTemplate = OBJCTemplate("""\
 $declaration {
-	id tmp;
 $setCustomArgs
 	NSData* jsonData = $jsonData;
 	if ( !$transportMethod ) {
@@ -485,60 +1177,265 @@ $setCustomArgs
 	if ( outputData == nil ) {
 		return$emptyVal;
 	}
+$decodeOutput
+}
+""")
+OBJCRPCMethodImplementationDecodeOutputTemplate = OBJCTemplate("""\
 	id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
 	if ( error && *error != nil ) {
 		return$emptyVal;
 	}
-	$returnStr
-}
+	$returnStr""")
+OBJCRPCMethodImplementationJSONReaderOutputTemplate = OBJCTemplate("""\
+	IFJSONReader readerState;
+	IFJSONReader* reader = &readerState;
+	IFJSONReaderInit(reader, outputData);
+	$responseType response = $response;
+	if ( !IFJSONReaderFinish(reader, error) ) {
+		return$emptyVal;
+	}
+	return response;""")
+OBJCRPCMethodImplementationMessagePackOutputTemplate = OBJCTemplate("""\
+	if ( IFMessagePackIsContentType(IFTransportReadContentType(self.transport)) ) {
+		IFMessagePackReader readerState;
+		IFMessagePackReader* reader = &readerState;
+		IFMessagePackReaderInit(reader, outputData);
+		$responseType response = $response;
+		if ( !IFMessagePackReaderFinish(reader, error) ) {
+			return$emptyVal;
+		}
+		return response;
+	}
 """)
+OBJCRPCMethodImplementationMessagePackNoOutput = """\
+	if ( IFMessagePackIsContentType(IFTransportReadContentType(self.transport)) ) {
+		return;
+	}
+"""
 
+def OBJCRPCMethodImplementation( method, options=OBJCDefaultOptions ):
 	customArgsList = []
 	for customRequestTypeKey in method.customRequestTypes.keys():
 		customRequestType = method.customRequestTypes[customRequestTypeKey]
-		customArgsList.append( customArgsTemplate.substitute( customArgSectionName=makeAlias('set_' + customRequestTypeKey), customArgDict=OBJCUnwindTypeToDict( customRequestType, None, 3 ) ) )
+		customArgsList.append( OBJCRPCMethodImplementationCustomArgsTemplate.substitute( customArgSectionName=makeAlias('set_' + customRequestTypeKey), customArgDict=OBJCUnwindTypeToDict( customRequestType, None, 3 ) ) )
 	setCustomArgs = '\n'.join(customArgsList)
 
-	jsonData='nil'
-	if method.requestJsonType is not None:
-		jsonData = jsonArgsTemplate.substitute( jsonArgDict=OBJCUnwindTypeToDict( method.requestJsonType, None, level=2 ) )	
+	jsonData = OBJCRPCMethodJSONData( method, options, 2 )
+	endpoint = OBJCRPCMethodEndpoint( method )
+
+	transportMethod = OBJCRPCMethodImplementationTransportMethodTemplate.substitute(endpoint=endpoint)
+	if method.httpMethod is not None:
+		transportMethod = OBJCRPCMethodImplementationTransportHTTPMethodTemplate.substitute(endpoint=endpoint, httpMethod=OBJCHTTPEnumFromName(method.httpMethod))
+	if OBJCRPCMethodUsesHTTPTransportOptions( method ):
+		httpMethod = 'IFHTTPMETHOD_AUTO' if method.httpMethod is None else OBJCHTTPEnumFromName(method.httpMethod)
+		transportMethod = OBJCRPCMethodImplementationTransportPoliciesTemplate.substitute(endpoint=endpoint, httpMethod=httpMethod, retryPolicy=OBJCRetryPolicy( method ), cachePolicy=OBJCCachePolicy( method ))
+		if method.bodyEncoding is not None:
+			transportMethod = OBJCRPCMethodImplementationTransportEncodingTemplate.substitute(endpoint=endpoint, httpMethod=httpMethod, retryPolicy=OBJCRetryPolicy( method ), cachePolicy=OBJCCachePolicy( method ), bodyEncoding=OBJCContentEncodingMap[method.bodyEncoding])
+
+	returnStr = ''
+	emptyVal = ''
+	responseType = OBJCRPCResponseType( method )
+	if method.responseType is not None:
+		returnStr = OBJCRPCMethodImplementationReturnTemplate.substitute( response=OBJCTypeFromDictionary( method.responseType, 'output', level=2 ) )
+		emptyVal = ' ' + OBJCEmptyValForType( method.responseType )
+
+	decodeOutput = OBJCRPCMethodImplementationDecodeOutputTemplate.substitute( returnStr=returnStr, emptyVal=emptyVal )
+	if options.jsonReader and method.responseType is not None:
+		decodeOutput = OBJCRPCMethodImplementationJSONReaderOutputTemplate.substitute( responseType=responseType, response=OBJCJSONReaderValue( method.responseType, 'reader', 1 ), emptyVal=emptyVal )
+	binaryOutput = ''
+	if options.codec == 'msgpack':
+		#responses of MessagePack content type are read by the binary codec, all the others are JSON
+		binaryOutput = OBJCRPCMethodImplementationMessagePackNoOutput
+		if method.responseType is not None:
+			binaryOutput = OBJCRPCMethodImplementationMessagePackOutputTemplate.substitute( responseType=responseType, response=OBJCMessagePackReaderValue( method.responseType, 'reader', 2 ), emptyVal=emptyVal )
+	decodeOutput = binaryOutput + decodeOutput
+
+	return OBJCRPCMethodImplementationTemplate.substitute( declaration=OBJCRPCMethodDeclaration( method ), setCustomArgs=setCustomArgs, jsonData=jsonData, transportMethod=transportMethod, decodeOutput=decodeOutput, emptyVal=emptyVal )
+
+OBJCRPCMethodAsyncImplementationTemplate = OBJCTemplate("""\
+$declaration {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(${emptyArg}[self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+$buildRequest
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+$completeRequest
+	}];
+}
+""")
+OBJCRPCMethodAsyncRequestTemplate = OBJCTemplate("""\
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:$endpoint method:$httpMethod];$setPolicies""")
+OBJCRPCMethodAsyncRequestWithArgsTemplate = OBJCTemplate("""\
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:$endpoint method:$httpMethod];$setPolicies
+$requestArgs
+	if ( requestError != nil ) {
+		completion(${emptyArg}requestError);
+		return;
+	}""")
+OBJCRPCMethodAsyncParamsTemplate = OBJCTemplate('\t[request setParams:$paramsDict forSection:@"$section"];')
+OBJCRPCMethodAsyncBodyTemplate = OBJCTemplate('\trequest.body = $jsonData;')
+OBJCRPCMethodAsyncRetryPolicyTemplate = OBJCTemplate('\n\trequest.retryPolicy = $retryPolicy;')
+OBJCRPCMethodAsyncCachePolicyTemplate = OBJCTemplate('\n\trequest.cachePolicy = $cachePolicy;')
+OBJCRPCMethodAsyncBodyEncodingTemplate = OBJCTemplate('\n\trequest.bodyEncoding = $bodyEncoding;')
+OBJCRPCMethodAsyncCompleteTemplate = OBJCTemplate('\t\tcompletion(transportError);')
+OBJCRPCMethodAsyncDecodeOutputTemplate = OBJCTemplate("""\
+		if ( transportError != nil || outputData == nil ) {
+			completion($emptyVal, transportError);
+			return;
+		}
+${binaryOutput}		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion($emptyVal, decodeError);
+			return;
+		}
+		$responseType response = $response;
+		completion(response, decodeError);""")
+OBJCRPCMethodAsyncJSONReaderOutputTemplate = OBJCTemplate("""\
+		if ( transportError != nil || outputData == nil ) {
+			completion($emptyVal, transportError);
+			return;
+		}
+${binaryOutput}		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		IFJSONReader readerState;
+		IFJSONReader* reader = &readerState;
+		IFJSONReaderInit(reader, outputData);
+		$responseType response = $response;
+		if ( !IFJSONReaderFinish(reader, error) ) {
+			completion($emptyVal, decodeError);
+			return;
+		}
+		completion(response, nil);""")
+OBJCRPCMethodAsyncMessagePackOutputTemplate = OBJCTemplate("""\
+		if ( IFMessagePackIsContentType(contentType) ) {
+			NSError* __autoreleasing decodeError = nil;
+			IFMessagePackReader readerState;
+			IFMessagePackReader* reader = &readerState;
+			IFMessagePackReaderInit(reader, outputData);
+			$responseType response = $response;
+			if ( !IFMessagePackReaderFinish(reader, &decodeError) ) {
+				completion($emptyVal, decodeError);
+				return;
+			}
+			completion(response, nil);
+			return;
+		}
+""")
 
-	restfulParamsArgs = ''
+def OBJCRPCMethodEndpoint( method ):
 	endpoint = 'endpoint'
 	if method.endpoint is not None:
 		endpoint = '@"%s"' % (method.endpoint)
 		if method.restfulParamsType is not None:
 			endpointStr = '@"%s"' % (re.sub(r'\$\{(\w+)\}', '%@', method.endpoint))
 			restfulParamsArgsList = ', '.join( method.restfulParamsType.fieldNames() )
-			endpoint = restfulParamsTemplate.substitute( endpoint=endpointStr, restfulParamsArgList=restfulParamsArgsList )			
+			endpoint = OBJCRPCMethodImplementationRestfulParamsTemplate.substitute( endpoint=endpointStr, restfulParamsArgList=restfulParamsArgsList )
+	return endpoint
+
+def OBJCPolicyValue( value ):
+	if type( value ) == bool:
+		return '@YES' if value else '@NO'
+	return '@%r' % value
+
+def OBJCPolicyDict( policy ):
+	#IDL "retry" and "cache" sections go to the transport as they are, IFRetryPolicy and IFCachePolicy know the same keys
+	return ', '.join( '@"%s":%s' % ( key, OBJCPolicyValue( value ) ) for key, value in policy.items() )
+
+def OBJCRetryPolicy( method ):
+	if method.retryPolicy is None:
+		return 'nil'
+	return OBJCRetryPolicyTemplate.substitute( policyDict=OBJCPolicyDict( method.retryPolicy ) )
+
+def OBJCCachePolicy( method ):
+	if method.cachePolicy is None:
+		return 'nil'
+	return OBJCCachePolicyTemplate.substitute( policyDict=OBJCPolicyDict( method.cachePolicy ) )
+
+def OBJCRPCMethodJSONData( method, options, level ):
+	if method.requestJsonType is None:
+		return 'nil'
+	if options.jsonWriter:
+		return OBJCRPCMethodImplementationJSONWriterTemplate.substitute( sizeHint=OBJCJSONSizeHint( method.requestJsonType ), writerStatements=OBJCJSONWriterObject( method.requestJsonType, None, level, 'return nil' ) )
+	return OBJCRPCMethodImplementationJsonArgsTemplate.substitute( jsonArgDict=OBJCUnwindTypeToDict( method.requestJsonType, None, level=level ) )
+
+def OBJCRPCMethodAsyncImplementation( method, options=OBJCDefaultOptions ):
+	#the request carries all the call context, so the client and its transport can run any number of calls at once
+	emptyArg = ''
+	responseType = OBJCRPCResponseType( method )
+	if method.responseType is not None:
+		emptyArg = OBJCEmptyValForType( method.responseType ) + ', '
 
-	transportMethod = transportMethodTemplate.substitute(endpoint=endpoint)
+	endpoint = OBJCRPCMethodEndpoint( method )
+	httpMethod = 'IFHTTPMETHOD_AUTO'
 	if method.httpMethod is not None:
-		transportMethod = transportHTTPMethodTemplate.substitute(endpoint=endpoint, httpMethod=OBJCHTTPEnumFromName(method.httpMethod))
+		httpMethod = OBJCHTTPEnumFromName( method.httpMethod )
 
-	returnStr = ''
-	emptyVal = ''
+	requestArgs = [ OBJCRPCMethodAsyncParamsTemplate.substitute( paramsDict=OBJCUnwindTypeToDict( customRequestType, None, 2 ), section=section ) for section, customRequestType in method.customRequestTypes.items() ]
+	if method.requestJsonType is not None:
+		requestArgs.append( OBJCRPCMethodAsyncBodyTemplate.substitute( jsonData=OBJCRPCMethodJSONData( method, options, 2 ) ) )
+
+	setPolicies = ''
+	if method.retryPolicy is not None:
+		setPolicies += OBJCRPCMethodAsyncRetryPolicyTemplate.substitute( retryPolicy=OBJCRetryPolicy( method ) )
+	if method.cachePolicy is not None:
+		setPolicies += OBJCRPCMethodAsyncCachePolicyTemplate.substitute( cachePolicy=OBJCCachePolicy( method ) )
+	if method.bodyEncoding is not None:
+		setPolicies += OBJCRPCMethodAsyncBodyEncodingTemplate.substitute( bodyEncoding=OBJCContentEncodingMap[method.bodyEncoding] )
+
+	if len(requestArgs) > 0:
+		buildRequest = OBJCRPCMethodAsyncRequestWithArgsTemplate.substitute( endpoint=endpoint, httpMethod=httpMethod, setPolicies=setPolicies, requestArgs='\n'.join(requestArgs), emptyArg=emptyArg )
+	else:
+		buildRequest = OBJCRPCMethodAsyncRequestTemplate.substitute( endpoint=endpoint, httpMethod=httpMethod, setPolicies=setPolicies )
+
+	completeRequest = OBJCRPCMethodAsyncCompleteTemplate.substitute()
 	if method.responseType is not None:
-		returnStr = returnTemplate.substitute( response=OBJCTypeFromDictionary( method.responseType, 'output', level=2 ) )
-		emptyVal = ' ' + OBJCEmptyValForType( method.responseType )
+		emptyVal = OBJCEmptyValForType( method.responseType )
+		binaryOutput = ''
+		if options.codec == 'msgpack':
+			binaryOutput = OBJCRPCMethodAsyncMessagePackOutputTemplate.substitute( emptyVal=emptyVal, responseType=responseType, response=OBJCMessagePackReaderValue( method.responseType, 'reader', 3 ) )
+		if options.jsonReader:
+			completeRequest = OBJCRPCMethodAsyncJSONReaderOutputTemplate.substitute( emptyVal=emptyVal, responseType=responseType, response=OBJCJSONReaderValue( method.responseType, 'reader', 2 ), binaryOutput=binaryOutput )
+		else:
+			completeRequest = OBJCRPCMethodAsyncDecodeOutputTemplate.substitute( emptyVal=emptyVal, responseType=responseType, response=OBJCTypeFromDictionary( method.responseType, 'output', level=3 ), binaryOutput=binaryOutput )
 
-	return template.substitute( declaration=OBJCRPCMethodDeclaration( method ), setCustomArgs=setCustomArgs, jsonData=jsonData, transportMethod=transportMethod, returnStr=returnStr, emptyVal=emptyVal )
+	return OBJCRPCMethodAsyncImplementationTemplate.substitute( declaration=OBJCRPCMethodAsyncDeclaration( method ), emptyArg=emptyArg, buildRequest=buildRequest, completeRequest=completeRequest )
 
-def OBJCRPCImplementation( module ):
-	if len(module.methods) == 0:
-		return ''
+OBJCRPCBatchImplementationTemplate = OBJCTemplate("""\
+$declaration {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion([self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportBatch* batch = [[IFTransportBatch alloc] init];
+	builder([[[self class] alloc] initWithTransport:batch]);
+	[batch sendWithTransport:(id<IFAsyncTransport>)self.transport endpoint:@"$endpoint" completion:completion];
+}
+""")
 
-	template = Template("""\
+def OBJCRPCBatchImplementation( module, batch ):
+	#the builder makes the calls with the usual completion handler methods of a client queueing their requests
+	return OBJCRPCBatchImplementationTemplate.substitute( declaration=OBJCRPCBatchDeclaration( module, batch ), endpoint=batch.endpoint )
+
+OBJCRPCImplementationChunksTemplate = OBJCTemplate("""\
 @implementation $moduleName
 $rpcMethodImplementationsList
 @end
 """)
 
-	methodList = []
-	for method in module.methods:
-		methodList.append( OBJCRPCMethodImplementation( method ) )
+def OBJCRPCImplementationChunks( module, options=OBJCDefaultOptions ):
+	if len(module.methods) == 0:
+		return ''
+
+	methodList = OBJCJoinChunks( '\n', itertools.chain( ( OBJCRPCMethodImplementation( method, options ) + '\n' + OBJCRPCMethodAsyncImplementation( method, options ) for method in module.methods ), ( OBJCRPCBatchImplementation( module, batch ) for batch in module.batches ) ) )
+	return OBJCTemplateChunks( OBJCRPCImplementationChunksTemplate, moduleName=module.name, rpcMethodImplementationsList=methodList )
 
-	return template.substitute( moduleName=module.name, rpcMethodImplementationsList='\n'.join( methodList ) )
+def OBJCRPCImplementation( module, options=OBJCDefaultOptions ):
+	return ''.join( OBJCRPCImplementationChunks( module, options ) )
 
 OBJCImplementationPreamble = """\
 #pragma clang diagnostic push
@@ -550,95 +1447,174 @@ static const NSUInteger jsonFormatOption =
 	NSJSONWritingPrettyPrinted;
 #else
 	0;
-#endif"""
+#endif
+
+//kCFNull is the [NSNull null] singleton, so nulls are told by pointer comparison;
+//the helpers are inline, the ones a file doesn't use take no space in the binary
+static inline BOOL jsonIsNull(id value) { return value == (id)kCFNull; }
+static inline id jsonNullable(id value) { return value == nil ? (id)kCFNull : value; }
+static inline BOOL jsonBool(id value) { return jsonIsNull(value) ? NO : ((NSNumber*)value).boolValue; }
+static inline int32_t jsonInt32(id value) { return jsonIsNull(value) ? 0 : ((NSNumber*)value).intValue; }
+static inline int64_t jsonInt64(id value) { return jsonIsNull(value) ? 0L : ((NSNumber*)value).longLongValue; }
+static inline double_t jsonDouble(id value) { return jsonIsNull(value) ? 0.0 : ((NSNumber*)value).doubleValue; }
+static inline NSString* jsonString(id value) { return jsonIsNull(value) ? nil : (NSString*)value; }
+static inline NSDictionary* jsonDictionary(id value) { return jsonIsNull(value) ? nil : (NSDictionary*)value; }
+static inline NSArray* jsonArray(id value) { return jsonIsNull(value) ? nil : (NSArray*)value; }
+static inline NSArray* jsonList(id value) { return [value isKindOfClass:NSArray.class] ? (NSArray*)value : nil; }
+static inline id jsonObjectFromString(id value, NSError* __autoreleasing* error) {
+	if ( value == nil || jsonIsNull(value) ) return nil;
+	return [NSJSONSerialization JSONObjectWithData:[(NSString*)value dataUsingEncoding:NSUTF8StringEncoding] options:NSJSONReadingAllowFragments error:error];
+}"""
+
+OBJCJSONWriterPreamble = """\
+#import "IFJSONWriter.h"
+
+""" + OBJCImplementationPreamble
+
+def OBJCPreamble( options ):
+	if options.jsonWriter:
+		return OBJCJSONWriterPreamble
+	return OBJCImplementationPreamble
 
 OBJCImplementationConclusion = """\
 #pragma clang diagnostic pop
 """
 
-transportImportListTemplate = Template("""\
+transportImportListTemplate = OBJCTemplate("""\
 #import "$modHeader.h"
 #import "IFServiceClient+Protected.h" """)
 
-transportHTTPImportListTemplate = Template("""\
+transportHTTPImportListTemplate = OBJCTemplate("""\
 #import "$modHeader.h"
 #import "IFHTTPTransport.h"
 #import "IFServiceClient+Protected.h" """)
 
-def OBJCModule( module ):
-	template = Template("""\
+OBJCModuleChunksTemplate = OBJCTemplate("""\
 $generatedWarning
 
 $importList
 
 $preamble
 
-$typeImplementationList
+$listFunctions$typeImplementationList
 
 $rpcImplementation
 
 $conclusion
 """)
 
+def OBJCModuleChunks( module, options=OBJCDefaultOptions ):
 	importList = transportImportListTemplate.substitute( modHeader=module.name )
 	if isModuleDependsOnHTTPTransport( module ):
 		importList = transportHTTPImportListTemplate.substitute( modHeader=module.name )
-	return template.substitute(generatedWarning=OBJCGeneratedWarning, importList=importList, preamble=OBJCImplementationPreamble, typeImplementationList=OBJCTypeImplementationList( module, OBJCTypeImplementation ), rpcImplementation=OBJCRPCImplementation( module ), conclusion=OBJCImplementationConclusion)
+	if len( module.batches ) > 0:
+		importList += '\n#import "IFTransportBatch.h"'
+	return OBJCTemplateChunks( OBJCModuleChunksTemplate, generatedWarning=OBJCGeneratedWarning, importList=importList, preamble=OBJCPreamble( options ), listFunctions=OBJCListFunctions( module, options=options ), typeImplementationList=OBJCTypeImplementationChunks( module, lambda genType: OBJCTypeImplementation( genType, options ) ), rpcImplementation=OBJCRPCImplementationChunks( module, options ), conclusion=OBJCImplementationConclusion)
 
-def OBJCModuleForCategory( module ):
-	template = Template("""\
+def OBJCModule( module, options=OBJCDefaultOptions ):
+	return ''.join( OBJCModuleChunks( module, options ) )
+
+OBJCModuleForCategoryChunksTemplate = OBJCTemplate("""\
 $generatedWarning
 
 #import "$modHeader.h"
 
 $typeImplementationList
 """)
-	return template.substitute(generatedWarning=OBJCGeneratedWarning, modHeader=module.name, typeImplementationList=OBJCTypeImplementationList( module, OBJCTypeImplementationForCategory ))
 
-def OBJCategory( module, category ):
-	template = Template("""\
+def OBJCModuleForCategoryChunks( module ):
+	return OBJCTemplateChunks( OBJCModuleForCategoryChunksTemplate, generatedWarning=OBJCGeneratedWarning, modHeader=module.name, typeImplementationList=OBJCTypeImplementationChunks( module, OBJCTypeImplementationForCategory ))
+
+def OBJCModuleForCategory( module ):
+	return ''.join( OBJCModuleForCategoryChunks( module ) )
+
+OBJCategoryChunksTemplate = OBJCTemplate("""\
 $generatedWarning
 
 #import "$moduleName+$category.h"
 
 $preamble
 
-$typeImplementationList
+$listFunctions$typeImplementationList
 
 $conclusion
 """)
-	return template.substitute(generatedWarning=OBJCGeneratedWarning, moduleName=module.name, category=category, preamble=OBJCImplementationPreamble, typeImplementationList=OBJCTypeImplementationList( module, lambda genType: OBJCCategoryTypeImplementation( genType, category ) ), conclusion=OBJCImplementationConclusion)
+
+def OBJCategoryChunks( module, category, options=OBJCDefaultOptions ):
+	return OBJCTemplateChunks( OBJCategoryChunksTemplate, generatedWarning=OBJCGeneratedWarning, moduleName=module.name, category=category, preamble=OBJCPreamble( options ), listFunctions=OBJCListFunctions( module, withMethods=False, options=options ), typeImplementationList=OBJCTypeImplementationChunks( module, lambda genType: OBJCCategoryTypeImplementation( genType, category, options ) ), conclusion=OBJCImplementationConclusion)
+
+def OBJCategory( module, category, options=OBJCDefaultOptions ):
+	return ''.join( OBJCategoryChunks( module, category, options ) )
 
 ############################
 # Entry point
 ############################
 
-def writeObjCImplementationMonolith( genDir, module ):
-	objCIface = open( os.path.join( genDir, module.name + ".h" ), "wt" )
-	objCImpl = open( os.path.join( genDir, module.name + ".m" ), "wt" )
-
-	objCIface.write( OBJCHeader( module ) )
-	objCImpl.write( OBJCModule( module ) )
-
-def writeObjCImplementationCategory( genDir, category, module ):
-	objCIface = open( os.path.join( genDir, module.name + ".h" ), "wt" )
-	objCImpl = open( os.path.join( genDir, module.name + ".m" ), "wt" )
-	objCIfaceCategory = open( os.path.join( genDir, module.name + "+" + category + ".h" ), "wt" )
-	objCImplCategory = open( os.path.join( genDir, module.name + "+" + category + ".m" ), "wt" )
-
-	objCIface.write( OBJCHeaderForCategory( module ) )
-	objCImpl.write( OBJCModuleForCategory( module ) )
-	objCIfaceCategory.write( OBJCCategoryHeader( module, category ) )
-	objCImplCategory.write( OBJCategory( module, category ) )
-
-def writeObjCImplementation( genDir, category, module ):
+def OBJCImplementationMonolith( module, profile=None, options=OBJCDefaultOptions ):
+	files = OrderedDict()
+	files[module.name + ".h"] = profiledChunks( profile, module.sourceFile, "header", OBJCHeaderChunks( module, options ) )
+	files[module.name + ".m"] = profiledChunks( profile, module.sourceFile, "implementation", OBJCModuleChunks( module, options ) )
+	return files
+
+def OBJCImplementationCategory( category, module, profile=None, options=OBJCDefaultOptions ):
+	#deferred fields need ivars and accessors of the class itself, which a category can't add
+	if options.lazy:
+		raise Exception( 'Lazy decoding is not supported in category mode' )
+	for genType in module.typeList.values():
+		if isinstance( genType, GenComplexType ) and genType.lazy:
+			raise Exception( 'Struct %s is lazy, lazy structs are not supported in category mode' % genType.name )
+	files = OrderedDict()
+	files[module.name + ".h"] = profiledChunks( profile, module.sourceFile, "header", OBJCHeaderForCategoryChunks( module ) )
+	files[module.name + ".m"] = profiledChunks( profile, module.sourceFile, "implementation", OBJCModuleForCategoryChunks( module ) )
+	files[module.name + "+" + category + ".h"] = profiledChunks( profile, module.sourceFile, "header", OBJCCategoryHeaderChunks( module, category, options ) )
+	files[module.name + "+" + category + ".m"] = profiledChunks( profile, module.sourceFile, "implementation", OBJCategoryChunks( module, category, options ) )
+	return files
+
+def writeFileIfChanged( filePath, chunks ):
+	#chunks are written into a temporary file as soon as they are rendered, then it atomically replaces the target one
+	if isinstance( chunks, basestring ):
+		chunks = [ chunks ]
+	tempFilePath = os.path.join( os.path.dirname( filePath ), '.%s.%s.tmp' % ( os.path.basename( filePath ), uuid.uuid4().hex[:8] ) )
+	sha = hashlib.sha1()
+	try:
+		with os.fdopen( os.open( tempFilePath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666 ), "wb" ) as outFile:
+			for chunk in chunks:
+				data = chunk.encode( 'utf-8' )
+				sha.update( data )
+				outFile.write( data )
+		outputHash = sha.hexdigest()
+
+		existingSha = hashlib.sha1()
+		if os.path.exists( filePath ):
+			with open( filePath, "rb" ) as existingFile:
+				for data in iter( lambda: existingFile.read( 65536 ), b'' ):
+					existingSha.update( data )
+			if existingSha.hexdigest() == outputHash:
+				os.remove( tempFilePath )
+				return outputHash
+		os.rename( tempFilePath, filePath )
+	except:
+		if os.path.exists( tempFilePath ):
+			os.remove( tempFilePath )
+		raise
+	return outputHash
+
+def writeObjCImplementation( genDir, category, module, profile=None, options=OBJCDefaultOptions ):
 
 	if not os.path.exists( genDir ):
 	    os.makedirs( genDir )
 
 	if category is not None and len(category) > 0:
-		writeObjCImplementationCategory( genDir, category, module )
+		files = OBJCImplementationCategory( category, module, profile, options )
 	else:
-		writeObjCImplementationMonolith( genDir, module )
-
-
+		files = OBJCImplementationMonolith( module, profile, options )
+
+	countersBefore = OBJCFragments.counters()
+	outputHashes = OrderedDict()
+	with profilePhase( profile, module.sourceFile, "write" ):
+		for fileName in files.keys():
+			outputHashes[fileName] = writeFileIfChanged( os.path.join( genDir, fileName ), files[fileName] )
+	if profile is not None:
+		for counter, value in OBJCFragments.counters().items():
+			profile.count( counter, value - countersBefore[counter] )
+	return outputHashes
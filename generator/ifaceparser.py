@@ -26,16 +26,18 @@ import os
 import re
 from collections import OrderedDict
 from ifaceobj import *
+from ifaceprofile import *
 
-def typeFromJSON( decoration, argName, value, typeList, importedTypeList ):
+def typeFromJSON( decoration, argName, value, typeList, importedTypeList, context=None ):
 
-	try:
-		return GenIntegralType(value)
-	except Exception as ex:
-		pass
+	if context is None:
+		context = defaultGenContext
 
 	if type( value ) == types.UnicodeType:
-		decoratedTypeName = GenType( value ).name
+		integralType = integralTypeFromName( value )
+		if integralType is not None:
+			return integralType
+		decoratedTypeName = context.decorateName( value )
 		if decoratedTypeName in importedTypeList:
 			return importedTypeList[ decoratedTypeName ]
 		if decoratedTypeName in typeList:
@@ -43,7 +45,7 @@ def typeFromJSON( decoration, argName, value, typeList, importedTypeList ):
 		raise Exception( 'Unknown type name found: ' + value )
 	
 	if type( value ) == types.DictType or type( value ) == OrderedDict:
-		newType = GenComplexType( decoration, argName )
+		newType = GenComplexType( decoration, argName, context )
 
 		if newType.name in importedTypeList or newType.name in typeList:
 			raise Exception( 'Duplicated name in struct declaration: ' + newType.name )
@@ -52,7 +54,7 @@ def typeFromJSON( decoration, argName, value, typeList, importedTypeList ):
 
 		for k in value.keys():
 			field = value[k]
-			newType.addFieldType( k, typeFromJSON( newType.name, k, field, typeList, importedTypeList ) )
+			newType.addFieldType( k, typeFromJSON( newType.name, k, field, typeList, importedTypeList, context ) )
 		if len( newType.fieldNames() ) == 0:
 			return None
 
@@ -61,21 +63,23 @@ def typeFromJSON( decoration, argName, value, typeList, importedTypeList ):
 		return newType
 
 	if type( value ) == types.ListType:
-		newType = GenListType( decoration, argName )
+		newType = GenListType( decoration, argName, context )
 		listItem = value[0]
-		newType.itemType = typeFromJSON( newType.name, 'item', listItem, typeList, importedTypeList )
+		newType.itemType = typeFromJSON( newType.name, 'item', listItem, typeList, importedTypeList, context )
 		typeList[newType.name] = newType
 		return newType
 
 	return None
 
-def buildTypeFromStructJSON( jsonItem, typeList, importedTypeList ):
+def buildTypeFromStructJSON( jsonItem, typeList, importedTypeList, context=None ):
 	typeName = jsonItem["struct"]
-	retType = typeFromJSON( "", typeName, jsonItem["typedef"], typeList, importedTypeList )
+	retType = typeFromJSON( "", typeName, jsonItem["typedef"], typeList, importedTypeList, context )
+	if retType is not None and "lazy" in jsonItem:
+		retType.lazy = bool( jsonItem["lazy"] )
 	if retType is not None and "extends" in jsonItem:
 		parentTypeName = jsonItem["extends"]
 		if (parentTypeName is not None):
-			decoratedParentTypeName = GenType( parentTypeName ).name
+			decoratedParentTypeName = ( context if context is not None else defaultGenContext ).decorateName( parentTypeName )
 			if (decoratedParentTypeName in typeList):
 				retType.baseType = typeList[ decoratedParentTypeName ]
 			elif (decoratedParentTypeName in importedTypeList):
@@ -85,6 +89,9 @@ def buildTypeFromStructJSON( jsonItem, typeList, importedTypeList ):
 	return retType
 
 validHTTPMethodNames = set(["get", "head", "post", "put", "delete", "patch", "options", "trace"])
+validCachePolicyKeys = OrderedDict([ ("ttl", float), ("revalidate", bool) ])
+validBodyEncodings = [ "gzip", "deflate" ]
+validRetryPolicyKeys = OrderedDict([ ("attempts", int), ("delay", float), ("multiplier", float), ("max_delay", float), ("jitter", float), ("max_elapsed", float), ("idempotent_only", bool), ("retry_after", bool) ])
 
 def matchHTTPMethod( jsonItem, methodKey, match ):
 	for validMethodName in validHTTPMethodNames:
@@ -94,7 +101,53 @@ def matchHTTPMethod( jsonItem, methodKey, match ):
 			return True
 	return False
 
-def buildMethodFromJSON( jsonItem, typeList, importedTypeList, method=None ):
+def buildPolicyFromJSON( policyName, methodName, jsonItem, validKeys ):
+	policy = OrderedDict()
+	for key in validKeys.keys():
+		if key in jsonItem:
+			value = jsonItem[key]
+			if type( value ) not in ( types.IntType, types.FloatType, types.BooleanType ):
+				raise Exception( '%s policy value %s of method %s should be a number or a boolean' % ( policyName, key, methodName ) )
+			policy[key] = validKeys[key]( value )
+	for key in jsonItem.keys():
+		if key not in validKeys:
+			raise Exception( 'Unknown %s policy key %s of method %s' % ( policyName.lower(), key, methodName ) )
+	return policy
+
+def buildRetryPolicyFromJSON( methodName, jsonItem ):
+	#"retry": false turns retries off, "retry": true keeps the transport defaults
+	if type( jsonItem ) == types.BooleanType:
+		return None if jsonItem else OrderedDict([ ("attempts", 1) ])
+	if not isinstance( jsonItem, dict ):
+		raise Exception( 'Retry policy of method %s should be a boolean or a dictionary' % methodName )
+	return buildPolicyFromJSON( 'Retry', methodName, jsonItem, validRetryPolicyKeys )
+
+def buildCachePolicyFromJSON( method, jsonItem ):
+	#"cache": 60 is a TTL in seconds, "cache": true only revalidates with ETag/Last-Modified
+	if type( jsonItem ) == types.BooleanType:
+		if not jsonItem:
+			return None
+		jsonItem = {}
+	elif type( jsonItem ) in ( types.IntType, types.FloatType ):
+		jsonItem = { "ttl": jsonItem }
+	elif not isinstance( jsonItem, dict ):
+		raise Exception( 'Cache policy of method %s should be a boolean, a number or a dictionary' % method.name )
+	#the transport caches GET and HEAD responses only
+	if method.httpMethod not in ( None, "get", "head" ) or ( method.httpMethod is None and method.requestJsonType is not None ):
+		raise Exception( 'Method %s can not be cached, only GET and HEAD responses are' % method.name )
+	return buildPolicyFromJSON( 'Cache', method.name, jsonItem, validCachePolicyKeys )
+
+def buildBodyEncodingFromJSON( method, jsonItem ):
+	#"compress": true is gzip
+	if type( jsonItem ) == types.BooleanType:
+		jsonItem = validBodyEncodings[0] if jsonItem else None
+	if jsonItem is not None and jsonItem not in validBodyEncodings:
+		raise Exception( 'Method %s can be compressed with %s only' % ( method.name, ' or '.join( validBodyEncodings ) ) )
+	if jsonItem is not None and method.requestJsonType is None:
+		raise Exception( 'Method %s has no request body to compress' % method.name )
+	return jsonItem
+
+def buildMethodFromJSON( jsonItem, typeList, importedTypeList, context=None ):
 
 	endpoint = None
 	methodName = None
@@ -103,6 +156,9 @@ def buildMethodFromJSON( jsonItem, typeList, importedTypeList, method=None ):
 	customRequests = OrderedDict()
 	response = None
 	restfulParams = None
+	retry = None
+	cache = None
+	compress = None
 
 	for methodKey in jsonItem.keys():
 		if methodKey == "procedure":
@@ -113,6 +169,12 @@ def buildMethodFromJSON( jsonItem, typeList, importedTypeList, method=None ):
 			response = jsonItem["response"]
 		elif methodKey == "request":
 			request = jsonItem["request"]
+		elif methodKey == "retry":
+			retry = jsonItem["retry"]
+		elif methodKey == "cache":
+			cache = jsonItem["cache"]
+		elif methodKey == "compress":
+			compress = jsonItem["compress"]
 		elif methodKey in validHTTPMethodNames:
 			methodName = jsonItem[methodKey]
 			httpMethod = methodKey.lower()
@@ -126,25 +188,33 @@ def buildMethodFromJSON( jsonItem, typeList, importedTypeList, method=None ):
 	typeDecoration = capitalizeFirstLetter( methodName )
 
 	method.httpMethod = httpMethod
+	if retry is not None:
+		method.retryPolicy = buildRetryPolicyFromJSON( methodName, retry )
 
 	if request is not None:
 		requestTypeName = '%s_json_args' % methodName
-		method.requestJsonType = typeFromJSON( None, requestTypeName, request, typeList, importedTypeList )
+		method.requestJsonType = typeFromJSON( None, requestTypeName, request, typeList, importedTypeList, context )
 		del typeList[method.requestJsonType.name]
 
+	if cache is not None:
+		method.cachePolicy = buildCachePolicyFromJSON( method, cache )
+
+	if compress is not None:
+		method.bodyEncoding = buildBodyEncodingFromJSON( method, compress )
+
 	if endpoint is not None:
 		restfulParams = re.findall( r'\$\{(\w+)\}', endpoint )
 		if len(restfulParams) > 0:
 			restfulParamsTypeName = '%s_restful_args' % methodName
-			restfulParamsType = GenComplexType( '', restfulParamsTypeName )
+			restfulParamsType = GenComplexType( '', restfulParamsTypeName, context )
 			for parm in restfulParams:
-				restfulParamsType.addFieldType( parm, GenIntegralType('string') )
+				restfulParamsType.addFieldType( parm, integralTypeFromName('string') )
 			method.restfulParamsType = restfulParamsType
 
 	for customRequestKey in customRequests.keys():
 		customRequest = customRequests[customRequestKey]
 		customRequestTypeName = '%s_%s_args' % (methodName, customRequestKey)
-		method.customRequestTypes[customRequestKey] = typeFromJSON( None, customRequestTypeName, customRequest, typeList, importedTypeList )
+		method.customRequestTypes[customRequestKey] = typeFromJSON( None, customRequestTypeName, customRequest, typeList, importedTypeList, context )
 		del typeList[method.customRequestTypes[customRequestKey].name]	
 
 	if response is None:
@@ -152,45 +222,128 @@ def buildMethodFromJSON( jsonItem, typeList, importedTypeList, method=None ):
 	elif len( response ) == 1:
 		# flatten return type if it is only one filed in dictionary
 		if type( response ) == types.ListType:
-			method.responseType = typeFromJSON( typeDecoration, "List", response, typeList, importedTypeList )
+			method.responseType = typeFromJSON( typeDecoration, "List", response, typeList, importedTypeList, context )
 			method.responseArgName = None
 		else:
-			method.responseType = typeFromJSON( typeDecoration, response.keys()[0], response.values()[0], typeList, importedTypeList )
+			method.responseType = typeFromJSON( typeDecoration, response.keys()[0], response.values()[0], typeList, importedTypeList, context )
 			method.responseArgName = response.keys()[0]
 	else:
-		method.responseType = typeFromJSON( typeDecoration, "Info", response, typeList, importedTypeList )
+		method.responseType = typeFromJSON( typeDecoration, "Info", response, typeList, importedTypeList, context )
 		method.responseArgName = None
 	
 	return method
 
-def parseModule( jsonFile ):
-	with open( jsonFile, "rt" ) as jFile:
-		jsonObj = json.load( jFile, object_pairs_hook=OrderedDict )
+def buildBatchFromJSON( jsonItem ):
+	#calls of any method of the module queued in a batch go to its endpoint in one request
+	batchName = jsonItem["batch"]
+	for batchKey in jsonItem.keys():
+		if batchKey not in ( "batch", "endpoint" ):
+			raise Exception( 'Unknown key %s of batch %s' % ( batchKey, batchName ) )
+	if "endpoint" not in jsonItem:
+		raise Exception( 'No endpoint provided for batch %s' % batchName )
+	return GenBatch( batchName, jsonItem["endpoint"] )
+
+class GenModuleCache:
+	def __init__( self ):
+		self.modules = {}
+		self.importChain = []
+
+	def keyForFile( self, jsonFile ):
+		return os.path.normcase( os.path.abspath( jsonFile ) )
+
+	def contains( self, jsonFile, namePrefix ):
+		return ( namePrefix if namePrefix is not None else "", self.keyForFile( jsonFile ) ) in self.modules
+
+	def sourceFiles( self ):
+		return [ module.sourceFile for module in self.modules.values() ]
+
+	def invalidate( self, changedFiles ):
+		changedKeys = set( [ self.keyForFile( changedFile ) for changedFile in changedFiles ] )
+		invalidatedKeys = []
+		for cachedModuleKey in self.modules.keys():
+			for sourceFile in moduleSourceFiles( self.modules[cachedModuleKey] ):
+				if self.keyForFile( sourceFile ) in changedKeys:
+					invalidatedKeys.append( cachedModuleKey )
+					break
+		for cachedModuleKey in invalidatedKeys:
+			del self.modules[cachedModuleKey]
+		return set( [ cachedModuleKey[1] for cachedModuleKey in invalidatedKeys ] )
+
+def parseModule( jsonFile, context=None, moduleCache=None ):
+	if context is None:
+		context = defaultGenContext
+	if moduleCache is None:
+		moduleCache = GenModuleCache()
+
+	moduleKey = moduleCache.keyForFile( jsonFile )
+	#the same file parsed with another prefix is another module
+	cachedModuleKey = ( context.namePrefix, moduleKey )
+	if cachedModuleKey in moduleCache.modules:
+		return moduleCache.modules[cachedModuleKey]
+
+	if moduleKey in moduleCache.importChain:
+		cycle = moduleCache.importChain[moduleCache.importChain.index( moduleKey ):] + [moduleKey]
+		raise Exception( 'Import cycle detected: ' + ' -> '.join( cycle ) )
+
+	moduleCache.importChain.append( moduleKey )
+	try:
+		module = loadModule( jsonFile, context, moduleCache )
+	finally:
+		moduleCache.importChain.pop()
 
-		if jsonObj["iface"] is None:
-			raise Exception('Module ' + jsonFile + ' is not a valid ifacegen IDL file. "iface" section was not found.')
+	moduleCache.modules[cachedModuleKey] = module
+	return module
 
-		baseDir = os.path.dirname( jsonFile )
+def loadModule( jsonFile, context, moduleCache ):
+	with profilePhase( context.profile, jsonFile, "load" ):
+		with open( jsonFile, "rt" ) as jFile:
+			jsonObj = json.load( jFile, object_pairs_hook=OrderedDict )
 
-		inputNameParts = os.path.basename( jsonFile ).split('.')
-		module = GenModule( inputNameParts[0] )
+	if jsonObj["iface"] is None:
+		raise Exception('Module ' + jsonFile + ' is not a valid ifacegen IDL file. "iface" section was not found.')
 
+	baseDir = os.path.dirname( jsonFile )
+
+	inputNameParts = os.path.basename( jsonFile ).split('.')
+	module = GenModule( inputNameParts[0], context )
+	module.sourceFile = os.path.abspath( jsonFile )
+
+	with profilePhase( context.profile, jsonFile, "types" ):
 		for jsonItem in jsonObj["iface"]:
 			if "struct" in jsonItem:
-				buildTypeFromStructJSON( jsonItem, module.typeList, module.importedTypeList )
+				buildTypeFromStructJSON( jsonItem, module.typeList, module.importedTypeList, context )
 			elif "procedure" in jsonItem:
-				module.methods.append( buildMethodFromJSON( jsonItem, module.typeList, module.importedTypeList ) )
+				module.methods.append( buildMethodFromJSON( jsonItem, module.typeList, module.importedTypeList, context ) )
+			elif "batch" in jsonItem:
+				module.batches.append( buildBatchFromJSON( jsonItem ) )
 			elif "import" in jsonItem:
-				importModule( os.path.join( baseDir, jsonItem["import"]), fromModule=module )
+				with profilePhase( context.profile, jsonFile, "imports" ):
+					importModule( os.path.join( baseDir, jsonItem["import"]), fromModule=module, context=context, moduleCache=moduleCache )
 
 			for validMethodName in validHTTPMethodNames:
 				if validMethodName in jsonItem:
-					module.methods.append( buildMethodFromJSON( jsonItem, module.typeList, module.importedTypeList ) )
+					module.methods.append( buildMethodFromJSON( jsonItem, module.typeList, module.importedTypeList, context ) )
+
+		if len( module.batches ) > 0 and len( module.methods ) == 0:
+			raise Exception( 'Module %s declares a batch but no methods to batch' % module.name )
+
+		resolveModuleFields( module )
 
 	return module
 
-def importModule( jsonFile, fromModule ):
-	importedModule = parseModule( jsonFile )
+def resolveModuleFields( module ):
+	genTypes = list( module.typeList.values() )
+	for method in module.methods:
+		genTypes.extend( [ method.requestJsonType, method.restfulParamsType, method.responseType ] )
+		genTypes.extend( method.customRequestTypes.values() )
+	for genType in genTypes:
+		if isinstance( genType, GenComplexType ):
+			genType.resolveFields()
+
+def importModule( jsonFile, fromModule, context=None, moduleCache=None ):
+	importedModule = parseModule( jsonFile, context, moduleCache )
+	if importedModule is not None and importedModule not in fromModule.importedModules:
+		fromModule.importedModules.append( importedModule )
 	if ( importedModule is None ) or ( importedModule.name in fromModule.importedModuleNames ) or ( importedModule.name == fromModule.name ):
 		return
 	for typeName in importedModule.importedTypeList.keys():
@@ -204,3 +357,14 @@ def importModule( jsonFile, fromModule ):
 		else:
 			fromModule.importedTypeList[typeName] = importedModule.typeList[typeName]
 	fromModule.importedModuleNames.append( importedModule.name )
+
+def moduleSourceFiles( module ):
+	sourceFiles = []
+	modulesToVisit = [module]
+	while len( modulesToVisit ) > 0:
+		currentModule = modulesToVisit.pop(0)
+		if currentModule.sourceFile in sourceFiles:
+			continue
+		sourceFiles.append( currentModule.sourceFile )
+		modulesToVisit.extend( currentModule.importedModules )
+	return sourceFiles
@@ -0,0 +1,173 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import sys
+import time
+from collections import OrderedDict
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+profilePhases = [ "load", "types", "imports", "header", "implementation", "write" ]
+
+def peakMemoryKB():
+	if resource is None:
+		return None
+	peak = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+	#ru_maxrss is in bytes on OS X and in kilobytes on Linux
+	if sys.platform == 'darwin':
+		peak = peak / 1024
+	return peak
+
+class GenProfilePhase:
+	def __init__( self, profile, moduleFile, phase ):
+		self.profile = profile
+		self.moduleName = os.path.relpath( moduleFile )
+		self.phase = phase
+
+	def __enter__( self ):
+		self.profile.begin( self.moduleName, self.phase )
+		return self
+
+	def __exit__( self, excType, excValue, traceback ):
+		self.profile.end()
+		return False
+
+class GenNullProfilePhase:
+	def __enter__( self ):
+		return self
+
+	def __exit__( self, excType, excValue, traceback ):
+		return False
+
+nullProfilePhase = GenNullProfilePhase()
+
+def profilePhase( profile, moduleFile, phase ):
+	if profile is None:
+		return nullProfilePhase
+	return GenProfilePhase( profile, moduleFile, phase )
+
+def profiledChunks( profile, moduleFile, phase, chunks ):
+	if profile is None:
+		return chunks
+	return GenProfiledChunks( profile, moduleFile, phase, chunks )
+
+class GenProfiledChunks:
+	def __init__( self, profile, moduleFile, phase, chunks ):
+		self.profile = profile
+		self.moduleFile = moduleFile
+		self.phase = phase
+		self.chunks = iter( chunks )
+
+	def __iter__( self ):
+		while True:
+			with profilePhase( self.profile, self.moduleFile, self.phase ):
+				try:
+					chunk = next( self.chunks )
+				except StopIteration:
+					return
+			yield chunk
+
+class GenProfile:
+	def __init__( self ):
+		self.times = OrderedDict()
+		#ru_maxrss is the peak of the whole process and never goes down, so a module gets the growth
+		#of the peak during its phases: how much memory the module took above what the earlier ones did
+		self.peakGrowth = OrderedDict()
+		self.lastPeak = peakMemoryKB()
+		self.counters = OrderedDict()
+		#phases are nested when a module imports another one, time of the inner phase is not counted in the outer one
+		self.phaseStack = []
+
+	def add( self, moduleName, phase, seconds ):
+		if not moduleName in self.times:
+			self.times[moduleName] = OrderedDict( [ ( phaseName, 0.0 ) for phaseName in profilePhases ] )
+		self.times[moduleName][phase] += seconds
+
+	def addPeakGrowth( self, moduleName ):
+		peak = peakMemoryKB()
+		if peak is None:
+			return
+		self.peakGrowth[moduleName] = self.peakGrowth.get( moduleName, 0 ) + peak - self.lastPeak
+		self.lastPeak = peak
+
+	def count( self, counter, value ):
+		self.counters[counter] = self.counters.get( counter, 0 ) + value
+
+	def begin( self, moduleName, phase ):
+		now = time.time()
+		if len( self.phaseStack ) > 0:
+			outerPhase = self.phaseStack[-1]
+			self.add( outerPhase[0], outerPhase[1], now - outerPhase[2] )
+			self.addPeakGrowth( outerPhase[0] )
+		else:
+			#the peak reached between phases is nobody's
+			self.lastPeak = peakMemoryKB()
+		self.phaseStack.append( [ moduleName, phase, now ] )
+
+	def end( self ):
+		now = time.time()
+		moduleName, phase, startTime = self.phaseStack.pop()
+		self.add( moduleName, phase, now - startTime )
+		self.addPeakGrowth( moduleName )
+		if len( self.phaseStack ) > 0:
+			self.phaseStack[-1][2] = now
+
+	def merge( self, other ):
+		for moduleName in other.times.keys():
+			for phase in other.times[moduleName].keys():
+				self.add( moduleName, phase, other.times[moduleName][phase] )
+		for moduleName in other.peakGrowth.keys():
+			self.peakGrowth[moduleName] = self.peakGrowth.get( moduleName, 0 ) + other.peakGrowth[moduleName]
+		for counter in other.counters.keys():
+			self.count( counter, other.counters[counter] )
+
+	def report( self ):
+		header = [ "module" ] + profilePhases + [ "total", "peak RSS growth, MB" ]
+		rows = []
+		totals = OrderedDict( [ ( phase, 0.0 ) for phase in profilePhases ] )
+		for moduleName in self.times.keys():
+			phaseTimes = self.times[moduleName]
+			row = [ moduleName ]
+			for phase in profilePhases:
+				row.append( '%.1f' % ( phaseTimes[phase] * 1000 ) )
+				totals[phase] += phaseTimes[phase]
+			row.append( '%.1f' % ( sum( phaseTimes.values() ) * 1000 ) )
+			row.append( '%.1f' % ( self.peakGrowth[moduleName] / 1024.0 ) if moduleName in self.peakGrowth else '-' )
+			rows.append( row )
+		totalRow = [ "total" ] + [ '%.1f' % ( totals[phase] * 1000 ) for phase in profilePhases ] + [ '%.1f' % ( sum( totals.values() ) * 1000 ) ]
+		totalRow.append( '%.1f' % ( sum( self.peakGrowth.values() ) / 1024.0 ) if len( self.peakGrowth ) > 0 else '-' )
+		rows.append( totalRow )
+
+		widths = [ max( [ len( row[column] ) for row in [ header ] + rows ] ) for column in range( len( header ) ) ]
+		lines = [ 'Generation profile, ms:' ]
+		for row in [ header ] + rows:
+			cells = [ row[0].ljust( widths[0] ) ] + [ row[column].rjust( widths[column] ) for column in range( 1, len( row ) ) ]
+			lines.append( '  '.join( cells ) )
+		peakMemory = peakMemoryKB()
+		if peakMemory is not None:
+			#with JOBS the modules are generated in other processes, their peaks are not in this one
+			lines.append( 'process peak RSS, MB: %.1f' % ( peakMemory / 1024.0 ) )
+		for counter in self.counters.keys():
+			lines.append( '%s: %d' % ( counter, self.counters[counter] ) )
+		return '\n'.join( lines )
@@ -0,0 +1,478 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from ifaceobj import *
+from ifacemsgpack import messagePackAppendMapHeader, messagePackAppendString
+from string import Template
+import re
+
+#Python decoders generated from the same GenModule as the Objective-C ones: fromJSONReader mirrors
+#initWithJSONReader: on top of ifacejsonreader.py, fromDictionary mirrors readDictionary:withError:;
+#with the msgpack codec fromMessagePackReader and appendMessagePack mirror the IFMessagePack.h based methods
+
+PYModuleTemplate = Template("""\
+# @generated
+#
+# AUTOGENERATED. DO NOT EDIT!
+#
+
+from ifacejsonreader import *
+${codecImports}from collections import OrderedDict
+import json
+$codecHelpers
+def readList( reader, readItem ):
+	if not reader.beginArray():
+		return None
+	items = []
+	while reader.nextItem():
+		item = readItem( reader )
+		if item is not None:
+			items.append( item )
+	return items
+
+def listFromDictionary( value, itemFromDictionary ):
+	if not isinstance( value, list ):
+		return None
+	#NSMutableArray can't hold nil, null items are dropped as the JSON reader does
+	items = [ itemFromDictionary( item ) for item in value ]
+	return [ item for item in items if item is not None ]
+
+def jsonObject( value ):
+	if isinstance( value, list ):
+		return [ jsonObject( item ) for item in value ]
+	if hasattr( value, 'toJSONObject' ):
+		return value.toJSONObject()
+	return value
+
+class TransportRequest( object ):
+	def __init__( self, endpoint, method ):
+		self.endpoint = endpoint
+		self.method = method
+		self.body = None
+		self.params = OrderedDict()
+		self.retryPolicy = None
+		self.cachePolicy = None
+		self.bodyEncoding = None
+
+	def setParams( self, section, params ):
+		self.params[section] = params
+
+class TransportBatch( object ):
+	#mirrors IFTransportBatch: queues the requests of a client made on it, then envelope() is the body
+	#of the batch request and dispatch() hands the results of the batch response to the queued completions
+	def __init__( self ):
+		self.calls = []
+
+	def sendRequest( self, request, completion ):
+		#the envelope is JSON, requests with compressed or non-JSON body fail right away
+		if request.bodyEncoding is not None:
+			completion( None, 'Call to "%s" has compressed body and cannot be batched' % request.endpoint )
+			return
+		method = request.method
+		if method == 'AUTO':
+			method = 'GET' if request.body is None else 'POST'
+		call = OrderedDict( [ ( 'method', method ), ( 'endpoint', request.endpoint ) ] )
+		if len( request.params ) > 0:
+			call['params'] = request.params
+		if request.body is not None:
+			try:
+				call['body'] = json.loads( request.body, object_pairs_hook=OrderedDict )
+			except ValueError:
+				completion( None, 'Call to "%s" has non-JSON body and cannot be batched' % request.endpoint )
+				return
+		self.calls.append( ( request, completion, call ) )
+
+	def takeQueuedCalls( self ):
+		batch = TransportBatch()
+		batch.calls = self.calls
+		self.calls = []
+		return batch
+
+	def envelope( self ):
+		calls = []
+		for index, ( request, completion, call ) in enumerate( self.calls ):
+			calls.append( OrderedDict( [ ( 'id', index ) ] + call.items() ) )
+		return json.dumps( OrderedDict( [ ( 'calls', calls ) ] ), separators=( ',', ':' ) )
+
+	def dispatch( self, data, error ):
+		calls = self.calls
+		self.calls = []
+		results = {}
+		if error is None:
+			try:
+				results = dict( ( result['id'], result ) for result in json.loads( data )['results'] )
+			except ( TypeError, ValueError, KeyError ) as ex:
+				error = 'Batch response is not valid: %s' % ex
+		for index, ( request, completion, call ) in enumerate( calls ):
+			result = results.get( index )
+			if error is not None:
+				completion( None, error )
+			elif result is None:
+				completion( None, 'No result for batch call %d' % index )
+			elif not 200 <= result.get( 'status', 200 ) < 300:
+				completion( None, result.get( 'error', 'Batch call %d failed with status %d' % ( index, result['status'] ) ) )
+			elif 'body' not in result:
+				completion( None, None )
+			else:
+				completion( json.dumps( result['body'], separators=( ',', ':' ) ), None )
+		return error
+
+$typeList
+$clientList
+""")
+
+PYModuleMessagePackHelpers = """
+def readMessagePackList( reader, readItem ):
+	count = reader.beginArray()
+	if count is None:
+		return None
+	items = []
+	while count > 0 and not reader.failed():
+		count -= 1
+		item = readItem( reader )
+		if item is not None:
+			items.append( item )
+	return items
+
+def appendMessagePackList( data, items, appendItem ):
+	if items is None:
+		messagePackAppendNil( data )
+		return
+	messagePackAppendArrayHeader( data, len( items ) )
+	for item in items:
+		appendItem( data, item )
+
+def appendMessagePackComplex( data, value ):
+	if value is None:
+		messagePackAppendNil( data )
+	else:
+		value.appendMessagePack( data )
+"""
+
+PYTypeTemplate = Template("""\
+class $typeName( object ):
+	def __init__( self ):
+$fieldInitList
+
+	@classmethod
+	def fromJSONReader( cls, reader ):
+		if not reader.beginObject():
+			return None
+		obj = cls()
+		obj.readJSONReader( reader )
+		if reader.failed():
+			return None
+		return obj
+
+	def readJSONReader( self, reader ):
+		while True:
+			key = reader.nextKey()
+			if key is None:
+				return
+			length = len( key )
+$fieldSwitch
+			reader.skipValue()
+
+	@classmethod
+	def fromDictionary( cls, value ):
+		if value is None:
+			return None
+		obj = cls()
+$fieldsFromDictionary
+		return obj
+
+	def toJSONObject( self ):
+		return OrderedDict( [
+$fieldsToJSONObject
+		] )
+""")
+
+#clients mirror the completion handler methods of the Objective-C ones: a transport gets
+#sendRequest( request, completion ) and calls completion( data, error ) whenever the response comes
+PYClientTemplate = Template("""\
+class $clientName( object ):
+	def __init__( self, transport ):
+		self.transport = transport
+$methodList
+""")
+
+PYClientMethodTemplate = Template("""
+	def $methodName( self, ${argList}completion ):
+		request = TransportRequest( $endpoint, $httpMethod )
+$requestArgs		def complete( data, error ):
+$completeRequest
+		self.transport.sendRequest( request, complete )
+""")
+
+PYClientBatchTemplate = Template("""
+	def $batchName( self, builder, completion ):
+		queue = TransportBatch()
+		builder( self.__class__( queue ) )
+		#calls queued while the envelope is in flight stay queued for the next one
+		batch = queue.takeQueuedCalls()
+		if len( batch.calls ) == 0:
+			completion( None )
+			return
+		request = TransportRequest( $endpoint, 'POST' )
+		request.body = batch.envelope()
+		self.transport.sendRequest( request, lambda data, error: completion( batch.dispatch( data, error ) ) )
+""")
+
+PYClientDecodeTemplate = Template("""\
+			if error is not None or data is None:
+				completion( None, error )
+				return
+			reader = JSONReader( data )
+			response = $response
+			if not reader.finish():
+				completion( None, reader.error() )
+				return
+			completion( response, None )""")
+
+PYFieldCaseTemplate = Template("""\
+			${condition} length == $length:""")
+PYFieldReadTemplate = Template("""\
+				if key == $literal:
+					self.$alias = $value
+					continue""")
+
+PYIntegralDefaultMap = { "bool": "False", "int32": "0", "int64": "0", "double": "0.0" }
+PYJSONReaderIntegralMap = { "bool": "readBool", "int32": "readInt32", "int64": "readInt64", "double": "readDouble", "string": "readString", "raw": "readObject", "rawstr": "readObjectString" }
+PYDictionaryIntegralMap = { "bool": "foundationBoolValue( %s )", "int32": "foundationInt32Value( %s )", "int64": "foundationInt64Value( %s )", "double": "foundationDoubleValue( %s )", "string": "%s", "raw": "%s", "rawstr": "foundationObjectFromString( %s )" }
+
+def PYBytesLiteral( text ):
+	return 'b' + repr( str( text.encode( 'utf-8' ) ) )
+
+def PYFieldDefault( genType ):
+	if isinstance( genType, GenIntegralType ) and genType.sType in PYIntegralDefaultMap:
+		return PYIntegralDefaultMap[genType.sType]
+	return 'None'
+
+def PYJSONReaderValue( genType, reader ):
+	if isinstance( genType, GenIntegralType ):
+		return '%s.%s()' % ( reader, PYJSONReaderIntegralMap[genType.sType] )
+	if isinstance( genType, GenComplexType ):
+		return '%s.fromJSONReader( %s )' % ( genType.name, reader )
+	if isinstance( genType.itemType, GenIntegralType ):
+		return '%s.readObject()' % reader
+	return 'readList( %s, lambda reader: %s )' % ( reader, PYJSONReaderValue( genType.itemType, 'reader' ) )
+
+def PYDictionaryValue( genType, value ):
+	if isinstance( genType, GenIntegralType ):
+		return PYDictionaryIntegralMap[genType.sType] % value
+	if isinstance( genType, GenComplexType ):
+		return '%s.fromDictionary( %s )' % ( genType.name, value )
+	if isinstance( genType.itemType, GenIntegralType ):
+		return value
+	return 'listFromDictionary( %s, lambda item: %s )' % ( value, PYDictionaryValue( genType.itemType, 'item' ) )
+
+def PYUniqueFields( genType ):
+	#a redeclared field is read once, as the ancestor declares it
+	fields = OrderedDict()
+	for field in genType.allFields():
+		fields.setdefault( field.name, field )
+	return fields.values()
+
+def PYFieldSwitch( genType, readerValue ):
+	fieldsByLength = OrderedDict()
+	for field in PYUniqueFields( genType ):
+		fieldsByLength.setdefault( len( field.name.encode( 'utf-8' ) ), [] ).append( field )
+	cases = []
+	for length in fieldsByLength.keys():
+		cases.append( PYFieldCaseTemplate.substitute( condition='if' if len( cases ) == 0 else 'elif', length=length ) )
+		for field in fieldsByLength[length]:
+			cases.append( PYFieldReadTemplate.substitute( literal=PYBytesLiteral( field.name ), alias=field.alias, value=readerValue( field.type, 'reader' ) ) )
+	return '\n'.join( cases )
+
+############################
+# MessagePack codec
+############################
+
+PYTypeMessagePackTemplate = Template("""
+	@classmethod
+	def fromMessagePackReader( cls, reader ):
+		count = reader.beginMap()
+		if count is None:
+			return None
+		obj = cls()
+		obj.readMessagePackReader( reader, count )
+		if reader.failed():
+			return None
+		return obj
+
+	def readMessagePackReader( self, reader, count ):
+		while count > 0:
+			count -= 1
+			key = reader.nextKey()
+			if key is None:
+				return
+			length = len( key )
+$fieldSwitch
+			reader.skipValue()
+
+	def appendMessagePack( self, data ):
+$writerStatements
+""")
+
+PYMessagePackWriterIntegralMap = { "bool": "messagePackAppendBool", "int32": "messagePackAppendInt32", "int64": "messagePackAppendInt64", "double": "messagePackAppendDouble", "string": "messagePackAppendString", "raw": "messagePackAppendObject", "rawstr": "messagePackAppendObjectString" }
+
+def PYMessagePackReaderValue( genType, reader ):
+	#MessagePackReader has the same typed reads as JSONReader
+	if isinstance( genType, GenIntegralType ):
+		return '%s.%s()' % ( reader, PYJSONReaderIntegralMap[genType.sType] )
+	if isinstance( genType, GenComplexType ):
+		return '%s.fromMessagePackReader( %s )' % ( genType.name, reader )
+	if isinstance( genType.itemType, GenIntegralType ):
+		return '%s.readObject()' % reader
+	return 'readMessagePackList( %s, lambda reader: %s )' % ( reader, PYMessagePackReaderValue( genType.itemType, 'reader' ) )
+
+def PYMessagePackWriterValue( genType, value ):
+	if isinstance( genType, GenIntegralType ):
+		return '%s( data, %s )' % ( PYMessagePackWriterIntegralMap[genType.sType], value )
+	if isinstance( genType, GenComplexType ):
+		return 'appendMessagePackComplex( data, %s )' % value
+	if isinstance( genType.itemType, GenIntegralType ):
+		return 'messagePackAppendObject( data, %s )' % value
+	return 'appendMessagePackList( data, %s, lambda data, item: %s )' % ( value, PYMessagePackWriterValue( genType.itemType, 'item' ) )
+
+def PYMessagePackWriterObject( genType ):
+	#the same bytes the Objective-C writer makes: the map header goes along with the first key
+	fields = PYUniqueFields( genType )
+	header = bytearray()
+	messagePackAppendMapHeader( header, len( fields ) )
+	statements = []
+	for field in fields:
+		messagePackAppendString( header, field.name )
+		statements.append( '\t\tdata += %s' % repr( str( header ) ) )
+		statements.append( '\t\t' + PYMessagePackWriterValue( field.type, 'self.' + field.alias ) )
+		header = bytearray()
+	if len( fields ) == 0:
+		statements.append( '\t\tdata += %s' % repr( str( header ) ) )
+	return '\n'.join( statements )
+
+def PYType( genType, codec ):
+	fields = PYUniqueFields( genType )
+	fieldInitList = [ '\t\tself.%s = %s' % ( field.alias, PYFieldDefault( field.type ) ) for field in fields ]
+	fieldsFromDictionary = [ '\t\tobj.%s = %s' % ( field.alias, PYDictionaryValue( field.type, 'value.get( %s )' % repr( field.name ) ) ) for field in fields ]
+	fieldsToJSONObject = [ '\t\t\t( %s, jsonObject( self.%s ) ),' % ( repr( field.name ), field.alias ) for field in fields ]
+	if len( fields ) == 0:
+		fieldInitList.append( '\t\tpass' )
+	typeCode = PYTypeTemplate.substitute( typeName=genType.name, fieldInitList='\n'.join( fieldInitList ), fieldSwitch=PYFieldSwitch( genType, PYJSONReaderValue ), fieldsFromDictionary='\n'.join( fieldsFromDictionary ), fieldsToJSONObject='\n'.join( fieldsToJSONObject ) )
+	if codec == 'msgpack':
+		typeCode += PYTypeMessagePackTemplate.substitute( fieldSwitch=PYFieldSwitch( genType, PYMessagePackReaderValue ), writerStatements=PYMessagePackWriterObject( genType ) )
+	return typeCode
+
+def PYCollectTypes( genType, types ):
+	while isinstance( genType, GenListType ):
+		genType = genType.itemType
+	if not isinstance( genType, GenComplexType ) or genType.name in types:
+		return
+	types[genType.name] = genType
+	for field in genType.allFields():
+		PYCollectTypes( field.type, types )
+
+def PYMethodArgTypes( method ):
+	argTypes = []
+	if method.restfulParamsType is not None:
+		argTypes.append( method.restfulParamsType )
+	argTypes.extend( method.customRequestTypes.values() )
+	if method.requestJsonType is not None:
+		argTypes.append( method.requestJsonType )
+	return argTypes
+
+def PYMethodArgs( method ):
+	#the same arguments, in the same order, the Objective-C method takes
+	return [ field for argType in PYMethodArgTypes( method ) for field in argType.allFields() ]
+
+def PYModuleTypes( modules ):
+	types = OrderedDict()
+	for module in modules:
+		genTypes = list( module.importedTypeList.values() ) + list( module.typeList.values() )
+		#anonymous response types are not listed in the module, but their fixtures are checked as well
+		genTypes.extend( [ method.responseType for method in module.methods if method.responseType is not None ] )
+		genTypes.extend( [ field.type for method in module.methods for field in PYMethodArgs( method ) ] )
+		for genType in genTypes:
+			PYCollectTypes( genType, types )
+	return types.values()
+
+def PYParamsDict( genType ):
+	return 'OrderedDict( [ %s ] )' % ', '.join( '( %s, jsonObject( %s ) )' % ( repr( field.name ), field.alias ) for field in genType.allFields() )
+
+def PYPolicy( policy ):
+	return 'OrderedDict( [ %s ] )' % ', '.join( '( %s, %r )' % ( repr( str( key ) ), value ) for key, value in policy.items() )
+
+def PYClientMethod( method ):
+	argList = [ field.alias + ', ' for field in PYMethodArgs( method ) ]
+	endpoint = 'endpoint'
+	if method.endpoint is None:
+		argList.insert( 0, 'endpoint, ' )
+	elif method.restfulParamsType is not None:
+		endpoint = '%s %% ( %s, )' % ( repr( str( re.sub( r'\$\{(\w+)\}', '%s', method.endpoint ) ) ), ', '.join( method.restfulParamsType.fieldNames() ) )
+	else:
+		endpoint = repr( str( method.endpoint ) )
+	httpMethod = repr( 'AUTO' if method.httpMethod is None else str( method.httpMethod.upper() ) )
+
+	requestArgs = []
+	if method.retryPolicy is not None:
+		requestArgs.append( '\t\trequest.retryPolicy = %s\n' % PYPolicy( method.retryPolicy ) )
+	if method.cachePolicy is not None:
+		requestArgs.append( '\t\trequest.cachePolicy = %s\n' % PYPolicy( method.cachePolicy ) )
+	if method.bodyEncoding is not None:
+		requestArgs.append( '\t\trequest.bodyEncoding = %s\n' % repr( str( method.bodyEncoding ) ) )
+	requestArgs += [ '\t\trequest.setParams( %s, %s )\n' % ( repr( str( section ) ), PYParamsDict( customRequestType ) ) for section, customRequestType in method.customRequestTypes.items() ]
+	if method.requestJsonType is not None:
+		requestArgs.append( "\t\trequest.body = json.dumps( %s, separators=( ',', ':' ) )\n" % PYParamsDict( method.requestJsonType ) )
+
+	completeRequest = '\t\t\tcompletion( error )'
+	if method.responseType is not None:
+		completeRequest = PYClientDecodeTemplate.substitute( response=PYJSONReaderValue( method.responseType, 'reader' ) )
+
+	return PYClientMethodTemplate.substitute( methodName=method.name, argList=''.join( argList ), endpoint=endpoint, httpMethod=httpMethod, requestArgs=''.join( requestArgs ), completeRequest=completeRequest )
+
+def PYClient( module ):
+	if len( module.methods ) == 0:
+		return ''
+	methodList = [ PYClientMethod( method ) for method in module.methods ]
+	methodList += [ PYClientBatchTemplate.substitute( batchName=batch.name, endpoint=repr( str( batch.endpoint ) ) ) for batch in module.batches ]
+	return PYClientTemplate.substitute( clientName=module.name, methodList=''.join( methodList ) )
+
+def PYModule( modules, codec=None ):
+	codecImports = 'from ifacemsgpack import *\n' if codec == 'msgpack' else ''
+	codecHelpers = PYModuleMessagePackHelpers if codec == 'msgpack' else ''
+	return PYModuleTemplate.substitute( codecImports=codecImports, codecHelpers=codecHelpers, typeList='\n'.join( PYType( genType, codec ) for genType in PYModuleTypes( modules ) ), clientList='\n'.join( PYClient( module ) for module in modules ) )
+
+def PYDecodedType( typeName, modules ):
+	#"Name" or "[Name]", "[[Name]]" etc. for lists of a type, or a method name for its response type
+	itemTypeName = typeName.strip( '[]' )
+	genType = None
+	for module in modules:
+		for method in module.methods:
+			if method.name == itemTypeName and method.responseType is not None:
+				genType = method.responseType
+		for typeList in ( module.typeList, module.importedTypeList ):
+			if itemTypeName in typeList:
+				genType = typeList[itemTypeName]
+	if genType is None:
+		return None
+	for i in range( typeName.count( '[' ) ):
+		listType = GenListType( '', genType.name + 'List' )
+		listType.itemType = genType
+		genType = listType
+	return genType
@@ -0,0 +1,48 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import sys
+
+#the generator modules import each other by their plain names, as ifacegen.py runs them
+generatorDir = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if generatorDir not in sys.path:
+	sys.path.insert( 0, generatorDir )
+
+repoDir = os.path.dirname( generatorDir )
+testIDLDir = os.path.join( repoDir, 'ifacegen.test', 'ifacegen.test.test' )
+exampleIDLDir = os.path.join( repoDir, 'ifacegen.example', 'rpc' )
+goldenDir = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), 'golden' )
+
+def pytest_addoption( parser ):
+	parser.addoption( '--update-golden', action='store_true', default=False, help='Rewrite the golden files with the generated output instead of comparing' )
+
+def checkGolden( config, name, text ):
+	#generated text has to be the checked in one byte for byte, --update-golden writes it after a deliberate change
+	path = os.path.join( goldenDir, name )
+	if config.getoption( '--update-golden' ):
+		if not os.path.exists( os.path.dirname( path ) ):
+			os.makedirs( os.path.dirname( path ) )
+		with open( path, 'wb' ) as outFile:
+			outFile.write( text.encode( 'utf-8' ) if isinstance( text, unicode ) else text )
+		return
+	with open( path, 'rb' ) as inFile:
+		expected = inFile.read().decode( 'utf-8' )
+	assert text == expected, '%s differs from the generated output, run pytest with --update-golden if the change is intended' % name
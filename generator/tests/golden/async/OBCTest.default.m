@@ -0,0 +1,170 @@
+- (void)simpleCallWithCompletion:(void (^)(int32_t response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(0, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:@"all" method:IFHTTPMETHOD_AUTO];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(0, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(0, decodeError);
+			return;
+		}
+		int32_t response = jsonInt32(output);
+		completion(response, decodeError);
+	}];
+}
+
+- (void)getEmployeesWithToken:(NSString*)token
+	andTimestamp:(int64_t)timestamp
+	andComplexParam:(OBCGetEmployeesCustomParamsArgsComplexParam*)complexParam
+	andSimpleParam:(int32_t)simpleParam
+	andEmployerId:(int64_t)employerId
+	andFilter:(NSArray*)filter
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:@"employees" method:IFHTTPMETHOD_AUTO];
+	[request setParams:@{
+		@"token":jsonNullable(token),
+		@"timestamp":@(timestamp)
+	} forSection:@"url_params"];
+	[request setParams:@{
+		@"complex_param":[complexParam dictionaryWithError:error],
+		@"simple_param":@(simpleParam)
+	} forSection:@"custom_params"];
+	request.body = [NSJSONSerialization dataWithJSONObject:@{
+		@"employer_id":@(employerId),
+		@"filter":OBCGetEmployeesJsonArgsFilterItemListToJSON(filter, error)
+	} options:jsonFormatOption error:error];
+	if ( requestError != nil ) {
+		completion(nil, requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		NSArray* response = OBCEmployeeListFromJSON(output, error);
+		completion(response, decodeError);
+	}];
+}
+
+- (void)procedureCallWithEndpoint:(NSString*)endpoint
+	andCompletion:(void (^)(NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion([self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:endpoint method:IFHTTPMETHOD_HEAD];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		completion(transportError);
+	}];
+}
+
+- (void)methodForGetWithEndpoint:(NSString*)endpoint
+	andToken:(NSString*)token
+	andCompletion:(void (^)(int64_t response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(0, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:endpoint method:IFHTTPMETHOD_GET];
+	[request setParams:@{
+		@"token":jsonNullable(token)
+	} forSection:@"url_params"];
+	if ( requestError != nil ) {
+		completion(0, requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(0, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(0, decodeError);
+			return;
+		}
+		int64_t response = jsonInt64(output);
+		completion(response, decodeError);
+	}];
+}
+
+- (void)methodForPutWithEmployee:(OBCEmployee*)employee
+	andCompletion:(void (^)(NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion([self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:@"employees" method:IFHTTPMETHOD_PUT];
+	request.body = [NSJSONSerialization dataWithJSONObject:@{
+		@"employee":[employee dictionaryWithError:error]
+	} options:jsonFormatOption error:error];
+	if ( requestError != nil ) {
+		completion(requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		completion(transportError);
+	}];
+}
+
+- (void)gitStarredReposWithUser:(NSString*)user
+	andToken:(NSString*)token
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@/repos", user] method:IFHTTPMETHOD_GET];
+	[request setParams:@{
+		@"token":jsonNullable(token)
+	} forSection:@"url_params"];
+	if ( requestError != nil ) {
+		completion(nil, requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		NSArray* response = OBCGitStarredReposListItemListFromJSON(output, error);
+		completion(response, decodeError);
+	}];
+}
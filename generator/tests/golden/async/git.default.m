@@ -0,0 +1,47 @@
+- (void)userWithUserName:(NSString*)userName
+	andCompletion:(void (^)(GitPublicUser* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@", userName] method:IFHTTPMETHOD_GET];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		GitPublicUser* response = [[GitPublicUser alloc] initWithDictionary:output error:error];
+		completion(response, decodeError);
+	}];
+}
+
+- (void)reposWithUserName:(NSString*)userName
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@/repos", userName] method:IFHTTPMETHOD_GET];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		NSArray* response = GitRepoListFromJSON(output, error);
+		completion(response, decodeError);
+	}];
+}
@@ -0,0 +1,64 @@
+- (void)userWithUserName:(NSString*)userName
+	andCompletion:(void (^)(GitPublicUser* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@", userName] method:IFHTTPMETHOD_GET];
+	request.cachePolicy = [IFCachePolicy policyWithDictionary:@{@"ttl":@60.0}];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		IFJSONReader readerState;
+		IFJSONReader* reader = &readerState;
+		IFJSONReaderInit(reader, outputData);
+		GitPublicUser* response = [[GitPublicUser alloc] initWithJSONReader:reader];
+		if ( !IFJSONReaderFinish(reader, error) ) {
+			completion(nil, decodeError);
+			return;
+		}
+		completion(response, nil);
+	}];
+}
+
+- (void)reposWithUserName:(NSString*)userName
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@/repos", userName] method:IFHTTPMETHOD_GET];
+	request.retryPolicy = [IFRetryPolicy policyWithDictionary:@{@"attempts":@5, @"delay":@0.5, @"max_elapsed":@30.0}];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		IFJSONReader readerState;
+		IFJSONReader* reader = &readerState;
+		IFJSONReaderInit(reader, outputData);
+		NSArray* response = GitRepoListFromJSONReader(reader);
+		if ( !IFJSONReaderFinish(reader, error) ) {
+			completion(nil, decodeError);
+			return;
+		}
+		completion(response, nil);
+	}];
+}
+
+- (void)batchWithBuilder:(void (^)(gitpolicies* batch))builder
+	andCompletion:(void (^)(NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion([self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportBatch* batch = [[IFTransportBatch alloc] init];
+	builder([[[self class] alloc] initWithTransport:batch]);
+	[batch sendWithTransport:(id<IFAsyncTransport>)self.transport endpoint:@"batch" completion:completion];
+}
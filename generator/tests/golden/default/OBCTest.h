@@ -0,0 +1,144 @@
+/**
+ * @generated
+ *
+ * AUTOGENERATED. DO NOT EDIT! 
+ *
+ */
+
+#import <Foundation/Foundation.h>
+#import "IFServiceClient.h"
+#import "OBCTypes.h"
+
+@interface OBCEmployeeEmploymentRecItemItem: NSObject
+- (instancetype)initWithBegin:(int64_t)begin
+	andEnd:(int64_t)end;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) int64_t begin;
+@property (nonatomic) int64_t end;
+@end
+
+@interface OBCEmployeeChildrenItem: NSObject
+- (instancetype)initWithName:(NSString*)name
+	andBirthdate:(int64_t)birthdate;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) NSString* name;
+@property (nonatomic) int64_t birthdate;
+@end
+
+@interface OBCEmployee: OBCHuman
+- (instancetype)initWithName:(NSString*)name
+	andTheId:(int64_t)theId
+	andMarried:(BOOL)married
+	andPassport:(OBCHumanPassport*)passport
+	andAge:(double_t)age
+	andEmploymentRec:(NSArray*)employmentRec
+	andEmploymentData:(NSDictionary*)employmentData
+	andChildren:(NSArray*)children;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) double_t age;
+@property (nonatomic) NSArray*/*NSArray*/ employmentRec;
+@property (nonatomic) NSDictionary* employmentData;
+@property (nonatomic) NSArray*/*OBCEmployeeChildrenItem*/ children;
+@end
+
+@interface OBCEmployer: NSObject
+- (instancetype)initWithStuff:(NSArray*)stuff
+	andInfo:(NSDictionary*)info;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) NSArray*/*OBCEmployee*/ stuff;
+@property (nonatomic) NSDictionary* info;
+@end
+
+@interface OBCDepartment: NSObject
+- (instancetype)initWithName:(NSString*)name
+	andEmployees:(NSArray*)employees
+	andDepartments:(NSArray*)departments;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) NSString* name;
+@property (nonatomic) NSArray*/*OBCEmployee*/ employees;
+@property (nonatomic) NSArray*/*OBCDepartment*/ departments;
+@end
+
+@interface OBCGetEmployeesJsonArgsFilterItem: NSObject
+- (instancetype)initWithPayload:(NSString*)payload;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) NSString* payload;
+@end
+
+@interface OBCGetEmployeesCustomParamsArgsComplexParam: NSObject
+- (instancetype)initWithComplexField:(NSString*)complexField;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) NSString* complexField;
+@end
+
+@interface OBCGitStarredReposListItem: NSObject
+- (instancetype)initWithTheId:(int64_t)theId
+	andName:(NSString*)name;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+@property (nonatomic) int64_t theId;
+@property (nonatomic) NSString* name;
+@end
+
+@interface OBCTest: IFServiceClient
+- (int32_t)simpleCallWithError:(NSError* __autoreleasing*)error;
+- (void)simpleCallWithCompletion:(void (^)(int32_t response, NSError* error))completion;
+- (NSArray*)getEmployeesWithToken:(NSString*)token
+	andTimestamp:(int64_t)timestamp
+	andComplexParam:(OBCGetEmployeesCustomParamsArgsComplexParam*)complexParam
+	andSimpleParam:(int32_t)simpleParam
+	andEmployerId:(int64_t)employerId
+	andFilter:(NSArray*)filter
+	andError:(NSError* __autoreleasing*)error;
+- (void)getEmployeesWithToken:(NSString*)token
+	andTimestamp:(int64_t)timestamp
+	andComplexParam:(OBCGetEmployeesCustomParamsArgsComplexParam*)complexParam
+	andSimpleParam:(int32_t)simpleParam
+	andEmployerId:(int64_t)employerId
+	andFilter:(NSArray*)filter
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion;
+- (void)procedureCallWithEndpoint:(NSString*)endpoint
+	andError:(NSError* __autoreleasing*)error;
+- (void)procedureCallWithEndpoint:(NSString*)endpoint
+	andCompletion:(void (^)(NSError* error))completion;
+- (int64_t)methodForGetWithEndpoint:(NSString*)endpoint
+	andToken:(NSString*)token
+	andError:(NSError* __autoreleasing*)error;
+- (void)methodForGetWithEndpoint:(NSString*)endpoint
+	andToken:(NSString*)token
+	andCompletion:(void (^)(int64_t response, NSError* error))completion;
+- (void)methodForPutWithEmployee:(OBCEmployee*)employee
+	andError:(NSError* __autoreleasing*)error;
+- (void)methodForPutWithEmployee:(OBCEmployee*)employee
+	andCompletion:(void (^)(NSError* error))completion;
+- (NSArray*)gitStarredReposWithUser:(NSString*)user
+	andToken:(NSString*)token
+	andError:(NSError* __autoreleasing*)error;
+- (void)gitStarredReposWithUser:(NSString*)user
+	andToken:(NSString*)token
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion;
+@end
+
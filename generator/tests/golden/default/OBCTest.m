@@ -0,0 +1,878 @@
+/**
+ * @generated
+ *
+ * AUTOGENERATED. DO NOT EDIT! 
+ *
+ */
+
+#import "OBCTest.h"
+#import "IFHTTPTransport.h"
+#import "IFServiceClient+Protected.h" 
+
+#pragma clang diagnostic push
+#pragma clang diagnostic ignored "-Wunused"
+#pragma clang diagnostic ignored "-Wundeclared-selector"
+
+static const NSUInteger jsonFormatOption = 
+#ifdef DEBUG
+	NSJSONWritingPrettyPrinted;
+#else
+	0;
+#endif
+
+//kCFNull is the [NSNull null] singleton, so nulls are told by pointer comparison;
+//the helpers are inline, the ones a file doesn't use take no space in the binary
+static inline BOOL jsonIsNull(id value) { return value == (id)kCFNull; }
+static inline id jsonNullable(id value) { return value == nil ? (id)kCFNull : value; }
+static inline BOOL jsonBool(id value) { return jsonIsNull(value) ? NO : ((NSNumber*)value).boolValue; }
+static inline int32_t jsonInt32(id value) { return jsonIsNull(value) ? 0 : ((NSNumber*)value).intValue; }
+static inline int64_t jsonInt64(id value) { return jsonIsNull(value) ? 0L : ((NSNumber*)value).longLongValue; }
+static inline double_t jsonDouble(id value) { return jsonIsNull(value) ? 0.0 : ((NSNumber*)value).doubleValue; }
+static inline NSString* jsonString(id value) { return jsonIsNull(value) ? nil : (NSString*)value; }
+static inline NSDictionary* jsonDictionary(id value) { return jsonIsNull(value) ? nil : (NSDictionary*)value; }
+static inline NSArray* jsonArray(id value) { return jsonIsNull(value) ? nil : (NSArray*)value; }
+static inline NSArray* jsonList(id value) { return [value isKindOfClass:NSArray.class] ? (NSArray*)value : nil; }
+static inline id jsonObjectFromString(id value, NSError* __autoreleasing* error) {
+	if ( value == nil || jsonIsNull(value) ) return nil;
+	return [NSJSONSerialization JSONObjectWithData:[(NSString*)value dataUsingEncoding:NSUTF8StringEncoding] options:NSJSONReadingAllowFragments error:error];
+}
+
+static NSArray* OBCEmployeeEmploymentRecItemItemListToJSON(NSArray* inArr, NSError* __autoreleasing* error) {
+	NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
+	for ( OBCEmployeeEmploymentRecItemItem* inObj in inArr ) { [resArr addObject:[inObj dictionaryWithError:error]]; }
+	return resArr;
+}
+
+static NSArray* OBCEmployeeEmploymentRecItemItemListFromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:[[OBCEmployeeEmploymentRecItemItem alloc] initWithDictionary:item error:error]]; }
+	return items;
+}
+
+static NSArray* OBCEmployeeEmploymentRecItemItemListListToJSON(NSArray* inArr, NSError* __autoreleasing* error) {
+	NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
+	for ( NSArray* inObj in inArr ) { [resArr addObject:OBCEmployeeEmploymentRecItemItemListToJSON(inObj, error)]; }
+	return resArr;
+}
+
+static NSArray* OBCEmployeeEmploymentRecItemItemListListFromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:OBCEmployeeEmploymentRecItemItemListFromJSON(item, error)]; }
+	return items;
+}
+
+static NSArray* OBCEmployeeChildrenItemListToJSON(NSArray* inArr, NSError* __autoreleasing* error) {
+	NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
+	for ( OBCEmployeeChildrenItem* inObj in inArr ) { [resArr addObject:[inObj dictionaryWithError:error]]; }
+	return resArr;
+}
+
+static NSArray* OBCEmployeeChildrenItemListFromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:[[OBCEmployeeChildrenItem alloc] initWithDictionary:item error:error]]; }
+	return items;
+}
+
+static NSArray* OBCEmployeeListToJSON(NSArray* inArr, NSError* __autoreleasing* error) {
+	NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
+	for ( OBCEmployee* inObj in inArr ) { [resArr addObject:[inObj dictionaryWithError:error]]; }
+	return resArr;
+}
+
+static NSArray* OBCEmployeeListFromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:[[OBCEmployee alloc] initWithDictionary:item error:error]]; }
+	return items;
+}
+
+static NSArray* OBCDepartmentListToJSON(NSArray* inArr, NSError* __autoreleasing* error) {
+	NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
+	for ( OBCDepartment* inObj in inArr ) { [resArr addObject:[inObj dictionaryWithError:error]]; }
+	return resArr;
+}
+
+static NSArray* OBCDepartmentListFromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:[[OBCDepartment alloc] initWithDictionary:item error:error]]; }
+	return items;
+}
+
+static NSArray* OBCGetEmployeesJsonArgsFilterItemListToJSON(NSArray* inArr, NSError* __autoreleasing* error) {
+	NSMutableArray* resArr = [NSMutableArray arrayWithCapacity:[inArr count]];
+	for ( OBCGetEmployeesJsonArgsFilterItem* inObj in inArr ) { [resArr addObject:[inObj dictionaryWithError:error]]; }
+	return resArr;
+}
+
+static NSArray* OBCGitStarredReposListItemListFromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:[[OBCGitStarredReposListItem alloc] initWithDictionary:item error:error]]; }
+	return items;
+}
+
+@implementation OBCEmployeeEmploymentRecItemItem
+
+- (instancetype)initWithBegin:(int64_t)begin
+	andEnd:(int64_t)end {
+	if (self=[super init]) {
+		_begin = begin;
+		_end = end;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"begin":@(self.begin),
+		@"end":@(self.end)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.begin = jsonInt64(dict[@"begin"]);
+	self.end = jsonInt64(dict[@"end"]);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCEmployeeChildrenItem
+
+- (instancetype)initWithName:(NSString*)name
+	andBirthdate:(int64_t)birthdate {
+	if (self=[super init]) {
+		_name = name;
+		_birthdate = birthdate;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"name":jsonNullable(self.name),
+		@"birthdate":@(self.birthdate)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.name = jsonString(dict[@"name"]);
+	self.birthdate = jsonInt64(dict[@"birthdate"]);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCEmployee
+
+- (instancetype)initWithName:(NSString*)name
+	andTheId:(int64_t)theId
+	andMarried:(BOOL)married
+	andPassport:(OBCHumanPassport*)passport
+	andAge:(double_t)age
+	andEmploymentRec:(NSArray*)employmentRec
+	andEmploymentData:(NSDictionary*)employmentData
+	andChildren:(NSArray*)children {
+	if (self = [super initWithName:name
+						andTheId:theId
+						andMarried:married
+						andPassport:passport]) {
+		_age = age;
+		_employmentRec = employmentRec;
+		_employmentData = employmentData;
+		_children = children;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"name":jsonNullable(self.name),
+		@"id":@(self.theId),
+		@"married":@(self.married),
+		@"passport":[self.passport dictionaryWithError:error],
+		@"age":@(self.age),
+		@"employment_rec":OBCEmployeeEmploymentRecItemItemListListToJSON(self.employmentRec, error),
+		@"employment_data":jsonNullable(self.employmentData),
+		@"children":OBCEmployeeChildrenItemListToJSON(self.children, error)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.name = jsonString(dict[@"name"]);
+	self.theId = jsonInt64(dict[@"id"]);
+	self.married = jsonBool(dict[@"married"]);
+	self.passport = [[OBCHumanPassport alloc] initWithDictionary:dict[@"passport"] error:error];
+	self.age = jsonDouble(dict[@"age"]);
+	self.employmentRec = OBCEmployeeEmploymentRecItemItemListListFromJSON(dict[@"employment_rec"], error);
+	self.employmentData = jsonDictionary(dict[@"employment_data"]);
+	self.children = OBCEmployeeChildrenItemListFromJSON(dict[@"children"], error);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCEmployer
+
+- (instancetype)initWithStuff:(NSArray*)stuff
+	andInfo:(NSDictionary*)info {
+	if (self=[super init]) {
+		_stuff = stuff;
+		_info = info;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"stuff":OBCEmployeeListToJSON(self.stuff, error),
+		@"info":jsonNullable(self.info)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.stuff = OBCEmployeeListFromJSON(dict[@"stuff"], error);
+	self.info = jsonDictionary(dict[@"info"]);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCDepartment
+
+- (instancetype)initWithName:(NSString*)name
+	andEmployees:(NSArray*)employees
+	andDepartments:(NSArray*)departments {
+	if (self=[super init]) {
+		_name = name;
+		_employees = employees;
+		_departments = departments;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"name":jsonNullable(self.name),
+		@"employees":OBCEmployeeListToJSON(self.employees, error),
+		@"departments":OBCDepartmentListToJSON(self.departments, error)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.name = jsonString(dict[@"name"]);
+	self.employees = OBCEmployeeListFromJSON(dict[@"employees"], error);
+	self.departments = OBCDepartmentListFromJSON(dict[@"departments"], error);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCGetEmployeesJsonArgsFilterItem
+
+- (instancetype)initWithPayload:(NSString*)payload {
+	if (self=[super init]) {
+		_payload = payload;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"payload":jsonNullable(self.payload)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.payload = jsonString(dict[@"payload"]);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCGetEmployeesCustomParamsArgsComplexParam
+
+- (instancetype)initWithComplexField:(NSString*)complexField {
+	if (self=[super init]) {
+		_complexField = complexField;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"complex_field":jsonNullable(self.complexField)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.complexField = jsonString(dict[@"complex_field"]);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCGitStarredReposListItem
+
+- (instancetype)initWithTheId:(int64_t)theId
+	andName:(NSString*)name {
+	if (self=[super init]) {
+		_theId = theId;
+		_name = name;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"id":@(self.theId),
+		@"name":jsonNullable(self.name)
+	};
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSDictionary* dict = [self dictionaryWithError:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.theId = jsonInt64(dict[@"id"]);
+	self.name = jsonString(dict[@"name"]);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+
+@implementation OBCTest
+- (int32_t)simpleCallWithError:(NSError* __autoreleasing*)error {
+
+	NSData* jsonData = nil;
+	if ( ![self.transport writeAll:jsonData endpoint:@"all" error:error] ) {
+		return 0;
+	}
+	NSData* outputData = [self.transport readAll];
+	if ( outputData == nil ) {
+		return 0;
+	}
+	id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+	if ( error && *error != nil ) {
+		return 0;
+	}
+	return jsonInt32(output);
+}
+
+- (void)simpleCallWithCompletion:(void (^)(int32_t response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(0, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:@"all" method:IFHTTPMETHOD_AUTO];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(0, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(0, decodeError);
+			return;
+		}
+		int32_t response = jsonInt32(output);
+		completion(response, decodeError);
+	}];
+}
+
+- (NSArray*)getEmployeesWithToken:(NSString*)token
+	andTimestamp:(int64_t)timestamp
+	andComplexParam:(OBCGetEmployeesCustomParamsArgsComplexParam*)complexParam
+	andSimpleParam:(int32_t)simpleParam
+	andEmployerId:(int64_t)employerId
+	andFilter:(NSArray*)filter
+	andError:(NSError* __autoreleasing*)error {
+	if (![self.transport respondsToSelector:@selector(setUrlParams:)]) {
+		assert("Transport does not respond to selector setUrlParams:");
+	} else {
+		[self.transport performSelector:@selector(setUrlParams:) withObject:@{
+			@"token":jsonNullable(token),
+			@"timestamp":@(timestamp)
+		}];
+	}
+
+	if (![self.transport respondsToSelector:@selector(setCustomParams:)]) {
+		assert("Transport does not respond to selector setCustomParams:");
+	} else {
+		[self.transport performSelector:@selector(setCustomParams:) withObject:@{
+			@"complex_param":[complexParam dictionaryWithError:error],
+			@"simple_param":@(simpleParam)
+		}];
+	}
+
+	NSData* jsonData = [NSJSONSerialization dataWithJSONObject:@{
+		@"employer_id":@(employerId),
+		@"filter":OBCGetEmployeesJsonArgsFilterItemListToJSON(filter, error)
+	} options:jsonFormatOption error:error];
+	if ( ![self.transport writeAll:jsonData endpoint:@"employees" error:error] ) {
+		return nil;
+	}
+	NSData* outputData = [self.transport readAll];
+	if ( outputData == nil ) {
+		return nil;
+	}
+	id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+	if ( error && *error != nil ) {
+		return nil;
+	}
+	return OBCEmployeeListFromJSON(output, error);
+}
+
+- (void)getEmployeesWithToken:(NSString*)token
+	andTimestamp:(int64_t)timestamp
+	andComplexParam:(OBCGetEmployeesCustomParamsArgsComplexParam*)complexParam
+	andSimpleParam:(int32_t)simpleParam
+	andEmployerId:(int64_t)employerId
+	andFilter:(NSArray*)filter
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:@"employees" method:IFHTTPMETHOD_AUTO];
+	[request setParams:@{
+		@"token":jsonNullable(token),
+		@"timestamp":@(timestamp)
+	} forSection:@"url_params"];
+	[request setParams:@{
+		@"complex_param":[complexParam dictionaryWithError:error],
+		@"simple_param":@(simpleParam)
+	} forSection:@"custom_params"];
+	request.body = [NSJSONSerialization dataWithJSONObject:@{
+		@"employer_id":@(employerId),
+		@"filter":OBCGetEmployeesJsonArgsFilterItemListToJSON(filter, error)
+	} options:jsonFormatOption error:error];
+	if ( requestError != nil ) {
+		completion(nil, requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		NSArray* response = OBCEmployeeListFromJSON(output, error);
+		completion(response, decodeError);
+	}];
+}
+
+- (void)procedureCallWithEndpoint:(NSString*)endpoint
+	andError:(NSError* __autoreleasing*)error {
+
+	NSData* jsonData = nil;
+	if ( ![(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:endpoint method:IFHTTPMETHOD_HEAD error:error] ) {
+		return;
+	}
+	NSData* outputData = [self.transport readAll];
+	if ( outputData == nil ) {
+		return;
+	}
+	id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+	if ( error && *error != nil ) {
+		return;
+	}
+	
+}
+
+- (void)procedureCallWithEndpoint:(NSString*)endpoint
+	andCompletion:(void (^)(NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion([self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:endpoint method:IFHTTPMETHOD_HEAD];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		completion(transportError);
+	}];
+}
+
+- (int64_t)methodForGetWithEndpoint:(NSString*)endpoint
+	andToken:(NSString*)token
+	andError:(NSError* __autoreleasing*)error {
+	if (![self.transport respondsToSelector:@selector(setUrlParams:)]) {
+		assert("Transport does not respond to selector setUrlParams:");
+	} else {
+		[self.transport performSelector:@selector(setUrlParams:) withObject:@{
+			@"token":jsonNullable(token)
+		}];
+	}
+
+	NSData* jsonData = nil;
+	if ( ![(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:endpoint method:IFHTTPMETHOD_GET error:error] ) {
+		return 0;
+	}
+	NSData* outputData = [self.transport readAll];
+	if ( outputData == nil ) {
+		return 0;
+	}
+	id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+	if ( error && *error != nil ) {
+		return 0;
+	}
+	return jsonInt64(output);
+}
+
+- (void)methodForGetWithEndpoint:(NSString*)endpoint
+	andToken:(NSString*)token
+	andCompletion:(void (^)(int64_t response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(0, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:endpoint method:IFHTTPMETHOD_GET];
+	[request setParams:@{
+		@"token":jsonNullable(token)
+	} forSection:@"url_params"];
+	if ( requestError != nil ) {
+		completion(0, requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(0, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(0, decodeError);
+			return;
+		}
+		int64_t response = jsonInt64(output);
+		completion(response, decodeError);
+	}];
+}
+
+- (void)methodForPutWithEmployee:(OBCEmployee*)employee
+	andError:(NSError* __autoreleasing*)error {
+
+	NSData* jsonData = [NSJSONSerialization dataWithJSONObject:@{
+		@"employee":[employee dictionaryWithError:error]
+	} options:jsonFormatOption error:error];
+	if ( ![(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:@"employees" method:IFHTTPMETHOD_PUT error:error] ) {
+		return;
+	}
+	NSData* outputData = [self.transport readAll];
+	if ( outputData == nil ) {
+		return;
+	}
+	id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+	if ( error && *error != nil ) {
+		return;
+	}
+	
+}
+
+- (void)methodForPutWithEmployee:(OBCEmployee*)employee
+	andCompletion:(void (^)(NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion([self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:@"employees" method:IFHTTPMETHOD_PUT];
+	request.body = [NSJSONSerialization dataWithJSONObject:@{
+		@"employee":[employee dictionaryWithError:error]
+	} options:jsonFormatOption error:error];
+	if ( requestError != nil ) {
+		completion(requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		completion(transportError);
+	}];
+}
+
+- (NSArray*)gitStarredReposWithUser:(NSString*)user
+	andToken:(NSString*)token
+	andError:(NSError* __autoreleasing*)error {
+	if (![self.transport respondsToSelector:@selector(setUrlParams:)]) {
+		assert("Transport does not respond to selector setUrlParams:");
+	} else {
+		[self.transport performSelector:@selector(setUrlParams:) withObject:@{
+			@"token":jsonNullable(token)
+		}];
+	}
+
+	NSData* jsonData = nil;
+	if ( ![(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:[NSString stringWithFormat:@"users/%@/repos", user] method:IFHTTPMETHOD_GET error:error] ) {
+		return nil;
+	}
+	NSData* outputData = [self.transport readAll];
+	if ( outputData == nil ) {
+		return nil;
+	}
+	id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+	if ( error && *error != nil ) {
+		return nil;
+	}
+	return OBCGitStarredReposListItemListFromJSON(output, error);
+}
+
+- (void)gitStarredReposWithUser:(NSString*)user
+	andToken:(NSString*)token
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	NSError* __autoreleasing requestError = nil;
+	NSError* __autoreleasing* error = &requestError;
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@/repos", user] method:IFHTTPMETHOD_GET];
+	[request setParams:@{
+		@"token":jsonNullable(token)
+	} forSection:@"url_params"];
+	if ( requestError != nil ) {
+		completion(nil, requestError);
+		return;
+	}
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		NSArray* response = OBCGitStarredReposListItemListFromJSON(output, error);
+		completion(response, decodeError);
+	}];
+}
+
+@end
+
+
+#pragma clang diagnostic pop
+
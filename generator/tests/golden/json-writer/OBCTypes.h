@@ -0,0 +1,41 @@
+/**
+ * @generated
+ *
+ * AUTOGENERATED. DO NOT EDIT! 
+ *
+ */
+
+#import <Foundation/Foundation.h>
+#import "IFServiceClient.h"
+
+@interface OBCHumanPassport: NSObject
+- (instancetype)initWithTheId:(int32_t)theId
+	andOrganization:(NSString*)organization
+	andPeriods:(NSArray*)periods;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+- (BOOL)appendJSONToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error;
+@property (nonatomic) int32_t theId;
+@property (nonatomic) NSString* organization;
+@property (nonatomic) NSArray*/*int64_t*/ periods;
+@end
+
+@interface OBCHuman: NSObject
+- (instancetype)initWithName:(NSString*)name
+	andTheId:(int64_t)theId
+	andMarried:(BOOL)married
+	andPassport:(OBCHumanPassport*)passport;
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error;
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error;
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error;
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error;
+- (BOOL)appendJSONToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error;
+@property (nonatomic) NSString* name;
+@property (nonatomic) int64_t theId;
+@property (nonatomic) BOOL married;
+@property (nonatomic) OBCHumanPassport* passport;
+@end
+
+
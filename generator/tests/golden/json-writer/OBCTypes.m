@@ -0,0 +1,184 @@
+/**
+ * @generated
+ *
+ * AUTOGENERATED. DO NOT EDIT! 
+ *
+ */
+
+#import "OBCTypes.h"
+#import "IFServiceClient+Protected.h" 
+
+#import "IFJSONWriter.h"
+
+#pragma clang diagnostic push
+#pragma clang diagnostic ignored "-Wunused"
+#pragma clang diagnostic ignored "-Wundeclared-selector"
+
+static const NSUInteger jsonFormatOption = 
+#ifdef DEBUG
+	NSJSONWritingPrettyPrinted;
+#else
+	0;
+#endif
+
+//kCFNull is the [NSNull null] singleton, so nulls are told by pointer comparison;
+//the helpers are inline, the ones a file doesn't use take no space in the binary
+static inline BOOL jsonIsNull(id value) { return value == (id)kCFNull; }
+static inline id jsonNullable(id value) { return value == nil ? (id)kCFNull : value; }
+static inline BOOL jsonBool(id value) { return jsonIsNull(value) ? NO : ((NSNumber*)value).boolValue; }
+static inline int32_t jsonInt32(id value) { return jsonIsNull(value) ? 0 : ((NSNumber*)value).intValue; }
+static inline int64_t jsonInt64(id value) { return jsonIsNull(value) ? 0L : ((NSNumber*)value).longLongValue; }
+static inline double_t jsonDouble(id value) { return jsonIsNull(value) ? 0.0 : ((NSNumber*)value).doubleValue; }
+static inline NSString* jsonString(id value) { return jsonIsNull(value) ? nil : (NSString*)value; }
+static inline NSDictionary* jsonDictionary(id value) { return jsonIsNull(value) ? nil : (NSDictionary*)value; }
+static inline NSArray* jsonArray(id value) { return jsonIsNull(value) ? nil : (NSArray*)value; }
+static inline NSArray* jsonList(id value) { return [value isKindOfClass:NSArray.class] ? (NSArray*)value : nil; }
+static inline id jsonObjectFromString(id value, NSError* __autoreleasing* error) {
+	if ( value == nil || jsonIsNull(value) ) return nil;
+	return [NSJSONSerialization JSONObjectWithData:[(NSString*)value dataUsingEncoding:NSUTF8StringEncoding] options:NSJSONReadingAllowFragments error:error];
+}
+
+@implementation OBCHumanPassport
+
+- (instancetype)initWithTheId:(int32_t)theId
+	andOrganization:(NSString*)organization
+	andPeriods:(NSArray*)periods {
+	if (self=[super init]) {
+		_theId = theId;
+		_organization = organization;
+		_periods = periods;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"id":@(self.theId),
+		@"organization":jsonNullable(self.organization),
+		@"periods":jsonNullable(self.periods)
+	};
+}
+
+- (BOOL)appendJSONToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error {
+	IFJSONAppendLiteral(data, "{\"id\":");
+	IFJSONAppendInt32(data, self.theId);
+	IFJSONAppendLiteral(data, ",\"organization\":");
+	IFJSONAppendString(data, self.organization);
+	IFJSONAppendLiteral(data, ",\"periods\":");
+	if ( !IFJSONAppendObject(data, self.periods, error) ) return NO;
+	IFJSONAppendLiteral(data, "}");
+	return YES;
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSMutableData* data = [NSMutableData dataWithCapacity:142];
+	if ( ![self appendJSONToData:data error:error] ) return nil;
+	return data;
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.theId = jsonInt32(dict[@"id"]);
+	self.organization = jsonString(dict[@"organization"]);
+	self.periods = jsonArray(dict[@"periods"]);
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+@implementation OBCHuman
+
+- (instancetype)initWithName:(NSString*)name
+	andTheId:(int64_t)theId
+	andMarried:(BOOL)married
+	andPassport:(OBCHumanPassport*)passport {
+	if (self=[super init]) {
+		_name = name;
+		_theId = theId;
+		_married = married;
+		_passport = passport;
+	}
+	return self;
+}
+
+- (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
+	return @{
+		@"name":jsonNullable(self.name),
+		@"id":@(self.theId),
+		@"married":@(self.married),
+		@"passport":[self.passport dictionaryWithError:error]
+	};
+}
+
+- (BOOL)appendJSONToData:(NSMutableData*)data error:(NSError* __autoreleasing*)error {
+	IFJSONAppendLiteral(data, "{\"name\":");
+	IFJSONAppendString(data, self.name);
+	IFJSONAppendLiteral(data, ",\"id\":");
+	IFJSONAppendInt64(data, self.theId);
+	IFJSONAppendLiteral(data, ",\"married\":");
+	IFJSONAppendBool(data, self.married);
+	IFJSONAppendLiteral(data, ",\"passport\":");
+	if ( self.passport == nil ) IFJSONAppendNull(data);
+	else if ( ![self.passport appendJSONToData:data error:error] ) return NO;
+	IFJSONAppendLiteral(data, "}");
+	return YES;
+}
+
+- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
+	NSMutableData* data = [NSMutableData dataWithCapacity:160];
+	if ( ![self appendJSONToData:data error:error] ) return nil;
+	return data;
+}
+
+- (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
+	self.name = jsonString(dict[@"name"]);
+	self.theId = jsonInt64(dict[@"id"]);
+	self.married = jsonBool(dict[@"married"]);
+	self.passport = [[OBCHumanPassport alloc] initWithDictionary:dict[@"passport"] error:error];
+}
+
+- (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
+	if ( dictionary == nil ) return nil;
+	if (self = [super init]) {
+		[self readDictionary:dictionary withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+- (instancetype)initWithJSONData:(NSData*)jsonData error:(NSError* __autoreleasing*)error {
+	if ( jsonData == nil ) return nil;
+	if (self = [super init]) {
+		NSDictionary* dict = [NSJSONSerialization JSONObjectWithData:jsonData options:NSJSONReadingAllowFragments error:error];
+		if ( error && *error != nil ) { self = nil; return nil; }
+		[self readDictionary:dict withError:error];
+		if ( error && *error != nil ) self = nil;
+	}
+	return self;
+}
+
+@end
+
+
+
+
+#pragma clang diagnostic pop
+
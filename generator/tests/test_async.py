@@ -0,0 +1,68 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from conftest import testIDLDir, exampleIDLDir, checkGolden
+from ifaceparser import *
+from ifaceobjcgen import *
+import os
+import pytest
+
+#completion handler methods and batches of the test and example IDLs, as the generator writes them,
+#are kept in tests/golden/async, one file per module and reader mode
+
+asyncModules = {
+	'OBCTest': ( testIDLDir, 'OBC', ( 'types.json', 'test.json' ) ),
+	'git': ( exampleIDLDir, None, ( 'gittypes.json', 'git.json' ) ),
+	'gitpolicies': ( exampleIDLDir, None, ( 'gittypes.json', 'gitpolicies.json' ) ),
+}
+asyncModes = {
+	'default': OBJCDefaultOptions,
+	'json-reader': OBJCOptions( jsonWriter=False, jsonReader=True, lazy=False, codec=None ),
+}
+
+def loadModule( moduleName ):
+	idlDir, prefix, names = asyncModules[moduleName]
+	context = GenContext( prefix )
+	moduleCache = GenModuleCache()
+	return [ parseModule( os.path.join( idlDir, name ), context, moduleCache ) for name in names ][-1]
+
+def asyncImplementations( module, options ):
+	methods = [ OBJCRPCMethodAsyncImplementation( method, options ) for method in module.methods ]
+	batches = [ OBJCRPCBatchImplementation( module, batch ) for batch in module.batches ]
+	return methods, batches
+
+@pytest.mark.parametrize( 'moduleName', sorted( asyncModules.keys() ) )
+@pytest.mark.parametrize( 'mode', sorted( asyncModes.keys() ) )
+def testAsyncMethodsMatchGolden( request, moduleName, mode ):
+	methods, batches = asyncImplementations( loadModule( moduleName ), asyncModes[mode] )
+	checkGolden( request.config, os.path.join( 'async', '%s.%s.m' % ( moduleName, mode ) ), '\n'.join( methods + batches ) )
+
+@pytest.mark.parametrize( 'moduleName', sorted( asyncModules.keys() ) )
+def testAsyncMethodsFailWithoutAsyncTransport( moduleName ):
+	#a blocking only transport fails the call through its completion with the response type empty value
+	module = loadModule( moduleName )
+	methods, batches = asyncImplementations( module, OBJCDefaultOptions )
+	assert len( methods ) == len( module.methods ) and len( methods ) > 0
+	for method, implementation in zip( module.methods, methods ):
+		emptyArg = '' if method.responseType is None else OBJCEmptyValForType( method.responseType ) + ', '
+		fallback = '\tif ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {\n\t\tcompletion(%s[self errorWithMessage:@"Transport does not support asynchronous requests"]);\n\t\treturn;\n\t}\n' % emptyArg
+		assert implementation.split( '{\n', 1 )[1].startswith( fallback ), method.name
+	for implementation in batches:
+		assert 'completion([self errorWithMessage:@"Transport does not support asynchronous requests"]);' in implementation
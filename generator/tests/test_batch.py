@@ -0,0 +1,62 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from conftest import exampleIDLDir
+from ifaceparser import *
+from ifacecheck import loadDecoders
+import json
+import os
+
+#TransportBatch of the generated Python clients mirrors IFTransportBatch
+
+def loadExampleDecoders():
+	context = GenContext( None )
+	moduleCache = GenModuleCache()
+	return loadDecoders( [ parseModule( os.path.join( exampleIDLDir, name ), context, moduleCache ) for name in ( 'gittypes.json', 'git.json' ) ] )
+
+def queueCall( decoders, batch, endpoint, results ):
+	request = decoders['TransportRequest']( endpoint, 'GET' )
+	batch.sendRequest( request, lambda data, error: results.append( ( endpoint, data, error ) ) )
+
+def testCallsQueuedInFlightStayQueued():
+	decoders = loadExampleDecoders()
+	queue = decoders['TransportBatch']()
+	results = []
+	queueCall( decoders, queue, 'users/octocat', results )
+	batch = queue.takeQueuedCalls()
+	queueCall( decoders, queue, 'users/octocat/repos', results )
+	assert [ call['endpoint'] for call in json.loads( batch.envelope() )['calls'] ] == [ 'users/octocat' ]
+	assert batch.dispatch( json.dumps( { 'results': [ { 'id': 0, 'status': 200, 'body': {} } ] } ), None ) is None
+	assert results == [ ( 'users/octocat', '{}', None ) ]
+	assert len( queue.calls ) == 1
+
+def testNonJSONCallsAreRejected():
+	decoders = loadExampleDecoders()
+	batch = decoders['TransportBatch']()
+	results = []
+	request = decoders['TransportRequest']( 'upload', 'POST' )
+	request.bodyEncoding = 'gzip'
+	request.body = '{}'
+	batch.sendRequest( request, lambda data, error: results.append( error ) )
+	request = decoders['TransportRequest']( 'upload', 'POST' )
+	request.body = '\x1f\x8b'
+	batch.sendRequest( request, lambda data, error: results.append( error ) )
+	assert len( batch.calls ) == 0
+	assert results == [ 'Call to "upload" has compressed body and cannot be batched', 'Call to "upload" has non-JSON body and cannot be batched' ]
@@ -0,0 +1,59 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from conftest import testIDLDir, checkGolden
+from ifaceparser import *
+from ifaceobjcgen import *
+import os
+import pytest
+
+#the whole output for the test IDL is kept in tests/golden, one directory per generation mode
+
+goldenModes = {
+	'default': OBJCDefaultOptions,
+	'json-writer': OBJCOptions( jsonWriter=True, jsonReader=False, lazy=False, codec=None ),
+}
+
+def generateTestModules( options, outDir ):
+	context = GenContext( 'OBC' )
+	moduleCache = GenModuleCache()
+	for name in ( 'types.json', 'test.json' ):
+		writeObjCImplementation( outDir, None, parseModule( os.path.join( testIDLDir, name ), context, moduleCache ), None, options )
+	files = OrderedDict()
+	for fileName in sorted( os.listdir( outDir ) ):
+		with open( os.path.join( outDir, fileName ), 'rb' ) as inFile:
+			files[fileName] = inFile.read().decode( 'utf-8' )
+	return files
+
+@pytest.mark.parametrize( 'mode', sorted( goldenModes.keys() ) )
+def testGeneratedOutputMatchesGolden( request, tmpdir, mode ):
+	files = generateTestModules( goldenModes[mode], str( tmpdir ) )
+	assert files.keys() == [ 'OBCTest.h', 'OBCTest.m', 'OBCTypes.h', 'OBCTypes.m' ]
+	for fileName, text in files.items():
+		checkGolden( request.config, os.path.join( mode, fileName ), text )
+
+@pytest.mark.parametrize( 'mode', sorted( goldenModes.keys() ) )
+def testDumpSerializesOnce( tmpdir, mode ):
+	implementation = generateTestModules( goldenModes[mode], str( tmpdir ) )['OBCTest.m']
+	dumps = implementation.split( '- (NSData*)dumpWithError:(NSError* __autoreleasing*)error {' )[1:]
+	assert len( dumps ) > 0
+	for dump in dumps:
+		body = dump[:dump.index( '\n}\n' )]
+		assert body.count( 'dictionaryWithError:' ) + body.count( 'appendJSONToData:' ) == 1
@@ -0,0 +1,53 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from conftest import testIDLDir
+from ifaceparser import *
+from ifaceobjcgen import *
+import os
+import pytest
+
+lazyOptions = OBJCOptions( jsonWriter=True, jsonReader=False, lazy=True, codec='msgpack' )
+
+def loadModule( name ):
+	return parseModule( os.path.join( testIDLDir, name ), GenContext( 'OBC' ), GenModuleCache() )
+
+def testLazyDecodeErrorsAreReported():
+	module = loadModule( 'test.json' )
+	employee = module.typeList['OBCEmployee']
+	lazyFields = OBJCLazyFields( employee, lazyOptions )
+	assert len( lazyFields ) > 0
+	declarations = OBJCTypeSerializersDeclarationList( employee, lazyOptions )
+	implementation = OBJCTypeImplementation( employee, lazyOptions )
+	for field in lazyFields:
+		assert '- (%s%s)%sWithError:(NSError* __autoreleasing*)error;' % ( OBJCAssumeType( field.type ), field.type.ptr, field.alias ) in declarations
+		assert 'return [self %sWithError:NULL];' % field.alias in implementation
+		#dictionaryWithError:, appendJSONToData:error: and appendMessagePackToData:error: decode it first
+		assert implementation.count( '[self %sWithError:&lazyError];' % field.alias ) == 3
+	assert 'NSError* __autoreleasing* error = NULL;' not in implementation
+
+def testCategoryRejectsLazy():
+	module = loadModule( 'category.json' )
+	with pytest.raises( Exception, match='not supported in category mode' ):
+		OBJCImplementationCategory( 'RPC', module, options=lazyOptions )
+	lazyType = next( genType for genType in module.typeList.values() if isinstance( genType, GenComplexType ) )
+	lazyType.lazy = True
+	with pytest.raises( Exception, match='Struct %s is lazy' % lazyType.name ):
+		OBJCImplementationCategory( 'RPC', module )
@@ -0,0 +1,43 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import conftest
+from ifaceparser import *
+from ifaceobjcgen import *
+from collections import OrderedDict
+
+#"retry" of a method is what the generated call passes to the transport in place of its own retryPolicy
+
+def buildMethod( **keys ):
+	jsonItem = OrderedDict( [ ( 'get', 'user' ), ( 'endpoint', 'user' ) ] )
+	jsonItem.update( keys )
+	return buildMethodFromJSON( jsonItem, OrderedDict(), OrderedDict(), GenContext( None ) )
+
+def testRetryTrueFallsBackToTransportPolicy():
+	method = buildMethod( retry=True )
+	assert method.retryPolicy is None
+	assert OBJCRetryPolicy( method ) == 'nil'
+	implementation = OBJCRPCMethodImplementation( method ) + OBJCRPCMethodAsyncImplementation( method )
+	assert 'IFRetryPolicy' not in implementation
+	assert implementation == OBJCRPCMethodImplementation( buildMethod() ) + OBJCRPCMethodAsyncImplementation( buildMethod() )
+
+def testRetryPolicies():
+	assert OBJCRetryPolicy( buildMethod( retry=False ) ) == '[IFRetryPolicy policyWithDictionary:@{@"attempts":@1}]'
+	assert OBJCRetryPolicy( buildMethod( retry={ 'attempts': 5 } ) ) == '[IFRetryPolicy policyWithDictionary:@{@"attempts":@5}]'
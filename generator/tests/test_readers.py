@@ -0,0 +1,111 @@
+# Copyright (c) 2014-2015 Evgeny Kamyshanov
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from conftest import testIDLDir
+from ifaceparser import *
+from ifaceobjcgen import *
+from ifacepygen import *
+from ifacecheck import checkFixtures
+import os
+import re
+import pytest
+
+#ifacecheck.py runs the Python counterparts of the generated readers over the fixtures,
+#these tests check the generated Objective-C readers do field by field what those counterparts do
+
+def loadTestModules():
+	context = GenContext( 'OBC' )
+	moduleCache = GenModuleCache()
+	return [ parseModule( os.path.join( testIDLDir, name ), context, moduleCache ) for name in ( 'types.json', 'test.json' ) ]
+
+#the Objective-C reader of each flavour and what its Python counterpart calls are named after
+readerFlavours = {
+	'JSON': ( OBJCOptions( jsonWriter=False, jsonReader=True, lazy=False, codec=None ), 'readJSONReader', 'IFJSON', 'initWithJSONReader:', 'FromJSONReader' ),
+	'MessagePack': ( OBJCOptions( jsonWriter=False, jsonReader=False, lazy=False, codec='msgpack' ), 'readMessagePackReader', 'IFMessagePack', 'initWithMessagePackReader:', 'FromMessagePackReader' ),
+}
+
+def expectedReaderValue( genType, flavour ):
+	options, readMethod, functionPrefix, initSelector, listSuffix = readerFlavours[flavour]
+	if isinstance( genType, GenIntegralType ):
+		#reader.readInt32() of Python is IFJSONReadInt32(reader) of Objective-C
+		pyRead = PYJSONReaderIntegralMap[genType.sType]
+		return '%s%s%s(reader)' % ( functionPrefix, pyRead[0].upper(), pyRead[1:] )
+	if isinstance( genType, GenComplexType ):
+		return '[[%s alloc] %sreader]' % ( genType.name, initSelector )
+	if isinstance( genType.itemType, GenIntegralType ):
+		return '%sReadObject(reader)' % functionPrefix
+	return '%s%s(reader)' % ( OBJCListFunctionName( genType ), listSuffix )
+
+def objcMethodBody( text, signature ):
+	start = text.index( signature )
+	return text[start:text.index( '\n}\n', start )]
+
+def objcFieldSwitch( body ):
+	#( key length, key, property, value ) of every case of a generated reader switch
+	fields = []
+	length = None
+	for line in body.split( '\n' ):
+		match = re.match( r'\t+case (\d+):$', line )
+		if match:
+			length = int( match.group( 1 ) )
+			continue
+		match = re.match( r'\t+if \( IF\w+KeyEquals\(key, "(.*)"\) \) \{$', line )
+		if match:
+			fields.append( [ length, match.group( 1 ).decode( 'string_escape' ) ] )
+			continue
+		match = re.match( r'\t+self\.(\w+) = (.*);$', line )
+		if match:
+			fields[-1] += [ match.group( 1 ), match.group( 2 ) ]
+	return [ tuple( field ) for field in fields ]
+
+def moduleListTypes( modules ):
+	return [ listType for module in modules for listType, directions in OBJCModuleListTypes( module ).values() if directions & OBJCListFromJSON ]
+
+@pytest.mark.parametrize( 'flavour', sorted( readerFlavours.keys() ) )
+def testReaderSwitchMatchesPythonCounterpart( flavour ):
+	options, readMethod = readerFlavours[flavour][:2]
+	modules = loadTestModules()
+	for module in modules:
+		text = OBJCModule( module, options )
+		for genType in module.typeList.values():
+			if not isinstance( genType, GenComplexType ):
+				continue
+			typeText = text[text.index( '@implementation %s\n' % genType.name ):]
+			switch = objcFieldSwitch( objcMethodBody( typeText, '- (void)%s:' % readMethod ) )
+			expected = [ ( len( field.name.encode( 'utf-8' ) ), field.name.encode( 'utf-8' ), field.alias, expectedReaderValue( field.type, flavour ) ) for field in PYUniqueFields( genType ) ]
+			assert sorted( switch ) == sorted( expected )
+
+@pytest.mark.parametrize( 'flavour', sorted( readerFlavours.keys() ) )
+def testListReadersAreSharedFunctions( flavour ):
+	options, readMethod, functionPrefix, initSelector, listSuffix = readerFlavours[flavour]
+	modules = loadTestModules()
+	for module in modules:
+		text = OBJCModule( module, options )
+		#no block literal per field or per response, every list type has one reader function
+		assert '^NSArray*()' not in text
+		for listType in moduleListTypes( [ module ] ):
+			function = 'static NSArray* %s%s(' % ( OBJCListFunctionName( listType ), listSuffix )
+			assert text.count( function ) == 1
+			assert 'id item = %s;' % expectedReaderValue( listType.itemType, flavour ) in objcMethodBody( text, function )
+
+def testFixturesDecodeAlike( capsys ):
+	modules = loadTestModules()
+	fixtures = [ os.path.join( testIDLDir, 'test_transport_employee.json' ) + ':OBCEmployee', os.path.join( testIDLDir, 'test_transport_response.json' ) + ':getEmployees' ]
+	assert checkFixtures( modules, fixtures ) == 0, capsys.readouterr()[0]
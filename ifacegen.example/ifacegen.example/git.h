@@ -13,7 +13,11 @@
 @interface git: IFServiceClient
 - (GitPublicUser*)userWithUserName:(NSString*)userName
 	andError:(NSError* __autoreleasing*)error;
+- (void)userWithUserName:(NSString*)userName
+	andCompletion:(void (^)(GitPublicUser* response, NSError* error))completion;
 - (NSArray*)reposWithUserName:(NSString*)userName
 	andError:(NSError* __autoreleasing*)error;
+- (void)reposWithUserName:(NSString*)userName
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion;
 @end
 
@@ -20,12 +20,36 @@ static const NSUInteger jsonFormatOption =
 	0;
 #endif
 
+//kCFNull is the [NSNull null] singleton, so nulls are told by pointer comparison;
+//the helpers are inline, the ones a file doesn't use take no space in the binary
+static inline BOOL jsonIsNull(id value) { return value == (id)kCFNull; }
+static inline id jsonNullable(id value) { return value == nil ? (id)kCFNull : value; }
+static inline BOOL jsonBool(id value) { return jsonIsNull(value) ? NO : ((NSNumber*)value).boolValue; }
+static inline int32_t jsonInt32(id value) { return jsonIsNull(value) ? 0 : ((NSNumber*)value).intValue; }
+static inline int64_t jsonInt64(id value) { return jsonIsNull(value) ? 0L : ((NSNumber*)value).longLongValue; }
+static inline double_t jsonDouble(id value) { return jsonIsNull(value) ? 0.0 : ((NSNumber*)value).doubleValue; }
+static inline NSString* jsonString(id value) { return jsonIsNull(value) ? nil : (NSString*)value; }
+static inline NSDictionary* jsonDictionary(id value) { return jsonIsNull(value) ? nil : (NSDictionary*)value; }
+static inline NSArray* jsonArray(id value) { return jsonIsNull(value) ? nil : (NSArray*)value; }
+static inline NSArray* jsonList(id value) { return [value isKindOfClass:NSArray.class] ? (NSArray*)value : nil; }
+static inline id jsonObjectFromString(id value, NSError* __autoreleasing* error) {
+	if ( value == nil || jsonIsNull(value) ) return nil;
+	return [NSJSONSerialization JSONObjectWithData:[(NSString*)value dataUsingEncoding:NSUTF8StringEncoding] options:NSJSONReadingAllowFragments error:error];
+}
+
+static NSArray* GitRepoListFromJSON(id inObj, NSError* __autoreleasing* error) {
+	NSArray* inArr = jsonList(inObj);
+	if ( inArr == nil ) return nil;
+	NSMutableArray* items = [NSMutableArray arrayWithCapacity:inArr.count];
+	for ( id item in inArr ) { [items addObject:[[GitRepo alloc] initWithDictionary:item error:error]]; }
+	return items;
+}
+
 
 
 @implementation git
 - (GitPublicUser*)userWithUserName:(NSString*)userName
 	andError:(NSError* __autoreleasing*)error {
-	id tmp;
 
 	NSData* jsonData = nil;
 	if ( ![(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:[NSString stringWithFormat:@"users/%@", userName] method:IFHTTPMETHOD_GET error:error] ) {
@@ -42,9 +66,32 @@ static const NSUInteger jsonFormatOption =
 	return [[GitPublicUser alloc] initWithDictionary:output error:error];
 }
 
+- (void)userWithUserName:(NSString*)userName
+	andCompletion:(void (^)(GitPublicUser* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@", userName] method:IFHTTPMETHOD_GET];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		GitPublicUser* response = [[GitPublicUser alloc] initWithDictionary:output error:error];
+		completion(response, decodeError);
+	}];
+}
+
 - (NSArray*)reposWithUserName:(NSString*)userName
 	andError:(NSError* __autoreleasing*)error {
-	id tmp;
 
 	NSData* jsonData = nil;
 	if ( ![(IFHTTPTransport*)self.transport writeAll:jsonData endpoint:[NSString stringWithFormat:@"users/%@/repos", userName] method:IFHTTPMETHOD_GET error:error] ) {
@@ -58,14 +105,31 @@ static const NSUInteger jsonFormatOption =
 	if ( error && *error != nil ) {
 		return nil;
 	}
-	return ^NSArray*(id inObj) {
-				NSMutableArray* items;
-				if ( inObj == nil ||  [inObj isEqual:[NSNull null]] || ![inObj isKindOfClass:NSArray.class]) return nil;
-				NSArray* inArr = (NSArray*)inObj;
-				items = [NSMutableArray arrayWithCapacity:inArr.count];
-				for ( id item in inArr ) { id tmp; [items addObject:[[GitRepo alloc] initWithDictionary:item error:error]]; }
-				return items;
-			}( output );
+	return GitRepoListFromJSON(output, error);
+}
+
+- (void)reposWithUserName:(NSString*)userName
+	andCompletion:(void (^)(NSArray* response, NSError* error))completion {
+	if ( ![self.transport conformsToProtocol:@protocol(IFAsyncTransport)] ) {
+		completion(nil, [self errorWithMessage:@"Transport does not support asynchronous requests"]);
+		return;
+	}
+	IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:[NSString stringWithFormat:@"users/%@/repos", userName] method:IFHTTPMETHOD_GET];
+	[(id<IFAsyncTransport>)self.transport sendRequest:request completion:^(NSData* outputData, NSString* contentType, NSError* transportError) {
+		if ( transportError != nil || outputData == nil ) {
+			completion(nil, transportError);
+			return;
+		}
+		NSError* __autoreleasing decodeError = nil;
+		NSError* __autoreleasing* error = &decodeError;
+		id output = [NSJSONSerialization JSONObjectWithData:outputData options:NSJSONReadingAllowFragments error:error];
+		if ( decodeError != nil ) {
+			completion(nil, decodeError);
+			return;
+		}
+		NSArray* response = GitRepoListFromJSON(output, error);
+		completion(response, decodeError);
+	}];
 }
 
 @end
@@ -19,6 +19,23 @@ static const NSUInteger jsonFormatOption =
 	0;
 #endif
 
+//kCFNull is the [NSNull null] singleton, so nulls are told by pointer comparison;
+//the helpers are inline, the ones a file doesn't use take no space in the binary
+static inline BOOL jsonIsNull(id value) { return value == (id)kCFNull; }
+static inline id jsonNullable(id value) { return value == nil ? (id)kCFNull : value; }
+static inline BOOL jsonBool(id value) { return jsonIsNull(value) ? NO : ((NSNumber*)value).boolValue; }
+static inline int32_t jsonInt32(id value) { return jsonIsNull(value) ? 0 : ((NSNumber*)value).intValue; }
+static inline int64_t jsonInt64(id value) { return jsonIsNull(value) ? 0L : ((NSNumber*)value).longLongValue; }
+static inline double_t jsonDouble(id value) { return jsonIsNull(value) ? 0.0 : ((NSNumber*)value).doubleValue; }
+static inline NSString* jsonString(id value) { return jsonIsNull(value) ? nil : (NSString*)value; }
+static inline NSDictionary* jsonDictionary(id value) { return jsonIsNull(value) ? nil : (NSDictionary*)value; }
+static inline NSArray* jsonArray(id value) { return jsonIsNull(value) ? nil : (NSArray*)value; }
+static inline NSArray* jsonList(id value) { return [value isKindOfClass:NSArray.class] ? (NSArray*)value : nil; }
+static inline id jsonObjectFromString(id value, NSError* __autoreleasing* error) {
+	if ( value == nil || jsonIsNull(value) ) return nil;
+	return [NSJSONSerialization JSONObjectWithData:[(NSString*)value dataUsingEncoding:NSUTF8StringEncoding] options:NSJSONReadingAllowFragments error:error];
+}
+
 @implementation GitUser
 
 - (instancetype)initWithLogin:(NSString*)login
@@ -36,25 +53,24 @@ static const NSUInteger jsonFormatOption =
 
 - (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
 	return @{
-		@"login":(self.login == nil ? [NSNull null] : self.login),
+		@"login":jsonNullable(self.login),
 		@"id":@(self.theId),
-		@"avatar_url":(self.avatarUrl == nil ? [NSNull null] : self.avatarUrl),
-		@"name":(self.name == nil ? [NSNull null] : self.name)
+		@"avatar_url":jsonNullable(self.avatarUrl),
+		@"name":jsonNullable(self.name)
 	};
 }
 
 - (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
 	NSDictionary* dict = [self dictionaryWithError:error];
-	if (*error) return nil;
-	else return [NSJSONSerialization dataWithJSONObject:[self dictionaryWithError:error] options:jsonFormatOption error:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
 }
 
 - (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
-	id tmp;
-	self.login = ( tmp = dict[@"login"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.theId = ( tmp = dict[@"id"], [tmp isEqual:[NSNull null]] ? 0L : ((NSNumber*)tmp).longLongValue );
-	self.avatarUrl = ( tmp = dict[@"avatar_url"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.name = ( tmp = dict[@"name"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
+	self.login = jsonString(dict[@"login"]);
+	self.theId = jsonInt64(dict[@"id"]);
+	self.avatarUrl = jsonString(dict[@"avatar_url"]);
+	self.name = jsonString(dict[@"name"]);
 }
 
 - (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
@@ -103,11 +119,11 @@ static const NSUInteger jsonFormatOption =
 
 - (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
 	return @{
-		@"login":(self.login == nil ? [NSNull null] : self.login),
+		@"login":jsonNullable(self.login),
 		@"id":@(self.theId),
-		@"avatar_url":(self.avatarUrl == nil ? [NSNull null] : self.avatarUrl),
-		@"name":(self.name == nil ? [NSNull null] : self.name),
-		@"email":(self.email == nil ? [NSNull null] : self.email),
+		@"avatar_url":jsonNullable(self.avatarUrl),
+		@"name":jsonNullable(self.name),
+		@"email":jsonNullable(self.email),
 		@"public_repos":@(self.publicRepos),
 		@"followers":@(self.followers),
 		@"following":@(self.following)
@@ -116,20 +132,19 @@ static const NSUInteger jsonFormatOption =
 
 - (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
 	NSDictionary* dict = [self dictionaryWithError:error];
-	if (*error) return nil;
-	else return [NSJSONSerialization dataWithJSONObject:[self dictionaryWithError:error] options:jsonFormatOption error:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
 }
 
 - (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
-	id tmp;
-	self.login = ( tmp = dict[@"login"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.theId = ( tmp = dict[@"id"], [tmp isEqual:[NSNull null]] ? 0L : ((NSNumber*)tmp).longLongValue );
-	self.avatarUrl = ( tmp = dict[@"avatar_url"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.name = ( tmp = dict[@"name"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.email = ( tmp = dict[@"email"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.publicRepos = ( tmp = dict[@"public_repos"], [tmp isEqual:[NSNull null]] ? 0 : ((NSNumber*)tmp).intValue );
-	self.followers = ( tmp = dict[@"followers"], [tmp isEqual:[NSNull null]] ? 0 : ((NSNumber*)tmp).intValue );
-	self.following = ( tmp = dict[@"following"], [tmp isEqual:[NSNull null]] ? 0 : ((NSNumber*)tmp).intValue );
+	self.login = jsonString(dict[@"login"]);
+	self.theId = jsonInt64(dict[@"id"]);
+	self.avatarUrl = jsonString(dict[@"avatar_url"]);
+	self.name = jsonString(dict[@"name"]);
+	self.email = jsonString(dict[@"email"]);
+	self.publicRepos = jsonInt32(dict[@"public_repos"]);
+	self.followers = jsonInt32(dict[@"followers"]);
+	self.following = jsonInt32(dict[@"following"]);
 }
 
 - (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
@@ -180,10 +195,10 @@ static const NSUInteger jsonFormatOption =
 - (NSDictionary*)dictionaryWithError:(NSError* __autoreleasing*)error {
 	return @{
 		@"id":@(self.theId),
-		@"name":(self.name == nil ? [NSNull null] : self.name),
+		@"name":jsonNullable(self.name),
 		@"owner":[self.owner dictionaryWithError:error],
-		@"description":(self.theDescription == nil ? [NSNull null] : self.theDescription),
-		@"url":(self.url == nil ? [NSNull null] : self.url),
+		@"description":jsonNullable(self.theDescription),
+		@"url":jsonNullable(self.url),
 		@"forks":@(self.forks),
 		@"open_issues":@(self.openIssues),
 		@"watchers":@(self.watchers)
@@ -192,20 +207,19 @@ static const NSUInteger jsonFormatOption =
 
 - (NSData*)dumpWithError:(NSError* __autoreleasing*)error {
 	NSDictionary* dict = [self dictionaryWithError:error];
-	if (*error) return nil;
-	else return [NSJSONSerialization dataWithJSONObject:[self dictionaryWithError:error] options:jsonFormatOption error:error];
+	if ( error && *error != nil ) return nil;
+	return [NSJSONSerialization dataWithJSONObject:dict options:jsonFormatOption error:error];
 }
 
 - (void)readDictionary:(NSDictionary*)dict withError:(NSError* __autoreleasing*)error {
-	id tmp;
-	self.theId = ( tmp = dict[@"id"], [tmp isEqual:[NSNull null]] ? 0 : ((NSNumber*)tmp).intValue );
-	self.name = ( tmp = dict[@"name"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
+	self.theId = jsonInt32(dict[@"id"]);
+	self.name = jsonString(dict[@"name"]);
 	self.owner = [[GitUser alloc] initWithDictionary:dict[@"owner"] error:error];
-	self.theDescription = ( tmp = dict[@"description"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.url = ( tmp = dict[@"url"], [tmp isEqual:[NSNull null]] ? nil : (NSString*)tmp );
-	self.forks = ( tmp = dict[@"forks"], [tmp isEqual:[NSNull null]] ? 0 : ((NSNumber*)tmp).intValue );
-	self.openIssues = ( tmp = dict[@"open_issues"], [tmp isEqual:[NSNull null]] ? 0 : ((NSNumber*)tmp).intValue );
-	self.watchers = ( tmp = dict[@"watchers"], [tmp isEqual:[NSNull null]] ? 0 : ((NSNumber*)tmp).intValue );
+	self.theDescription = jsonString(dict[@"description"]);
+	self.url = jsonString(dict[@"url"]);
+	self.forks = jsonInt32(dict[@"forks"]);
+	self.openIssues = jsonInt32(dict[@"open_issues"]);
+	self.watchers = jsonInt32(dict[@"watchers"]);
 }
 
 - (instancetype)initWithDictionary:(NSDictionary*)dictionary error:(NSError* __autoreleasing*)error {
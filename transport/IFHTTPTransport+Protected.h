@@ -26,13 +26,28 @@
 @interface IFHTTPTransport (Protected)
 
 - (NSMutableURLRequest*)prepareRequestWithURL:(NSURL*)url method:(IFHTTPMethod)method data:(NSData*)data;
+- (void)encodeBodyOfRequest:(NSMutableURLRequest*)request encoding:(IFContentEncoding)encoding;
 - (NSURL*)buildURL:(NSString*)endpoint;
+- (NSURL*)buildURL:(NSString*)endpoint params:(NSDictionary*)params;
 - (NSString*)buildRequestParamsString:(NSDictionary*)requestParams;
+- (NSError*)errorForResponse:(NSHTTPURLResponse*)response;
 - (BOOL)shouldBreakOnError:(NSError*)error;
+- (BOOL)shouldRetryAfterError:(NSError*)error;
+- (void)performRequest:(NSURLRequest*)request
+           retryPolicy:(IFRetryPolicy*)retryPolicy
+            completion:(void (^)(NSData* data, NSHTTPURLResponse* response, NSError* error))completion;
+- (void)performRequest:(NSURLRequest*)request
+           retryPolicy:(IFRetryPolicy*)retryPolicy
+           cachePolicy:(IFCachePolicy*)cachePolicy
+            completion:(void (^)(NSData* data, NSString* contentType, NSHTTPURLResponse* response, NSError* error))completion;
+- (NSString*)cacheKeyForRequest:(NSURLRequest*)request;
+- (id)coalescingKeyForRequest:(NSURLRequest*)request;
 
 @property (nonatomic, copy) NSURL* rootURL;
 @property (nonatomic, copy) NSData* currentAnswer;
+@property (nonatomic, copy) NSString* currentContentType;
 @property (nonatomic, copy) NSHTTPURLResponse* curentResponse;
 @property (nonatomic, copy) NSDictionary* currentRequestParams;
+@property (nonatomic) NSURLSession* session;
 
 @end
@@ -25,28 +25,70 @@
 #import "IFTransport.h"
 
 extern NSString* const IFHTTPTransportErrorDomain;
+// error codes of the domain are HTTP status codes but this one: a blocking writeAll: made on the queue
+// the session calls completions on, from a completion handler of an asynchronous call for example
+extern const NSInteger IFHTTPTransportBlockingCallOnSessionQueueError;
 
-typedef NS_ENUM(NSInteger, IFHTTPMethod) {
-	IFHTTPMETHOD_AUTO,
-    IFHTTPMETHOD_GET,
-    IFHTTPMETHOD_HEAD,
-    IFHTTPMETHOD_POST,
-    IFHTTPMETHOD_PUT,
-    IFHTTPMETHOD_DELETE,
-    IFHTTPMETHOD_PATCH,
-    IFHTTPMETHOD_OPTIONS,
-    IFHTTPMETHOD_TRACE
-};
+/**
+ *	initWithURL:options: keys. Transports created with equal options share one NSURLSession,
+ *	so connections are kept alive and reused across calls and transports.
+ **/
+
+// NSURLSessionConfiguration to start from, default one if missing
+extern NSString* const IFHTTPTransportSessionConfigurationOption;
+// NSNumber with NSInteger
+extern NSString* const IFHTTPTransportMaxConnectionsPerHostOption;
+// NSNumber with NSTimeInterval, seconds to wait for more data
+extern NSString* const IFHTTPTransportRequestTimeoutOption;
+// NSNumber with NSTimeInterval, seconds for the whole request
+extern NSString* const IFHTTPTransportResourceTimeoutOption;
+// NSNumber with NSURLRequestCachePolicy
+extern NSString* const IFHTTPTransportCachePolicyOption;
+// NSNumber with BOOL
+extern NSString* const IFHTTPTransportPipeliningOption;
 
-@interface IFHTTPTransport : NSObject<IFTransport>
+@interface IFHTTPTransport : NSObject<IFAsyncTransport>
 
 - (id)initWithURL:(NSURL*)url;
+- (id)initWithURL:(NSURL*)url options:(NSDictionary*)options;
 
 - (void)setUrlParams:(NSDictionary*)params;
 - (NSHTTPURLResponse*)currentResponse;
 
 - (BOOL)writeAll:(NSData*)data endpoint:(NSString*)endpoint method:(IFHTTPMethod)method error:(NSError* __autoreleasing*)error;
+// nil policies are the transport ones, cachePolicy nil means no caching
+- (BOOL)writeAll:(NSData*)data
+        endpoint:(NSString*)endpoint
+          method:(IFHTTPMethod)method
+     retryPolicy:(IFRetryPolicy*)retryPolicy
+     cachePolicy:(IFCachePolicy*)cachePolicy
+           error:(NSError* __autoreleasing*)error;
+// the body is compressed with bodyEncoding if it is compressionThreshold bytes or longer
+- (BOOL)writeAll:(NSData*)data
+        endpoint:(NSString*)endpoint
+          method:(IFHTTPMethod)method
+     retryPolicy:(IFRetryPolicy*)retryPolicy
+     cachePolicy:(IFCachePolicy*)cachePolicy
+    bodyEncoding:(IFContentEncoding)bodyEncoding
+           error:(NSError* __autoreleasing*)error;
 
+// used by requests with no retry policy of their own
+@property (nonatomic, copy) IFRetryPolicy* retryPolicy;
+// responses of requests with a cache policy, shared cache by default, nil turns caching off
+@property (nonatomic) IFResponseCache* responseCache;
+// GET and HEAD requests identical to one in flight share its response, YES by default
+@property (nonatomic) BOOL coalescesRequests;
+// requests sent to the network, retries included
+@property (nonatomic, readonly) NSUInteger sentRequestsCount;
+// requests answered by an identical one in flight
+@property (nonatomic, readonly) NSUInteger coalescedRequestsCount;
+// shorter request bodies are sent uncompressed whatever their encoding is, 1024 by default
+@property (nonatomic) NSUInteger compressionThreshold;
+// Accept-Encoding header of all the requests, "gzip, deflate" by default, nil leaves it to the session
+@property (nonatomic, copy) NSString* acceptEncoding;
+// Accept header of all the requests, nil by default; the Content-Type of the response goes along with the data answered
+@property (nonatomic, copy) NSString* accept;
+// same as retryPolicy.maxAttempts
 @property (nonatomic) NSInteger retriesCount;
 @property (nonatomic) NSString* userAgent;
 
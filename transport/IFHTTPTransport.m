@@ -23,6 +23,8 @@
 
 #import "IFHTTPTransport.h"
 #import "IFHTTPTransport+Protected.h"
+#import <zlib.h>
+#import <CommonCrypto/CommonDigest.h>
 
 #ifdef DEBUG
 #   define IFDebugLog(...) NSLog(__VA_ARGS__)
@@ -31,22 +33,45 @@
 #endif
 
 NSString* const IFHTTPTransportErrorDomain = @"com.oss.ifacegen.transport.httperror";
+const NSInteger IFHTTPTransportBlockingCallOnSessionQueueError = -1;
+
+NSString* const IFHTTPTransportSessionConfigurationOption = @"sessionConfiguration";
+NSString* const IFHTTPTransportMaxConnectionsPerHostOption = @"maxConnectionsPerHost";
+NSString* const IFHTTPTransportRequestTimeoutOption = @"requestTimeout";
+NSString* const IFHTTPTransportResourceTimeoutOption = @"resourceTimeout";
+NSString* const IFHTTPTransportCachePolicyOption = @"cachePolicy";
+NSString* const IFHTTPTransportPipeliningOption = @"pipelining";
 
 @interface IFHTTPTransport()
 
 @property (nonatomic, copy) NSURL* rootURL;
 @property (nonatomic, copy) NSData* currentAnswer;
+@property (nonatomic, copy) NSString* currentContentType;
 @property (nonatomic, copy) NSHTTPURLResponse* curentResponse;
 @property (nonatomic, copy) NSDictionary* currentRequestParams;
+@property (nonatomic) NSURLSession* session;
+@property (nonatomic) NSMutableDictionary* inFlightRequests;
+@property (nonatomic, readwrite) NSUInteger sentRequestsCount;
+@property (nonatomic, readwrite) NSUInteger coalescedRequestsCount;
 
 @end
 
 @implementation IFHTTPTransport
 
 - (id)initWithURL:(NSURL*)url {
+    return [self initWithURL:url options:nil];
+}
+
+- (id)initWithURL:(NSURL*)url options:(NSDictionary*)options {
     if ( self = [super init] ) {
         self.rootURL = url;
-        self.retriesCount = 3;
+        self.session = [[self class] sessionWithOptions:options];
+        self.retryPolicy = [IFRetryPolicy defaultPolicy];
+        self.responseCache = [IFResponseCache sharedCache];
+        self.coalescesRequests = YES;
+        self.compressionThreshold = 1024;
+        self.acceptEncoding = @"gzip, deflate";
+        self.inFlightRequests = [NSMutableDictionary dictionary];
 
         NSString* appVersion = [[[NSBundle mainBundle] infoDictionary] objectForKey:@"CFBundleVersion"];
         NSString* appName = [[NSBundle mainBundle] bundleIdentifier];
@@ -55,6 +80,49 @@ NSString* const IFHTTPTransportErrorDomain = @"com.oss.ifacegen.transport.httper
     return self;
 }
 
++ (NSURLSession*)sessionWithOptions:(NSDictionary*)options {
+    static NSMutableDictionary* sessions;
+    static dispatch_once_t onceToken;
+    dispatch_once(&onceToken, ^{
+        sessions = [NSMutableDictionary dictionary];
+    });
+
+    NSDictionary* key = options ?: @{};
+    @synchronized(sessions) {
+        NSURLSession* session = [sessions objectForKey:key];
+        if ( session == nil ) {
+            session = [NSURLSession sessionWithConfiguration:[self sessionConfigurationWithOptions:options]];
+            [sessions setObject:session forKey:key];
+        }
+        return session;
+    }
+}
+
++ (NSURLSessionConfiguration*)sessionConfigurationWithOptions:(NSDictionary*)options {
+    NSURLSessionConfiguration* configuration = [[options objectForKey:IFHTTPTransportSessionConfigurationOption] copy];
+    if ( configuration == nil ) {
+        configuration = [NSURLSessionConfiguration defaultSessionConfiguration];
+    }
+
+    NSNumber* value;
+    if ( (value = [options objectForKey:IFHTTPTransportMaxConnectionsPerHostOption]) != nil ) {
+        configuration.HTTPMaximumConnectionsPerHost = [value integerValue];
+    }
+    if ( (value = [options objectForKey:IFHTTPTransportRequestTimeoutOption]) != nil ) {
+        configuration.timeoutIntervalForRequest = [value doubleValue];
+    }
+    if ( (value = [options objectForKey:IFHTTPTransportResourceTimeoutOption]) != nil ) {
+        configuration.timeoutIntervalForResource = [value doubleValue];
+    }
+    if ( (value = [options objectForKey:IFHTTPTransportCachePolicyOption]) != nil ) {
+        configuration.requestCachePolicy = [value unsignedIntegerValue];
+    }
+    if ( (value = [options objectForKey:IFHTTPTransportPipeliningOption]) != nil ) {
+        configuration.HTTPShouldUsePipelining = [value boolValue];
+    }
+    return configuration;
+}
+
 - (void)setUrlParams:(NSDictionary*)params {
     self.currentRequestParams = params;
 }
@@ -62,47 +130,78 @@ NSString* const IFHTTPTransportErrorDomain = @"com.oss.ifacegen.transport.httper
 #pragma mark - Transport proto
 
 - (BOOL)writeAll:(NSData*)data endpoint:(NSString*)endpoint method:(IFHTTPMethod)method error:(NSError* __autoreleasing*)error {
-    *error = nil;
+    return [self writeAll:data endpoint:endpoint method:method retryPolicy:nil cachePolicy:nil error:error];
+}
+
+- (BOOL)writeAll:(NSData*)data
+        endpoint:(NSString*)endpoint
+          method:(IFHTTPMethod)method
+     retryPolicy:(IFRetryPolicy*)retryPolicy
+     cachePolicy:(IFCachePolicy*)cachePolicy
+           error:(NSError* __autoreleasing*)error {
+    return [self writeAll:data endpoint:endpoint method:method retryPolicy:retryPolicy cachePolicy:cachePolicy bodyEncoding:IFCONTENTENCODING_IDENTITY error:error];
+}
+
+- (BOOL)writeAll:(NSData*)data
+        endpoint:(NSString*)endpoint
+          method:(IFHTTPMethod)method
+     retryPolicy:(IFRetryPolicy*)retryPolicy
+     cachePolicy:(IFCachePolicy*)cachePolicy
+    bodyEncoding:(IFContentEncoding)bodyEncoding
+           error:(NSError* __autoreleasing*)error {
+    if ( error ) {
+        *error = nil;
+    }
+    
+    // the answer would come on the very queue waiting for it
+    if ( [NSOperationQueue currentQueue] == self.session.delegateQueue ) {
+        if ( error ) {
+            *error = [[NSError alloc] initWithDomain:IFHTTPTransportErrorDomain
+                                                code:IFHTTPTransportBlockingCallOnSessionQueueError
+                                            userInfo:@{ NSLocalizedDescriptionKey: @"Blocking call can't be made on the session queue, use the completion handler method" }];
+        }
+        return NO;
+    }
     
     self.currentAnswer = nil;
+    self.currentContentType = nil;
     self.curentResponse = nil;
     
     NSURL* requestURL = [self buildURL:endpoint];
     NSMutableURLRequest* request = [self prepareRequestWithURL:requestURL method:method data:data];
+    [self encodeBodyOfRequest:request encoding:bodyEncoding];
     
-    NSHTTPURLResponse* response;
-    NSInteger retriesCounter = self.retriesCount;
-    while ( retriesCounter-- ) {
-        self.currentAnswer = [NSURLConnection sendSynchronousRequest:request
-                                                   returningResponse:&response
-                                                               error:error];
-        
-        if ( *error == nil || [self shouldBreakOnError:*error] ) {
-            break;
-        }
-        
-        sleep(10);
-    }
-    
-    if ( *error != nil ) {
-        return NO;
-    }
+    // the calling thread just waits for the answer, retries are scheduled on a queue
+    dispatch_semaphore_t done = dispatch_semaphore_create(0);
+    __block NSData* answer;
+    __block NSString* contentType;
+    __block NSHTTPURLResponse* response;
+    __block NSError* requestError;
+    [self performRequest:request
+             retryPolicy:retryPolicy ?: self.retryPolicy
+             cachePolicy:cachePolicy
+              completion:^(NSData* data, NSString* dataContentType, NSHTTPURLResponse* httpResponse, NSError* httpError) {
+                  answer = data;
+                  contentType = dataContentType;
+                  response = httpResponse;
+                  requestError = httpError;
+                  dispatch_semaphore_signal(done);
+              }];
+    dispatch_semaphore_wait(done, DISPATCH_TIME_FOREVER);
     
-    self.currentRequestParams = nil;
+    self.currentAnswer = answer;
+    self.currentContentType = contentType;
     self.curentResponse = response;
     
-    IFDebugLog(@"Response code: %ld", (long)[self.curentResponse statusCode]);
-    
-    if ( [self.curentResponse statusCode] < 200 || [self.curentResponse statusCode] > 202 ) {
-        
-        NSDictionary* userInfo = @{ @"NSLocalizedDescriptionKey": [NSHTTPURLResponse localizedStringForStatusCode:
-                                                                   [self.curentResponse statusCode]
-                                                                   ]};
-        
-        *error = [[NSError alloc] initWithDomain:IFHTTPTransportErrorDomain
-                                            code:[self.curentResponse statusCode]
-                                        userInfo:userInfo];
-        
+    // no response for a fresh cached answer
+    if ( response != nil || requestError == nil ) {
+        self.currentRequestParams = nil;
+    }
+    
+    if ( requestError != nil ) {
+        if ( error ) {
+            *error = requestError;
+        }
         return NO;
     }
     
@@ -126,15 +225,232 @@ NSString* const IFHTTPTransportErrorDomain = @"com.oss.ifacegen.transport.httper
     return self.currentAnswer;
 }
 
+- (NSString*)readContentType {
+    return self.currentContentType;
+}
+
 - (NSHTTPURLResponse*)currentResponse {
     return self.curentResponse;
 }
 
+- (NSInteger)retriesCount {
+    return self.retryPolicy.maxAttempts;
+}
+
+- (void)setRetriesCount:(NSInteger)retriesCount {
+    IFRetryPolicy* retryPolicy = [self.retryPolicy copy] ?: [IFRetryPolicy defaultPolicy];
+    retryPolicy.maxAttempts = retriesCount;
+    self.retryPolicy = retryPolicy;
+}
+
+#pragma mark - Async transport proto
+
+- (void)sendRequest:(IFTransportRequest*)request completion:(IFTransportCompletion)completion {
+    NSURL* requestURL = [self buildURL:request.endpoint params:[request paramsForSection:@"url_params"]];
+    NSMutableURLRequest* urlRequest = [self prepareRequestWithURL:requestURL method:request.method data:request.body];
+    [self encodeBodyOfRequest:urlRequest encoding:request.bodyEncoding];
+
+    [self performRequest:urlRequest
+             retryPolicy:request.retryPolicy ?: self.retryPolicy
+             cachePolicy:request.cachePolicy
+              completion:^(NSData* data, NSString* contentType, NSHTTPURLResponse* response, NSError* error) {
+                  completion([data length] ? data : nil, contentType, error);
+              }];
+}
+
+#pragma mark - Cache
+
+- (void)performRequest:(NSURLRequest*)request
+           retryPolicy:(IFRetryPolicy*)retryPolicy
+           cachePolicy:(IFCachePolicy*)cachePolicy
+            completion:(void (^)(NSData* data, NSString* contentType, NSHTTPURLResponse* response, NSError* error))completion {
+    IFResponseCache* responseCache = self.responseCache;
+    BOOL cacheable = [request.HTTPMethod isEqualToString:@"GET"] || [request.HTTPMethod isEqualToString:@"HEAD"];
+    if ( cachePolicy == nil || responseCache == nil || !cacheable ) {
+        [self performRequest:request
+                 retryPolicy:retryPolicy
+                  completion:^(NSData* data, NSHTTPURLResponse* response, NSError* error) {
+                      completion(data, response.MIMEType, response, error);
+                  }];
+        return;
+    }
+
+    NSString* cacheKey = [self cacheKeyForRequest:request];
+    IFResponseCacheEntry* entry = [responseCache entryForKey:cacheKey];
+    if ( entry != nil && [entry isFreshForPolicy:cachePolicy] ) {
+        IFDebugLog(@"Cached response: %@", cacheKey);
+        // completions never run before the call returns, cached answers come on the session queue too
+        [self.session.delegateQueue addOperationWithBlock:^{
+            completion(entry.data, entry.contentType, nil, nil);
+        }];
+        return;
+    }
+
+    // responses are cached here, not by the session
+    NSMutableURLRequest* conditionalRequest = [request mutableCopy];
+    conditionalRequest.cachePolicy = NSURLRequestReloadIgnoringLocalCacheData;
+    if ( entry != nil && cachePolicy.revalidate ) {
+        if ( entry.etag != nil ) {
+            [conditionalRequest setValue:entry.etag forHTTPHeaderField:@"If-None-Match"];
+        }
+        if ( entry.lastModified != nil ) {
+            [conditionalRequest setValue:entry.lastModified forHTTPHeaderField:@"If-Modified-Since"];
+        }
+    }
+
+    [self performRequest:conditionalRequest
+             retryPolicy:retryPolicy
+              completion:^(NSData* data, NSHTTPURLResponse* response, NSError* error) {
+                  if ( [response statusCode] == 304 && entry != nil && cachePolicy.revalidate ) {
+                      IFDebugLog(@"Revalidated cached response: %@", cacheKey);
+                      // 304 answer carries no body, the content type is the one of the cached response
+                      IFResponseCacheEntry* revalidated = [responseCache revalidateEntry:entry];
+                      completion(revalidated.data, revalidated.contentType, response, nil);
+                      return;
+                  }
+
+                  if ( error == nil ) {
+                      IFResponseCacheEntry* stored = [responseCache storeData:data response:response forKey:cacheKey];
+                      if ( stored != nil ) {
+                          data = stored.data;
+                      }
+                  }
+                  completion(data, response.MIMEType, response, error);
+              }];
+}
+
+static BOOL IFCacheKeyIgnoresHeader(NSString* field) {
+    // conditional headers are added to the cached request itself, the others don't change the answer
+    static NSSet* ignoredHeaders;
+    static dispatch_once_t onceToken;
+    dispatch_once(&onceToken, ^{
+        ignoredHeaders = [NSSet setWithObjects:@"if-none-match", @"if-modified-since", @"user-agent", @"accept-encoding", @"content-length", nil];
+    });
+    return [ignoredHeaders containsObject:[field lowercaseString]];
+}
+
+- (NSString*)cacheKeyForRequest:(NSURLRequest*)request {
+    // the cache may be shared by transports sending different credentials, so every header that may
+    // change the answer is a part of the key, as it is of the coalescing one; they are hashed
+    // so Authorization and Cookie values are not written to the disk tier
+    NSDictionary* fields = [request allHTTPHeaderFields];
+    NSMutableString* headers = [NSMutableString string];
+    for ( NSString* field in [[fields allKeys] sortedArrayUsingSelector:@selector(caseInsensitiveCompare:)] ) {
+        if ( !IFCacheKeyIgnoresHeader(field) ) {
+            [headers appendFormat:@"%@: %@\n", [field lowercaseString], [fields objectForKey:field]];
+        }
+    }
+    NSData* headerData = [headers dataUsingEncoding:NSUTF8StringEncoding];
+    unsigned char digest[CC_SHA256_DIGEST_LENGTH];
+    CC_SHA256([headerData bytes], (CC_LONG)[headerData length], digest);
+
+    NSMutableString* key = [NSMutableString stringWithFormat:@"%@ %@ ", request.HTTPMethod, [request.URL absoluteString]];
+    for ( NSUInteger index = 0; index < CC_SHA256_DIGEST_LENGTH; index++ ) {
+        [key appendFormat:@"%02x", digest[index]];
+    }
+    return key;
+}
+
+#pragma mark - Retries
+
+- (void)performRequest:(NSURLRequest*)request
+           retryPolicy:(IFRetryPolicy*)retryPolicy
+            completion:(void (^)(NSData* data, NSHTTPURLResponse* response, NSError* error))completion {
+    id key = [self coalescingKeyForRequest:request];
+    if ( key == nil ) {
+        [self performRequest:request retryPolicy:retryPolicy attempt:1 startDate:[NSDate date] completion:completion];
+        return;
+    }
+
+    // an identical request in flight answers this one too
+    @synchronized(self.inFlightRequests) {
+        NSMutableArray* completions = [self.inFlightRequests objectForKey:key];
+        if ( completions != nil ) {
+            [completions addObject:[completion copy]];
+            self.coalescedRequestsCount++;
+            IFDebugLog(@"Coalesced request: %@", request);
+            return;
+        }
+        [self.inFlightRequests setObject:[NSMutableArray arrayWithObject:[completion copy]] forKey:key];
+    }
+
+    [self performRequest:request
+             retryPolicy:retryPolicy
+                 attempt:1
+               startDate:[NSDate date]
+              completion:^(NSData* data, NSHTTPURLResponse* response, NSError* error) {
+                  NSArray* completions;
+                  @synchronized(self.inFlightRequests) {
+                      completions = [self.inFlightRequests objectForKey:key];
+                      [self.inFlightRequests removeObjectForKey:key];
+                  }
+                  for ( void (^waiting)(NSData*, NSHTTPURLResponse*, NSError*) in completions ) {
+                      waiting(data, response, error);
+                  }
+              }];
+}
+
+- (id)coalescingKeyForRequest:(NSURLRequest*)request {
+    // only requests that read data are shared, two writes stay two writes
+    BOOL safe = [request.HTTPMethod isEqualToString:@"GET"] || [request.HTTPMethod isEqualToString:@"HEAD"];
+    if ( !self.coalescesRequests || !safe ) {
+        return nil;
+    }
+    // headers tell conditional requests apart
+    return @[ request.HTTPMethod,
+              [request.URL absoluteString],
+              request.HTTPBody ?: [NSNull null],
+              [request allHTTPHeaderFields] ?: @{} ];
+}
+
+- (void)performRequest:(NSURLRequest*)request
+           retryPolicy:(IFRetryPolicy*)retryPolicy
+               attempt:(NSInteger)attempt
+             startDate:(NSDate*)startDate
+            completion:(void (^)(NSData* data, NSHTTPURLResponse* response, NSError* error))completion {
+    @synchronized(self.inFlightRequests) {
+        self.sentRequestsCount++;
+    }
+
+    NSURLSessionDataTask* task = [self.session dataTaskWithRequest:request
+                                                 completionHandler:^(NSData* data, NSURLResponse* urlResponse, NSError* error) {
+        NSHTTPURLResponse* response = (NSHTTPURLResponse*)urlResponse;
+        if ( error == nil ) {
+            IFDebugLog(@"Response code: %ld", (long)[response statusCode]);
+            error = [self errorForResponse:response];
+        }
+
+        NSTimeInterval delay = IFRetryPolicyNoRetry;
+        if ( error != nil && [self shouldRetryAfterError:error] ) {
+            delay = [retryPolicy delayBeforeAttempt:attempt + 1
+                                         httpMethod:request.HTTPMethod
+                                           response:response
+                                        elapsedTime:-[startDate timeIntervalSinceNow]];
+        }
+
+        if ( delay < 0 ) {
+            completion(data, response, error);
+            return;
+        }
+
+        IFDebugLog(@"Retrying in %.2f s after error: %@", delay, error);
+        dispatch_after(dispatch_time(DISPATCH_TIME_NOW, (int64_t)(delay * NSEC_PER_SEC)),
+                       dispatch_get_global_queue(DISPATCH_QUEUE_PRIORITY_DEFAULT, 0), ^{
+            [self performRequest:request retryPolicy:retryPolicy attempt:attempt + 1 startDate:startDate completion:completion];
+        });
+    }];
+    [task resume];
+}
+
 #pragma mark - Overrides
 
 static NSString* const methods[] = { @"", @"GET", @"HEAD", @"POST", @"PUT", @"DELETE", @"PATCH", @"OPTIONS", @"TRACE" };
 
 - (NSURL*)buildURL:(NSString*)endpoint {
+    return [self buildURL:endpoint params:self.currentRequestParams];
+}
+
+- (NSURL*)buildURL:(NSString*)endpoint params:(NSDictionary*)params {
     if ( endpoint == nil ) {
         endpoint = @"";
     }
@@ -147,8 +463,8 @@ static NSString* const methods[] = { @"", @"GET", @"HEAD", @"POST", @"PUT", @"DE
     }
     
     NSString* requestParamsString;
-    if ( self.currentRequestParams != nil ) {
-        requestParamsString = [self buildRequestParamsString:self.currentRequestParams];
+    if ( params != nil ) {
+        requestParamsString = [self buildRequestParamsString:params];
         requestURL = [NSURL URLWithString: [[requestURL absoluteString] stringByAppendingString:requestParamsString]];
     }
     
@@ -157,7 +473,10 @@ static NSString* const methods[] = { @"", @"GET", @"HEAD", @"POST", @"PUT", @"DE
 
 - (NSMutableURLRequest*)prepareRequestWithURL:(NSURL*)url method:(IFHTTPMethod)method data:(NSData*)data {
     
-    NSMutableURLRequest *request = [[NSMutableURLRequest alloc] initWithURL:url];
+    NSURLSessionConfiguration* configuration = self.session.configuration;
+    NSMutableURLRequest *request = [[NSMutableURLRequest alloc] initWithURL:url
+                                                                cachePolicy:configuration.requestCachePolicy
+                                                            timeoutInterval:configuration.timeoutIntervalForRequest];
     IFDebugLog(@"Request: %@", request);
 
     if ( method == IFHTTPMETHOD_AUTO ) {
@@ -184,18 +503,64 @@ static NSString* const methods[] = { @"", @"GET", @"HEAD", @"POST", @"PUT", @"DE
     }
 
     [request setValue:self.userAgent forHTTPHeaderField:@"User-Agent"];
+    if ( self.acceptEncoding != nil ) {
+        // the session inflates gzip and deflate responses by itself
+        [request setValue:self.acceptEncoding forHTTPHeaderField:@"Accept-Encoding"];
+    }
+    if ( self.accept != nil ) {
+        [request setValue:self.accept forHTTPHeaderField:@"Accept"];
+    }
 
     return request;
 }
 
+static NSData* IFCompressedData(NSData* data, IFContentEncoding encoding) {
+    z_stream stream;
+    memset(&stream, 0, sizeof(stream));
+    // gzip wrapper for gzip, zlib one for HTTP deflate
+    int windowBits = encoding == IFCONTENTENCODING_GZIP ? MAX_WBITS + 16 : MAX_WBITS;
+    if ( deflateInit2(&stream, Z_DEFAULT_COMPRESSION, Z_DEFLATED, windowBits, 8, Z_DEFAULT_STRATEGY) != Z_OK ) {
+        return nil;
+    }
+    NSMutableData* compressed = [NSMutableData dataWithLength:deflateBound(&stream, (uLong)[data length])];
+    stream.next_in = (Bytef*)[data bytes];
+    stream.avail_in = (uInt)[data length];
+    stream.next_out = [compressed mutableBytes];
+    stream.avail_out = (uInt)[compressed length];
+    int status = deflate(&stream, Z_FINISH);
+    deflateEnd(&stream);
+    if ( status != Z_STREAM_END ) {
+        return nil;
+    }
+    [compressed setLength:stream.total_out];
+    return compressed;
+}
+
+- (void)encodeBodyOfRequest:(NSMutableURLRequest*)request encoding:(IFContentEncoding)encoding {
+    NSData* body = request.HTTPBody;
+    if ( encoding == IFCONTENTENCODING_IDENTITY || body == nil || [body length] < self.compressionThreshold ) {
+        return;
+    }
+    NSData* compressedBody = IFCompressedData(body, encoding);
+    // an incompressible body is sent as it is
+    if ( compressedBody == nil || [compressedBody length] >= [body length] ) {
+        return;
+    }
+    IFDebugLog(@"Request body compressed from %lu to %lu bytes", (unsigned long)[body length], (unsigned long)[compressedBody length]);
+    [request setHTTPBody:compressedBody];
+    [request setValue:(encoding == IFCONTENTENCODING_GZIP ? @"gzip" : @"deflate") forHTTPHeaderField:@"Content-Encoding"];
+    [request setValue:[NSString stringWithFormat:@"%lu", (unsigned long)[compressedBody length]]
+   forHTTPHeaderField:@"Content-Length"];
+}
+
 - (NSString*)buildRequestParamsString:(NSDictionary*)requestParams {
 
     NSString* reqParm = [NSString string];
     NSString* separator = @"?";
 
-    for ( NSString* key in [self.currentRequestParams allKeys] ) {
+    for ( NSString* key in [requestParams allKeys] ) {
     
-        NSString* keyValue = [NSString stringWithFormat:@"%@", [self.currentRequestParams objectForKey:key]];
+        NSString* keyValue = [NSString stringWithFormat:@"%@", [requestParams objectForKey:key]];
         if ( [keyValue isEqual:[NSNull null]] || [keyValue length] == 0 ) {
             continue;
         }
@@ -212,6 +577,33 @@ static NSString* const methods[] = { @"", @"GET", @"HEAD", @"POST", @"PUT", @"DE
     return reqParm;
 }
 
+- (NSError*)errorForResponse:(NSHTTPURLResponse*)response {
+    if ( [response statusCode] >= 200 && [response statusCode] <= 202 ) {
+        return nil;
+    }
+
+    NSDictionary* userInfo = @{ @"NSLocalizedDescriptionKey": [NSHTTPURLResponse localizedStringForStatusCode:
+                                                               [response statusCode]
+                                                               ]};
+
+    return [[NSError alloc] initWithDomain:IFHTTPTransportErrorDomain
+                                      code:[response statusCode]
+                                  userInfo:userInfo];
+}
+
+- (BOOL)shouldRetryAfterError:(NSError*)error {
+    if ( [[error domain] isEqualToString:IFHTTPTransportErrorDomain] ) {
+        // server is busy or timed out, anything else is the same next time
+        switch ( [error code] ) {
+            case 408: case 429: case 500: case 502: case 503: case 504:
+                return YES;
+            default:
+                return NO;
+        }
+    }
+    return ![self shouldBreakOnError:error];
+}
+
 - (BOOL)shouldBreakOnError:(NSError*)error {
 
     // connection lost, retry doesn't needed
@@ -0,0 +1,77 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import <Foundation/Foundation.h>
+
+extern NSString* const IFJSONReaderErrorDomain;
+
+/**
+ *	Pull reader the generated initWithJSONReader: methods decode JSON with.
+ *	Values are read right from the bytes of NSData, which has to live while the reader is used,
+ *	with no intermediate NSDictionary trees. Once an error occurs, all the functions return empty values.
+ **/
+
+typedef struct {
+    const uint8_t* bytes;
+    NSUInteger length;
+    NSUInteger position;
+    BOOL firstMember;
+    const char* errorMessage;
+    NSUInteger errorPosition;
+    char keyBuffer[256];
+} IFJSONReader;
+
+typedef struct {
+    const char* bytes;
+    NSUInteger length;
+} IFJSONKey;
+
+#define IFJSONKeyEquals(key, literal) ((key).length == sizeof(literal) - 1 && memcmp((key).bytes, (literal), sizeof(literal) - 1) == 0)
+
+void IFJSONReaderInit(IFJSONReader* reader, NSData* data);
+/** fails if an error occured or there is anything but whitespace after the value read */
+BOOL IFJSONReaderFinish(IFJSONReader* reader, NSError* __autoreleasing* error);
+BOOL IFJSONReaderFailed(IFJSONReader* reader);
+
+/** NO for null */
+BOOL IFJSONReaderBeginObject(IFJSONReader* reader);
+/** NO after the last member, the value of the member has to be read or skipped before the next call */
+BOOL IFJSONReaderNextKey(IFJSONReader* reader, IFJSONKey* key);
+/** NO for null */
+BOOL IFJSONReaderBeginArray(IFJSONReader* reader);
+/** NO after the last item, the item has to be read or skipped before the next call */
+BOOL IFJSONReaderNextItem(IFJSONReader* reader);
+void IFJSONReaderSkipValue(IFJSONReader* reader);
+
+/** numbers are converted the way NSNumber and NSString do, null is read as 0 */
+BOOL IFJSONReadBool(IFJSONReader* reader);
+int32_t IFJSONReadInt32(IFJSONReader* reader);
+int64_t IFJSONReadInt64(IFJSONReader* reader);
+double IFJSONReadDouble(IFJSONReader* reader);
+
+/** nil for null */
+NSString* IFJSONReadString(IFJSONReader* reader);
+/** value read by NSJSONSerialization, nil for null */
+id IFJSONReadObject(IFJSONReader* reader);
+/** value read by NSJSONSerialization from a string value, nil for null */
+id IFJSONReadObjectString(IFJSONReader* reader);
@@ -0,0 +1,535 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import "IFJSONReader.h"
+
+NSString* const IFJSONReaderErrorDomain = @"com.oss.ifacegen.jsonreader";
+
+static const NSUInteger IFJSONReaderMaxDepth = 512;
+
+static void IFJSONReaderFail(IFJSONReader* reader, const char* message) {
+    if ( reader->errorMessage == NULL ) {
+        reader->errorMessage = message;
+        reader->errorPosition = reader->position;
+    }
+}
+
+static void IFJSONReaderSkipWhitespace(IFJSONReader* reader) {
+    while ( reader->position < reader->length ) {
+        uint8_t c = reader->bytes[reader->position];
+        if ( c != ' ' && c != '\t' && c != '\n' && c != '\r' ) {
+            return;
+        }
+        reader->position++;
+    }
+}
+
+/** skips whitespace and returns the next byte without consuming it, 0 at the end of data or after an error */
+static uint8_t IFJSONReaderPeek(IFJSONReader* reader) {
+    if ( reader->errorMessage != NULL ) {
+        return 0;
+    }
+    IFJSONReaderSkipWhitespace(reader);
+    if ( reader->position >= reader->length ) {
+        IFJSONReaderFail(reader, "Unexpected end of JSON data");
+        return 0;
+    }
+    return reader->bytes[reader->position];
+}
+
+static BOOL IFJSONReaderConsumeLiteral(IFJSONReader* reader, const char* literal, NSUInteger length) {
+    if ( reader->length - reader->position < length || memcmp(reader->bytes + reader->position, literal, length) != 0 ) {
+        IFJSONReaderFail(reader, "Invalid literal");
+        return NO;
+    }
+    reader->position += length;
+    return YES;
+}
+
+/** consumes null if it is the next value */
+static BOOL IFJSONReaderSkipNull(IFJSONReader* reader) {
+    if ( IFJSONReaderPeek(reader) != 'n' ) {
+        return NO;
+    }
+    IFJSONReaderConsumeLiteral(reader, "null", 4);
+    return YES;
+}
+
+/** finds the end of the string starting at the current position, which is the opening quote */
+static BOOL IFJSONReaderScanString(IFJSONReader* reader, NSUInteger* start, NSUInteger* end, BOOL* escaped) {
+    NSUInteger position = reader->position + 1;
+    *escaped = NO;
+    while ( position < reader->length ) {
+        uint8_t c = reader->bytes[position];
+        if ( c == '"' ) {
+            *start = reader->position + 1;
+            *end = position;
+            reader->position = position + 1;
+            return YES;
+        }
+        if ( c == '\\' ) {
+            *escaped = YES;
+            position++;
+        } else if ( c < 0x20 ) {
+            reader->position = position;
+            IFJSONReaderFail(reader, "Control character in string");
+            return NO;
+        }
+        position++;
+    }
+    reader->position = reader->length;
+    IFJSONReaderFail(reader, "Unterminated string");
+    return NO;
+}
+
+static int IFJSONHexValue(uint8_t c) {
+    if ( c >= '0' && c <= '9' ) return c - '0';
+    if ( c >= 'a' && c <= 'f' ) return c - 'a' + 10;
+    if ( c >= 'A' && c <= 'F' ) return c - 'A' + 10;
+    return -1;
+}
+
+static BOOL IFJSONReadHex4(const uint8_t* bytes, NSUInteger position, NSUInteger end, uint32_t* value) {
+    if ( end - position < 4 ) {
+        return NO;
+    }
+    *value = 0;
+    for ( NSUInteger i = position; i < position + 4; ++i ) {
+        int digit = IFJSONHexValue(bytes[i]);
+        if ( digit < 0 ) {
+            return NO;
+        }
+        *value = (*value << 4) | digit;
+    }
+    return YES;
+}
+
+/** unescapes bytes[start, end) into output, which has to be at least end - start long; returns the length written or NSNotFound */
+static NSUInteger IFJSONUnescape(const uint8_t* bytes, NSUInteger start, NSUInteger end, char* output) {
+    NSUInteger length = 0;
+    NSUInteger position = start;
+    while ( position < end ) {
+        uint8_t c = bytes[position++];
+        if ( c != '\\' ) {
+            output[length++] = c;
+            continue;
+        }
+        if ( position >= end ) {
+            return NSNotFound;
+        }
+        c = bytes[position++];
+        switch ( c ) {
+            case '"': output[length++] = '"'; break;
+            case '\\': output[length++] = '\\'; break;
+            case '/': output[length++] = '/'; break;
+            case 'b': output[length++] = '\b'; break;
+            case 'f': output[length++] = '\f'; break;
+            case 'n': output[length++] = '\n'; break;
+            case 'r': output[length++] = '\r'; break;
+            case 't': output[length++] = '\t'; break;
+            case 'u': {
+                uint32_t codePoint;
+                if ( !IFJSONReadHex4(bytes, position, end, &codePoint) ) {
+                    return NSNotFound;
+                }
+                position += 4;
+                if ( codePoint >= 0xD800 && codePoint <= 0xDBFF ) {
+                    uint32_t lowSurrogate;
+                    if ( end - position < 6 || bytes[position] != '\\' || bytes[position + 1] != 'u' ||
+                         !IFJSONReadHex4(bytes, position + 2, end, &lowSurrogate) || lowSurrogate < 0xDC00 || lowSurrogate > 0xDFFF ) {
+                        return NSNotFound;
+                    }
+                    position += 6;
+                    codePoint = 0x10000 + ((codePoint - 0xD800) << 10) + (lowSurrogate - 0xDC00);
+                }
+                //an escape takes at least as many bytes as its UTF-8 encoding
+                if ( codePoint < 0x80 ) {
+                    output[length++] = (char)codePoint;
+                } else if ( codePoint < 0x800 ) {
+                    output[length++] = (char)(0xC0 | (codePoint >> 6));
+                    output[length++] = (char)(0x80 | (codePoint & 0x3F));
+                } else if ( codePoint < 0x10000 ) {
+                    output[length++] = (char)(0xE0 | (codePoint >> 12));
+                    output[length++] = (char)(0x80 | ((codePoint >> 6) & 0x3F));
+                    output[length++] = (char)(0x80 | (codePoint & 0x3F));
+                } else {
+                    output[length++] = (char)(0xF0 | (codePoint >> 18));
+                    output[length++] = (char)(0x80 | ((codePoint >> 12) & 0x3F));
+                    output[length++] = (char)(0x80 | ((codePoint >> 6) & 0x3F));
+                    output[length++] = (char)(0x80 | (codePoint & 0x3F));
+                }
+                break;
+            }
+            default:
+                return NSNotFound;
+        }
+    }
+    return length;
+}
+
+static void IFJSONReaderSkipNumber(IFJSONReader* reader) {
+    NSUInteger start = reader->position;
+    while ( reader->position < reader->length ) {
+        uint8_t c = reader->bytes[reader->position];
+        if ( !((c >= '0' && c <= '9') || c == '-' || c == '+' || c == '.' || c == 'e' || c == 'E') ) {
+            break;
+        }
+        reader->position++;
+    }
+    if ( reader->position == start ) {
+        IFJSONReaderFail(reader, "Unexpected character");
+    }
+}
+
+void IFJSONReaderSkipValue(IFJSONReader* reader) {
+    NSUInteger depth = 0;
+    do {
+        uint8_t c = IFJSONReaderPeek(reader);
+        NSUInteger start, end;
+        BOOL escaped;
+        switch ( c ) {
+            case 0:
+                return;
+            case '{':
+            case '[':
+                if ( ++depth > IFJSONReaderMaxDepth ) {
+                    IFJSONReaderFail(reader, "JSON is nested too deep");
+                    return;
+                }
+                reader->position++;
+                //empty containers are closed right away
+                c = IFJSONReaderPeek(reader);
+                if ( c == '}' || c == ']' ) {
+                    reader->position++;
+                    depth--;
+                }
+                continue;
+            case '}':
+            case ']':
+            case ',':
+            case ':':
+                if ( depth == 0 ) {
+                    IFJSONReaderFail(reader, "Unexpected character");
+                    return;
+                }
+                reader->position++;
+                if ( c == '}' || c == ']' ) {
+                    depth--;
+                }
+                continue;
+            case '"':
+                IFJSONReaderScanString(reader, &start, &end, &escaped);
+                break;
+            case 't':
+                IFJSONReaderConsumeLiteral(reader, "true", 4);
+                break;
+            case 'f':
+                IFJSONReaderConsumeLiteral(reader, "false", 5);
+                break;
+            case 'n':
+                IFJSONReaderConsumeLiteral(reader, "null", 4);
+                break;
+            default:
+                IFJSONReaderSkipNumber(reader);
+                break;
+        }
+    } while ( depth > 0 && reader->errorMessage == NULL );
+}
+
+void IFJSONReaderInit(IFJSONReader* reader, NSData* data) {
+    reader->bytes = data.bytes;
+    reader->length = data.length;
+    reader->position = 0;
+    reader->firstMember = NO;
+    reader->errorMessage = NULL;
+    reader->errorPosition = 0;
+}
+
+BOOL IFJSONReaderFailed(IFJSONReader* reader) {
+    return reader->errorMessage != NULL;
+}
+
+BOOL IFJSONReaderFinish(IFJSONReader* reader, NSError* __autoreleasing* error) {
+    if ( reader->errorMessage == NULL ) {
+        IFJSONReaderSkipWhitespace(reader);
+        if ( reader->position < reader->length ) {
+            IFJSONReaderFail(reader, "Garbage at the end of JSON data");
+        }
+    }
+    if ( reader->errorMessage == NULL ) {
+        return YES;
+    }
+    if ( error ) {
+        NSString* message = [NSString stringWithFormat:@"%s at offset %lu", reader->errorMessage, (unsigned long)reader->errorPosition];
+        *error = [NSError errorWithDomain:IFJSONReaderErrorDomain code:0 userInfo:@{NSLocalizedDescriptionKey: message}];
+    }
+    return NO;
+}
+
+static BOOL IFJSONReaderBeginContainer(IFJSONReader* reader, uint8_t opening) {
+    uint8_t c = IFJSONReaderPeek(reader);
+    if ( c == 'n' ) {
+        IFJSONReaderConsumeLiteral(reader, "null", 4);
+        return NO;
+    }
+    if ( c != opening ) {
+        if ( c != 0 ) {
+            IFJSONReaderFail(reader, opening == '{' ? "Object expected" : "Array expected");
+        }
+        return NO;
+    }
+    reader->position++;
+    reader->firstMember = YES;
+    return YES;
+}
+
+/** consumes the separator before the next member, or the closing bracket */
+static BOOL IFJSONReaderNextMember(IFJSONReader* reader, uint8_t closing) {
+    uint8_t c = IFJSONReaderPeek(reader);
+    BOOL first = reader->firstMember;
+    reader->firstMember = NO;
+    if ( c == closing ) {
+        reader->position++;
+        return NO;
+    }
+    if ( !first ) {
+        if ( c != ',' ) {
+            if ( c != 0 ) {
+                IFJSONReaderFail(reader, "Comma expected");
+            }
+            return NO;
+        }
+        reader->position++;
+    }
+    return reader->errorMessage == NULL;
+}
+
+BOOL IFJSONReaderBeginObject(IFJSONReader* reader) {
+    return IFJSONReaderBeginContainer(reader, '{');
+}
+
+BOOL IFJSONReaderNextKey(IFJSONReader* reader, IFJSONKey* key) {
+    if ( !IFJSONReaderNextMember(reader, '}') ) {
+        return NO;
+    }
+    if ( IFJSONReaderPeek(reader) != '"' ) {
+        IFJSONReaderFail(reader, "Member name expected");
+        return NO;
+    }
+    NSUInteger start, end;
+    BOOL escaped;
+    if ( !IFJSONReaderScanString(reader, &start, &end, &escaped) ) {
+        return NO;
+    }
+    key->bytes = (const char*)reader->bytes + start;
+    key->length = end - start;
+    if ( escaped ) {
+        //long escaped names can't match any field and are left as is
+        if ( end - start <= sizeof(reader->keyBuffer) ) {
+            NSUInteger length = IFJSONUnescape(reader->bytes, start, end, reader->keyBuffer);
+            if ( length == NSNotFound ) {
+                IFJSONReaderFail(reader, "Invalid escape sequence");
+                return NO;
+            }
+            key->bytes = reader->keyBuffer;
+            key->length = length;
+        }
+    }
+    if ( IFJSONReaderPeek(reader) != ':' ) {
+        IFJSONReaderFail(reader, "Colon expected");
+        return NO;
+    }
+    reader->position++;
+    return YES;
+}
+
+BOOL IFJSONReaderBeginArray(IFJSONReader* reader) {
+    return IFJSONReaderBeginContainer(reader, '[');
+}
+
+BOOL IFJSONReaderNextItem(IFJSONReader* reader) {
+    return IFJSONReaderNextMember(reader, ']');
+}
+
+typedef enum {
+    IFJSONNumberInteger,
+    IFJSONNumberReal,
+    IFJSONNumberString,
+    IFJSONNumberNone
+} IFJSONNumberKind;
+
+/** reads a number, true/false or the bytes of a string into buffer; null gives IFJSONNumberNone */
+static IFJSONNumberKind IFJSONReaderReadNumber(IFJSONReader* reader, char* buffer, NSUInteger bufferLength) {
+    uint8_t c = IFJSONReaderPeek(reader);
+    NSUInteger start, end;
+    BOOL escaped = NO;
+    switch ( c ) {
+        case 0:
+            return IFJSONNumberNone;
+        case 'n':
+            IFJSONReaderConsumeLiteral(reader, "null", 4);
+            return IFJSONNumberNone;
+        case 't':
+            IFJSONReaderConsumeLiteral(reader, "true", 4);
+            strlcpy(buffer, "1", bufferLength);
+            return IFJSONNumberInteger;
+        case 'f':
+            IFJSONReaderConsumeLiteral(reader, "false", 5);
+            return IFJSONNumberNone;
+        case '"':
+            //NSString answers intValue, doubleValue etc. as well, numbers in strings are read the same way
+            if ( !IFJSONReaderScanString(reader, &start, &end, &escaped) ) {
+                return IFJSONNumberNone;
+            }
+            break;
+        case '{':
+        case '[':
+            IFJSONReaderFail(reader, "Number expected");
+            return IFJSONNumberNone;
+        default:
+            start = reader->position;
+            IFJSONReaderSkipNumber(reader);
+            end = reader->position;
+            break;
+    }
+    NSUInteger length = MIN(end - start, bufferLength - 1);
+    memcpy(buffer, reader->bytes + start, length);
+    buffer[length] = 0;
+    if ( c == '"' ) {
+        return IFJSONNumberString;
+    }
+    for ( NSUInteger i = 0; i < length; ++i ) {
+        if ( buffer[i] == '.' || buffer[i] == 'e' || buffer[i] == 'E' ) {
+            return IFJSONNumberReal;
+        }
+    }
+    return IFJSONNumberInteger;
+}
+
+static BOOL IFJSONBoolFromString(const char* buffer) {
+    //the way NSString boolValue works: Y, y, T, t or a non-zero digit after whitespace, sign and zeros
+    const char* c = buffer + strspn(buffer, " \t\n\r+-0");
+    return *c != 0 && strchr("YyTt123456789", *c) != NULL;
+}
+
+BOOL IFJSONReadBool(IFJSONReader* reader) {
+    char buffer[64];
+    switch ( IFJSONReaderReadNumber(reader, buffer, sizeof(buffer)) ) {
+        case IFJSONNumberInteger:
+        case IFJSONNumberString:
+            return IFJSONBoolFromString(buffer);
+        case IFJSONNumberReal: return strtod(buffer, NULL) != 0.0;
+        default: return NO;
+    }
+}
+
+int64_t IFJSONReadInt64(IFJSONReader* reader) {
+    char buffer[64];
+    switch ( IFJSONReaderReadNumber(reader, buffer, sizeof(buffer)) ) {
+        //NSString longLongValue stops at a decimal point or an exponent, as strtoll does
+        case IFJSONNumberInteger:
+        case IFJSONNumberString:
+            return strtoll(buffer, NULL, 10);
+        case IFJSONNumberReal: return (int64_t)strtod(buffer, NULL);
+        default: return 0;
+    }
+}
+
+int32_t IFJSONReadInt32(IFJSONReader* reader) {
+    return (int32_t)IFJSONReadInt64(reader);
+}
+
+double IFJSONReadDouble(IFJSONReader* reader) {
+    char buffer[64];
+    switch ( IFJSONReaderReadNumber(reader, buffer, sizeof(buffer)) ) {
+        case IFJSONNumberInteger:
+        case IFJSONNumberReal:
+        case IFJSONNumberString:
+            return strtod(buffer, NULL);
+        default:
+            return 0.0;
+    }
+}
+
+NSString* IFJSONReadString(IFJSONReader* reader) {
+    uint8_t c = IFJSONReaderPeek(reader);
+    if ( c == 'n' ) {
+        IFJSONReaderConsumeLiteral(reader, "null", 4);
+        return nil;
+    }
+    if ( c != '"' ) {
+        if ( c != 0 ) {
+            IFJSONReaderFail(reader, "String expected");
+        }
+        return nil;
+    }
+    NSUInteger start, end;
+    BOOL escaped;
+    if ( !IFJSONReaderScanString(reader, &start, &end, &escaped) ) {
+        return nil;
+    }
+    NSString* string = nil;
+    if ( !escaped ) {
+        string = [[NSString alloc] initWithBytes:reader->bytes + start length:end - start encoding:NSUTF8StringEncoding];
+    } else {
+        char* buffer = malloc(end - start);
+        NSUInteger length = IFJSONUnescape(reader->bytes, start, end, buffer);
+        if ( length != NSNotFound ) {
+            string = [[NSString alloc] initWithBytes:buffer length:length encoding:NSUTF8StringEncoding];
+        }
+        free(buffer);
+    }
+    if ( string == nil ) {
+        IFJSONReaderFail(reader, "Invalid string");
+    }
+    return string;
+}
+
+static id IFJSONObjectFromData(IFJSONReader* reader, NSData* data) {
+    id object = [NSJSONSerialization JSONObjectWithData:data options:NSJSONReadingAllowFragments error:nil];
+    if ( object == nil ) {
+        IFJSONReaderFail(reader, "Invalid JSON value");
+    }
+    return object;
+}
+
+id IFJSONReadObject(IFJSONReader* reader) {
+    if ( IFJSONReaderSkipNull(reader) || reader->errorMessage != NULL ) {
+        return nil;
+    }
+    NSUInteger start = reader->position;
+    IFJSONReaderSkipValue(reader);
+    if ( reader->errorMessage != NULL ) {
+        return nil;
+    }
+    NSData* data = [NSData dataWithBytesNoCopy:(void*)(reader->bytes + start) length:reader->position - start freeWhenDone:NO];
+    return IFJSONObjectFromData(reader, data);
+}
+
+id IFJSONReadObjectString(IFJSONReader* reader) {
+    NSString* string = IFJSONReadString(reader);
+    if ( string == nil ) {
+        return nil;
+    }
+    return IFJSONObjectFromData(reader, [string dataUsingEncoding:NSUTF8StringEncoding]);
+}
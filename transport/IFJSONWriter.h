@@ -0,0 +1,48 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import <Foundation/Foundation.h>
+
+extern NSString* const IFJSONWriterErrorDomain;
+
+/**
+ *	Helpers the generated appendJSONToData:error: methods write JSON with,
+ *	bytes are appended to the data as is, with no intermediate NSDictionary trees.
+ **/
+
+#define IFJSONAppendLiteral(data, literal) [(data) appendBytes:(literal) length:sizeof(literal) - 1]
+#define IFJSONAppendNull(data) IFJSONAppendLiteral(data, "null")
+
+void IFJSONAppendBool(NSMutableData* data, BOOL value);
+void IFJSONAppendInt32(NSMutableData* data, int32_t value);
+void IFJSONAppendInt64(NSMutableData* data, int64_t value);
+BOOL IFJSONAppendDouble(NSMutableData* data, double value, NSError* __autoreleasing* error);
+
+/** nil is written as null */
+void IFJSONAppendString(NSMutableData* data, NSString* string);
+
+/** NSDictionary or NSArray, written by NSJSONSerialization; nil and NSNull are written as null */
+BOOL IFJSONAppendObject(NSMutableData* data, id object, NSError* __autoreleasing* error);
+
+/** NSDictionary or NSArray, written as a string containing its JSON; nil and NSNull are written as null */
+BOOL IFJSONAppendObjectString(NSMutableData* data, id object, NSError* __autoreleasing* error);
@@ -0,0 +1,133 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import "IFJSONWriter.h"
+
+NSString* const IFJSONWriterErrorDomain = @"com.oss.ifacegen.jsonwriter";
+
+static const char IFJSONHexDigits[] = "0123456789abcdef";
+
+static void IFJSONSetError(NSError* __autoreleasing* error, NSString* message) {
+    if ( error ) {
+        *error = [NSError errorWithDomain:IFJSONWriterErrorDomain code:0 userInfo:@{NSLocalizedDescriptionKey: message}];
+    }
+}
+
+void IFJSONAppendBool(NSMutableData* data, BOOL value) {
+    if ( value ) {
+        IFJSONAppendLiteral(data, "true");
+    } else {
+        IFJSONAppendLiteral(data, "false");
+    }
+}
+
+void IFJSONAppendInt32(NSMutableData* data, int32_t value) {
+    char buffer[16];
+    int length = snprintf(buffer, sizeof(buffer), "%d", value);
+    [data appendBytes:buffer length:length];
+}
+
+void IFJSONAppendInt64(NSMutableData* data, int64_t value) {
+    char buffer[24];
+    int length = snprintf(buffer, sizeof(buffer), "%lld", (long long)value);
+    [data appendBytes:buffer length:length];
+}
+
+BOOL IFJSONAppendDouble(NSMutableData* data, double value, NSError* __autoreleasing* error) {
+    if ( isnan(value) || isinf(value) ) {
+        IFJSONSetError(error, @"Invalid number value in JSON write");
+        return NO;
+    }
+    char buffer[32];
+    int length = snprintf(buffer, sizeof(buffer), "%.17g", value);
+    [data appendBytes:buffer length:length];
+    return YES;
+}
+
+void IFJSONAppendString(NSMutableData* data, NSString* string) {
+    if ( string == nil ) {
+        IFJSONAppendNull(data);
+        return;
+    }
+
+    char stackBuffer[256];
+    NSUInteger length = [string lengthOfBytesUsingEncoding:NSUTF8StringEncoding];
+    char* bytes = length <= sizeof(stackBuffer) ? stackBuffer : malloc(length);
+    [string getBytes:bytes maxLength:length usedLength:&length encoding:NSUTF8StringEncoding options:0 range:NSMakeRange(0, string.length) remainingRange:NULL];
+
+    IFJSONAppendLiteral(data, "\"");
+    NSUInteger runStart = 0;
+    for ( NSUInteger i = 0; i < length; ++i ) {
+        unsigned char c = (unsigned char)bytes[i];
+        if ( c >= 0x20 && c != '"' && c != '\\' ) {
+            continue;
+        }
+        [data appendBytes:bytes + runStart length:i - runStart];
+        switch ( c ) {
+            case '"': IFJSONAppendLiteral(data, "\\\""); break;
+            case '\\': IFJSONAppendLiteral(data, "\\\\"); break;
+            case '\n': IFJSONAppendLiteral(data, "\\n"); break;
+            case '\r': IFJSONAppendLiteral(data, "\\r"); break;
+            case '\t': IFJSONAppendLiteral(data, "\\t"); break;
+            case '\b': IFJSONAppendLiteral(data, "\\b"); break;
+            case '\f': IFJSONAppendLiteral(data, "\\f"); break;
+            default: {
+                char escaped[6] = { '\\', 'u', '0', '0', IFJSONHexDigits[c >> 4], IFJSONHexDigits[c & 0xF] };
+                [data appendBytes:escaped length:sizeof(escaped)];
+            }
+        }
+        runStart = i + 1;
+    }
+    [data appendBytes:bytes + runStart length:length - runStart];
+    IFJSONAppendLiteral(data, "\"");
+
+    if ( bytes != stackBuffer ) {
+        free(bytes);
+    }
+}
+
+BOOL IFJSONAppendObject(NSMutableData* data, id object, NSError* __autoreleasing* error) {
+    if ( object == nil || [object isEqual:[NSNull null]] ) {
+        IFJSONAppendNull(data);
+        return YES;
+    }
+    NSData* objectData = [NSJSONSerialization dataWithJSONObject:object options:0 error:error];
+    if ( objectData == nil ) {
+        return NO;
+    }
+    [data appendData:objectData];
+    return YES;
+}
+
+BOOL IFJSONAppendObjectString(NSMutableData* data, id object, NSError* __autoreleasing* error) {
+    if ( object == nil || [object isEqual:[NSNull null]] ) {
+        IFJSONAppendNull(data);
+        return YES;
+    }
+    NSData* objectData = [NSJSONSerialization dataWithJSONObject:object options:0 error:error];
+    if ( objectData == nil ) {
+        return NO;
+    }
+    IFJSONAppendString(data, [[NSString alloc] initWithData:objectData encoding:NSUTF8StringEncoding]);
+    return YES;
+}
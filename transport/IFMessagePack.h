@@ -0,0 +1,101 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import <Foundation/Foundation.h>
+
+extern NSString* const IFMessagePackErrorDomain;
+extern NSString* const IFMessagePackContentType;
+
+/** YES for application/x-msgpack and application/msgpack, parameters after ';' are ignored */
+BOOL IFMessagePackIsContentType(NSString* contentType);
+
+/**
+ *	Helpers the generated appendMessagePackToData:error: methods write MessagePack with,
+ *	bytes are appended to the data as is, with no intermediate NSDictionary trees.
+ *	Integers take the shortest encoding of their value, doubles are always float 64.
+ **/
+
+#define IFMessagePackAppendLiteral(data, literal) [(data) appendBytes:(literal) length:sizeof(literal) - 1]
+#define IFMessagePackAppendNil(data) IFMessagePackAppendLiteral(data, "\300")
+
+void IFMessagePackAppendBool(NSMutableData* data, BOOL value);
+void IFMessagePackAppendInt64(NSMutableData* data, int64_t value);
+void IFMessagePackAppendDouble(NSMutableData* data, double value);
+void IFMessagePackAppendMapHeader(NSMutableData* data, NSUInteger count);
+void IFMessagePackAppendArrayHeader(NSMutableData* data, NSUInteger count);
+
+/** nil is written as nil */
+void IFMessagePackAppendString(NSMutableData* data, NSString* string);
+
+/** NSDictionary with string keys, NSArray, NSString, NSNumber or NSData (as bin); nil and NSNull are written as nil */
+BOOL IFMessagePackAppendObject(NSMutableData* data, id object, NSError* __autoreleasing* error);
+
+/** NSDictionary or NSArray, written as a string containing its JSON; nil and NSNull are written as nil */
+BOOL IFMessagePackAppendObjectString(NSMutableData* data, id object, NSError* __autoreleasing* error);
+
+/**
+ *	Pull reader the generated initWithMessagePackReader: methods decode MessagePack with,
+ *	the counterpart of IFJSONReader. Values are read right from the bytes of NSData, which has to live
+ *	while the reader is used. Once an error occurs, all the functions return empty values.
+ **/
+
+typedef struct {
+    const uint8_t* bytes;
+    NSUInteger length;
+    NSUInteger position;
+    const char* errorMessage;
+    NSUInteger errorPosition;
+} IFMessagePackReader;
+
+typedef struct {
+    const char* bytes;
+    NSUInteger length;
+} IFMessagePackKey;
+
+#define IFMessagePackKeyEquals(key, literal) ((key).length == sizeof(literal) - 1 && memcmp((key).bytes, (literal), sizeof(literal) - 1) == 0)
+
+void IFMessagePackReaderInit(IFMessagePackReader* reader, NSData* data);
+/** fails if an error occured or there is anything after the value read */
+BOOL IFMessagePackReaderFinish(IFMessagePackReader* reader, NSError* __autoreleasing* error);
+BOOL IFMessagePackReaderFailed(IFMessagePackReader* reader);
+
+/** NO for nil, otherwise count is the number of entries, each one is a key and a value to read or skip */
+BOOL IFMessagePackReaderBeginMap(IFMessagePackReader* reader, NSUInteger* count);
+/** the key has to be a string, its value has to be read or skipped before the next call */
+BOOL IFMessagePackReaderNextKey(IFMessagePackReader* reader, IFMessagePackKey* key);
+/** NO for nil, otherwise count is the number of items to read or skip */
+BOOL IFMessagePackReaderBeginArray(IFMessagePackReader* reader, NSUInteger* count);
+void IFMessagePackReaderSkipValue(IFMessagePackReader* reader);
+
+/** numbers are converted the way NSNumber and NSString do, nil is read as 0 */
+BOOL IFMessagePackReadBool(IFMessagePackReader* reader);
+int32_t IFMessagePackReadInt32(IFMessagePackReader* reader);
+int64_t IFMessagePackReadInt64(IFMessagePackReader* reader);
+double IFMessagePackReadDouble(IFMessagePackReader* reader);
+
+/** nil for nil */
+NSString* IFMessagePackReadString(IFMessagePackReader* reader);
+/** NSDictionary, NSArray, NSString, NSNumber or NSData the value is made of, NSNull for nested nils; nil for nil */
+id IFMessagePackReadObject(IFMessagePackReader* reader);
+/** value read by NSJSONSerialization from a string value, nil for nil */
+id IFMessagePackReadObjectString(IFMessagePackReader* reader);
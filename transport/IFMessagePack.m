@@ -0,0 +1,646 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import "IFMessagePack.h"
+
+NSString* const IFMessagePackErrorDomain = @"com.oss.ifacegen.messagepack";
+NSString* const IFMessagePackContentType = @"application/x-msgpack";
+
+static const NSUInteger IFMessagePackReaderMaxDepth = 512;
+
+BOOL IFMessagePackIsContentType(NSString* contentType) {
+    if ( contentType == nil ) {
+        return NO;
+    }
+    NSString* mediaType = [[[contentType componentsSeparatedByString:@";"] firstObject] stringByTrimmingCharactersInSet:[NSCharacterSet whitespaceCharacterSet]];
+    return [mediaType caseInsensitiveCompare:IFMessagePackContentType] == NSOrderedSame || [mediaType caseInsensitiveCompare:@"application/msgpack"] == NSOrderedSame;
+}
+
+#pragma mark - Writer
+
+static void IFMessagePackSetError(NSError* __autoreleasing* error, NSString* message) {
+    if ( error ) {
+        *error = [NSError errorWithDomain:IFMessagePackErrorDomain code:0 userInfo:@{NSLocalizedDescriptionKey: message}];
+    }
+}
+
+/** the type byte followed by the size lowest bytes of value, big-endian */
+static void IFMessagePackAppendHeader(NSMutableData* data, uint8_t type, uint64_t value, NSUInteger size) {
+    uint8_t bytes[9];
+    bytes[0] = type;
+    for ( NSUInteger i = 0; i < size; ++i ) {
+        bytes[size - i] = (uint8_t)(value >> (8 * i));
+    }
+    [data appendBytes:bytes length:size + 1];
+}
+
+/** the header of a str, bin, array or map of the given length, fixType is 0 for the types with no fix form */
+static void IFMessagePackAppendLengthHeader(NSMutableData* data, uint8_t fixType, NSUInteger fixLimit, uint8_t type8, uint8_t type16, uint8_t type32, uint64_t length) {
+    if ( fixType != 0 && length < fixLimit ) {
+        IFMessagePackAppendHeader(data, fixType | (uint8_t)length, 0, 0);
+    } else if ( type8 != 0 && length <= UINT8_MAX ) {
+        IFMessagePackAppendHeader(data, type8, length, 1);
+    } else if ( length <= UINT16_MAX ) {
+        IFMessagePackAppendHeader(data, type16, length, 2);
+    } else {
+        IFMessagePackAppendHeader(data, type32, length, 4);
+    }
+}
+
+void IFMessagePackAppendBool(NSMutableData* data, BOOL value) {
+    if ( value ) {
+        IFMessagePackAppendLiteral(data, "\303");
+    } else {
+        IFMessagePackAppendLiteral(data, "\302");
+    }
+}
+
+static void IFMessagePackAppendUInt64(NSMutableData* data, uint64_t value) {
+    if ( value <= 0x7F ) {
+        IFMessagePackAppendHeader(data, (uint8_t)value, 0, 0);
+    } else if ( value <= UINT8_MAX ) {
+        IFMessagePackAppendHeader(data, 0xCC, value, 1);
+    } else if ( value <= UINT16_MAX ) {
+        IFMessagePackAppendHeader(data, 0xCD, value, 2);
+    } else if ( value <= UINT32_MAX ) {
+        IFMessagePackAppendHeader(data, 0xCE, value, 4);
+    } else {
+        IFMessagePackAppendHeader(data, 0xCF, value, 8);
+    }
+}
+
+void IFMessagePackAppendInt64(NSMutableData* data, int64_t value) {
+    if ( value >= 0 ) {
+        IFMessagePackAppendUInt64(data, (uint64_t)value);
+    } else if ( value >= -32 ) {
+        IFMessagePackAppendHeader(data, (uint8_t)value, 0, 0);
+    } else if ( value >= INT8_MIN ) {
+        IFMessagePackAppendHeader(data, 0xD0, (uint64_t)value, 1);
+    } else if ( value >= INT16_MIN ) {
+        IFMessagePackAppendHeader(data, 0xD1, (uint64_t)value, 2);
+    } else if ( value >= INT32_MIN ) {
+        IFMessagePackAppendHeader(data, 0xD2, (uint64_t)value, 4);
+    } else {
+        IFMessagePackAppendHeader(data, 0xD3, (uint64_t)value, 8);
+    }
+}
+
+void IFMessagePackAppendDouble(NSMutableData* data, double value) {
+    uint64_t bits;
+    memcpy(&bits, &value, sizeof(bits));
+    IFMessagePackAppendHeader(data, 0xCB, bits, 8);
+}
+
+void IFMessagePackAppendMapHeader(NSMutableData* data, NSUInteger count) {
+    IFMessagePackAppendLengthHeader(data, 0x80, 16, 0, 0xDE, 0xDF, count);
+}
+
+void IFMessagePackAppendArrayHeader(NSMutableData* data, NSUInteger count) {
+    IFMessagePackAppendLengthHeader(data, 0x90, 16, 0, 0xDC, 0xDD, count);
+}
+
+void IFMessagePackAppendString(NSMutableData* data, NSString* string) {
+    if ( string == nil ) {
+        IFMessagePackAppendNil(data);
+        return;
+    }
+    NSUInteger length = [string lengthOfBytesUsingEncoding:NSUTF8StringEncoding];
+    IFMessagePackAppendLengthHeader(data, 0xA0, 32, 0xD9, 0xDA, 0xDB, length);
+    NSUInteger offset = data.length;
+    [data increaseLengthBy:length];
+    [string getBytes:(uint8_t*)data.mutableBytes + offset maxLength:length usedLength:NULL encoding:NSUTF8StringEncoding options:0 range:NSMakeRange(0, string.length) remainingRange:NULL];
+}
+
+BOOL IFMessagePackAppendObject(NSMutableData* data, id object, NSError* __autoreleasing* error) {
+    if ( object == nil || object == (id)kCFNull ) {
+        IFMessagePackAppendNil(data);
+    } else if ( [object isKindOfClass:NSString.class] ) {
+        IFMessagePackAppendString(data, object);
+    } else if ( [object isKindOfClass:NSNumber.class] ) {
+        NSNumber* number = object;
+        if ( object == (id)kCFBooleanTrue || object == (id)kCFBooleanFalse ) {
+            IFMessagePackAppendBool(data, number.boolValue);
+        } else if ( CFNumberIsFloatType((CFNumberRef)number) ) {
+            IFMessagePackAppendDouble(data, number.doubleValue);
+        } else if ( strcmp(number.objCType, @encode(unsigned long long)) == 0 ) {
+            IFMessagePackAppendUInt64(data, number.unsignedLongLongValue);
+        } else {
+            IFMessagePackAppendInt64(data, number.longLongValue);
+        }
+    } else if ( [object isKindOfClass:NSDictionary.class] ) {
+        NSDictionary* dictionary = object;
+        IFMessagePackAppendMapHeader(data, dictionary.count);
+        for ( id key in dictionary ) {
+            if ( ![key isKindOfClass:NSString.class] ) {
+                IFMessagePackSetError(error, @"Map key is not a string in MessagePack write");
+                return NO;
+            }
+            IFMessagePackAppendString(data, key);
+            if ( !IFMessagePackAppendObject(data, dictionary[key], error) ) {
+                return NO;
+            }
+        }
+    } else if ( [object isKindOfClass:NSArray.class] ) {
+        NSArray* array = object;
+        IFMessagePackAppendArrayHeader(data, array.count);
+        for ( id item in array ) {
+            if ( !IFMessagePackAppendObject(data, item, error) ) {
+                return NO;
+            }
+        }
+    } else if ( [object isKindOfClass:NSData.class] ) {
+        IFMessagePackAppendLengthHeader(data, 0, 0, 0xC4, 0xC5, 0xC6, [object length]);
+        [data appendData:object];
+    } else {
+        IFMessagePackSetError(error, @"Invalid type in MessagePack write");
+        return NO;
+    }
+    return YES;
+}
+
+BOOL IFMessagePackAppendObjectString(NSMutableData* data, id object, NSError* __autoreleasing* error) {
+    if ( object == nil || object == (id)kCFNull ) {
+        IFMessagePackAppendNil(data);
+        return YES;
+    }
+    NSData* objectData = [NSJSONSerialization dataWithJSONObject:object options:0 error:error];
+    if ( objectData == nil ) {
+        return NO;
+    }
+    IFMessagePackAppendString(data, [[NSString alloc] initWithData:objectData encoding:NSUTF8StringEncoding]);
+    return YES;
+}
+
+#pragma mark - Reader
+
+typedef enum {
+    IFMessagePackTypeNil,
+    IFMessagePackTypeBool,
+    IFMessagePackTypeInteger,
+    // above INT64_MAX
+    IFMessagePackTypeUnsigned,
+    IFMessagePackTypeReal,
+    IFMessagePackTypeString,
+    IFMessagePackTypeBinary,
+    IFMessagePackTypeExtension,
+    IFMessagePackTypeArray,
+    IFMessagePackTypeMap
+} IFMessagePackType;
+
+/** a value header; bytes of a string, binary or extension are at [start, start + length), containers hold length entries */
+typedef struct {
+    IFMessagePackType type;
+    int64_t integer;
+    uint64_t unsignedInteger;
+    double real;
+    NSUInteger start;
+    NSUInteger length;
+} IFMessagePackValue;
+
+static void IFMessagePackReaderFail(IFMessagePackReader* reader, const char* message) {
+    if ( reader->errorMessage == NULL ) {
+        reader->errorMessage = message;
+        reader->errorPosition = reader->position;
+    }
+}
+
+static BOOL IFMessagePackReaderReadUInt(IFMessagePackReader* reader, NSUInteger size, uint64_t* value) {
+    if ( reader->length - reader->position < size ) {
+        IFMessagePackReaderFail(reader, "Unexpected end of data");
+        return NO;
+    }
+    *value = 0;
+    for ( NSUInteger i = 0; i < size; ++i ) {
+        *value = (*value << 8) | reader->bytes[reader->position++];
+    }
+    return YES;
+}
+
+/** skips typeSize bytes of extension type, then takes length bytes of payload */
+static BOOL IFMessagePackReaderTakeBytes(IFMessagePackReader* reader, IFMessagePackValue* value, NSUInteger typeSize, uint64_t length) {
+    if ( reader->length - reader->position < typeSize || reader->length - reader->position - typeSize < length ) {
+        IFMessagePackReaderFail(reader, "Unexpected end of data");
+        return NO;
+    }
+    value->start = reader->position + typeSize;
+    value->length = (NSUInteger)length;
+    reader->position = value->start + value->length;
+    return YES;
+}
+
+/** every entry takes a byte at least, so counts over the data left can't be right */
+static BOOL IFMessagePackReaderCheckCount(IFMessagePackReader* reader, IFMessagePackValue* value, uint64_t count) {
+    uint64_t bytes = value->type == IFMessagePackTypeMap ? count * 2 : count;
+    if ( bytes > reader->length - reader->position ) {
+        IFMessagePackReaderFail(reader, "Unexpected end of data");
+        return NO;
+    }
+    value->length = (NSUInteger)count;
+    return YES;
+}
+
+/** reads the header of the next value, the bytes of strings, binaries and extensions are consumed as well */
+static BOOL IFMessagePackReaderReadHeader(IFMessagePackReader* reader, IFMessagePackValue* value) {
+    if ( reader->errorMessage != NULL ) {
+        return NO;
+    }
+    if ( reader->position >= reader->length ) {
+        IFMessagePackReaderFail(reader, "Unexpected end of data");
+        return NO;
+    }
+    uint8_t c = reader->bytes[reader->position++];
+    uint64_t u = 0;
+    value->integer = 0;
+    if ( c <= 0x7F || c >= 0xE0 ) {
+        value->type = IFMessagePackTypeInteger;
+        value->integer = (int8_t)c;
+        return YES;
+    }
+    if ( c <= 0x8F ) {
+        value->type = IFMessagePackTypeMap;
+        return IFMessagePackReaderCheckCount(reader, value, c & 0x0F);
+    }
+    if ( c <= 0x9F ) {
+        value->type = IFMessagePackTypeArray;
+        return IFMessagePackReaderCheckCount(reader, value, c & 0x0F);
+    }
+    if ( c <= 0xBF ) {
+        value->type = IFMessagePackTypeString;
+        return IFMessagePackReaderTakeBytes(reader, value, 0, c & 0x1F);
+    }
+    switch ( c ) {
+        case 0xC0:
+            value->type = IFMessagePackTypeNil;
+            return YES;
+        case 0xC2:
+        case 0xC3:
+            value->type = IFMessagePackTypeBool;
+            value->integer = c == 0xC3;
+            return YES;
+        case 0xC4:
+        case 0xC5:
+        case 0xC6:
+            value->type = IFMessagePackTypeBinary;
+            return IFMessagePackReaderReadUInt(reader, 1 << (c - 0xC4), &u) && IFMessagePackReaderTakeBytes(reader, value, 0, u);
+        case 0xC7:
+        case 0xC8:
+        case 0xC9:
+            value->type = IFMessagePackTypeExtension;
+            return IFMessagePackReaderReadUInt(reader, 1 << (c - 0xC7), &u) && IFMessagePackReaderTakeBytes(reader, value, 1, u);
+        case 0xCA: {
+            value->type = IFMessagePackTypeReal;
+            if ( !IFMessagePackReaderReadUInt(reader, 4, &u) ) return NO;
+            uint32_t bits = (uint32_t)u;
+            float real;
+            memcpy(&real, &bits, sizeof(real));
+            value->real = real;
+            return YES;
+        }
+        case 0xCB:
+            value->type = IFMessagePackTypeReal;
+            if ( !IFMessagePackReaderReadUInt(reader, 8, &u) ) return NO;
+            memcpy(&value->real, &u, sizeof(value->real));
+            return YES;
+        case 0xCC:
+        case 0xCD:
+        case 0xCE:
+        case 0xCF:
+            if ( !IFMessagePackReaderReadUInt(reader, 1 << (c - 0xCC), &u) ) return NO;
+            value->type = u > INT64_MAX ? IFMessagePackTypeUnsigned : IFMessagePackTypeInteger;
+            value->integer = u > INT64_MAX ? INT64_MAX : (int64_t)u;
+            value->unsignedInteger = u;
+            return YES;
+        case 0xD0:
+        case 0xD1:
+        case 0xD2:
+        case 0xD3: {
+            NSUInteger size = 1 << (c - 0xD0);
+            if ( !IFMessagePackReaderReadUInt(reader, size, &u) ) return NO;
+            //sign extension of the size bytes read
+            NSUInteger shift = 64 - 8 * size;
+            value->type = IFMessagePackTypeInteger;
+            value->integer = (int64_t)(u << shift) >> shift;
+            return YES;
+        }
+        case 0xD4:
+        case 0xD5:
+        case 0xD6:
+        case 0xD7:
+        case 0xD8:
+            value->type = IFMessagePackTypeExtension;
+            return IFMessagePackReaderTakeBytes(reader, value, 1, 1 << (c - 0xD4));
+        case 0xD9:
+        case 0xDA:
+        case 0xDB:
+            value->type = IFMessagePackTypeString;
+            return IFMessagePackReaderReadUInt(reader, 1 << (c - 0xD9), &u) && IFMessagePackReaderTakeBytes(reader, value, 0, u);
+        case 0xDC:
+        case 0xDD:
+            value->type = IFMessagePackTypeArray;
+            return IFMessagePackReaderReadUInt(reader, 2 << (c - 0xDC), &u) && IFMessagePackReaderCheckCount(reader, value, u);
+        case 0xDE:
+        case 0xDF:
+            value->type = IFMessagePackTypeMap;
+            return IFMessagePackReaderReadUInt(reader, 2 << (c - 0xDE), &u) && IFMessagePackReaderCheckCount(reader, value, u);
+        default:
+            reader->position--;
+            IFMessagePackReaderFail(reader, "Invalid type");
+            return NO;
+    }
+}
+
+void IFMessagePackReaderSkipValue(IFMessagePackReader* reader) {
+    //values to skip are counted, so nesting takes no stack
+    NSUInteger remaining = 1;
+    while ( remaining > 0 ) {
+        IFMessagePackValue value;
+        if ( !IFMessagePackReaderReadHeader(reader, &value) ) {
+            return;
+        }
+        remaining--;
+        if ( value.type == IFMessagePackTypeArray ) {
+            remaining += value.length;
+        } else if ( value.type == IFMessagePackTypeMap ) {
+            remaining += value.length * 2;
+        }
+    }
+}
+
+void IFMessagePackReaderInit(IFMessagePackReader* reader, NSData* data) {
+    reader->bytes = data.bytes;
+    reader->length = data.length;
+    reader->position = 0;
+    reader->errorMessage = NULL;
+    reader->errorPosition = 0;
+}
+
+BOOL IFMessagePackReaderFailed(IFMessagePackReader* reader) {
+    return reader->errorMessage != NULL;
+}
+
+BOOL IFMessagePackReaderFinish(IFMessagePackReader* reader, NSError* __autoreleasing* error) {
+    if ( reader->errorMessage == NULL && reader->position < reader->length ) {
+        IFMessagePackReaderFail(reader, "Garbage at the end of data");
+    }
+    if ( reader->errorMessage == NULL ) {
+        return YES;
+    }
+    if ( error ) {
+        NSString* message = [NSString stringWithFormat:@"%s at offset %lu", reader->errorMessage, (unsigned long)reader->errorPosition];
+        *error = [NSError errorWithDomain:IFMessagePackErrorDomain code:0 userInfo:@{NSLocalizedDescriptionKey: message}];
+    }
+    return NO;
+}
+
+static BOOL IFMessagePackReaderBeginContainer(IFMessagePackReader* reader, IFMessagePackType type, NSUInteger* count) {
+    NSUInteger start = reader->position;
+    IFMessagePackValue value;
+    *count = 0;
+    if ( !IFMessagePackReaderReadHeader(reader, &value) || value.type == IFMessagePackTypeNil ) {
+        return NO;
+    }
+    if ( value.type != type ) {
+        reader->position = start;
+        IFMessagePackReaderFail(reader, type == IFMessagePackTypeMap ? "Map expected" : "Array expected");
+        return NO;
+    }
+    *count = value.length;
+    return YES;
+}
+
+BOOL IFMessagePackReaderBeginMap(IFMessagePackReader* reader, NSUInteger* count) {
+    return IFMessagePackReaderBeginContainer(reader, IFMessagePackTypeMap, count);
+}
+
+BOOL IFMessagePackReaderNextKey(IFMessagePackReader* reader, IFMessagePackKey* key) {
+    NSUInteger start = reader->position;
+    IFMessagePackValue value;
+    if ( !IFMessagePackReaderReadHeader(reader, &value) ) {
+        return NO;
+    }
+    if ( value.type != IFMessagePackTypeString ) {
+        reader->position = start;
+        IFMessagePackReaderFail(reader, "Map key is not a string");
+        return NO;
+    }
+    key->bytes = (const char*)reader->bytes + value.start;
+    key->length = value.length;
+    return YES;
+}
+
+BOOL IFMessagePackReaderBeginArray(IFMessagePackReader* reader, NSUInteger* count) {
+    return IFMessagePackReaderBeginContainer(reader, IFMessagePackTypeArray, count);
+}
+
+/** reads a scalar, the bytes of a string are copied into buffer; containers, binaries and extensions fail */
+static BOOL IFMessagePackReaderReadNumber(IFMessagePackReader* reader, IFMessagePackValue* value, char* buffer, NSUInteger bufferLength) {
+    NSUInteger start = reader->position;
+    if ( !IFMessagePackReaderReadHeader(reader, value) ) {
+        return NO;
+    }
+    switch ( value->type ) {
+        case IFMessagePackTypeString: {
+            //NSString answers intValue, doubleValue etc. as well, numbers in strings are read the same way
+            NSUInteger length = MIN(value->length, bufferLength - 1);
+            memcpy(buffer, reader->bytes + value->start, length);
+            buffer[length] = 0;
+            return YES;
+        }
+        case IFMessagePackTypeBinary:
+        case IFMessagePackTypeExtension:
+        case IFMessagePackTypeArray:
+        case IFMessagePackTypeMap:
+            reader->position = start;
+            IFMessagePackReaderFail(reader, "Number expected");
+            return NO;
+        default:
+            return YES;
+    }
+}
+
+static BOOL IFMessagePackBoolFromString(const char* buffer) {
+    //the way NSString boolValue works: Y, y, T, t or a non-zero digit after whitespace, sign and zeros
+    const char* c = buffer + strspn(buffer, " \t\n\r+-0");
+    return *c != 0 && strchr("YyTt123456789", *c) != NULL;
+}
+
+static int64_t IFMessagePackRealToInt64(double value) {
+    if ( isnan(value) ) return 0;
+    if ( isinf(value) ) return INT64_MIN;
+    if ( value >= 9223372036854775807.0 ) return INT64_MAX;
+    if ( value <= -9223372036854775808.0 ) return INT64_MIN;
+    return (int64_t)value;
+}
+
+BOOL IFMessagePackReadBool(IFMessagePackReader* reader) {
+    IFMessagePackValue value;
+    char buffer[64];
+    if ( !IFMessagePackReaderReadNumber(reader, &value, buffer, sizeof(buffer)) ) {
+        return NO;
+    }
+    switch ( value.type ) {
+        case IFMessagePackTypeBool:
+        case IFMessagePackTypeInteger:
+        case IFMessagePackTypeUnsigned:
+            return value.integer != 0;
+        case IFMessagePackTypeReal: return value.real != 0.0;
+        case IFMessagePackTypeString: return IFMessagePackBoolFromString(buffer);
+        default: return NO;
+    }
+}
+
+int64_t IFMessagePackReadInt64(IFMessagePackReader* reader) {
+    IFMessagePackValue value;
+    char buffer[64];
+    if ( !IFMessagePackReaderReadNumber(reader, &value, buffer, sizeof(buffer)) ) {
+        return 0;
+    }
+    switch ( value.type ) {
+        case IFMessagePackTypeBool:
+        case IFMessagePackTypeInteger:
+        case IFMessagePackTypeUnsigned:
+            return value.integer;
+        case IFMessagePackTypeReal: return IFMessagePackRealToInt64(value.real);
+        case IFMessagePackTypeString: return strtoll(buffer, NULL, 10);
+        default: return 0;
+    }
+}
+
+int32_t IFMessagePackReadInt32(IFMessagePackReader* reader) {
+    return (int32_t)IFMessagePackReadInt64(reader);
+}
+
+double IFMessagePackReadDouble(IFMessagePackReader* reader) {
+    IFMessagePackValue value;
+    char buffer[64];
+    if ( !IFMessagePackReaderReadNumber(reader, &value, buffer, sizeof(buffer)) ) {
+        return 0.0;
+    }
+    switch ( value.type ) {
+        case IFMessagePackTypeBool:
+        case IFMessagePackTypeInteger:
+            return (double)value.integer;
+        case IFMessagePackTypeUnsigned: return (double)value.unsignedInteger;
+        case IFMessagePackTypeReal: return value.real;
+        case IFMessagePackTypeString: return strtod(buffer, NULL);
+        default: return 0.0;
+    }
+}
+
+static NSString* IFMessagePackReaderStringValue(IFMessagePackReader* reader, IFMessagePackValue* value) {
+    NSString* string = [[NSString alloc] initWithBytes:reader->bytes + value->start length:value->length encoding:NSUTF8StringEncoding];
+    if ( string == nil ) {
+        reader->position = value->start;
+        IFMessagePackReaderFail(reader, "Invalid string");
+    }
+    return string;
+}
+
+NSString* IFMessagePackReadString(IFMessagePackReader* reader) {
+    NSUInteger start = reader->position;
+    IFMessagePackValue value;
+    if ( !IFMessagePackReaderReadHeader(reader, &value) || value.type == IFMessagePackTypeNil ) {
+        return nil;
+    }
+    if ( value.type != IFMessagePackTypeString ) {
+        reader->position = start;
+        IFMessagePackReaderFail(reader, "String expected");
+        return nil;
+    }
+    return IFMessagePackReaderStringValue(reader, &value);
+}
+
+/** NSNull for nil, nil once an error occurs */
+static id IFMessagePackReaderReadValue(IFMessagePackReader* reader, NSUInteger depth) {
+    NSUInteger start = reader->position;
+    IFMessagePackValue value;
+    if ( !IFMessagePackReaderReadHeader(reader, &value) ) {
+        return nil;
+    }
+    switch ( value.type ) {
+        case IFMessagePackTypeNil: return [NSNull null];
+        case IFMessagePackTypeBool: return value.integer ? @YES : @NO;
+        case IFMessagePackTypeInteger: return @(value.integer);
+        case IFMessagePackTypeUnsigned: return @(value.unsignedInteger);
+        case IFMessagePackTypeReal: return @(value.real);
+        case IFMessagePackTypeString: return IFMessagePackReaderStringValue(reader, &value);
+        case IFMessagePackTypeBinary: return [NSData dataWithBytes:reader->bytes + value.start length:value.length];
+        case IFMessagePackTypeExtension:
+            reader->position = start;
+            IFMessagePackReaderFail(reader, "Unsupported type");
+            return nil;
+        default:
+            break;
+    }
+    if ( depth >= IFMessagePackReaderMaxDepth ) {
+        reader->position = start;
+        IFMessagePackReaderFail(reader, "MessagePack is nested too deep");
+        return nil;
+    }
+    if ( value.type == IFMessagePackTypeArray ) {
+        NSMutableArray* array = [NSMutableArray arrayWithCapacity:value.length];
+        for ( NSUInteger i = 0; i < value.length; ++i ) {
+            id item = IFMessagePackReaderReadValue(reader, depth + 1);
+            if ( item == nil ) {
+                return nil;
+            }
+            [array addObject:item];
+        }
+        return array;
+    }
+    NSMutableDictionary* dictionary = [NSMutableDictionary dictionaryWithCapacity:value.length];
+    for ( NSUInteger i = 0; i < value.length; ++i ) {
+        IFMessagePackKey key;
+        if ( !IFMessagePackReaderNextKey(reader, &key) ) {
+            return nil;
+        }
+        NSString* name = [[NSString alloc] initWithBytes:key.bytes length:key.length encoding:NSUTF8StringEncoding];
+        if ( name == nil ) {
+            IFMessagePackReaderFail(reader, "Invalid string");
+            return nil;
+        }
+        id item = IFMessagePackReaderReadValue(reader, depth + 1);
+        if ( item == nil ) {
+            return nil;
+        }
+        dictionary[name] = item;
+    }
+    return dictionary;
+}
+
+id IFMessagePackReadObject(IFMessagePackReader* reader) {
+    id object = IFMessagePackReaderReadValue(reader, 0);
+    return object == (id)kCFNull ? nil : object;
+}
+
+id IFMessagePackReadObjectString(IFMessagePackReader* reader) {
+    NSString* string = IFMessagePackReadString(reader);
+    if ( string == nil ) {
+        return nil;
+    }
+    id object = [NSJSONSerialization JSONObjectWithData:[string dataUsingEncoding:NSUTF8StringEncoding] options:NSJSONReadingAllowFragments error:nil];
+    if ( object == nil ) {
+        IFMessagePackReaderFail(reader, "Invalid JSON value");
+    }
+    return object;
+}
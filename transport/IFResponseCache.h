@@ -0,0 +1,79 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import <Foundation/Foundation.h>
+
+/**
+ *	How responses of a procedure are cached. Within ttl seconds since a response was received
+ *	or revalidated it is used with no request at all. After that, with revalidate, the request is
+ *	sent with If-None-Match/If-Modified-Since and 304 answer makes the cached response fresh again.
+ **/
+
+@interface IFCachePolicy : NSObject<NSCopying>
+
+/**
+ *	Keys are the ones of "cache" IDL section: "ttl" and "revalidate". Missing keys keep default values.
+ **/
++ (instancetype)policyWithDictionary:(NSDictionary*)dictionary;
+
+@property (nonatomic) NSTimeInterval ttl;
+@property (nonatomic) BOOL revalidate;
+
+@end
+
+@interface IFResponseCacheEntry : NSObject<NSCoding>
+
+- (BOOL)isFreshForPolicy:(IFCachePolicy*)policy;
+
+@property (nonatomic, readonly, copy) NSString* key;
+@property (nonatomic, readonly) NSData* data;
+@property (nonatomic, readonly, copy) NSString* etag;
+@property (nonatomic, readonly, copy) NSString* lastModified;
+// MIME type of the response, handed out along with the data
+@property (nonatomic, readonly, copy) NSString* contentType;
+@property (nonatomic, readonly) NSDate* date;
+
+@end
+
+/**
+ *	Memory cache bounded by the total size of responses, the least recently used ones are evicted first,
+ *	with optional disk tier keeping every response stored. Thread safe.
+ **/
+
+@interface IFResponseCache : NSObject
+
+// memory only, 4 MB
++ (instancetype)sharedCache;
+
+- (instancetype)initWithMemoryCapacity:(NSUInteger)memoryCapacity diskPath:(NSString*)diskPath;
+
+- (IFResponseCacheEntry*)entryForKey:(NSString*)key;
+- (IFResponseCacheEntry*)storeData:(NSData*)data response:(NSHTTPURLResponse*)response forKey:(NSString*)key;
+- (IFResponseCacheEntry*)revalidateEntry:(IFResponseCacheEntry*)entry;
+- (void)removeAllEntries;
+
+@property (nonatomic, readonly) NSUInteger memoryCapacity;
+@property (nonatomic, readonly) NSUInteger memoryUsage;
+@property (nonatomic, readonly, copy) NSString* diskPath;
+
+@end
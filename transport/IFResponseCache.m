@@ -0,0 +1,271 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import "IFResponseCache.h"
+
+@implementation IFCachePolicy
+
++ (instancetype)policyWithDictionary:(NSDictionary*)dictionary {
+    IFCachePolicy* policy = [[self alloc] init];
+
+    NSNumber* value;
+    if ( (value = dictionary[@"ttl"]) != nil ) policy.ttl = [value doubleValue];
+    if ( (value = dictionary[@"revalidate"]) != nil ) policy.revalidate = [value boolValue];
+
+    return policy;
+}
+
+- (instancetype)init {
+    if ( self = [super init] ) {
+        _ttl = 0;
+        _revalidate = YES;
+    }
+    return self;
+}
+
+- (id)copyWithZone:(NSZone*)zone {
+    IFCachePolicy* policy = [[[self class] allocWithZone:zone] init];
+    policy.ttl = self.ttl;
+    policy.revalidate = self.revalidate;
+    return policy;
+}
+
+@end
+
+@interface IFResponseCacheEntry()
+
+@property (nonatomic, readwrite, copy) NSString* key;
+@property (nonatomic, readwrite) NSData* data;
+@property (nonatomic, readwrite, copy) NSString* etag;
+@property (nonatomic, readwrite, copy) NSString* lastModified;
+@property (nonatomic, readwrite, copy) NSString* contentType;
+@property (nonatomic, readwrite) NSDate* date;
+
+@end
+
+@implementation IFResponseCacheEntry
+
+- (BOOL)isFreshForPolicy:(IFCachePolicy*)policy {
+    return -[self.date timeIntervalSinceNow] < policy.ttl;
+}
+
+- (id)initWithCoder:(NSCoder*)decoder {
+    if ( self = [super init] ) {
+        _key = [decoder decodeObjectForKey:@"key"];
+        _data = [decoder decodeObjectForKey:@"data"];
+        _etag = [decoder decodeObjectForKey:@"etag"];
+        _lastModified = [decoder decodeObjectForKey:@"lastModified"];
+        _contentType = [decoder decodeObjectForKey:@"contentType"];
+        _date = [decoder decodeObjectForKey:@"date"];
+    }
+    return self;
+}
+
+- (void)encodeWithCoder:(NSCoder*)coder {
+    [coder encodeObject:self.key forKey:@"key"];
+    [coder encodeObject:self.data forKey:@"data"];
+    [coder encodeObject:self.etag forKey:@"etag"];
+    [coder encodeObject:self.lastModified forKey:@"lastModified"];
+    [coder encodeObject:self.contentType forKey:@"contentType"];
+    [coder encodeObject:self.date forKey:@"date"];
+}
+
+@end
+
+@interface IFResponseCache()
+
+@property (nonatomic, readwrite) NSUInteger memoryCapacity;
+@property (nonatomic, readwrite) NSUInteger memoryUsage;
+@property (nonatomic, readwrite, copy) NSString* diskPath;
+@property (nonatomic) NSMutableDictionary* entries;
+// least recently used first
+@property (nonatomic) NSMutableOrderedSet* recentKeys;
+@property (nonatomic) dispatch_queue_t diskQueue;
+
+@end
+
+@implementation IFResponseCache
+
++ (instancetype)sharedCache {
+    static IFResponseCache* sharedCache;
+    static dispatch_once_t onceToken;
+    dispatch_once(&onceToken, ^{
+        sharedCache = [[self alloc] initWithMemoryCapacity:4 * 1024 * 1024 diskPath:nil];
+    });
+    return sharedCache;
+}
+
+- (instancetype)initWithMemoryCapacity:(NSUInteger)memoryCapacity diskPath:(NSString*)diskPath {
+    if ( self = [super init] ) {
+        _memoryCapacity = memoryCapacity;
+        _diskPath = [diskPath copy];
+        _entries = [NSMutableDictionary dictionary];
+        _recentKeys = [NSMutableOrderedSet orderedSet];
+        if ( diskPath != nil ) {
+            _diskQueue = dispatch_queue_create("com.oss.ifacegen.transport.responsecache", DISPATCH_QUEUE_SERIAL);
+            [[NSFileManager defaultManager] createDirectoryAtPath:diskPath withIntermediateDirectories:YES attributes:nil error:nil];
+        }
+    }
+    return self;
+}
+
+- (IFResponseCacheEntry*)entryForKey:(NSString*)key {
+    @synchronized(self) {
+        IFResponseCacheEntry* entry = [self.entries objectForKey:key];
+        if ( entry != nil ) {
+            [self.recentKeys removeObject:key];
+            [self.recentKeys addObject:key];
+            return entry;
+        }
+    }
+
+    IFResponseCacheEntry* entry = [self diskEntryForKey:key];
+    if ( entry != nil ) {
+        @synchronized(self) {
+            [self addMemoryEntry:entry];
+        }
+    }
+    return entry;
+}
+
+- (IFResponseCacheEntry*)storeData:(NSData*)data response:(NSHTTPURLResponse*)response forKey:(NSString*)key {
+    NSDictionary* headers = [response allHeaderFields];
+    NSString* cacheControl = [headers objectForKey:@"Cache-Control"];
+    if ( [data length] == 0 || ( cacheControl != nil && [cacheControl rangeOfString:@"no-store"].location != NSNotFound ) ) {
+        return nil;
+    }
+
+    IFResponseCacheEntry* entry = [[IFResponseCacheEntry alloc] init];
+    entry.key = key;
+    entry.data = data;
+    entry.etag = [headers objectForKey:@"ETag"];
+    entry.lastModified = [headers objectForKey:@"Last-Modified"];
+    entry.contentType = response.MIMEType;
+    entry.date = [NSDate date];
+
+    @synchronized(self) {
+        [self addMemoryEntry:entry];
+    }
+    [self storeDiskEntry:entry];
+    return entry;
+}
+
+- (IFResponseCacheEntry*)revalidateEntry:(IFResponseCacheEntry*)entry {
+    IFResponseCacheEntry* revalidated = [[IFResponseCacheEntry alloc] init];
+    revalidated.key = entry.key;
+    revalidated.data = entry.data;
+    revalidated.etag = entry.etag;
+    revalidated.lastModified = entry.lastModified;
+    revalidated.contentType = entry.contentType;
+    revalidated.date = [NSDate date];
+
+    @synchronized(self) {
+        [self addMemoryEntry:revalidated];
+    }
+    [self storeDiskEntry:revalidated];
+    return revalidated;
+}
+
+- (void)removeAllEntries {
+    @synchronized(self) {
+        [self.entries removeAllObjects];
+        [self.recentKeys removeAllObjects];
+        self.memoryUsage = 0;
+    }
+
+    if ( self.diskQueue != nil ) {
+        NSString* diskPath = self.diskPath;
+        dispatch_async(self.diskQueue, ^{
+            [[NSFileManager defaultManager] removeItemAtPath:diskPath error:nil];
+            [[NSFileManager defaultManager] createDirectoryAtPath:diskPath withIntermediateDirectories:YES attributes:nil error:nil];
+        });
+    }
+}
+
+#pragma mark - Memory
+
+- (void)addMemoryEntry:(IFResponseCacheEntry*)entry {
+    [self removeMemoryEntryForKey:entry.key];
+    if ( [entry.data length] > self.memoryCapacity ) {
+        return;
+    }
+
+    [self.entries setObject:entry forKey:entry.key];
+    [self.recentKeys addObject:entry.key];
+    self.memoryUsage += [entry.data length];
+
+    while ( self.memoryUsage > self.memoryCapacity ) {
+        [self removeMemoryEntryForKey:[self.recentKeys firstObject]];
+    }
+}
+
+- (void)removeMemoryEntryForKey:(NSString*)key {
+    IFResponseCacheEntry* entry = [self.entries objectForKey:key];
+    if ( entry == nil ) {
+        return;
+    }
+    self.memoryUsage -= [entry.data length];
+    [self.entries removeObjectForKey:key];
+    [self.recentKeys removeObject:key];
+}
+
+#pragma mark - Disk
+
+- (NSString*)diskPathForKey:(NSString*)key {
+    // a hash collision is caught by the key stored in the entry
+    return [self.diskPath stringByAppendingPathComponent:[NSString stringWithFormat:@"%lx", (unsigned long)[key hash]]];
+}
+
+- (IFResponseCacheEntry*)diskEntryForKey:(NSString*)key {
+    if ( self.diskQueue == nil ) {
+        return nil;
+    }
+
+    __block IFResponseCacheEntry* entry;
+    dispatch_sync(self.diskQueue, ^{
+        @try {
+            entry = [NSKeyedUnarchiver unarchiveObjectWithFile:[self diskPathForKey:key]];
+        }
+        @catch (NSException* exception) {
+            entry = nil;
+        }
+    });
+
+    if ( ![entry isKindOfClass:[IFResponseCacheEntry class]] || ![entry.key isEqualToString:key] || entry.data == nil ) {
+        return nil;
+    }
+    return entry;
+}
+
+- (void)storeDiskEntry:(IFResponseCacheEntry*)entry {
+    if ( self.diskQueue == nil ) {
+        return;
+    }
+
+    NSString* path = [self diskPathForKey:entry.key];
+    dispatch_async(self.diskQueue, ^{
+        [NSKeyedArchiver archiveRootObject:entry toFile:path];
+    });
+}
+
+@end
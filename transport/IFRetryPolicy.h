@@ -0,0 +1,64 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import <Foundation/Foundation.h>
+
+/**
+ *	When and how soon a failed request is sent again.
+ *	Delays grow exponentially from initialDelay up to maxDelay, each of them is shortened by a random part
+ *	of up to jitter, so clients failed at once don't retry at once. A Retry-After header of the response
+ *	replaces the computed delay. No retry is done after maxElapsedTime since the first attempt.
+ **/
+
+extern const NSTimeInterval IFRetryPolicyNoRetry;
+
+@interface IFRetryPolicy : NSObject<NSCopying>
+
++ (instancetype)defaultPolicy;
+
+/**
+ *	Keys are the ones of "retry" IDL section: "attempts", "delay", "multiplier", "max_delay", "jitter",
+ *	"max_elapsed", "idempotent_only" and "retry_after". Missing keys keep default values.
+ **/
++ (instancetype)policyWithDictionary:(NSDictionary*)dictionary;
+
+- (BOOL)shouldRetryHTTPMethod:(NSString*)method;
+
+/**
+ *	Returns the delay before the attempt given (the first one is 1) or IFRetryPolicyNoRetry
+ **/
+- (NSTimeInterval)delayBeforeAttempt:(NSInteger)attempt
+                          httpMethod:(NSString*)method
+                            response:(NSHTTPURLResponse*)response
+                         elapsedTime:(NSTimeInterval)elapsedTime;
+
+@property (nonatomic) NSInteger maxAttempts;
+@property (nonatomic) NSTimeInterval initialDelay;
+@property (nonatomic) double multiplier;
+@property (nonatomic) NSTimeInterval maxDelay;
+@property (nonatomic) double jitter;
+@property (nonatomic) NSTimeInterval maxElapsedTime;
+@property (nonatomic) BOOL idempotentOnly;
+@property (nonatomic) BOOL honorRetryAfter;
+
+@end
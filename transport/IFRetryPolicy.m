@@ -0,0 +1,148 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import "IFRetryPolicy.h"
+
+const NSTimeInterval IFRetryPolicyNoRetry = -1;
+
+@implementation IFRetryPolicy
+
++ (instancetype)defaultPolicy {
+    return [[self alloc] init];
+}
+
++ (instancetype)policyWithDictionary:(NSDictionary*)dictionary {
+    IFRetryPolicy* policy = [[self alloc] init];
+
+    NSNumber* value;
+    if ( (value = dictionary[@"attempts"]) != nil ) policy.maxAttempts = [value integerValue];
+    if ( (value = dictionary[@"delay"]) != nil ) policy.initialDelay = [value doubleValue];
+    if ( (value = dictionary[@"multiplier"]) != nil ) policy.multiplier = [value doubleValue];
+    if ( (value = dictionary[@"max_delay"]) != nil ) policy.maxDelay = [value doubleValue];
+    if ( (value = dictionary[@"jitter"]) != nil ) policy.jitter = [value doubleValue];
+    if ( (value = dictionary[@"max_elapsed"]) != nil ) policy.maxElapsedTime = [value doubleValue];
+    if ( (value = dictionary[@"idempotent_only"]) != nil ) policy.idempotentOnly = [value boolValue];
+    if ( (value = dictionary[@"retry_after"]) != nil ) policy.honorRetryAfter = [value boolValue];
+
+    return policy;
+}
+
+- (instancetype)init {
+    if ( self = [super init] ) {
+        _maxAttempts = 3;
+        _initialDelay = 1;
+        _multiplier = 2;
+        _maxDelay = 30;
+        _jitter = 0.5;
+        _maxElapsedTime = 60;
+        _idempotentOnly = YES;
+        _honorRetryAfter = YES;
+    }
+    return self;
+}
+
+- (id)copyWithZone:(NSZone*)zone {
+    IFRetryPolicy* policy = [[[self class] allocWithZone:zone] init];
+    policy.maxAttempts = self.maxAttempts;
+    policy.initialDelay = self.initialDelay;
+    policy.multiplier = self.multiplier;
+    policy.maxDelay = self.maxDelay;
+    policy.jitter = self.jitter;
+    policy.maxElapsedTime = self.maxElapsedTime;
+    policy.idempotentOnly = self.idempotentOnly;
+    policy.honorRetryAfter = self.honorRetryAfter;
+    return policy;
+}
+
+- (BOOL)shouldRetryHTTPMethod:(NSString*)method {
+    if ( !self.idempotentOnly ) {
+        return YES;
+    }
+
+    static NSSet* idempotentMethods;
+    static dispatch_once_t onceToken;
+    dispatch_once(&onceToken, ^{
+        idempotentMethods = [NSSet setWithObjects:@"GET", @"HEAD", @"PUT", @"DELETE", @"OPTIONS", @"TRACE", nil];
+    });
+    return [idempotentMethods containsObject:[method uppercaseString]];
+}
+
+- (NSTimeInterval)delayBeforeAttempt:(NSInteger)attempt
+                          httpMethod:(NSString*)method
+                            response:(NSHTTPURLResponse*)response
+                         elapsedTime:(NSTimeInterval)elapsedTime {
+    if ( attempt <= 1 ) {
+        return 0;
+    }
+
+    if ( attempt > self.maxAttempts || ![self shouldRetryHTTPMethod:method] ) {
+        return IFRetryPolicyNoRetry;
+    }
+
+    NSTimeInterval delay = [self retryAfterDelay:response];
+    if ( delay < 0 ) {
+        delay = MIN(self.maxDelay, self.initialDelay * pow(self.multiplier, attempt - 2));
+        delay -= delay * self.jitter * ((double)arc4random_uniform(UINT32_MAX) / UINT32_MAX);
+    }
+
+    if ( elapsedTime + delay > self.maxElapsedTime ) {
+        return IFRetryPolicyNoRetry;
+    }
+    return delay;
+}
+
+#pragma mark - Retry-After
+
+- (NSTimeInterval)retryAfterDelay:(NSHTTPURLResponse*)response {
+    NSString* retryAfter = self.honorRetryAfter ? [[response allHeaderFields] objectForKey:@"Retry-After"] : nil;
+    if ( retryAfter == nil ) {
+        return -1;
+    }
+
+    // either delay-seconds or HTTP-date
+    NSScanner* scanner = [NSScanner scannerWithString:retryAfter];
+    NSInteger seconds;
+    if ( [scanner scanInteger:&seconds] && [scanner isAtEnd] ) {
+        return MAX(0, seconds);
+    }
+
+    static NSDateFormatter* formatter;
+    static dispatch_once_t onceToken;
+    dispatch_once(&onceToken, ^{
+        formatter = [[NSDateFormatter alloc] init];
+        formatter.locale = [[NSLocale alloc] initWithLocaleIdentifier:@"en_US_POSIX"];
+        formatter.timeZone = [NSTimeZone timeZoneWithAbbreviation:@"GMT"];
+        formatter.dateFormat = @"EEE',' dd MMM yyyy HH':'mm':'ss 'GMT'";
+    });
+
+    NSDate* date;
+    @synchronized(formatter) {
+        date = [formatter dateFromString:retryAfter];
+    }
+    if ( date == nil ) {
+        return -1;
+    }
+    return MAX(0, [date timeIntervalSinceNow]);
+}
+
+@end
@@ -22,10 +22,76 @@
 **/
 
 #import <Foundation/Foundation.h>
+#import "IFRetryPolicy.h"
+#import "IFResponseCache.h"
+
+typedef NS_ENUM(NSInteger, IFHTTPMethod) {
+	IFHTTPMETHOD_AUTO,
+    IFHTTPMETHOD_GET,
+    IFHTTPMETHOD_HEAD,
+    IFHTTPMETHOD_POST,
+    IFHTTPMETHOD_PUT,
+    IFHTTPMETHOD_DELETE,
+    IFHTTPMETHOD_PATCH,
+    IFHTTPMETHOD_OPTIONS,
+    IFHTTPMETHOD_TRACE
+};
+
+typedef NS_ENUM(NSInteger, IFContentEncoding) {
+    IFCONTENTENCODING_IDENTITY,
+    IFCONTENTENCODING_GZIP,
+    IFCONTENTENCODING_DEFLATE
+};
 
 @protocol IFTransport<NSObject>
 
 - (BOOL)writeAll:(NSData*)data endpoint:(NSString*)endpoint error:(NSError* __autoreleasing*)error;
 - (NSData*)readAll;
 
+@optional
+// content type of the data readAll returns, nil if unknown
+- (NSString*)readContentType;
+
 @end
+
+/**
+ *	Everything a single call sends: the transport keeps no per-call state,
+ *	so any number of requests may be in flight over one transport.
+ *	Params hold the custom request sections ("url_params", "custom_params", ...) by their IDL names.
+ **/
+
+@interface IFTransportRequest : NSObject
+
+- (instancetype)initWithEndpoint:(NSString*)endpoint method:(IFHTTPMethod)method;
+
+- (void)setParams:(NSDictionary*)params forSection:(NSString*)section;
+- (NSDictionary*)paramsForSection:(NSString*)section;
+
+@property (nonatomic, copy) NSString* endpoint;
+@property (nonatomic) IFHTTPMethod method;
+@property (nonatomic, copy) NSData* body;
+// how the body may be compressed, IDENTITY to send it as is
+@property (nonatomic) IFContentEncoding bodyEncoding;
+// nil for the transport one
+@property (nonatomic, copy) IFRetryPolicy* retryPolicy;
+// nil for no caching
+@property (nonatomic, copy) IFCachePolicy* cachePolicy;
+@property (nonatomic, readonly) NSDictionary* params;
+
+@end
+
+// contentType is the one of the data answered, nil if unknown
+typedef void (^IFTransportCompletion)(NSData* data, NSString* contentType, NSError* error);
+
+@protocol IFAsyncTransport<IFTransport>
+
+- (void)sendRequest:(IFTransportRequest*)request completion:(IFTransportCompletion)completion;
+
+@end
+
+/**
+ *	The generated code picks the codec to decode an answer with by its content type,
+ *	data of unknown content type is JSON. Returns nil for transports without readContentType.
+ **/
+
+NSString* IFTransportReadContentType(id<IFTransport> transport);
@@ -0,0 +1,66 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import "IFTransport.h"
+
+@interface IFTransportRequest()
+
+@property (nonatomic) NSMutableDictionary* sections;
+
+@end
+
+@implementation IFTransportRequest
+
+- (instancetype)initWithEndpoint:(NSString*)endpoint method:(IFHTTPMethod)method {
+    if ( self = [super init] ) {
+        _endpoint = [endpoint copy];
+        _method = method;
+        _sections = [NSMutableDictionary dictionary];
+    }
+    return self;
+}
+
+- (void)setParams:(NSDictionary*)params forSection:(NSString*)section {
+    if ( params == nil ) {
+        [self.sections removeObjectForKey:section];
+    } else {
+        [self.sections setObject:[params copy] forKey:section];
+    }
+}
+
+- (NSDictionary*)paramsForSection:(NSString*)section {
+    return [self.sections objectForKey:section];
+}
+
+- (NSDictionary*)params {
+    return [self.sections copy];
+}
+
+@end
+
+NSString* IFTransportReadContentType(id<IFTransport> transport) {
+    if ( ![transport respondsToSelector:@selector(readContentType)] ) {
+        return nil;
+    }
+    return [transport readContentType];
+}
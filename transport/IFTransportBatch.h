@@ -0,0 +1,56 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import <Foundation/Foundation.h>
+#import "IFTransport.h"
+
+extern NSString* const IFTransportBatchErrorDomain;
+
+/**
+ *	Queues the requests of the calls made over it and sends all of them in one envelope request:
+ *	{"calls": [{"id": 0, "method": "GET", "endpoint": "users/me", "params": {"url_params": {...}}, "body": {...}}, ...]}
+ *	The answer is {"results": [{"id": 0, "status": 200, "body": {...}}, ...]} in any order, each body comes
+ *	to the completion of its call as the response to the call alone would. A result with non-2xx status
+ *	fails its call with the status as the error code and "error" of the result as the description.
+ *	Retry and cache policies of the queued requests are not applied, the envelope request is sent as is.
+ *	The envelope is JSON, so a request with compressed or non-JSON body is not queued: its completion
+ *	gets an IFTransportBatchErrorDomain error right away.
+ **/
+
+@interface IFTransportBatch : NSObject<IFAsyncTransport>
+
+// another batch with all the queued calls, this one is left empty to queue the calls made later
+- (IFTransportBatch*)takeQueuedCalls;
+
+// POST request carrying the envelope of all the queued requests
+- (IFTransportRequest*)requestWithEndpoint:(NSString*)endpoint error:(NSError* __autoreleasing*)error;
+
+// calls the completions of the queued requests with their results, returns the error of the whole batch
+- (NSError*)completeWithData:(NSData*)data error:(NSError*)error;
+
+// sends the calls queued so far, the ones made while they are in flight stay queued
+- (void)sendWithTransport:(id<IFAsyncTransport>)transport endpoint:(NSString*)endpoint completion:(void (^)(NSError* error))completion;
+
+@property (nonatomic, readonly) NSUInteger count;
+
+@end
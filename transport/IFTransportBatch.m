@@ -0,0 +1,242 @@
+/**
+ *	Created by Evgeny Kamyshanov on Feb-Mar, 2015
+ *	Copyright (c) 2014-2015 Evgeny Kamyshanov
+ *
+ *	Permission is hereby granted, free of charge, to any person obtaining a copy
+ *	of this software and associated documentation files (the "Software"), to deal
+ *	in the Software without restriction, including without limitation the rights
+ *	to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *	copies of the Software, and to permit persons to whom the Software is
+ *	furnished to do so, subject to the following conditions:
+ *
+ *	The above copyright notice and this permission notice shall be included in
+ *	all copies or substantial portions of the Software.
+ *
+ *	THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *	OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *	THE SOFTWARE.
+ **/
+
+#import "IFTransportBatch.h"
+
+NSString* const IFTransportBatchErrorDomain = @"IFTransportBatch";
+
+static NSString* const methods[] = { @"", @"GET", @"HEAD", @"POST", @"PUT", @"DELETE", @"PATCH", @"OPTIONS", @"TRACE" };
+
+@interface IFTransportBatch()
+
+// envelope calls without ids, built when the requests are queued
+@property (nonatomic) NSMutableArray* calls;
+@property (nonatomic) NSMutableArray* completions;
+
+@end
+
+@implementation IFTransportBatch
+
+- (instancetype)init {
+    if ( self = [super init] ) {
+        _calls = [NSMutableArray array];
+        _completions = [NSMutableArray array];
+    }
+    return self;
+}
+
+- (NSUInteger)count {
+    @synchronized(self) {
+        return self.calls.count;
+    }
+}
+
+#pragma mark - IFAsyncTransport
+
+- (void)sendRequest:(IFTransportRequest*)request completion:(IFTransportCompletion)completion {
+    NSError* error = nil;
+    NSDictionary* call = [self callWithRequest:request error:&error];
+    if ( call == nil ) {
+        completion(nil, nil, error);
+        return;
+    }
+    @synchronized(self) {
+        [self.calls addObject:call];
+        [self.completions addObject:[completion copy]];
+    }
+}
+
+- (BOOL)writeAll:(NSData*)data endpoint:(NSString*)endpoint error:(NSError* __autoreleasing*)error {
+    if ( error ) {
+        *error = [self errorWithCode:0 message:@"Only asynchronous calls can be batched"];
+    }
+    return NO;
+}
+
+- (NSData*)readAll {
+    return nil;
+}
+
+#pragma mark - Envelope
+
+- (IFTransportBatch*)takeQueuedCalls {
+    IFTransportBatch* batch = [[IFTransportBatch alloc] init];
+    @synchronized(self) {
+        [batch.calls addObjectsFromArray:self.calls];
+        [batch.completions addObjectsFromArray:self.completions];
+        [self.calls removeAllObjects];
+        [self.completions removeAllObjects];
+    }
+    return batch;
+}
+
+- (IFTransportRequest*)requestWithEndpoint:(NSString*)endpoint error:(NSError* __autoreleasing*)error {
+    NSArray* queuedCalls;
+    @synchronized(self) {
+        queuedCalls = [self.calls copy];
+    }
+
+    NSMutableArray* calls = [NSMutableArray arrayWithCapacity:queuedCalls.count];
+    for ( NSUInteger index = 0; index < queuedCalls.count; index++ ) {
+        NSMutableDictionary* call = [NSMutableDictionary dictionaryWithDictionary:[queuedCalls objectAtIndex:index]];
+        [call setObject:@(index) forKey:@"id"];
+        [calls addObject:call];
+    }
+
+    NSData* body = [NSJSONSerialization dataWithJSONObject:@{@"calls": calls} options:0 error:error];
+    if ( body == nil ) {
+        return nil;
+    }
+    IFTransportRequest* request = [[IFTransportRequest alloc] initWithEndpoint:endpoint method:IFHTTPMETHOD_POST];
+    request.body = body;
+    return request;
+}
+
+- (NSError*)completeWithData:(NSData*)data error:(NSError*)error {
+    NSArray* completions;
+    @synchronized(self) {
+        completions = [self.completions copy];
+        [self.calls removeAllObjects];
+        [self.completions removeAllObjects];
+    }
+
+    NSDictionary* results = nil;
+    if ( error == nil ) {
+        results = [self resultsFromData:data error:&error];
+    }
+
+    [completions enumerateObjectsUsingBlock:^(IFTransportCompletion completion, NSUInteger index, BOOL* stop) {
+        if ( error != nil ) {
+            completion(nil, nil, error);
+            return;
+        }
+        NSDictionary* result = [results objectForKey:@(index)];
+        if ( result == nil ) {
+            completion(nil, nil, [self errorWithCode:0 message:[NSString stringWithFormat:@"No result for batch call %lu", (unsigned long)index]]);
+            return;
+        }
+        NSError* callError = nil;
+        NSData* callData = [self dataFromResult:result error:&callError];
+        // result bodies are JSON whatever the envelope came in
+        completion(callData, @"application/json", callError);
+    }];
+    return error;
+}
+
+- (void)sendWithTransport:(id<IFAsyncTransport>)transport endpoint:(NSString*)endpoint completion:(void (^)(NSError* error))completion {
+    // calls queued while the envelope is in flight stay queued for the next one
+    IFTransportBatch* batch = [self takeQueuedCalls];
+    if ( batch.count == 0 ) {
+        completion(nil);
+        return;
+    }
+    NSError* error = nil;
+    IFTransportRequest* request = [batch requestWithEndpoint:endpoint error:&error];
+    if ( request == nil ) {
+        completion([batch completeWithData:nil error:error]);
+        return;
+    }
+    [transport sendRequest:request completion:^(NSData* data, NSString* contentType, NSError* transportError) {
+        completion([batch completeWithData:data error:transportError]);
+    }];
+}
+
+#pragma mark - Helpers
+
+- (NSDictionary*)callWithRequest:(IFTransportRequest*)request error:(NSError* __autoreleasing*)error {
+    // the envelope is JSON, so only uncompressed JSON bodies can go in it
+    if ( request.bodyEncoding != IFCONTENTENCODING_IDENTITY ) {
+        *error = [self errorWithCode:0 message:[NSString stringWithFormat:@"Call to \"%@\" has compressed body and cannot be batched", request.endpoint]];
+        return nil;
+    }
+    IFHTTPMethod method = request.method;
+    if ( method == IFHTTPMETHOD_AUTO ) {
+        method = request.body == nil ? IFHTTPMETHOD_GET : IFHTTPMETHOD_POST;
+    }
+    NSMutableDictionary* call = [NSMutableDictionary dictionaryWithDictionary:@{@"method": methods[method], @"endpoint": request.endpoint ?: @""}];
+    if ( request.params.count > 0 ) {
+        [call setObject:request.params forKey:@"params"];
+    }
+    if ( request.body != nil ) {
+        id body = [NSJSONSerialization JSONObjectWithData:request.body options:NSJSONReadingAllowFragments error:NULL];
+        if ( body == nil ) {
+            *error = [self errorWithCode:0 message:[NSString stringWithFormat:@"Call to \"%@\" has non-JSON body and cannot be batched", request.endpoint]];
+            return nil;
+        }
+        [call setObject:body forKey:@"body"];
+    }
+    return call;
+}
+
+- (NSDictionary*)resultsFromData:(NSData*)data error:(NSError* __autoreleasing*)error {
+    if ( data == nil ) {
+        *error = [self errorWithCode:0 message:@"Empty batch response"];
+        return nil;
+    }
+    id envelope = [NSJSONSerialization JSONObjectWithData:data options:0 error:error];
+    if ( envelope == nil ) {
+        return nil;
+    }
+    NSArray* resultList = [envelope isKindOfClass:[NSDictionary class]] ? [envelope objectForKey:@"results"] : nil;
+    if ( ![resultList isKindOfClass:[NSArray class]] ) {
+        *error = [self errorWithCode:0 message:@"Batch response has no results"];
+        return nil;
+    }
+    NSMutableDictionary* results = [NSMutableDictionary dictionaryWithCapacity:resultList.count];
+    for ( id result in resultList ) {
+        id resultId = [result isKindOfClass:[NSDictionary class]] ? [result objectForKey:@"id"] : nil;
+        if ( [resultId isKindOfClass:[NSNumber class]] ) {
+            [results setObject:result forKey:@([resultId unsignedIntegerValue])];
+        }
+    }
+    return results;
+}
+
+- (NSData*)dataFromResult:(NSDictionary*)result error:(NSError* __autoreleasing*)error {
+    NSNumber* status = [result objectForKey:@"status"];
+    NSInteger statusCode = [status isKindOfClass:[NSNumber class]] ? [status integerValue] : 200;
+    if ( statusCode < 200 || statusCode >= 300 ) {
+        NSString* message = [result objectForKey:@"error"];
+        if ( ![message isKindOfClass:[NSString class]] ) {
+            message = [NSHTTPURLResponse localizedStringForStatusCode:statusCode];
+        }
+        *error = [self errorWithCode:statusCode message:message];
+        return nil;
+    }
+    id body = [result objectForKey:@"body"];
+    if ( body == nil ) {
+        return nil;
+    }
+    if ( [body isKindOfClass:[NSArray class]] || [body isKindOfClass:[NSDictionary class]] ) {
+        return [NSJSONSerialization dataWithJSONObject:body options:0 error:error];
+    }
+    // a fragment is written as the only item of an array, then the brackets are cut off
+    NSData* data = [NSJSONSerialization dataWithJSONObject:@[body] options:0 error:error];
+    return data.length < 2 ? nil : [data subdataWithRange:NSMakeRange(1, data.length - 2)];
+}
+
+- (NSError*)errorWithCode:(NSInteger)code message:(NSString*)message {
+    return [NSError errorWithDomain:IFTransportBatchErrorDomain code:code userInfo:@{NSLocalizedDescriptionKey: message}];
+}
+
+@end